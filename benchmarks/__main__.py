@@ -0,0 +1,13 @@
+"""
+Runs the benchmark suites: python -m benchmarks [--json results.json] [--baseline baseline.json]
+"""
+
+import sys
+
+from benchmarks import bench_container, bench_framework, bench_startup
+from benchmarks.harness import main
+
+SUITES = [bench_framework.suite, bench_container.suite, bench_startup.suite]
+
+if __name__ == "__main__":
+    sys.exit(main(SUITES))
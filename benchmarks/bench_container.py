@@ -0,0 +1,47 @@
+"""
+Benchmarks of resolving use cases through lib.container against constructing them by hand,
+for each provider scope a use case can be registered with.
+
+@author:
+@version: 1.0
+"""
+
+from typing import Callable
+
+from dependency_injector import containers, providers
+
+from benchmarks.fixtures import InMemoryPresenterResponse, NoOpPresenter, NoOpUseCase, RequestModel
+from benchmarks.harness import Suite
+from lib.container import Pooled, UseCaseResolver
+
+suite = Suite("container")
+
+
+class Container(containers.DeclarativeContainer):
+    response = providers.Factory(InMemoryPresenterResponse)
+    presenter = providers.Singleton(NoOpPresenter)
+    request_presenter = providers.Factory(NoOpPresenter)
+    singleton_usecase = providers.Singleton(NoOpUseCase, presenter)
+    thread_local_usecase = providers.ThreadLocalSingleton(NoOpUseCase, presenter)
+    factory_usecase = providers.Factory(NoOpUseCase, request_presenter)
+    pooled_usecase = Pooled(NoOpUseCase, presenter, size=4)
+
+
+@suite.benchmark("manual_construct_and_execute")
+def manual_construct_and_execute() -> Callable[[], object]:
+    return lambda: NoOpUseCase(NoOpPresenter(InMemoryPresenterResponse())).execute(RequestModel(id=1))
+
+
+def _resolve(scope: str) -> Callable[[], Callable[[], object]]:
+    def factory() -> Callable[[], object]:
+        container = Container()
+        resolver = UseCaseResolver()
+        resolver.register(RequestModel, getattr(container, f"{scope}_usecase"), response=container.response)
+        resolver.wire()
+        return lambda: resolver.execute(RequestModel(id=1))
+
+    return factory
+
+
+for _scope in ("singleton", "thread_local", "factory", "pooled"):
+    suite.benchmark(f"resolve_{_scope}_and_execute")(_resolve(_scope))
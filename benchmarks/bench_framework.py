@@ -0,0 +1,214 @@
+"""
+Benchmarks of the framework's own per-request overhead, measured with no-op gateways
+and an in-memory PresenterResponse so that only lib code is timed.
+
+@author:
+@version: 1.0
+"""
+
+import logging
+from typing import Callable
+
+from benchmarks.fixtures import (
+    ErrorResponseModel,
+    InMemoryPresenterResponse,
+    NoOpPresenter,
+    NoOpUseCase,
+    RequestModel,
+    ResponseModel,
+    field_values,
+    make_model,
+)
+from benchmarks.harness import Suite
+from lib.context import ExecutionContext, bind_context, reset_context
+from lib.fingerprint import fingerprint
+from lib.json_response import JSONPresenterResponse
+from lib.pipeline import UseCasePipeline, map_fields
+from lib.presenter import BasePresenter
+from lib.primary_ports import BaseOutputPort
+from lib.profiling import Profiler
+from lib.dto import BaseDTO
+from lib.usecase_models import BaseErrorResponseModel, BaseResponseModel
+from lib.view_model import BaseViewModel
+
+suite = Suite("framework")
+
+FIELD_COUNTS = (1, 10, 50)
+
+
+@suite.benchmark("construct_usecase_and_presenter")
+def construct_usecase_and_presenter() -> Callable[[], object]:
+    response = InMemoryPresenterResponse()
+    return lambda: NoOpUseCase(NoOpPresenter(response))
+
+
+def _execute(id: int) -> Callable[[], Callable[[], object]]:
+    def factory() -> Callable[[], object]:
+        usecase = NoOpUseCase(NoOpPresenter(InMemoryPresenterResponse()))
+        requestModel = RequestModel(id=id)
+        return lambda: usecase.execute(requestModel)
+
+    return factory
+
+
+suite.benchmark("execute_success")(_execute(1))
+suite.benchmark("execute_dto_error")(_execute(-1))
+suite.benchmark("execute_process_error")(_execute(0))
+
+
+def _execute_profiled(rate: float) -> Callable[[], Callable[[], object]]:
+    def factory() -> Callable[[], object]:
+        class ProfiledUseCase(NoOpUseCase):
+            pass
+
+        Profiler(rate=rate).instrument(ProfiledUseCase)
+        usecase = ProfiledUseCase(NoOpPresenter(InMemoryPresenterResponse()))
+        requestModel = RequestModel(id=1)
+        return lambda: usecase.execute(requestModel)
+
+    return factory
+
+
+suite.benchmark("execute_success_profiler_unsampled")(_execute_profiled(0.0))
+suite.benchmark("execute_success_profiler_sampled")(_execute_profiled(1.0))
+
+
+@suite.benchmark("execute_with_shared_instances")
+def execute_with_shared_instances() -> Callable[[], object]:
+    usecase = NoOpUseCase(NoOpPresenter())
+    return lambda: usecase.execute_with(RequestModel(id=1), response=InMemoryPresenterResponse())
+
+
+@suite.benchmark("construct_and_execute")
+def construct_and_execute() -> Callable[[], object]:
+    response = InMemoryPresenterResponse()
+    return lambda: NoOpUseCase(NoOpPresenter(response)).execute(RequestModel(id=1))
+
+
+def _construct(
+    model: type[BaseDTO | BaseResponseModel | BaseErrorResponseModel | BaseViewModel], **base: object
+) -> None:
+    for field_count in FIELD_COUNTS:
+        cls = make_model(model, field_count)
+        data = {**base, **field_values(field_count)}
+
+        def factory(cls: type = cls, data: dict[str, object] = data) -> Callable[[], object]:
+            return lambda: cls(**data)
+
+        suite.benchmark(f"construct_{model.__name__}_{field_count}_fields")(factory)
+
+
+_construct(BaseDTO, status=True, errorCode=0, errorName="", errorMessage="")
+_construct(BaseResponseModel)
+_construct(BaseErrorResponseModel, code=500, message="error")
+_construct(BaseViewModel, status=True)
+
+
+class ListViewModel(BaseViewModel):
+    items: list[int]
+
+
+LIST_ITEMS = list(range(10_000))
+
+
+@suite.benchmark("construct_list_view_model_10k_items")
+def construct_list_view_model() -> Callable[[], object]:
+    return lambda: ListViewModel(status=True, items=LIST_ITEMS)
+
+
+@suite.benchmark("construct_list_view_model_10k_items_trusted")
+def construct_list_view_model_trusted() -> Callable[[], object]:
+    return lambda: ListViewModel.trusted(status=True, items=LIST_ITEMS)
+
+
+@suite.benchmark("log_disabled_eager_fstring")
+def log_disabled_eager_fstring() -> Callable[[], object]:
+    usecase = NoOpUseCase(NoOpPresenter())
+    usecase.logger.setLevel(logging.WARNING)
+    requestModel = RequestModel(id=1)
+    return lambda: usecase.logger.logger.info(f"Executing {usecase} with {requestModel}")
+
+
+@suite.benchmark("log_disabled_structured")
+def log_disabled_structured() -> Callable[[], object]:
+    usecase = NoOpUseCase(NoOpPresenter())
+    usecase.logger.setLevel(logging.WARNING)
+    requestModel = RequestModel(id=1)
+    return lambda: usecase.logger.info("usecase.executing", request=requestModel)
+
+
+class _CapturingPresenter(BaseOutputPort[ResponseModel, ErrorResponseModel]):
+    def __init__(self) -> None:
+        super().__init__()
+        self.result: ResponseModel | ErrorResponseModel | None = None
+
+    def presentSuccess(self, responseModel: ResponseModel) -> None:
+        self.result = responseModel
+
+    def presentError(self, errorModel: ErrorResponseModel) -> None:
+        self.result = errorModel
+
+
+@suite.benchmark("compose_two_usecases_by_capture_and_revalidation")
+def compose_by_capture() -> Callable[[], object]:
+    first, second = NoOpUseCase(), NoOpUseCase(NoOpPresenter())
+    response = InMemoryPresenterResponse()
+
+    def compose() -> None:
+        capture = _CapturingPresenter()
+        first.execute_with(RequestModel(id=1), capture)
+        assert isinstance(capture.result, ResponseModel)
+        second.execute_with(RequestModel(**capture.result.model_dump(exclude={"status"})), response=response)
+
+    return compose
+
+
+@suite.benchmark("compose_two_usecases_with_pipeline")
+def compose_with_pipeline() -> Callable[[], object]:
+    pipeline = UseCasePipeline[RequestModel](NoOpUseCase()).then(map_fields(RequestModel), NoOpUseCase(NoOpPresenter()))
+    response = InMemoryPresenterResponse()
+    return lambda: pipeline.execute_with(RequestModel(id=1), response=response)
+
+
+class ListResponseModel(BaseResponseModel):
+    items: list[int]
+
+
+class _ListPresenter(BasePresenter[ListResponseModel, ErrorResponseModel, ListViewModel]):
+    conditional = True
+
+    def convertResponseToViewModel(self, responseModel: ListResponseModel) -> ListViewModel:
+        return ListViewModel(status=True, items=responseModel.items)
+
+    def convertErrorToViewModel(self, errorModel: ErrorResponseModel) -> ListViewModel:
+        return ListViewModel(status=False, items=[], errorMessage=errorModel.message)
+
+
+LIST_RESPONSE = ListResponseModel(items=LIST_ITEMS)
+
+
+@suite.benchmark("fingerprint_response_model_10k_items")
+def fingerprint_response_model() -> Callable[[], object]:
+    return lambda: fingerprint(LIST_RESPONSE)
+
+
+def _present_list(if_none_match: str | None) -> Callable[[], Callable[[], object]]:
+    def factory() -> Callable[[], object]:
+        presenter = _ListPresenter()
+        context = ExecutionContext(None, presenter, JSONPresenterResponse(), if_none_match)
+
+        def present() -> None:
+            token = bind_context(context)
+            try:
+                presenter.presentSuccess(LIST_RESPONSE)
+            finally:
+                reset_context(token)
+
+        return present
+
+    return factory
+
+
+# a changed result pays the fingerprint on top of conversion and serialization, an unchanged one only the fingerprint
+suite.benchmark("present_10k_items_changed")(_present_list(None))
+suite.benchmark("present_10k_items_not_modified")(_present_list(fingerprint(LIST_RESPONSE)))
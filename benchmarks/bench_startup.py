@@ -0,0 +1,72 @@
+"""
+Benchmarks of startup cost: defining models with eager and deferred schema building, and importing
+lib plus an application's worth of models in a fresh interpreter, with and without CAPS_LAZY_SCHEMAS.
+
+@author:
+@version: 1.0
+"""
+
+import os
+import subprocess
+import sys
+from typing import Any, Callable
+
+from pydantic import BaseModel, ConfigDict, create_model
+
+from benchmarks.harness import Suite
+from lib.startup import warmup
+
+suite = Suite("startup")
+
+FIELD_COUNT = 20
+MODEL_COUNT = 100
+
+# an entry point that imports the library and defines MODEL_COUNT application models,
+# then validates a single one of them, like an invocation that serves one use case
+_ENTRY_POINT = f"""
+from pydantic import create_model
+import lib.usecase, lib.presenter, lib.json_response
+from lib.dto import BaseDTO
+fields = {{f"f{{i}}": (int, ...) for i in range({FIELD_COUNT})}}
+models = [create_model(f"DTO{{n}}", __base__=BaseDTO, **fields) for n in range({MODEL_COUNT})]
+models[0](status=True, errorCode=0, errorName="", errorMessage="", **{{name: 1 for name in fields}})
+"""
+
+
+class _EagerBase(BaseModel):
+    model_config = ConfigDict(defer_build=False)
+
+
+class _DeferredBase(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
+
+_fields: dict[str, Any] = {f"f{i}": (int, ...) for i in range(FIELD_COUNT)}
+
+
+@suite.benchmark(f"define_model_{FIELD_COUNT}_fields_eager")
+def define_model_eager() -> Callable[[], object]:
+    return lambda: create_model("Eager", __base__=_EagerBase, **_fields)
+
+
+@suite.benchmark(f"define_model_{FIELD_COUNT}_fields_deferred")
+def define_model_deferred() -> Callable[[], object]:
+    return lambda: create_model("Deferred", __base__=_DeferredBase, **_fields)
+
+
+@suite.benchmark(f"define_and_warmup_model_{FIELD_COUNT}_fields_deferred")
+def define_and_warmup_model_deferred() -> Callable[[], object]:
+    return lambda: warmup(create_model("Deferred", __base__=_DeferredBase, **_fields))
+
+
+def _import(lazy: bool) -> Callable[[], Callable[[], object]]:
+    def factory() -> Callable[[], object]:
+        env = {**os.environ, "CAPS_LAZY_SCHEMAS": "1" if lazy else "0"}
+        command = [sys.executable, "-c", _ENTRY_POINT]
+        return lambda: subprocess.run(command, env=env, check=True)
+
+    return factory
+
+
+suite.benchmark(f"import_lib_and_{MODEL_COUNT}_models_eager")(_import(False))
+suite.benchmark(f"import_lib_and_{MODEL_COUNT}_models_lazy")(_import(True))
@@ -0,0 +1,216 @@
+"""
+This module defines the stand-ins the benchmarks run the framework with: no-op gateways,
+gateways with simulated latency, in-memory presenter responses and models with a configurable
+number of fields.
+
+@author:
+@version: 1.0
+"""
+
+import asyncio
+import random
+import time
+from typing import Any, TypeVar
+from pydantic import BaseModel, create_model
+
+from lib.dto import BaseDTO
+from lib.presenter import AsyncBasePresenter, BasePresenter
+from lib.response import AsyncPresenterResponse, PresenterResponse
+from lib.secondary_ports import AsyncBaseGateway, BaseGateway
+from lib.usecase import AsyncBaseSingleDTOUseCase, BaseSingleDTOUseCase
+from lib.usecase_models import (
+    BaseAuthenticatedRequestModel,
+    BaseErrorResponseModel,
+    BaseRequestModel,
+    BaseResponseModel,
+)
+from lib.view_model import BaseViewModel
+
+TModel = TypeVar("TModel", bound=BaseModel)
+
+
+def make_model(base: type[TModel], field_count: int) -> type[TModel]:
+    """
+    Returns a subclass of base with int fields f0 .. f<field_count - 1>.
+    """
+    fields: dict[str, Any] = {f"f{i}": (int, ...) for i in range(field_count)}
+    model: type[TModel] = create_model(f"{base.__name__}{field_count}", __base__=base, **fields)
+    return model
+
+
+def field_values(field_count: int) -> dict[str, int]:
+    return {f"f{i}": i for i in range(field_count)}
+
+
+class InMemoryPresenterResponse(PresenterResponse):
+    """
+    Keeps the last presented view model and counts the presentations.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.last: BaseViewModel | None = None
+        self.count: int = 0
+
+    def present(self, view_model: BaseViewModel) -> None:
+        self.last = view_model
+        self.count += 1
+
+
+class AsyncInMemoryPresenterResponse(AsyncPresenterResponse):
+    """
+    Keeps the last presented view model and counts the presentations.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.last: BaseViewModel | None = None
+        self.count: int = 0
+
+    async def present(self, view_model: BaseViewModel) -> None:
+        self.last = view_model
+        self.count += 1
+
+
+class RequestModel(BaseRequestModel):
+    id: int
+
+
+class DTO(BaseDTO):
+    id: int
+
+
+class ResponseModel(BaseResponseModel):
+    id: int
+
+
+class ErrorResponseModel(BaseErrorResponseModel):
+    pass
+
+
+class ViewModel(BaseViewModel):
+    id: int | None = None
+
+
+OK_DTO = DTO(status=True, errorCode=0, errorName="", errorMessage="", id=1)
+FAILED_DTO = DTO(status=False, errorCode=404, errorName="NotFound", errorMessage="not found", id=0)
+
+
+class NoOpPresenter(BasePresenter[ResponseModel, ErrorResponseModel, ViewModel]):
+    def convertResponseToViewModel(self, responseModel: ResponseModel) -> ViewModel:
+        return ViewModel(status=True, id=responseModel.id)
+
+    def convertErrorToViewModel(self, errorModel: ErrorResponseModel) -> ViewModel:
+        return ViewModel(status=False, errorName=str(errorModel.code), errorMessage=errorModel.message)
+
+
+class NoOpUseCase(
+    BaseSingleDTOUseCase[RequestModel, BaseAuthenticatedRequestModel, ResponseModel, ErrorResponseModel, DTO]
+):
+    """
+    A use case whose gateway returns a prebuilt DTO: id < 0 fails the DTO, id == 0 fails processing.
+    """
+
+    def validate_request_model(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> None:
+        pass
+
+    def make_dto_request(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> DTO:
+        return FAILED_DTO if requestModel.id < 0 else OK_DTO  # type: ignore[union-attr]
+
+    def handle_dto_error(self, dto: DTO) -> ErrorResponseModel:
+        return ErrorResponseModel(code=dto.errorCode, message=dto.errorMessage)
+
+    def process_dto(self, dto: DTO) -> ResponseModel | ErrorResponseModel:
+        if dto.id == 0:
+            return ErrorResponseModel(code=400, message="invalid")
+        return ResponseModel(id=dto.id)
+
+
+class AsyncNoOpPresenter(AsyncBasePresenter[ResponseModel, ErrorResponseModel, ViewModel]):
+    def convertResponseToViewModel(self, responseModel: ResponseModel) -> ViewModel:
+        return ViewModel(status=True, id=responseModel.id)
+
+    def convertErrorToViewModel(self, errorModel: ErrorResponseModel) -> ViewModel:
+        return ViewModel(status=False, errorName=str(errorModel.code), errorMessage=errorModel.message)
+
+
+class SimulatedLatencyGateway(BaseGateway[int, DTO]):
+    """
+    A gateway that waits like a remote service before returning a DTO, failing a fraction of the lookups.
+
+    @param latency: The mean time a lookup takes, in seconds.
+    @param jitter: The maximum deviation from latency, in seconds, drawn uniformly per lookup.
+    @param error_rate: The fraction of lookups that return a failed DTO.
+    @param seed: The seed of the latency and error draws.
+    """
+
+    def __init__(self, latency: float = 0.001, jitter: float = 0.0, error_rate: float = 0.0, seed: int = 0) -> None:
+        super().__init__()
+        self.latency: float = latency
+        self.jitter: float = jitter
+        self.error_rate: float = error_rate
+        self._random: random.Random = random.Random(seed)
+
+    def draw(self) -> tuple[float, bool]:
+        """
+        Returns the latency of the next lookup and whether it fails.
+        """
+        delay = self.latency + self._random.uniform(-self.jitter, self.jitter) if self.jitter else self.latency
+        return max(0.0, delay), self._random.random() < self.error_rate
+
+    def get(self, key: int) -> DTO:
+        delay, failed = self.draw()
+        time.sleep(delay)
+        return FAILED_DTO if failed else OK_DTO
+
+
+class AsyncSimulatedLatencyGateway(AsyncBaseGateway[int, DTO]):
+    """
+    The asynchronous counterpart of SimulatedLatencyGateway, waiting with asyncio.sleep.
+    """
+
+    def __init__(self, latency: float = 0.001, jitter: float = 0.0, error_rate: float = 0.0, seed: int = 0) -> None:
+        super().__init__()
+        self._draws: SimulatedLatencyGateway = SimulatedLatencyGateway(latency, jitter, error_rate, seed)
+
+    async def get(self, key: int) -> DTO:
+        delay, failed = self._draws.draw()
+        await asyncio.sleep(delay)
+        return FAILED_DTO if failed else OK_DTO
+
+
+class GatewayUseCase(NoOpUseCase):
+    """
+    A use case fetching its DTO from a gateway, e.g. a SimulatedLatencyGateway.
+    """
+
+    def __init__(self, gateway: BaseGateway[int, DTO], presenter: NoOpPresenter | None = None) -> None:
+        super().__init__(presenter)
+        self.gateway: BaseGateway[int, DTO] = gateway
+
+    def make_dto_request(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> DTO:
+        return self.gateway.get(requestModel.id)  # type: ignore[union-attr]
+
+
+class AsyncGatewayUseCase(
+    AsyncBaseSingleDTOUseCase[RequestModel, BaseAuthenticatedRequestModel, ResponseModel, ErrorResponseModel, DTO]
+):
+    """
+    The asynchronous counterpart of GatewayUseCase.
+    """
+
+    def __init__(self, gateway: AsyncBaseGateway[int, DTO], presenter: AsyncNoOpPresenter | None = None) -> None:
+        super().__init__(presenter)
+        self.gateway: AsyncBaseGateway[int, DTO] = gateway
+
+    async def validate_request_model(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> None:
+        pass
+
+    async def make_dto_request(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> DTO:
+        return await self.gateway.get(requestModel.id)  # type: ignore[union-attr]
+
+    def handle_dto_error(self, dto: DTO) -> ErrorResponseModel:
+        return ErrorResponseModel(code=dto.errorCode, message=dto.errorMessage)
+
+    async def process_dto(self, dto: DTO) -> ResponseModel | ErrorResponseModel:
+        return ResponseModel(id=dto.id)
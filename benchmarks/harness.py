@@ -0,0 +1,175 @@
+"""
+This module defines the benchmark harness: timing of registered benchmarks,
+machine-readable results and comparison against a stored baseline.
+
+@author:
+@version: 1.0
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import time
+from typing import Any, Callable, Sequence
+
+
+class BenchmarkResult:
+    """
+    The timing of one benchmark.
+
+    :name (str): The qualified name of the benchmark, "<suite>.<benchmark>".
+    :ns_per_call (float): The median time per call over all repeats, in nanoseconds.
+    :min_ns_per_call (float): The fastest repeat, in nanoseconds per call.
+    :number (int): The calls per repeat.
+    :repeat (int): The number of repeats.
+    """
+
+    def __init__(self, name: str, ns_per_call: float, min_ns_per_call: float, number: int, repeat: int) -> None:
+        self.name: str = name
+        self.ns_per_call: float = ns_per_call
+        self.min_ns_per_call: float = min_ns_per_call
+        self.number: int = number
+        self.repeat: int = repeat
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "ns_per_call": self.ns_per_call,
+            "min_ns_per_call": self.min_ns_per_call,
+            "number": self.number,
+            "repeat": self.repeat,
+        }
+
+
+def measure(
+    fn: Callable[[], object], number: int | None = None, repeat: int = 5, target: float = 0.1
+) -> tuple[float, float, int]:
+    """
+    Times fn, returning (median ns per call, min ns per call, calls per repeat).
+
+    :param number: The calls per repeat, calibrated so a repeat takes about target seconds if None.
+    :param repeat: The number of repeats.
+    :param target: The calibration target, in seconds per repeat.
+    """
+    if number is None:
+        number = 1
+        while number < 1 << 24:
+            start = time.perf_counter()
+            for _ in range(number):
+                fn()
+            if time.perf_counter() - start >= target:
+                break
+            number *= 2
+    timings: list[float] = []
+    for _ in range(repeat):
+        start_ns = time.perf_counter_ns()
+        for _ in range(number):
+            fn()
+        timings.append((time.perf_counter_ns() - start_ns) / number)
+    return statistics.median(timings), min(timings), number
+
+
+class Suite:
+    """
+    A named group of benchmarks. A benchmark is a factory returning the zero-argument
+    function to time, so setup cost stays out of the measurement.
+
+    @param name: The name of the suite.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name: str = name
+        self.benchmarks: dict[str, Callable[[], Callable[[], object]]] = {}
+
+    def benchmark(
+        self, name: str
+    ) -> Callable[[Callable[[], Callable[[], object]]], Callable[[], Callable[[], object]]]:
+        """
+        Decorator registering a benchmark factory under name.
+        """
+
+        def register(factory: Callable[[], Callable[[], object]]) -> Callable[[], Callable[[], object]]:
+            self.benchmarks[name] = factory
+            return factory
+
+        return register
+
+    def run(
+        self, number: int | None = None, repeat: int = 5, target: float = 0.1, only: str | None = None
+    ) -> list[BenchmarkResult]:
+        """
+        Runs every benchmark of the suite whose qualified name contains only.
+        """
+        results = []
+        for name, factory in self.benchmarks.items():
+            qualified = f"{self.name}.{name}"
+            if only is not None and only not in qualified:
+                continue
+            median, fastest, calls = measure(factory(), number=number, repeat=repeat, target=target)
+            results.append(BenchmarkResult(qualified, median, fastest, calls, repeat))
+        return results
+
+
+def to_json(results: Sequence[BenchmarkResult]) -> dict[str, Any]:
+    """
+    Returns the machine-readable form of results, as stored for baselines.
+    """
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "results": {result.name: result.to_dict() for result in results},
+    }
+
+
+def compare(
+    current: dict[str, Any], baseline: dict[str, Any], tolerance: float = 0.1
+) -> list[tuple[str, float, float]]:
+    """
+    Returns the (name, baseline ns, current ns) of every benchmark that got slower than
+    the baseline by more than tolerance (a fraction). Benchmarks missing from either side are ignored.
+    """
+    regressions = []
+    for name, result in current["results"].items():
+        reference = baseline["results"].get(name)
+        if reference is None:
+            continue
+        if result["ns_per_call"] > reference["ns_per_call"] * (1 + tolerance):
+            regressions.append((name, reference["ns_per_call"], result["ns_per_call"]))
+    return regressions
+
+
+def main(suites: Sequence[Suite], argv: Sequence[str] | None = None) -> int:
+    """
+    Command line entry point: runs the suites, prints a table, optionally writes the results
+    as JSON and compares them to a baseline. Returns 1 when a regression is found.
+    """
+    parser = argparse.ArgumentParser(description="Run the caps benchmarks.")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--baseline", help="compare against the results stored in this file")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="allowed slowdown vs the baseline (0.1 = 10%%)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--number", type=int, default=None, help="calls per repeat (default: calibrated)")
+    parser.add_argument("--only", default=None, help="only run benchmarks whose name contains this")
+    args = parser.parse_args(argv)
+
+    results: list[BenchmarkResult] = []
+    for suite in suites:
+        results += suite.run(number=args.number, repeat=args.repeat, only=args.only)
+    width = max((len(result.name) for result in results), default=10)
+    for result in results:
+        print(f"{result.name:<{width}}  {result.ns_per_call:>12.0f} ns/call  (min {result.min_ns_per_call:.0f})")
+
+    current = to_json(results)
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(current, file, indent=2, sort_keys=True)
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        regressions = compare(current, baseline, args.tolerance)
+        for name, before, after in regressions:
+            print(f"REGRESSION {name}: {before:.0f} -> {after:.0f} ns/call (+{(after / before - 1) * 100:.0f}%)")
+        if regressions:
+            return 1
+    return 0
@@ -0,0 +1,319 @@
+"""
+This module defines the load harness: it drives an input port with a stream of request models from
+many threads or asyncio tasks at once and reports throughput, latency percentiles and error ratio,
+over a sweep of concurrency levels, to find where the throughput stops growing.
+
+A target is a factory returning an input port and the in-memory presenter response it presents to.
+Every worker builds its own, so ports need not be thread-safe. An execution is an error when it raises
+or presents a failed view model. With a rate the load is open-loop: request i is due i / rate seconds
+after the start, and its latency is measured from then, so a saturated port shows its queueing delay
+instead of hiding it. Without a rate every worker sends its next request as soon as the previous one
+is presented.
+
+    python -m benchmarks.load --mode threads --levels 1,2,4,8,16,32 --latency 0.005 --error-rate 0.01
+
+@author:
+@version: 1.0
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import threading
+import time
+from typing import Any, Awaitable, Callable, Iterable, Iterator, Sequence
+
+from benchmarks.fixtures import (
+    AsyncGatewayUseCase,
+    AsyncInMemoryPresenterResponse,
+    AsyncNoOpPresenter,
+    AsyncSimulatedLatencyGateway,
+    GatewayUseCase,
+    InMemoryPresenterResponse,
+    NoOpPresenter,
+    RequestModel,
+    SimulatedLatencyGateway,
+)
+from lib.primary_ports import AsyncBaseInputPort, BaseInputPort
+from lib.usecase_models import BaseRequestModel
+
+PERCENTILES = (50.0, 95.0, 99.0, 99.9)
+
+Target = Callable[[], tuple[BaseInputPort[Any], InMemoryPresenterResponse]]
+AsyncTarget = Callable[[], tuple[AsyncBaseInputPort[Any], AsyncInMemoryPresenterResponse]]
+Requests = Callable[[int], BaseRequestModel]
+
+
+class LoadResult:
+    """
+    The outcome of driving a target at one concurrency level.
+
+    :mode (str): "threads" or "asyncio".
+    :concurrency (int): The number of concurrent workers.
+    :requests (int): The executions completed.
+    :errors (int): The executions that raised or presented a failed view model.
+    :elapsed (float): The duration of the run, in seconds.
+    :latencies (dict[float, float]): The latency percentiles, in seconds, by percentile.
+    """
+
+    def __init__(
+        self, mode: str, concurrency: int, requests: int, errors: int, elapsed: float, latencies: dict[float, float]
+    ) -> None:
+        self.mode: str = mode
+        self.concurrency: int = concurrency
+        self.requests: int = requests
+        self.errors: int = errors
+        self.elapsed: float = elapsed
+        self.latencies: dict[float, float] = latencies
+
+    @property
+    def throughput(self) -> float:
+        """
+        Completed executions per second.
+        """
+        return self.requests / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def error_ratio(self) -> float:
+        return self.errors / self.requests if self.requests else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "concurrency": self.concurrency,
+            "requests": self.requests,
+            "errors": self.errors,
+            "elapsed": self.elapsed,
+            "throughput": self.throughput,
+            "error_ratio": self.error_ratio,
+            "latencies": {str(p): latency for p, latency in self.latencies.items()},
+        }
+
+
+def percentiles(samples: Iterable[float], wanted: Iterable[float] = PERCENTILES) -> dict[float, float]:
+    """
+    Returns the nearest-rank percentiles of samples, NaN when there are none.
+    """
+    ordered = sorted(samples)
+    if not ordered:
+        return {p: math.nan for p in wanted}
+    # rounded so that float error in e.g. 99.9 / 100 * 1000 does not push the rank up by one
+    return {p: ordered[max(0, math.ceil(round(p / 100 * len(ordered), 9)) - 1)] for p in wanted}
+
+
+class _Schedule:
+    """
+    Hands out request indexes to the workers until the run is over, with the time each one is due.
+    """
+
+    def __init__(self, duration: float, rate: float | None, limit: int | None) -> None:
+        self.rate: float | None = rate
+        self.limit: int | None = limit
+        self.start: float = time.perf_counter()
+        self.end: float = self.start + duration
+        self._counter: Iterator[int] = itertools.count()
+        self._lock: threading.Lock = threading.Lock()
+
+    def next(self) -> tuple[int, float] | None:
+        with self._lock:
+            index = next(self._counter)
+        if self.limit is not None and index >= self.limit:
+            return None
+        due = time.perf_counter() if self.rate is None else self.start + index / self.rate
+        if due >= self.end:
+            return None
+        return index, due
+
+
+def _failed(response: InMemoryPresenterResponse | AsyncInMemoryPresenterResponse) -> bool:
+    return response.last is not None and not response.last.status
+
+
+def run_threads(
+    target: Target,
+    requests: Requests,
+    concurrency: int,
+    duration: float = 1.0,
+    rate: float | None = None,
+    limit: int | None = None,
+) -> LoadResult:
+    """
+    Drives target from concurrency threads for duration seconds.
+
+    :param target: Returns the port a worker executes and the presenter response it presents to.
+    :param requests: Returns the request model of the i-th execution.
+    :param concurrency: The number of threads.
+    :param duration: How long requests are sent for, in seconds.
+    :param rate: The total request rate per second, as fast as possible if None.
+    :param limit: The maximum number of requests.
+    """
+    ports = [target() for _ in range(concurrency)]
+    schedule = _Schedule(duration, rate, limit)
+    latencies: list[list[float]] = [[] for _ in range(concurrency)]
+    errors = [0] * concurrency
+
+    def work(worker: int) -> None:
+        port, response = ports[worker]
+        samples = latencies[worker]
+        while (item := schedule.next()) is not None:
+            index, due = item
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            response.last = None
+            try:
+                port.execute(requests(index))
+                failed = _failed(response)
+            except Exception:
+                failed = True
+            samples.append(time.perf_counter() - due)
+            errors[worker] += failed
+
+    threads = [threading.Thread(target=work, args=(worker,), daemon=True) for worker in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - schedule.start
+    samples = [latency for worker in latencies for latency in worker]
+    return LoadResult("threads", concurrency, len(samples), sum(errors), elapsed, percentiles(samples))
+
+
+async def run_asyncio(
+    target: AsyncTarget,
+    requests: Requests,
+    concurrency: int,
+    duration: float = 1.0,
+    rate: float | None = None,
+    limit: int | None = None,
+) -> LoadResult:
+    """
+    Drives target from concurrency tasks on the running event loop for duration seconds.
+    The parameters are those of run_threads.
+    """
+    ports = [target() for _ in range(concurrency)]
+    schedule = _Schedule(duration, rate, limit)
+    samples: list[float] = []
+    errors = 0
+
+    async def work(worker: int) -> None:
+        nonlocal errors
+        port, response = ports[worker]
+        while (item := schedule.next()) is not None:
+            index, due = item
+            delay = due - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            response.last = None
+            try:
+                await port.execute(requests(index))
+                failed = _failed(response)
+            except Exception:
+                failed = True
+            samples.append(time.perf_counter() - due)
+            errors += failed
+
+    await asyncio.gather(*(work(worker) for worker in range(concurrency)))
+    elapsed = time.perf_counter() - schedule.start
+    return LoadResult("asyncio", concurrency, len(samples), errors, elapsed, percentiles(samples))
+
+
+def sweep(run: Callable[[int], LoadResult | Awaitable[LoadResult]], levels: Sequence[int]) -> list[LoadResult]:
+    """
+    Returns the results of run at every concurrency level, in order. run may be a coroutine function.
+    """
+    results = []
+    for level in levels:
+        result = run(level)
+        if not isinstance(result, LoadResult):
+            result = asyncio.run(result)  # type: ignore[arg-type]
+        results.append(result)
+    return results
+
+
+def saturation_point(results: Sequence[LoadResult], gain: float = 0.1) -> LoadResult | None:
+    """
+    Returns the first result beyond which more concurrency raised throughput by less than gain
+    (a fraction), the level past which extra load only queues up. None if throughput kept growing.
+    """
+    for current, following in zip(results, results[1:]):
+        if following.throughput < current.throughput * (1 + gain):
+            return current
+    return None
+
+
+def format_results(results: Sequence[LoadResult], saturated: LoadResult | None = None) -> str:
+    """
+    Returns the results as a table, marking the saturation point.
+    """
+    header = f"{'mode':<8} {'conc':>5} {'reqs':>8} {'req/s':>10} {'errors':>7}" + "".join(
+        f" {'p' + format(p, 'g'):>9}" for p in PERCENTILES
+    )
+    lines = [header]
+    for result in results:
+        line = (
+            f"{result.mode:<8} {result.concurrency:>5} {result.requests:>8} {result.throughput:>10.1f}"
+            f" {result.error_ratio:>7.2%}"
+        )
+        line += "".join(f" {result.latencies[p] * 1000:>7.2f}ms" for p in PERCENTILES)
+        if result is saturated:
+            line += "  <- saturation"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """
+    Command line entry point: sweeps the simulated-latency gateway use case over concurrency levels
+    and prints the results, optionally writing them as JSON.
+    """
+    parser = argparse.ArgumentParser(description="Load-test a use case over a sweep of concurrency levels.")
+    parser.add_argument("--mode", choices=("threads", "asyncio"), default="threads")
+    parser.add_argument("--levels", default="1,2,4,8,16,32", help="comma-separated concurrency levels")
+    parser.add_argument("--duration", type=float, default=2.0, help="seconds per level")
+    parser.add_argument("--rate", type=float, default=None, help="total requests per second (default: closed loop)")
+    parser.add_argument("--latency", type=float, default=0.005, help="mean gateway latency, in seconds")
+    parser.add_argument("--jitter", type=float, default=0.002, help="maximum gateway latency deviation, in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.01, help="fraction of failed gateway lookups")
+    parser.add_argument("--gain", type=float, default=0.1, help="throughput gain below which a level saturates")
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args(argv)
+    levels = [int(level) for level in args.levels.split(",")]
+    seeds = itertools.count()
+
+    def request(index: int) -> BaseRequestModel:
+        return RequestModel(id=index + 1)
+
+    def target() -> tuple[BaseInputPort[Any], InMemoryPresenterResponse]:
+        response = InMemoryPresenterResponse()
+        gateway = SimulatedLatencyGateway(args.latency, args.jitter, args.error_rate, next(seeds))
+        return GatewayUseCase(gateway, NoOpPresenter(response)), response
+
+    def async_target() -> tuple[AsyncBaseInputPort[Any], AsyncInMemoryPresenterResponse]:
+        response = AsyncInMemoryPresenterResponse()
+        gateway = AsyncSimulatedLatencyGateway(args.latency, args.jitter, args.error_rate, next(seeds))
+        return AsyncGatewayUseCase(gateway, AsyncNoOpPresenter(response)), response
+
+    if args.mode == "threads":
+        results = sweep(lambda level: run_threads(target, request, level, args.duration, args.rate), levels)
+    else:
+        results = sweep(lambda level: run_asyncio(async_target, request, level, args.duration, args.rate), levels)
+    saturated = saturation_point(results, args.gain)
+    print(format_results(results, saturated))
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(
+                {
+                    "results": [result.to_dict() for result in results],
+                    "saturation": None if saturated is None else saturated.concurrency,
+                },
+                file,
+                indent=2,
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,139 @@
+"""
+The Clean Architecture SDK. Its public names are exported lazily: importing lib is nearly free and
+`from lib import BaseSingleDTOUseCase` only imports the modules that name needs, so entry points do
+not pay for the parts of the library they never use.
+
+@author:
+@version: 1.0
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from lib.usecase_models import (
+        BaseRequestModel as BaseRequestModel,
+        BaseAuthenticatedRequestModel as BaseAuthenticatedRequestModel,
+        BaseResponseModel as BaseResponseModel,
+        BaseErrorResponseModel as BaseErrorResponseModel,
+        validate_request_models as validate_request_models,
+    )
+    from lib.dto import BaseDTO as BaseDTO
+    from lib.view_model import (
+        BaseViewModel as BaseViewModel,
+        BaseBatchViewModel as BaseBatchViewModel,
+    )
+    from lib.trusted import (
+        TrustedModel as TrustedModel,
+        set_trusted_validation_rate as set_trusted_validation_rate,
+    )
+    from lib.primary_ports import (
+        BaseInputPort as BaseInputPort,
+        BaseOutputPort as BaseOutputPort,
+        AsyncBaseInputPort as AsyncBaseInputPort,
+        AsyncBaseOutputPort as AsyncBaseOutputPort,
+    )
+    from lib.secondary_ports import (
+        BaseGateway as BaseGateway,
+        AsyncBaseGateway as AsyncBaseGateway,
+        ConnectionPool as ConnectionPool,
+        SQLiteGateway as SQLiteGateway,
+    )
+    from lib.usecase import (
+        BaseUseCase as BaseUseCase,
+        BaseSingleDTOUseCase as BaseSingleDTOUseCase,
+        BaseMultiDTOUseCase as BaseMultiDTOUseCase,
+        BaseStreamingUseCase as BaseStreamingUseCase,
+        AsyncBaseUseCase as AsyncBaseUseCase,
+        AsyncBaseSingleDTOUseCase as AsyncBaseSingleDTOUseCase,
+        AsyncBaseMultiDTOUseCase as AsyncBaseMultiDTOUseCase,
+        AsyncBaseStreamingUseCase as AsyncBaseStreamingUseCase,
+    )
+    from lib.pipeline import (
+        UseCasePipeline as UseCasePipeline,
+        AsyncUseCasePipeline as AsyncUseCasePipeline,
+        map_fields as map_fields,
+    )
+    from lib.presenter import (
+        BasePresenter as BasePresenter,
+        AsyncBasePresenter as AsyncBasePresenter,
+    )
+    from lib.response import (
+        PresenterResponse as PresenterResponse,
+        AsyncPresenterResponse as AsyncPresenterResponse,
+    )
+    from lib.json_response import (
+        JSONPresenterResponse as JSONPresenterResponse,
+        AsyncJSONPresenterResponse as AsyncJSONPresenterResponse,
+    )
+    from lib.payload import Payload as Payload
+    from lib.deadline import (
+        Deadline as Deadline,
+        DeadlineExceeded as DeadlineExceeded,
+        current_deadline as current_deadline,
+    )
+    from lib.context import (
+        ExecutionContext as ExecutionContext,
+        current_context as current_context,
+    )
+    from lib.startup import warmup as warmup
+
+_EXPORTS: dict[str, str] = {
+    "BaseRequestModel": "lib.usecase_models",
+    "BaseAuthenticatedRequestModel": "lib.usecase_models",
+    "BaseResponseModel": "lib.usecase_models",
+    "BaseErrorResponseModel": "lib.usecase_models",
+    "validate_request_models": "lib.usecase_models",
+    "BaseDTO": "lib.dto",
+    "BaseViewModel": "lib.view_model",
+    "BaseBatchViewModel": "lib.view_model",
+    "TrustedModel": "lib.trusted",
+    "set_trusted_validation_rate": "lib.trusted",
+    "BaseInputPort": "lib.primary_ports",
+    "BaseOutputPort": "lib.primary_ports",
+    "AsyncBaseInputPort": "lib.primary_ports",
+    "AsyncBaseOutputPort": "lib.primary_ports",
+    "BaseGateway": "lib.secondary_ports",
+    "AsyncBaseGateway": "lib.secondary_ports",
+    "ConnectionPool": "lib.secondary_ports",
+    "SQLiteGateway": "lib.secondary_ports",
+    "BaseUseCase": "lib.usecase",
+    "BaseSingleDTOUseCase": "lib.usecase",
+    "BaseMultiDTOUseCase": "lib.usecase",
+    "BaseStreamingUseCase": "lib.usecase",
+    "AsyncBaseUseCase": "lib.usecase",
+    "AsyncBaseSingleDTOUseCase": "lib.usecase",
+    "AsyncBaseMultiDTOUseCase": "lib.usecase",
+    "AsyncBaseStreamingUseCase": "lib.usecase",
+    "UseCasePipeline": "lib.pipeline",
+    "AsyncUseCasePipeline": "lib.pipeline",
+    "map_fields": "lib.pipeline",
+    "BasePresenter": "lib.presenter",
+    "AsyncBasePresenter": "lib.presenter",
+    "PresenterResponse": "lib.response",
+    "AsyncPresenterResponse": "lib.response",
+    "JSONPresenterResponse": "lib.json_response",
+    "AsyncJSONPresenterResponse": "lib.json_response",
+    "Payload": "lib.payload",
+    "Deadline": "lib.deadline",
+    "DeadlineExceeded": "lib.deadline",
+    "current_deadline": "lib.deadline",
+    "ExecutionContext": "lib.context",
+    "current_context": "lib.context",
+    "warmup": "lib.startup",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -1,10 +1,19 @@
 from abc import ABC
 import logging
+from typing import Any, ClassVar
+from lib.log import StructuredLogger
 
 
 class BaseAbstractClass(ABC):
+    logger: ClassVar[StructuredLogger] = StructuredLogger(logging.getLogger(__name__))
+    """The logger of the class, named after its module and qualified name, shared by its instances."""
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls.logger = StructuredLogger(logging.getLogger(f"{cls.__module__}.{cls.__qualname__}"))
+
     def __init__(self) -> None:
-        self.logger = logging.getLogger(__name__)
+        pass
 
     def __repr__(self) -> str:
         return f"{__name__}"
@@ -0,0 +1,205 @@
+"""
+This module defines a bounded LRU/TTL cache and the DTOCache built on top of it.
+
+@author:
+@version: 1.0
+"""
+
+from collections import OrderedDict
+import threading
+import time
+from typing import Callable, Generic, Hashable, TypeVar, cast
+
+from lib.dto import BaseDTO
+from lib.usecase_models import BaseRequestModel, request_key
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class CacheStats:
+    """
+    Counters of a cache.
+
+    :hits (int): Lookups served from the cache.
+    :misses (int): Lookups that found nothing, or only an expired entry.
+    :evictions (int): Entries dropped because the cache was full.
+    :expirations (int): Entries dropped because their TTL had passed.
+    """
+
+    __slots__ = ("hits", "misses", "evictions", "expirations")
+
+    def __init__(self) -> None:
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.expirations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"CacheStats(hits={self.hits}, misses={self.misses}, "
+            f"evictions={self.evictions}, expirations={self.expirations})"
+        )
+
+
+class LRUCache(Generic[K, V]):
+    """
+    A thread-safe cache bounded by size, evicting the least recently used entry when full
+    and dropping entries whose time to live has passed.
+
+    @param maxsize: The maximum number of entries.
+    @param ttl: The default time to live in seconds, None for no expiry.
+    @param clock: The monotonic clock to use, injectable for tests.
+    """
+
+    def __init__(
+        self, maxsize: int = 1024, ttl: float | None = None, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize: int = maxsize
+        self.ttl: float | None = ttl
+        self.stats: CacheStats = CacheStats()
+        self._clock: Callable[[], float] = clock
+        self._entries: OrderedDict[K, tuple[V, float | None]] = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K) -> V | None:
+        """
+        Returns the cached value for key, or None if it is missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= self._clock():
+                del self._entries[key]
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return value
+
+    def set(self, key: K, value: V, ttl: float | None = None) -> None:
+        """
+        Stores value under key, evicting the least recently used entry if the cache is full.
+
+        :param ttl: Overrides the default time to live for this entry.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = None if ttl is None else self._clock() + ttl
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def delete(self, key: K) -> bool:
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+
+    def delete_where(self, predicate: Callable[[K], bool]) -> int:
+        """
+        Deletes every entry whose key matches predicate and returns how many were deleted.
+        """
+        with self._lock:
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class DTOCache:
+    """
+    Opt-in memoization of make_dto_request results, keyed on the use case class and the request model's content.
+    Assign an instance to a use case class' dto_cache attribute to enable it; subclasses inheriting it,
+    or use cases sharing an instance, never serve each other's DTOs.
+
+    Requests that are a BaseAuthenticatedRequestModel are scoped to their user_id,
+    so a DTO fetched for one user is never served to another.
+
+    @param maxsize: The maximum number of cached DTOs.
+    @param ttl: The time to live of successful DTOs, in seconds.
+    @param error_ttl: The time to live of failed DTOs (status == False), None to not cache them.
+    @param clock: The monotonic clock to use, injectable for tests.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float | None = 60.0,
+        error_ttl: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.error_ttl: float | None = error_ttl
+        self._cache: LRUCache[Hashable, BaseDTO] = LRUCache(maxsize=maxsize, ttl=ttl, clock=clock)
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._cache.stats
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def get(self, requestModel: BaseRequestModel, key: Hashable | None = None) -> BaseDTO | None:
+        """
+        Returns the DTO cached for requestModel, or None.
+
+        :param key: The request_key of requestModel, if the caller already computed it.
+        """
+        return self._cache.get(request_key(requestModel) if key is None else key)
+
+    def put(self, requestModel: BaseRequestModel, dto: BaseDTO, key: Hashable | None = None) -> None:
+        """
+        Caches dto for requestModel, honouring error_ttl for failed DTOs.
+
+        :param key: The request_key of requestModel, if the caller already computed it.
+        """
+        if dto.status == False and self.error_ttl is None:
+            return
+        key = request_key(requestModel) if key is None else key
+        if dto.status == False:
+            self._cache.set(key, dto, ttl=self.error_ttl)
+        else:
+            self._cache.set(key, dto)
+
+    def invalidate(self, requestModel: BaseRequestModel, owner: type | None = None) -> bool:
+        """
+        Drops the DTO cached for requestModel, returns whether there was one.
+
+        :param owner: The use case class the DTO was fetched by, None to drop it for every use case.
+        """
+        if owner is not None:
+            return self._cache.delete(request_key(requestModel, owner))
+        scope, _, model, content = cast(tuple[Hashable, ...], request_key(requestModel))
+
+        def matches(key: Hashable) -> bool:
+            stored = cast(tuple[Hashable, ...], key)
+            return (stored[0], stored[2], stored[3]) == (scope, model, content)
+
+        return self._cache.delete_where(matches) > 0
+
+    def invalidate_user(self, user_id: int) -> int:
+        """
+        Drops every DTO cached for the given user, returns how many were dropped.
+        """
+        return self._cache.delete_where(lambda key: key[0] == user_id)  # type: ignore[index]
+
+    def clear(self) -> None:
+        self._cache.clear()
@@ -0,0 +1,314 @@
+"""
+This module integrates dependency-injector: UseCaseResolver and AsyncUseCaseResolver map request model
+types to the container providers of their use case, presenter and presenter response, and Pooled is a
+provider scope for objects that must not be shared by concurrent requests.
+
+Scopes are the providers' own: providers.Singleton for stateless use cases and presenters (shared safely
+thanks to execute_with), providers.ThreadLocalSingleton for objects bound to a thread, providers.Factory
+for per-request objects such as presenter responses, and Pooled for a bounded set of reusable instances
+such as use cases wrapping a non-thread-safe gateway.
+
+wire() runs at startup: it instantiates the singletons and stores every binding in a dict keyed by request
+model type, so resolving a request is a dict lookup plus the call of the per-request providers, without
+reflection on the hot path.
+
+@author:
+@version: 1.0
+"""
+
+import asyncio
+from collections import deque
+import copy
+from contextlib import contextmanager
+import queue
+import threading
+from typing import Any, Callable, Generic, Iterator, TypeVar
+
+from dependency_injector import providers
+
+from lib.deadline import Deadline
+from lib.usecase_models import BaseRequestModel
+
+T = TypeVar("T")
+
+
+class Pooled(providers.Provider, Generic[T]):  # type: ignore[type-arg]
+    """
+    Provides instances from a bounded pool: calling the provider checks an instance out, creating it
+    with provides(*args, **kwargs) while fewer than size exist, and waiting for a release otherwise.
+    Every instance checked out must be handed back with release, or used through lease.
+    Coroutines check instances out with acquire, which awaits a release instead of blocking the event loop.
+
+    @param provides: The factory of the pooled instances.
+    @param size: The maximum number of instances.
+    @param timeout: How long to wait for a free instance before raising queue.Empty, None to wait forever.
+    """
+
+    def __init__(
+        self, provides: Callable[..., T], *args: Any, size: int = 8, timeout: float | None = None, **kwargs: Any
+    ) -> None:
+        if size <= 0:
+            raise ValueError("size must be positive")
+        self.factory: providers.Factory[T] = providers.Factory(provides, *args, **kwargs)
+        self.size: int = size
+        self.timeout: float | None = timeout
+        self.created: int = 0
+        self._free: queue.LifoQueue[T] = queue.LifoQueue()
+        self._waiters: deque[tuple[asyncio.AbstractEventLoop, asyncio.Future[T]]] = deque()
+        self._lock = threading.Lock()
+        super().__init__()
+
+    def __deepcopy__(self, memo: dict[Any, Any] | None) -> "Pooled[T]":
+        # containers copy their providers when instantiated; the copy gets its own, empty pool
+        memo = {} if memo is None else memo
+        pooled: Pooled[T] = Pooled.__new__(Pooled)
+        memo[id(self)] = pooled
+        pooled.factory = copy.deepcopy(self.factory, memo)
+        pooled.size = self.size
+        pooled.timeout = self.timeout
+        pooled.created = 0
+        pooled._free = queue.LifoQueue()
+        pooled._waiters = deque()
+        pooled._lock = threading.Lock()
+        providers.Provider.__init__(pooled)
+        return pooled
+
+    def _provide(self, args: tuple[Any, ...], kwargs: dict[str, Any]) -> T:
+        instance = self._take_or_create()
+        if instance is not None:
+            return instance
+        return self._free.get(timeout=self.timeout)
+
+    async def acquire(self) -> T:
+        """
+        Checks an instance out like calling the provider, but awaits a release when the pool is exhausted,
+        so the tasks holding instances keep running on the event loop and can hand them back.
+
+        :raises queue.Empty: If no instance was released within timeout.
+        """
+        instance = self._take_or_create()
+        if instance is not None:
+            return instance
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[T] = loop.create_future()
+        with self._lock:
+            try:
+                # released between _take_or_create and now
+                return self._free.get_nowait()
+            except queue.Empty:
+                self._waiters.append((loop, future))
+        try:
+            return await asyncio.wait_for(future, self.timeout)
+        except BaseException as error:
+            with self._lock:
+                if (loop, future) in self._waiters:
+                    self._waiters.remove((loop, future))
+            if future.done() and not future.cancelled():
+                # handed over, but this task was cancelled before it resumed
+                self.release(future.result())
+            if isinstance(error, asyncio.TimeoutError):
+                raise queue.Empty from None
+            raise
+
+    def release(self, instance: T) -> None:
+        """
+        Hands instance back: to the longest waiting acquire, or to the pool.
+        """
+        with self._lock:
+            while self._waiters:
+                loop, future = self._waiters.popleft()
+                if future.cancelled():
+                    continue
+                try:
+                    loop.call_soon_threadsafe(self._hand_over, future, instance)
+                except RuntimeError:  # the loop is closed
+                    continue
+                return
+            self._free.put(instance)
+
+    def _hand_over(self, future: "asyncio.Future[T]", instance: T) -> None:
+        # runs on the waiter's event loop
+        if future.done():
+            self.release(instance)
+        else:
+            future.set_result(instance)
+
+    def _take_or_create(self) -> T | None:
+        # returns a free instance or a new one while fewer than size exist, None when the pool is exhausted
+        try:
+            return self._free.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            create = self.created < self.size
+            if create:
+                self.created += 1
+        if not create:
+            return None
+        try:
+            instance: T = self.factory()
+        except BaseException:
+            with self._lock:
+                self.created -= 1
+            raise
+        return instance
+
+    @contextmanager
+    def lease(self) -> Iterator[T]:
+        instance: T = self()
+        try:
+            yield instance
+        finally:
+            self.release(instance)
+
+
+class _Binding:
+    """
+    A pre-wired registration: singletons are stored as instances, other scopes as their provider.
+    """
+
+    __slots__ = ("usecase", "usecase_provider", "pool", "presenter", "presenter_provider", "response_provider")
+
+    def __init__(self, usecase: Any, presenter: Any, response: Any) -> None:
+        self.usecase: Any = None
+        self.usecase_provider: Any = None
+        self.pool: Pooled[Any] | None = None
+        if isinstance(usecase, Pooled):
+            self.pool = usecase
+        elif isinstance(usecase, providers.Singleton):
+            self.usecase = usecase()
+        else:
+            self.usecase_provider = usecase
+        self.presenter: Any = None
+        self.presenter_provider: Any = None
+        if isinstance(presenter, providers.Singleton):
+            self.presenter = presenter()
+        else:
+            self.presenter_provider = presenter
+        self.response_provider: Any = response
+
+
+class _Resolver:
+    def __init__(self) -> None:
+        self._registrations: dict[type[BaseRequestModel], tuple[Any, Any, Any]] = {}
+        self._bindings: dict[type[BaseRequestModel], _Binding] = {}
+
+    def register(
+        self,
+        request_type: type[BaseRequestModel],
+        usecase: providers.Provider,  # type: ignore[type-arg]
+        presenter: providers.Provider | None = None,  # type: ignore[type-arg]
+        response: providers.Provider | None = None,  # type: ignore[type-arg]
+    ) -> None:
+        """
+        Registers the providers serving a request model type. Takes effect at the next wire().
+
+        :param usecase: Provides the use case. The use case's own presenter is used when presenter is None.
+        :param presenter: Provides the presenter.
+        :param response: Provides the presenter response of a request when execute is not given one.
+        """
+        self._registrations[request_type] = (usecase, presenter, response)
+
+    def wire(self) -> None:
+        """
+        Builds the bindings of every registration, instantiating the singletons. Call it once at startup.
+        """
+        self._bindings = {
+            request_type: _Binding(*registration) for request_type, registration in self._registrations.items()
+        }
+
+    def _binding(self, request_type: type[BaseRequestModel]) -> _Binding:
+        binding = self._bindings.get(request_type)
+        if binding is None:
+            if request_type not in self._registrations:
+                raise LookupError(f"no use case is registered for {request_type.__qualname__}")
+            self.wire()
+            binding = self._bindings[request_type]
+        return binding
+
+    def resolve(self, request_type: type[BaseRequestModel]) -> tuple[Any, Any]:
+        """
+        Returns the (use case, presenter) serving request_type. A pooled use case must be released
+        to its Pooled provider after use.
+        """
+        binding = self._binding(request_type)
+        usecase = binding.usecase
+        if usecase is None:
+            usecase = binding.pool() if binding.pool is not None else binding.usecase_provider()
+        presenter = binding.presenter
+        if presenter is None and binding.presenter_provider is not None:
+            presenter = binding.presenter_provider()
+        return usecase, presenter
+
+
+class UseCaseResolver(_Resolver):
+    """
+    Executes request models with the use case and presenter registered for their type.
+    """
+
+    def execute(
+        self, requestModel: BaseRequestModel, response: Any = None, deadline: Deadline | float | None = None
+    ) -> Any:
+        """
+        Executes requestModel with its use case and presenter, presenting to response.
+
+        :param response: The presenter response of this request, by default one from the registered response provider.
+        :param deadline: The deadline of this request, or its time budget in seconds.
+        :return: The presenter response used.
+        """
+        binding = self._binding(type(requestModel))
+        if response is None and binding.response_provider is not None:
+            response = binding.response_provider()
+        presenter = binding.presenter
+        if presenter is None and binding.presenter_provider is not None:
+            presenter = binding.presenter_provider()
+        pool = binding.pool
+        if pool is None:
+            usecase = binding.usecase
+            if usecase is None:
+                usecase = binding.usecase_provider()
+            usecase.execute_with(requestModel, presenter, response, deadline)
+            return response
+        usecase = pool()
+        try:
+            usecase.execute_with(requestModel, presenter, response, deadline)
+        finally:
+            pool.release(usecase)
+        return response
+
+
+class AsyncUseCaseResolver(_Resolver):
+    """
+    Executes request models with the asynchronous use case and presenter registered for their type.
+    A pooled use case is checked out with Pooled.acquire, so an exhausted pool suspends the task, not the loop.
+    """
+
+    async def execute(
+        self, requestModel: BaseRequestModel, response: Any = None, deadline: Deadline | float | None = None
+    ) -> Any:
+        """
+        Executes requestModel with its use case and presenter, presenting to response.
+
+        :param response: The presenter response of this request, by default one from the registered response provider.
+        :param deadline: The deadline of this request, or its time budget in seconds.
+        :return: The presenter response used.
+        """
+        binding = self._binding(type(requestModel))
+        if response is None and binding.response_provider is not None:
+            response = binding.response_provider()
+        presenter = binding.presenter
+        if presenter is None and binding.presenter_provider is not None:
+            presenter = binding.presenter_provider()
+        pool = binding.pool
+        if pool is None:
+            usecase = binding.usecase
+            if usecase is None:
+                usecase = binding.usecase_provider()
+            await usecase.execute_with(requestModel, presenter, response, deadline)
+            return response
+        usecase = await pool.acquire()
+        try:
+            await usecase.execute_with(requestModel, presenter, response, deadline)
+        finally:
+            pool.release(usecase)
+        return response
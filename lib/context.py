@@ -0,0 +1,55 @@
+"""
+This module defines the ExecutionContext, the per-invocation state of a use case execution.
+
+Use cases and presenters can be built once and shared across threads and tasks: the presenter
+and the presenter response of a single invocation are bound through a context variable by
+execute_with, instead of being stored on the instances.
+
+@author:
+@version: 1.0
+"""
+
+from contextvars import ContextVar, Token
+from typing import Any
+
+
+class ExecutionContext:
+    """
+    The objects bound to one invocation of a use case.
+
+    :usecase (object): The use case being executed.
+    :presenter (Any): The output port results are presented to, or None to use the use case's own.
+    :response (Any): The presenter response the presenter writes to, or None to use the presenter's own.
+    :if_none_match (str | None): The fingerprint of the result the client already has, if any.
+    """
+
+    __slots__ = ("usecase", "presenter", "response", "if_none_match")
+
+    def __init__(
+        self, usecase: object, presenter: Any = None, response: Any = None, if_none_match: str | None = None
+    ) -> None:
+        self.usecase: object = usecase
+        self.presenter: Any = presenter
+        self.response: Any = response
+        self.if_none_match: str | None = if_none_match
+
+
+_current_context: ContextVar[ExecutionContext | None] = ContextVar("caps_execution_context", default=None)
+
+
+def current_context() -> ExecutionContext | None:
+    """
+    Returns the context of the invocation running in this thread or task, if any.
+    """
+    return _current_context.get()
+
+
+def bind_context(context: ExecutionContext) -> Token[ExecutionContext | None]:
+    """
+    Makes context the current one, returns the token to pass to reset_context.
+    """
+    return _current_context.set(context)
+
+
+def reset_context(token: Token[ExecutionContext | None]) -> None:
+    _current_context.reset(token)
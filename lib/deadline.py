@@ -0,0 +1,148 @@
+"""
+This module defines Deadline, the time budget of a use case execution, and the context variable
+that carries it from execute_with (or a use case's timeout) down to gateways.
+
+Use cases check the deadline between their stages and present handle_timeout once it has passed;
+asynchronous use cases also cancel the DTO fetch in flight. Gateways read current_deadline() to bound
+their own network timeouts. While no deadline is set, current_deadline() returns the shared NO_DEADLINE,
+whose checks do nothing.
+
+@author:
+@version: 1.0
+"""
+
+import asyncio
+from contextvars import ContextVar, Token
+import math
+import time
+from typing import Awaitable, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+class DeadlineExceeded(Exception):
+    """
+    Raised when the deadline of an execution has passed.
+
+    :stage (str): The stage after, or during, which the deadline was found to have passed.
+    """
+
+    def __init__(self, stage: str) -> None:
+        super().__init__(f"deadline exceeded at the {stage} stage")
+        self.stage: str = stage
+
+
+class Deadline:
+    """
+    A point in time by which an execution has to be done.
+
+    @param expires_at: The deadline, in the time of clock.
+    @param clock: The monotonic clock to use, injectable for tests.
+    """
+
+    __slots__ = ("expires_at", "_clock")
+
+    def __init__(self, expires_at: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self.expires_at: float = expires_at
+        self._clock: Callable[[], float] = clock
+
+    @classmethod
+    def after(cls, seconds: float, clock: Callable[[], float] = time.monotonic) -> "Deadline":
+        """
+        Returns the deadline seconds from now.
+        """
+        return cls(clock() + seconds, clock)
+
+    def remaining(self) -> float:
+        """
+        Returns the seconds left before the deadline, 0 once it has passed.
+        """
+        return max(0.0, self.expires_at - self._clock())
+
+    @property
+    def expired(self) -> bool:
+        return self._clock() >= self.expires_at
+
+    def check(self, stage: str) -> None:
+        """
+        Raises DeadlineExceeded if the deadline has passed.
+        """
+        if self._clock() >= self.expires_at:
+            raise DeadlineExceeded(stage)
+
+    def timeout(self, default: float | None = None) -> float | None:
+        """
+        Returns the timeout a gateway should use for a call: the remaining time, capped by default.
+        """
+        remaining = self.remaining()
+        return remaining if default is None else min(default, remaining)
+
+    async def wait(self, awaitable: Awaitable[T], stage: str) -> T:
+        """
+        Awaits awaitable, cancelling it and raising DeadlineExceeded if the deadline passes first.
+        """
+        try:
+            return await asyncio.wait_for(awaitable, self.remaining())
+        except asyncio.TimeoutError:
+            raise DeadlineExceeded(stage) from None
+
+
+class _NoDeadline(Deadline):
+    __slots__ = ()
+
+    def __init__(self) -> None:
+        super().__init__(math.inf)
+
+    def remaining(self) -> float:
+        return math.inf
+
+    @property
+    def expired(self) -> bool:
+        return False
+
+    def check(self, stage: str) -> None:
+        pass
+
+    def timeout(self, default: float | None = None) -> float | None:
+        return default
+
+    async def wait(self, awaitable: Awaitable[T], stage: str) -> T:
+        return await awaitable
+
+
+NO_DEADLINE: Deadline = _NoDeadline()
+_current_deadline: ContextVar[Deadline] = ContextVar("caps_current_deadline", default=NO_DEADLINE)
+
+
+def current_deadline() -> Deadline:
+    """
+    Returns the deadline of the execution running in this context, or NO_DEADLINE.
+    """
+    return _current_deadline.get()
+
+
+def bind_deadline(deadline: Deadline | float) -> Token[Deadline]:
+    """
+    Makes deadline, or a deadline that many seconds from now, the current one.
+    Returns the token to pass to reset_deadline.
+    """
+    if not isinstance(deadline, Deadline):
+        deadline = Deadline.after(deadline)
+    return _current_deadline.set(deadline)
+
+
+def reset_deadline(token: Token[Deadline] | None) -> None:
+    if token is not None:
+        _current_deadline.reset(token)
+
+
+def enter_deadline(timeout: float | None) -> tuple[Deadline, Token[Deadline] | None]:
+    """
+    Returns the current deadline, after binding one timeout seconds from now if there is none and timeout is set.
+    The token is None unless a deadline was bound.
+    """
+    deadline = _current_deadline.get()
+    if deadline is NO_DEADLINE and timeout is not None:
+        deadline = Deadline.after(timeout)
+        return deadline, _current_deadline.set(deadline)
+    return deadline, None
@@ -1,8 +1,8 @@
 from typing import TypeVar
-from pydantic import BaseModel
+from lib.trusted import TrustedModel
 
 
-class BaseDTO(BaseModel):
+class BaseDTO(TrustedModel):
     status: bool
     errorCode: int
     errorName: str
@@ -0,0 +1,370 @@
+"""
+This module defines UseCaseExecutor and AsyncUseCaseExecutor, which dispatch request models to the
+input ports registered for their type with bounded concurrency and a bounded waiting queue.
+
+A request that finds the queue full is either rejected, in which case a BaseErrorResponseModel is
+presented to its presenter, or blocks its submitter until there is room (backpressure).
+
+@author:
+@version: 1.0
+"""
+
+import asyncio
+from collections import deque
+import contextvars
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+import math
+import os
+import threading
+import time
+from typing import Any, Callable, Generic, Literal, TypeVar
+from pydantic import BaseModel
+
+from lib.primary_ports import AsyncBaseInputPort, AsyncBaseOutputPort, BaseInputPort, BaseOutputPort
+from lib.usecase_models import BaseErrorResponseModel, BaseRequestModel
+
+TFactory = TypeVar("TFactory")
+
+UseCaseFactory = Callable[[BaseOutputPort[Any, Any]], BaseInputPort[Any]]
+AsyncUseCaseFactory = Callable[[AsyncBaseOutputPort[Any, Any]], AsyncBaseInputPort[Any]]
+RejectionHandler = Callable[[BaseRequestModel], BaseErrorResponseModel]
+
+
+def default_rejection(requestModel: BaseRequestModel) -> BaseErrorResponseModel:
+    return BaseErrorResponseModel(code=503, message=f"{type(requestModel).__name__} rejected: the queue is full")
+
+
+class ExecutorMetrics:
+    """
+    Counters and gauges of an executor.
+
+    :submitted (int): Requests admitted to the queue.
+    :rejected (int): Requests rejected because the queue was full.
+    :completed (int): Requests whose execution returned.
+    :failed (int): Requests whose execution raised.
+    :queue_depth (int): Requests currently waiting for a worker.
+    :max_queue_depth (int): The highest queue_depth seen.
+    :running (int): Requests currently executing.
+    """
+
+    def __init__(self, max_samples: int = 10_000) -> None:
+        self.submitted: int = 0
+        self.rejected: int = 0
+        self.completed: int = 0
+        self.failed: int = 0
+        self.queue_depth: int = 0
+        self.max_queue_depth: int = 0
+        self.running: int = 0
+        self._wait_times: deque[float] = deque(maxlen=max_samples)
+
+    def record_wait(self, seconds: float) -> None:
+        self._wait_times.append(seconds)
+
+    def wait_time_percentiles(self, percentiles: tuple[float, ...] = (50, 95, 99)) -> dict[float, float]:
+        """
+        Returns the nearest-rank percentiles of the time requests spent in the queue, in seconds.
+        """
+        samples = sorted(self._wait_times)
+        if not samples:
+            return {p: math.nan for p in percentiles}
+        return {p: samples[max(0, math.ceil(p / 100 * len(samples)) - 1)] for p in percentiles}
+
+
+class _Registration(Generic[TFactory]):
+    __slots__ = ("factory", "max_concurrency", "on_reject", "running")
+
+    def __init__(self, factory: TFactory, max_concurrency: int | None, on_reject: RejectionHandler) -> None:
+        self.factory: TFactory = factory
+        self.max_concurrency: float = math.inf if max_concurrency is None else max_concurrency
+        self.on_reject: RejectionHandler = on_reject
+        self.running: int = 0
+
+
+class _Job:
+    __slots__ = ("registration", "requestModel", "presenter", "future", "submitted_at", "context")
+
+    def __init__(
+        self,
+        registration: _Registration[UseCaseFactory],
+        requestModel: BaseRequestModel,
+        presenter: BaseOutputPort[Any, Any],
+    ) -> None:
+        self.registration: _Registration[UseCaseFactory] = registration
+        self.requestModel: BaseRequestModel = requestModel
+        self.presenter: BaseOutputPort[Any, Any] = presenter
+        self.future: Future[None] = Future()
+        self.submitted_at: float = time.monotonic()
+        # the submitter's context, so that its deadline and bound context reach the worker thread
+        self.context: contextvars.Context = contextvars.copy_context()
+
+
+class _CapturingPresenter(BaseOutputPort[Any, Any]):
+    """
+    Records what a use case presents in a worker process, so the parent can replay it to the real presenter.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.presented: list[tuple[bool, BaseModel]] = []
+
+    def presentSuccess(self, responseModel: Any) -> None:
+        self.presented.append((True, responseModel))
+
+    def presentError(self, errorModel: Any) -> None:
+        self.presented.append((False, errorModel))
+
+
+def _execute(factory: UseCaseFactory, requestModel: BaseRequestModel, presenter: BaseOutputPort[Any, Any]) -> None:
+    factory(presenter).execute(requestModel)
+
+
+def _execute_in_process(factory: UseCaseFactory, requestModel: BaseRequestModel) -> list[tuple[bool, BaseModel]]:
+    presenter = _CapturingPresenter()
+    factory(presenter).execute(requestModel)
+    return presenter.presented
+
+
+class UseCaseExecutor:
+    """
+    Dispatches request models to the use cases registered for their type on a thread or process pool.
+
+    At most max_workers requests run at once (and at most max_concurrency per registration); the others
+    wait in a FIFO queue of at most max_queue requests. With the process backend, factories and request
+    models must be picklable, and what the use case presents in the worker is replayed to the presenter
+    in the parent process.
+
+    @param backend: "thread" or "process".
+    @param max_workers: The size of the pool, os.cpu_count() by default.
+    @param max_queue: How many requests may wait for a worker.
+    @param block: Whether submit waits for room in a full queue instead of rejecting.
+    @param block_timeout: How long submit waits for room before rejecting, None for no limit.
+    """
+
+    def __init__(
+        self,
+        backend: Literal["thread", "process"] = "thread",
+        max_workers: int | None = None,
+        max_queue: int = 1024,
+        block: bool = False,
+        block_timeout: float | None = None,
+    ) -> None:
+        self.backend: Literal["thread", "process"] = backend
+        self.max_workers: int = max_workers or os.cpu_count() or 1
+        self.max_queue: int = max_queue
+        self.block: bool = block
+        self.block_timeout: float | None = block_timeout
+        self.metrics: ExecutorMetrics = ExecutorMetrics()
+        self._pool: Executor = (
+            ProcessPoolExecutor(self.max_workers)
+            if backend == "process"
+            else ThreadPoolExecutor(self.max_workers, thread_name_prefix="caps-usecase")
+        )
+        self._registrations: dict[type[BaseRequestModel], _Registration[UseCaseFactory]] = {}
+        self._waiting: deque[_Job] = deque()
+        self._condition: threading.Condition = threading.Condition()
+        self._watching: threading.local = threading.local()
+
+    def register(
+        self,
+        request_type: type[BaseRequestModel],
+        factory: UseCaseFactory,
+        max_concurrency: int | None = None,
+        on_reject: RejectionHandler = default_rejection,
+    ) -> None:
+        """
+        Registers the use case executing request models of request_type.
+
+        :param factory: Builds the input port, given the presenter of the request.
+        :param max_concurrency: How many of these requests may run at once, unlimited if None.
+        :param on_reject: Builds the error model presented when a request is rejected.
+        """
+        self._registrations[request_type] = _Registration(factory, max_concurrency, on_reject)
+
+    def submit(self, requestModel: BaseRequestModel, presenter: BaseOutputPort[Any, Any]) -> Future[None]:
+        """
+        Queues the execution of requestModel, returns a future resolved once it has been presented.
+        A rejected request is presented an error right away and gets an already resolved future.
+        """
+        registration = self._registrations.get(type(requestModel))
+        if registration is None:
+            raise KeyError(f"no use case registered for {type(requestModel).__name__}")
+        job = _Job(registration, requestModel, presenter)
+        started: list[tuple[_Job, Future[Any]]] = []
+        with self._condition:
+            if self.metrics.queue_depth >= self.max_queue and self.block:
+                self._condition.wait_for(lambda: self.metrics.queue_depth < self.max_queue, self.block_timeout)
+            if self.metrics.queue_depth >= self.max_queue:
+                self.metrics.rejected += 1
+                rejected = True
+            else:
+                rejected = False
+                self.metrics.submitted += 1
+                self._waiting.append(job)
+                self.metrics.queue_depth += 1
+                self.metrics.max_queue_depth = max(self.metrics.max_queue_depth, self.metrics.queue_depth)
+                started = self._dispatch()
+        self._watch(started)
+        if rejected:
+            presenter.presentError(registration.on_reject(requestModel))
+            job.future.set_result(None)
+        return job.future
+
+    def _dispatch(self) -> list[tuple[_Job, Future[Any]]]:
+        # called with the condition held: starts waiting jobs while there are free workers,
+        # returns them for the caller to _watch once it released the condition
+        started: list[tuple[_Job, Future[Any]]] = []
+        index = 0
+        while self.metrics.running < self.max_workers and index < len(self._waiting):
+            job = self._waiting[index]
+            if job.registration.running >= job.registration.max_concurrency:
+                index += 1
+                continue
+            del self._waiting[index]
+            self.metrics.queue_depth -= 1
+            self.metrics.running += 1
+            job.registration.running += 1
+            self.metrics.record_wait(time.monotonic() - job.submitted_at)
+            if self.backend == "process":
+                future: Future[Any] = self._pool.submit(_execute_in_process, job.registration.factory, job.requestModel)
+            else:
+                future = self._pool.submit(
+                    job.context.run, _execute, job.registration.factory, job.requestModel, job.presenter
+                )
+            started.append((job, future))
+        self._condition.notify_all()
+        return started
+
+    def _watch(self, started: list[tuple[_Job, Future[Any]]]) -> None:
+        """
+        Registers the completion callbacks of started jobs. A future that is already done runs _done right
+        away, which may start and watch more jobs: those are appended to the list this thread is already
+        watching, so a run of finished futures is handled in a loop instead of recursing.
+        """
+        pending: deque[tuple[_Job, Future[Any]]] | None = getattr(self._watching, "pending", None)
+        if pending is not None:
+            pending.extend(started)
+            return
+        pending = self._watching.pending = deque(started)
+        try:
+            while pending:
+                job, future = pending.popleft()
+                future.add_done_callback(lambda future, job=job: self._done(job, future))  # type: ignore[misc]
+        finally:
+            self._watching.pending = None
+
+    def _done(self, job: _Job, future: Future[Any]) -> None:
+        error = future.exception()
+        if error is None and self.backend == "process":
+            try:
+                for success, model in future.result():
+                    if success:
+                        job.presenter.presentSuccess(model)
+                    else:
+                        job.presenter.presentError(model)
+            except BaseException as presenting_error:
+                error = presenting_error
+        with self._condition:
+            self.metrics.running -= 1
+            job.registration.running -= 1
+            if error is None:
+                self.metrics.completed += 1
+            else:
+                self.metrics.failed += 1
+            started = self._dispatch()
+        if error is None:
+            job.future.set_result(None)
+        else:
+            job.future.set_exception(error)
+        self._watch(started)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait)
+
+
+class AsyncUseCaseExecutor:
+    """
+    The asyncio backend: dispatches request models to the async use cases registered for their type on the
+    running event loop, with at most max_concurrency executions at once (and per registration) and at most
+    max_queue requests waiting for a slot.
+
+    @param max_concurrency: How many executions may run at once.
+    @param max_queue: How many requests may wait for a slot.
+    @param block: Whether submit waits for room in a full queue instead of rejecting.
+    """
+
+    def __init__(self, max_concurrency: int = 100, max_queue: int = 1024, block: bool = False) -> None:
+        self.max_concurrency: int = max_concurrency
+        self.max_queue: int = max_queue
+        self.block: bool = block
+        self.metrics: ExecutorMetrics = ExecutorMetrics()
+        self._registrations: dict[type[BaseRequestModel], _Registration[AsyncUseCaseFactory]] = {}
+        self._slots: asyncio.Semaphore = asyncio.Semaphore(max_concurrency)
+        self._limits: dict[type[BaseRequestModel], asyncio.Semaphore] = {}
+        self._room: asyncio.Condition | None = None
+
+    def register(
+        self,
+        request_type: type[BaseRequestModel],
+        factory: AsyncUseCaseFactory,
+        max_concurrency: int | None = None,
+        on_reject: RejectionHandler = default_rejection,
+    ) -> None:
+        """
+        Registers the async use case executing request models of request_type.
+
+        :param factory: Builds the input port, given the presenter of the request.
+        :param max_concurrency: How many of these requests may run at once, unlimited if None.
+        :param on_reject: Builds the error model presented when a request is rejected.
+        """
+        self._registrations[request_type] = _Registration(factory, max_concurrency, on_reject)
+        if max_concurrency is not None:
+            self._limits[request_type] = asyncio.Semaphore(max_concurrency)
+
+    async def submit(self, requestModel: BaseRequestModel, presenter: AsyncBaseOutputPort[Any, Any]) -> None:
+        """
+        Executes requestModel once a slot is free, or presents an error right away if the queue is full.
+        """
+        registration = self._registrations.get(type(requestModel))
+        if registration is None:
+            raise KeyError(f"no use case registered for {type(requestModel).__name__}")
+        if self._room is None:
+            self._room = asyncio.Condition()
+        if self.metrics.queue_depth >= self.max_queue and self.block:
+            async with self._room:
+                await self._room.wait_for(lambda: self.metrics.queue_depth < self.max_queue)
+        if self.metrics.queue_depth >= self.max_queue:
+            self.metrics.rejected += 1
+            await presenter.presentError(registration.on_reject(requestModel))
+            return
+        self.metrics.submitted += 1
+        self.metrics.queue_depth += 1
+        self.metrics.max_queue_depth = max(self.metrics.max_queue_depth, self.metrics.queue_depth)
+        submitted_at = time.monotonic()
+        limit = self._limits.get(type(requestModel))
+        limited = False
+        try:
+            if limit is not None:
+                limited = await limit.acquire()
+            await self._slots.acquire()
+        except BaseException:
+            if limit is not None and limited:
+                limit.release()
+            self.metrics.queue_depth -= 1
+            raise
+        self.metrics.queue_depth -= 1
+        self.metrics.running += 1
+        self.metrics.record_wait(time.monotonic() - submitted_at)
+        async with self._room:
+            self._room.notify_all()
+        try:
+            await registration.factory(presenter).execute(requestModel)
+        except BaseException:
+            self.metrics.failed += 1
+            raise
+        else:
+            self.metrics.completed += 1
+        finally:
+            self.metrics.running -= 1
+            self._slots.release()
+            if limit is not None:
+                limit.release()
@@ -0,0 +1,41 @@
+"""
+This module computes fingerprints: short, stable content hashes of response models and view models,
+used as ETags so that a presenter can answer "not modified" to a client that already has the result.
+
+A fingerprint is the BLAKE2b digest of the model's class and its JSON serialization by the compiled
+pydantic-core serializer, followed by the content of its Payload fields, which JSON only carries as
+metadata. It is stable across processes and releases as long as the model's fields do not change, but
+dict fields hash in insertion order. Hashing a loader payload calls its loader.
+
+@author:
+@version: 1.0
+"""
+
+from hashlib import blake2b
+
+from pydantic import BaseModel
+
+from lib.payload import to_json_with_payloads
+
+DIGEST_SIZE = 16
+
+
+def fingerprint(model: BaseModel) -> str:
+    """
+    Returns the fingerprint of model, as 32 hexadecimal characters.
+    """
+    cls = type(model)
+    digest = blake2b(f"{cls.__module__}:{cls.__qualname__}".encode(), digest_size=DIGEST_SIZE)
+    data, payloads = to_json_with_payloads(model)
+    digest.update(data)
+    for payload in payloads:
+        for chunk in payload.iter_chunks():
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def fingerprint_bytes(data: bytes | memoryview) -> str:
+    """
+    Returns the fingerprint of an already serialized payload, e.g. the body of a JSONPresenterResponse.
+    """
+    return blake2b(data, digest_size=DIGEST_SIZE).hexdigest()
@@ -0,0 +1,508 @@
+"""
+This module defines the idempotency layer: IdempotentUseCase and AsyncIdempotentUseCase wrap a use case,
+record the view models its presenter presents for a request, and replay them to the presenter response
+when the same request is executed again, without re-running the use case and its make_dto_request calls.
+
+The recorded view models are stored as JSON bytes, with the content of their payloads, in an
+IdempotencyStore with a time to live:
+InMemoryIdempotencyStore for a single process, SQLiteIdempotencyStore as a shared store, or any other
+implementation of the interface. Concurrent duplicates within a process are coalesced into one execution.
+
+Requests are authenticated with the wrapped use case's token verifier before the store is read, and
+every key, derived or supplied by the client, is scoped to the user and the request model type, so a
+recorded response is only replayed to the user it was recorded for.
+
+@author:
+@version: 1.0
+"""
+
+from abc import ABC, abstractmethod
+import base64
+import hashlib
+import importlib
+import sqlite3
+import threading
+import time
+from typing import Any, AsyncIterator, Callable, Generic, Iterator
+
+from lib.cache import LRUCache
+from lib.payload import from_json_with_payloads, to_json_with_payloads
+from lib.primary_ports import AsyncBaseInputPort, BaseInputPort
+from lib.response import AsyncPresenterResponse, PresenterResponse
+from lib.singleflight import AsyncSingleFlight, SingleFlight
+from lib.usecase import AsyncBaseUseCase, BaseUseCase
+from lib.usecase_models import BaseAuthenticatedRequestModel, BaseRequestModel, TBaseRequestModel
+from lib.view_model import BaseViewModel
+
+
+def idempotency_key(requestModel: BaseRequestModel) -> str:
+    """
+    Derives an idempotency key from the content of a request model, scoped to the user of authenticated
+    requests and leaving out the auth_token, like the DTO cache keys.
+    """
+    if isinstance(requestModel, BaseAuthenticatedRequestModel):
+        scope = str(requestModel.user_id)
+        content = requestModel.model_dump_json(exclude={"auth_token"})
+    else:
+        scope = ""
+        content = requestModel.model_dump_json()
+    model = type(requestModel)
+    data = f"{scope}\x00{model.__module__}.{model.__qualname__}\x00{content}".encode()
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def scoped_key(requestModel: BaseRequestModel, key: str) -> str:
+    """
+    Scopes key to the user of an authenticated request model and to the type of the request model,
+    so that the same key sent by two users, or for two kinds of request, never shares a record.
+    """
+    scope = str(requestModel.user_id) if isinstance(requestModel, BaseAuthenticatedRequestModel) else ""
+    model = type(requestModel)
+    data = f"{scope}\x00{model.__module__}.{model.__qualname__}\x00{key}".encode()
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class IdempotencyStore(ABC):
+    """
+    Abstract base class for the stores of recorded responses.
+    Implement it on a shared store (Redis, a database table, ...) to deduplicate across processes.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> bytes | None:
+        """
+        Returns the recorded response stored under key, or None if there is none or it has expired.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        """
+        Stores a recorded response under key for ttl seconds.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+
+class InMemoryIdempotencyStore(IdempotencyStore):
+    """
+    Stores recorded responses in a bounded LRU cache of this process.
+
+    @param maxsize: The maximum number of recorded responses.
+    @param clock: The monotonic clock to use, injectable for tests.
+    """
+
+    def __init__(self, maxsize: int = 10_000, clock: Callable[[], float] = time.monotonic) -> None:
+        self._cache: LRUCache[str, bytes] = LRUCache(maxsize, clock=clock)
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def get(self, key: str) -> bytes | None:
+        return self._cache.get(key)
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._cache.set(key, value, ttl)
+
+    def delete(self, key: str) -> None:
+        self._cache.delete(key)
+
+
+class SQLiteIdempotencyStore(IdempotencyStore):
+    """
+    Stores recorded responses in a SQLite table, shared by the processes using the same database file.
+    Expired rows are ignored on read and deleted every evict_every writes.
+
+    @param path: The database file, ":memory:" for a private in-memory database.
+    @param table: The table name.
+    @param evict_every: How many writes happen between two deletions of expired rows.
+    @param clock: The wall clock to use, injectable for tests. It must agree across the processes.
+    """
+
+    def __init__(
+        self,
+        path: str = ":memory:",
+        table: str = "caps_idempotency",
+        evict_every: int = 1000,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if not table.isidentifier():
+            raise ValueError(f"invalid table name {table!r}")
+        self.table: str = table
+        self.evict_every: int = evict_every
+        self._clock: Callable[[], float] = clock
+        self._writes: int = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT value FROM {self.table} WHERE key = ? AND expires_at > ?", (key, self._clock())
+            ).fetchone()
+        return None if row is None else bytes(row[0])
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        with self._lock:
+            now = self._clock()
+            self._connection.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, now + ttl),
+            )
+            self._writes += 1
+            if self._writes % self.evict_every == 0:
+                self._connection.execute(f"DELETE FROM {self.table} WHERE expires_at <= ?", (now,))
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._connection.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def evict_expired(self) -> int:
+        """
+        Deletes the expired rows and returns how many were deleted.
+        """
+        with self._lock:
+            return self._connection.execute(
+                f"DELETE FROM {self.table} WHERE expires_at <= ?", (self._clock(),)
+            ).rowcount
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+_view_model_types: dict[str, type[BaseViewModel]] = {}
+
+
+def _type_path(view_model_type: type[BaseViewModel]) -> str:
+    path = f"{view_model_type.__module__}:{view_model_type.__qualname__}"
+    _view_model_types.setdefault(path, view_model_type)
+    return path
+
+
+def _resolve_type(path: str) -> type[BaseViewModel]:
+    view_model_type = _view_model_types.get(path)
+    if view_model_type is None:
+        module, _, qualname = path.partition(":")
+        found: Any = importlib.import_module(module)
+        for name in qualname.split("."):
+            found = getattr(found, name)
+        view_model_type = _view_model_types[path] = found
+    return view_model_type
+
+
+def encode_view_models(view_models: list[BaseViewModel]) -> bytes:
+    """
+    Encodes view models as one "<module>:<qualname>\t<json>" line each, followed by a "\t<base64>" field
+    per payload the view model contains, since its JSON only holds the payload metadata. Serialized JSON
+    never contains a raw tab or newline, so the lines need no further escaping.
+    """
+    lines: list[bytes] = []
+    for view_model in view_models:
+        body, payloads = to_json_with_payloads(view_model)
+        fields = [_type_path(type(view_model)).encode(), body]
+        fields.extend(base64.b64encode(payload.view()) for payload in payloads)
+        lines.append(b"\t".join(fields) + b"\n")
+    return b"".join(lines)
+
+
+_FINGERPRINT = b"@fingerprint"
+
+
+def decode_view_models(data: bytes) -> list[BaseViewModel]:
+    view_models: list[BaseViewModel] = []
+    for line in data.splitlines():
+        path, body, *contents = line.split(b"\t")
+        if path != _FINGERPRINT:
+            view_model_type = _resolve_type(path.decode())
+            view_models.append(from_json_with_payloads(view_model_type, body, map(base64.b64decode, contents)))
+    return view_models
+
+
+def _encode_record(view_models: list[BaseViewModel], fingerprint: str | None) -> bytes:
+    data = encode_view_models(view_models)
+    if fingerprint is None:
+        return data
+    return _FINGERPRINT + b"\t" + fingerprint.encode() + b"\n" + data
+
+
+def _recorded_fingerprint(data: bytes) -> str | None:
+    if not data.startswith(_FINGERPRINT + b"\t"):
+        return None
+    return data[len(_FINGERPRINT) + 1 : data.index(b"\n")].decode()
+
+
+class _RecordingResponse(PresenterResponse):
+    """
+    Records the view models presented to target. The fingerprint set by a conditional presenter is
+    target's, and a not-modified presentation is forwarded without being recorded: it only answers the
+    client that sent the matching If-None-Match.
+    """
+
+    def __init__(self, target: PresenterResponse) -> None:
+        super().__init__()
+        self.target: PresenterResponse = target
+        self.view_models: list[BaseViewModel] = []
+        self.not_modified: bool = False
+
+    @property
+    def fingerprint(self) -> str | None:
+        return self.target.fingerprint
+
+    @fingerprint.setter
+    def fingerprint(self, fingerprint: str | None) -> None:
+        self.target.fingerprint = fingerprint
+
+    def present(self, view_model: BaseViewModel) -> None:
+        self.view_models.append(view_model)
+        self.target.present(view_model)
+
+    def present_not_modified(self, fingerprint: str) -> None:
+        self.not_modified = True
+        self.target.present_not_modified(fingerprint)
+
+    def present_stream(self, view_models: Iterator[BaseViewModel]) -> None:
+        self.target.present_stream(self._record(view_models))
+
+    def _record(self, view_models: Iterator[BaseViewModel]) -> Iterator[BaseViewModel]:
+        for view_model in view_models:
+            self.view_models.append(view_model)
+            yield view_model
+
+
+class _AsyncRecordingResponse(AsyncPresenterResponse):
+    def __init__(self, target: AsyncPresenterResponse) -> None:
+        super().__init__()
+        self.target: AsyncPresenterResponse = target
+        self.view_models: list[BaseViewModel] = []
+        self.not_modified: bool = False
+
+    @property
+    def fingerprint(self) -> str | None:
+        return self.target.fingerprint
+
+    @fingerprint.setter
+    def fingerprint(self, fingerprint: str | None) -> None:
+        self.target.fingerprint = fingerprint
+
+    async def present(self, view_model: BaseViewModel) -> None:
+        self.view_models.append(view_model)
+        await self.target.present(view_model)
+
+    async def present_not_modified(self, fingerprint: str) -> None:
+        self.not_modified = True
+        await self.target.present_not_modified(fingerprint)
+
+    async def present_stream(self, view_models: AsyncIterator[BaseViewModel]) -> None:
+        await self.target.present_stream(self._record(view_models))
+
+    async def _record(self, view_models: AsyncIterator[BaseViewModel]) -> AsyncIterator[BaseViewModel]:
+        async for view_model in view_models:
+            self.view_models.append(view_model)
+            yield view_model
+
+
+def _target_response(presenter: Any, response: Any) -> Any:
+    if response is not None:
+        return response
+    if not hasattr(type(presenter), "response"):
+        raise TypeError(f"{type(presenter).__qualname__} has no presenter response to record, pass one to execute_with")
+    return presenter.response
+
+
+class _Idempotency(Generic[TBaseRequestModel]):
+    def __init__(
+        self,
+        store: IdempotencyStore,
+        ttl: float,
+        key: Callable[[TBaseRequestModel], str | None],
+        store_errors: bool,
+    ) -> None:
+        self.store: IdempotencyStore = store
+        self.ttl: float = ttl
+        self.key: Callable[[TBaseRequestModel], str | None] = key
+        self.store_errors: bool = store_errors
+        self.replayed: int = 0
+
+    def _save(self, key: str, recorder: "_RecordingResponse | _AsyncRecordingResponse") -> bytes | None:
+        view_models = recorder.view_models
+        if recorder.not_modified or not view_models:
+            return None
+        if not self.store_errors and not all(view_model.status for view_model in view_models):
+            return None
+        data = _encode_record(view_models, recorder.fingerprint)
+        self.store.set(key, data, self.ttl)
+        return data
+
+
+class IdempotentUseCase(_Idempotency[TBaseRequestModel], BaseInputPort[TBaseRequestModel]):
+    """
+    Executes a use case at most once per idempotency key and TTL: the view models presented for the
+    first request are stored, and replayed to the presenter response of every duplicate.
+
+    Only executions whose view models all succeeded are stored unless store_errors is set,
+    so that retrying after a transient failure runs the use case again.
+
+    The request is authenticated with the use case's token_verifier before any lookup, and rejected
+    requests are executed without idempotency, so the use case presents its authentication error.
+    Keys are scoped to the verified user and the request model type with scoped_key.
+
+    @param usecase: The use case to execute. Its presenter must be a BasePresenter, as the view models are
+                    recorded from its presenter response.
+    @param store: The store of recorded responses.
+    @param ttl: How long a recorded response is replayed, in seconds.
+    @param key: Derives the idempotency key of a request model, None to execute it without idempotency.
+    @param store_errors: Whether failed view models are stored and replayed as well.
+    """
+
+    def __init__(
+        self,
+        usecase: BaseUseCase[Any, Any, Any, Any],
+        store: IdempotencyStore,
+        ttl: float = 24 * 3600,
+        key: Callable[[TBaseRequestModel], str | None] = idempotency_key,
+        store_errors: bool = False,
+    ) -> None:
+        _Idempotency.__init__(self, store, ttl, key, store_errors)
+        BaseInputPort.__init__(self)
+        self.usecase: BaseUseCase[Any, Any, Any, Any] = usecase
+        self._in_flight: SingleFlight = SingleFlight()
+
+    def execute(self, requestModel: TBaseRequestModel) -> None:
+        self.execute_with(requestModel)
+
+    def execute_with(
+        self,
+        requestModel: TBaseRequestModel,
+        presenter: Any = None,
+        response: PresenterResponse | None = None,
+        idempotency_key: str | None = None,
+        if_none_match: str | None = None,
+    ) -> None:
+        """
+        Executes the use case, or replays the response recorded for the same idempotency key.
+
+        :param presenter: The presenter to use instead of the use case's.
+        :param response: The presenter response to present to instead of the presenter's.
+        :param idempotency_key: A key supplied by the client, instead of the one derived from the request model.
+            It is scoped to the user and the request model type like derived keys.
+        :param if_none_match: The fingerprint of the result the client already has, for a conditional presenter.
+            A not-modified result is not stored, and a replayed one is presented as not modified when it matches.
+        """
+        raw_key = idempotency_key or self.key(requestModel)
+        if raw_key is None or not self.usecase.authenticate(requestModel):
+            # rejected requests are executed for the use case to present its authentication error
+            self.usecase.execute_with(requestModel, presenter, response, if_none_match=if_none_match)
+            return
+        key = scoped_key(requestModel, raw_key)
+        presenter = presenter or self.usecase.presenter
+        target: PresenterResponse = _target_response(presenter, response)
+        data = self.store.get(key)
+        if data is None:
+            recorder = _RecordingResponse(target)
+            executed = False
+
+            def run() -> bytes | None:
+                nonlocal executed
+                executed = True
+                self.usecase.execute_with(requestModel, presenter, recorder, if_none_match=if_none_match)
+                return self._save(key, recorder)
+
+            data = self._in_flight.do(key, run)
+            if executed:
+                return
+            if data is None:
+                # the coalesced execution was not stored, run this duplicate on its own
+                self.usecase.execute_with(requestModel, presenter, target, if_none_match=if_none_match)
+                return
+        self.replayed += 1
+        tag = target.fingerprint = _recorded_fingerprint(data)
+        if tag is not None and tag == if_none_match:
+            target.present_not_modified(tag)
+            return
+        for view_model in decode_view_models(data):
+            target.present(view_model)
+
+
+class AsyncIdempotentUseCase(_Idempotency[TBaseRequestModel], AsyncBaseInputPort[TBaseRequestModel]):
+    """
+    The asynchronous counterpart of IdempotentUseCase, wrapping an AsyncBaseUseCase whose presenter is
+    an AsyncBasePresenter. The store is called synchronously, as stores are expected to be fast.
+
+    @param usecase: The use case to execute.
+    @param store: The store of recorded responses.
+    @param ttl: How long a recorded response is replayed, in seconds.
+    @param key: Derives the idempotency key of a request model, None to execute it without idempotency.
+    @param store_errors: Whether failed view models are stored and replayed as well.
+    """
+
+    def __init__(
+        self,
+        usecase: AsyncBaseUseCase[Any, Any, Any, Any],
+        store: IdempotencyStore,
+        ttl: float = 24 * 3600,
+        key: Callable[[TBaseRequestModel], str | None] = idempotency_key,
+        store_errors: bool = False,
+    ) -> None:
+        _Idempotency.__init__(self, store, ttl, key, store_errors)
+        AsyncBaseInputPort.__init__(self)
+        self.usecase: AsyncBaseUseCase[Any, Any, Any, Any] = usecase
+        self._in_flight: AsyncSingleFlight = AsyncSingleFlight()
+
+    async def execute(self, requestModel: TBaseRequestModel) -> None:
+        await self.execute_with(requestModel)
+
+    async def execute_with(
+        self,
+        requestModel: TBaseRequestModel,
+        presenter: Any = None,
+        response: AsyncPresenterResponse | None = None,
+        idempotency_key: str | None = None,
+        if_none_match: str | None = None,
+    ) -> None:
+        """
+        Executes the use case, or replays the response recorded for the same idempotency key.
+
+        :param presenter: The presenter to use instead of the use case's.
+        :param response: The presenter response to present to instead of the presenter's.
+        :param idempotency_key: A key supplied by the client, instead of the one derived from the request model.
+            It is scoped to the user and the request model type like derived keys.
+        :param if_none_match: The fingerprint of the result the client already has, for a conditional presenter.
+            A not-modified result is not stored, and a replayed one is presented as not modified when it matches.
+        """
+        raw_key = idempotency_key or self.key(requestModel)
+        if raw_key is None or not await self.usecase.authenticate(requestModel):
+            await self.usecase.execute_with(requestModel, presenter, response, if_none_match=if_none_match)
+            return
+        key = scoped_key(requestModel, raw_key)
+        presenter = presenter or self.usecase.presenter
+        target: AsyncPresenterResponse = _target_response(presenter, response)
+        data = self.store.get(key)
+        if data is None:
+            recorder = _AsyncRecordingResponse(target)
+            executed = False
+
+            async def run() -> bytes | None:
+                nonlocal executed
+                executed = True
+                await self.usecase.execute_with(requestModel, presenter, recorder, if_none_match=if_none_match)
+                return self._save(key, recorder)
+
+            data = await self._in_flight.do(key, run)
+            if executed:
+                return
+            if data is None:
+                await self.usecase.execute_with(requestModel, presenter, target, if_none_match=if_none_match)
+                return
+        self.replayed += 1
+        tag = target.fingerprint = _recorded_fingerprint(data)
+        if tag is not None and tag == if_none_match:
+            await target.present_not_modified(tag)
+            return
+        for view_model in decode_view_models(data):
+            await target.present(view_model)
@@ -0,0 +1,288 @@
+"""
+This module defines the per-stage timing instrumentation of the execute pipeline.
+
+Use cases record how long every stage of an execution took (auth, validate, dto, process,
+and in BasePresenter convert and present) together with its outcome, and hand the
+resulting ExecutionTrace to the sinks registered on the module-level instrumentation.
+While no sink is registered, execute only gets a shared no-op trace.
+
+@author:
+@version: 1.0
+"""
+
+from abc import ABC, abstractmethod
+from collections import deque
+from contextvars import ContextVar
+import math
+import threading
+import time
+from typing import Any, Callable, Iterable
+
+AUTH = "auth"
+VALIDATE = "validate"
+DTO = "dto"
+PROCESS = "process"
+CONVERT = "convert"
+PRESENT = "present"
+STAGES = (AUTH, VALIDATE, DTO, PROCESS, CONVERT, PRESENT)
+
+SUCCESS = "success"
+DTO_ERROR = "dto_error"
+PROCESS_ERROR = "process_error"
+AUTH_ERROR = "auth_error"
+TIMEOUT = "timeout"
+EXCEPTION = "exception"
+OUTCOMES = (SUCCESS, AUTH_ERROR, DTO_ERROR, PROCESS_ERROR, TIMEOUT, EXCEPTION)
+
+
+class ExecutionTrace:
+    """
+    The stage durations of one execution of a use case.
+
+    :usecase (str): The module and qualified name of the use case class, e.g. "orders.usecases.CreateOrder".
+    :durations (dict[str, float]): Seconds spent in every stage that was marked.
+    :total (float): Seconds from the start of the execution to finish.
+    :outcome (str | None): One of OUTCOMES, once finished.
+    """
+
+    __slots__ = ("usecase", "durations", "total", "outcome", "_instrumentation", "_start", "_last", "_token")
+
+    def __init__(self, usecase: str, instrumentation: "Instrumentation") -> None:
+        self.usecase: str = usecase
+        self.durations: dict[str, float] = {}
+        self.total: float = 0.0
+        self.outcome: str | None = None
+        self._instrumentation: Instrumentation = instrumentation
+        self._start: float = time.perf_counter()
+        self._last: float = self._start
+        self._token: Any = _current_trace.set(self)
+
+    def mark(self, stage: str) -> None:
+        """
+        Attributes the time elapsed since the previous mark to stage.
+        """
+        now = time.perf_counter()
+        self.durations[stage] = self.durations.get(stage, 0.0) + now - self._last
+        self._last = now
+
+    def finish(self, outcome: str) -> None:
+        """
+        Closes the trace with the given outcome and hands it to the sinks. Only the first call counts.
+        """
+        if self.outcome is not None:
+            return
+        self.total = time.perf_counter() - self._start
+        self.outcome = outcome
+        _current_trace.reset(self._token)
+        self._instrumentation.record(self)
+
+
+class _NullTrace(ExecutionTrace):
+    __slots__ = ()
+
+    def __init__(self) -> None:
+        pass
+
+    def mark(self, stage: str) -> None:
+        pass
+
+    def finish(self, outcome: str) -> None:
+        pass
+
+
+NULL_TRACE: ExecutionTrace = _NullTrace()
+_current_trace: ContextVar[ExecutionTrace] = ContextVar("caps_current_trace", default=NULL_TRACE)
+
+
+def current_trace() -> ExecutionTrace:
+    """
+    Returns the trace of the execution running in this context, or NULL_TRACE.
+    """
+    return _current_trace.get()
+
+
+class InstrumentationSink(ABC):
+    """
+    Abstract base class for the receivers of finished execution traces.
+    """
+
+    @abstractmethod
+    def record(self, trace: ExecutionTrace) -> None:
+        raise NotImplementedError
+
+
+class CallbackSink(InstrumentationSink):
+    """
+    Calls the given function with every finished trace.
+    """
+
+    def __init__(self, callback: Callable[[ExecutionTrace], None]) -> None:
+        self.callback: Callable[[ExecutionTrace], None] = callback
+
+    def record(self, trace: ExecutionTrace) -> None:
+        self.callback(trace)
+
+
+class HistogramSink(InstrumentationSink):
+    """
+    Keeps the most recent durations of every (use case, stage) pair in memory and reports percentiles.
+
+    @param max_samples: How many samples to keep per use case and stage.
+    """
+
+    def __init__(self, max_samples: int = 10_000) -> None:
+        self.max_samples: int = max_samples
+        self._samples: dict[tuple[str, str], deque[float]] = {}
+        self._outcomes: dict[tuple[str, str], int] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def record(self, trace: ExecutionTrace) -> None:
+        with self._lock:
+            for stage, duration in trace.durations.items():
+                self._append(trace.usecase, stage, duration)
+            self._append(trace.usecase, "total", trace.total)
+            key = (trace.usecase, trace.outcome or EXCEPTION)
+            self._outcomes[key] = self._outcomes.get(key, 0) + 1
+
+    def _append(self, usecase: str, stage: str, duration: float) -> None:
+        samples = self._samples.get((usecase, stage))
+        if samples is None:
+            samples = self._samples[(usecase, stage)] = deque(maxlen=self.max_samples)
+        samples.append(duration)
+
+    def percentiles(
+        self, usecase: str, stage: str = "total", percentiles: Iterable[float] = (50, 95, 99)
+    ) -> dict[float, float]:
+        """
+        Returns the nearest-rank percentiles of the recorded durations, in seconds.
+
+        :param usecase: The module and qualified name of the use case class.
+        :param stage: One of STAGES, or "total".
+        :param percentiles: The percentiles to compute, between 0 and 100.
+        """
+        with self._lock:
+            samples = sorted(self._samples.get((usecase, stage), ()))
+        if not samples:
+            return {p: math.nan for p in percentiles}
+        return {p: samples[max(0, math.ceil(p / 100 * len(samples)) - 1)] for p in percentiles}
+
+    def outcomes(self, usecase: str) -> dict[str, int]:
+        """
+        Returns how many executions of the use case ended with every outcome.
+        """
+        with self._lock:
+            return {outcome: self._outcomes.get((usecase, outcome), 0) for outcome in OUTCOMES}
+
+    def share(self, usecase: str) -> dict[str, float]:
+        """
+        Returns the fraction of the recorded total time spent in every stage.
+        """
+        with self._lock:
+            total = sum(self._samples.get((usecase, "total"), ()))
+            return {
+                stage: sum(self._samples[(usecase, stage)]) / total if total else 0.0
+                for stage in STAGES
+                if (usecase, stage) in self._samples
+            }
+
+
+class PrometheusSink(InstrumentationSink):
+    """
+    Aggregates traces into Prometheus histograms and counters, rendered in the text exposition format.
+
+    @param buckets: The upper bounds of the histogram buckets, in seconds.
+    @param prefix: The prefix of the metric names.
+    """
+
+    DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS, prefix: str = "caps_usecase") -> None:
+        self.buckets: tuple[float, ...] = tuple(sorted(buckets))
+        self.prefix: str = prefix
+        self._histograms: dict[tuple[str, str], tuple[list[int], list[float]]] = {}
+        self._outcomes: dict[tuple[str, str], int] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def record(self, trace: ExecutionTrace) -> None:
+        with self._lock:
+            for stage, duration in trace.durations.items():
+                self._observe(trace.usecase, stage, duration)
+            self._observe(trace.usecase, "total", trace.total)
+            key = (trace.usecase, trace.outcome or EXCEPTION)
+            self._outcomes[key] = self._outcomes.get(key, 0) + 1
+
+    def _observe(self, usecase: str, stage: str, duration: float) -> None:
+        histogram = self._histograms.get((usecase, stage))
+        if histogram is None:
+            histogram = self._histograms[(usecase, stage)] = ([0] * (len(self.buckets) + 1), [0.0])
+        counts, total = histogram
+        for index, bound in enumerate(self.buckets):
+            if duration <= bound:
+                counts[index] += 1
+                break
+        else:
+            counts[-1] += 1
+        total[0] += duration
+
+    def render(self) -> str:
+        """
+        Returns the metrics in the Prometheus text exposition format.
+        """
+        name = f"{self.prefix}_stage_seconds"
+        lines = [f"# HELP {name} Time spent per use case execution stage.", f"# TYPE {name} histogram"]
+        with self._lock:
+            for (usecase, stage), (counts, total) in sorted(self._histograms.items()):
+                labels = f'usecase="{usecase}",stage="{stage}"'
+                cumulative = 0
+                for bound, count in zip(self.buckets, counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                cumulative += counts[-1]
+                lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {cumulative}')
+                lines.append(f"{name}_sum{{{labels}}} {total[0]}")
+                lines.append(f"{name}_count{{{labels}}} {cumulative}")
+            name = f"{self.prefix}_executions_total"
+            lines += [f"# HELP {name} Use case executions per outcome.", f"# TYPE {name} counter"]
+            for (usecase, outcome), count in sorted(self._outcomes.items()):
+                lines.append(f'{name}{{usecase="{usecase}",outcome="{outcome}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+
+class Instrumentation:
+    """
+    The registry of instrumentation sinks. Tracing is enabled while at least one sink is registered.
+    """
+
+    def __init__(self) -> None:
+        self._sinks: tuple[InstrumentationSink, ...] = ()
+        self._names: dict[type, str] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._sinks)
+
+    def add_sink(self, sink: InstrumentationSink) -> None:
+        self._sinks = self._sinks + (sink,)
+
+    def remove_sink(self, sink: InstrumentationSink) -> None:
+        self._sinks = tuple(s for s in self._sinks if s is not sink)
+
+    def start(self, usecase: object) -> ExecutionTrace:
+        """
+        Starts the trace of one execution of usecase, or returns NULL_TRACE while disabled.
+        """
+        if not self._sinks:
+            return NULL_TRACE
+        cls = type(usecase)
+        name = self._names.get(cls)
+        if name is None:
+            # same-named classes of different modules are different use cases
+            name = self._names[cls] = f"{cls.__module__}.{cls.__qualname__}"
+        return ExecutionTrace(name, self)
+
+    def record(self, trace: ExecutionTrace) -> None:
+        for sink in self._sinks:
+            sink.record(trace)
+
+
+instrumentation = Instrumentation()
@@ -0,0 +1,248 @@
+"""
+This module defines JSONPresenterResponse and AsyncJSONPresenterResponse, concrete presenter
+responses that serialize view models straight to JSON bytes.
+
+The view model is serialized by its compiled pydantic-core serializer, which produces the JSON
+bytes without building an intermediate dict or str; the bytes are then exposed as a memoryview
+and written to the sink without further copies.
+Streams of view models are written as newline-delimited JSON, one line per view model as soon as it is converted.
+A successful view model with a Payload field is presented as the payload itself, streamed to the sink in chunks.
+
+@author:
+@version: 1.0
+"""
+
+from typing import Any, AsyncIterator, Iterator, Mapping, Protocol
+from pydantic_core import SchemaSerializer
+
+from lib.payload import Payload, payload_field
+from lib.response import AsyncPresenterResponse, PresenterResponse
+from lib.view_model import BaseViewModel
+
+
+def json_serializer(view_model_class: type[BaseViewModel]) -> SchemaSerializer:
+    """
+    Returns the compiled JSON serializer of a view model class, rebuilding the class first if its schema
+    was deferred. pydantic compiles it once per class, so there is nothing further to cache.
+
+    :param view_model_class: The view model class.
+    :return: The pydantic-core serializer.
+    """
+    if not view_model_class.__pydantic_complete__:
+        view_model_class.model_rebuild(force=True)
+    return view_model_class.__pydantic_serializer__
+
+
+def serialize_view_model(view_model: BaseViewModel) -> bytes:
+    """
+    Serializes a view model to JSON bytes with the compiled serializer of its class.
+    """
+    return json_serializer(type(view_model)).to_json(view_model)
+
+
+class Writable(Protocol):
+    def write(self, data: Any, /) -> Any:
+        """Writes data, like a file object."""
+
+
+class Sendable(Protocol):
+    def sendall(self, data: Any, /) -> Any:
+        """Sends all of data, like a socket."""
+
+
+class AsyncWritable(Protocol):
+    def write(self, data: Any, /) -> Any:
+        """Buffers data, like asyncio.StreamWriter."""
+
+    async def drain(self) -> None:
+        """Waits until the buffered data can be flushed."""
+
+
+class _StatusMapping:
+    def __init__(self, status_codes: Mapping[str, int] | None, success_status: int, error_status: int) -> None:
+        self.status_codes: Mapping[str, int] = status_codes or {}
+        self.success_status: int = success_status
+        self.error_status: int = error_status
+
+    def status_code(self, view_model: BaseViewModel) -> int:
+        if view_model.status:
+            return self.success_status
+        if view_model.errorName is None:
+            return self.error_status
+        return self.status_codes.get(view_model.errorName, self.error_status)
+
+
+class JSONPresenterResponse(PresenterResponse):
+    """
+    Presents view models as JSON bytes, with an HTTP-like status code derived from the view model.
+
+    After present, status_code holds the mapped status, media_type the content type and body a memoryview
+    over the JSON bytes. If a sink is given the body is also written to it, with sendall for socket-like sinks
+    and write otherwise. For a view model with a Payload, body is the payload's view, or empty once the
+    payload was streamed to the sink chunk by chunk.
+
+    @param sink: A file-like or socket-like object to write the body to, if any.
+    @param status_codes: Maps BaseViewModel.errorName to a status code for failed view models.
+    @param success_status: The status code of successful view models.
+    @param error_status: The status code of failed view models whose errorName is not mapped.
+    """
+
+    content_type: str = "application/json"
+    stream_content_type: str = "application/x-ndjson"
+
+    def __init__(
+        self,
+        sink: Writable | Sendable | None = None,
+        status_codes: Mapping[str, int] | None = None,
+        success_status: int = 200,
+        error_status: int = 500,
+    ) -> None:
+        super().__init__()
+        self.sink: Writable | Sendable | None = sink
+        self.status_code: int | None = None
+        self.body: memoryview = memoryview(b"")
+        self.media_type: str = self.content_type
+        self._statuses: _StatusMapping = _StatusMapping(status_codes, success_status, error_status)
+        self._write: Any = None if sink is None else getattr(sink, "sendall", None) or getattr(sink, "write")
+
+    def present(self, view_model: BaseViewModel) -> None:
+        self.status_code = self._statuses.status_code(view_model)
+        field = payload_field(type(view_model))
+        if field is not None and view_model.status:
+            payload = getattr(view_model, field)
+            if payload is not None:
+                self.present_payload(payload)
+                return
+        self.media_type = self.content_type
+        self.body = memoryview(serialize_view_model(view_model))
+        if self._write is not None:
+            self._write(self.body)
+
+    def present_payload(self, payload: Payload) -> None:
+        """
+        Presents payload as the body, streaming it to the sink one chunk at a time.
+        Without a sink, body is a view of a buffer or loader payload and a copy of a file payload.
+        """
+        self.media_type = payload.media_type
+        if self._write is None:
+            # a file is read rather than mapped: nothing would close a map held by body
+            self.body = payload.view() if payload.path is None else memoryview(payload.read())
+            return
+        self.body = memoryview(b"")
+        for chunk in payload.iter_chunks():
+            self._write(chunk)
+
+    def present_stream(self, view_models: Iterator[BaseViewModel]) -> None:
+        """
+        Presents view models as newline-delimited JSON, writing every line to the sink as soon as it is serialized.
+        status_code is mapped from the first view model, the one a streamed response starts with.
+        Without a sink the lines are collected in body.
+        """
+        self.status_code = None
+        self.media_type = self.stream_content_type
+        lines: list[bytes] = []
+        for view_model in view_models:
+            if self.status_code is None:
+                self.status_code = self._statuses.status_code(view_model)
+            line = serialize_view_model(view_model) + b"\n"
+            if self._write is None:
+                lines.append(line)
+            else:
+                self._write(line)
+        if self.status_code is None:
+            self.status_code = self._statuses.success_status
+        self.body = memoryview(b"".join(lines))
+
+    def present_not_modified(self, fingerprint: str) -> None:
+        """
+        Presents 304 Not Modified with an empty body; nothing is written to the sink.
+        """
+        self.fingerprint = fingerprint
+        self.status_code = 304
+        self.body = memoryview(b"")
+
+
+class AsyncJSONPresenterResponse(AsyncPresenterResponse):
+    """
+    The asynchronous counterpart of JSONPresenterResponse, writing to a stream with write and drain,
+    like asyncio.StreamWriter.
+
+    @param sink: A stream writer to write the body to, if any.
+    @param status_codes: Maps BaseViewModel.errorName to a status code for failed view models.
+    @param success_status: The status code of successful view models.
+    @param error_status: The status code of failed view models whose errorName is not mapped.
+    """
+
+    content_type: str = "application/json"
+    stream_content_type: str = "application/x-ndjson"
+
+    def __init__(
+        self,
+        sink: AsyncWritable | None = None,
+        status_codes: Mapping[str, int] | None = None,
+        success_status: int = 200,
+        error_status: int = 500,
+    ) -> None:
+        super().__init__()
+        self.sink: AsyncWritable | None = sink
+        self.status_code: int | None = None
+        self.body: memoryview = memoryview(b"")
+        self.media_type: str = self.content_type
+        self._statuses: _StatusMapping = _StatusMapping(status_codes, success_status, error_status)
+
+    async def present(self, view_model: BaseViewModel) -> None:
+        self.status_code = self._statuses.status_code(view_model)
+        field = payload_field(type(view_model))
+        if field is not None and view_model.status:
+            payload = getattr(view_model, field)
+            if payload is not None:
+                await self.present_payload(payload)
+                return
+        self.media_type = self.content_type
+        self.body = memoryview(serialize_view_model(view_model))
+        if self.sink is not None:
+            self.sink.write(self.body)
+            await self.sink.drain()
+
+    async def present_payload(self, payload: Payload) -> None:
+        """
+        Presents payload as the body, writing it to the sink one chunk at a time and draining after each.
+        """
+        self.media_type = payload.media_type
+        if self.sink is None:
+            # a file is read rather than mapped: nothing would close a map held by body
+            self.body = payload.view() if payload.path is None else memoryview(payload.read())
+            return
+        self.body = memoryview(b"")
+        for chunk in payload.iter_chunks():
+            self.sink.write(chunk)
+            await self.sink.drain()
+
+    async def present_stream(self, view_models: AsyncIterator[BaseViewModel]) -> None:
+        """
+        Presents view models as newline-delimited JSON, writing and draining every line as soon as it is serialized.
+        status_code is mapped from the first view model. Without a sink the lines are collected in body.
+        """
+        self.status_code = None
+        self.media_type = self.stream_content_type
+        lines: list[bytes] = []
+        async for view_model in view_models:
+            if self.status_code is None:
+                self.status_code = self._statuses.status_code(view_model)
+            line = serialize_view_model(view_model) + b"\n"
+            if self.sink is None:
+                lines.append(line)
+            else:
+                self.sink.write(line)
+                await self.sink.drain()
+        if self.status_code is None:
+            self.status_code = self._statuses.success_status
+        self.body = memoryview(b"".join(lines))
+
+    async def present_not_modified(self, fingerprint: str) -> None:
+        """
+        Presents 304 Not Modified with an empty body; nothing is written to the sink.
+        """
+        self.fingerprint = fingerprint
+        self.status_code = 304
+        self.body = memoryview(b"")
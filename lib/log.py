@@ -0,0 +1,261 @@
+"""
+This module defines the framework's structured logging: StructuredLogger, the class-level logger every
+port, use case and gateway gets from BaseAbstractClass, and LoggingSink, which logs finished executions.
+
+Events are a name plus keyword fields. Nothing is rendered unless the level is enabled and a handler
+formats the record, so passing whole request or response models as fields costs nothing while INFO is
+off. The fields are also attached to the record as caps_event / caps_fields for structured handlers.
+High-volume events can be sampled: sampled() logs only a fraction of them, set with set_log_sample_rate.
+
+@author:
+@version: 1.0
+"""
+
+from contextvars import ContextVar, Token
+import logging
+import os
+import random
+import sys
+from typing import Any, Mapping
+
+from lib.instrumentation import EXCEPTION, SUCCESS, ExecutionTrace, InstrumentationSink
+
+_sample_rate: float = float(os.environ.get("CAPS_LOG_SAMPLE_RATE", "1"))
+_current_request_id: ContextVar[str | None] = ContextVar("caps_request_id", default=None)
+# the frames between our caller and Logger._log: the level method and _log. Before 3.11, findCaller
+# counted the first frame outside logging as one level already, so one fewer is added
+_STACKLEVEL_OFFSET: int = 2 if sys.version_info >= (3, 11) else 1
+
+
+def set_log_sample_rate(rate: float) -> None:
+    """
+    Sets the fraction of sampled events that are logged, e.g. 0.01 to keep one success in a hundred.
+    The initial value is read from the CAPS_LOG_SAMPLE_RATE environment variable, 1 by default.
+
+    :param rate: A fraction between 0 and 1.
+    """
+    global _sample_rate
+    if not 0.0 <= rate <= 1.0:
+        raise ValueError("rate must be between 0 and 1")
+    _sample_rate = rate
+
+
+def log_sample_rate() -> float:
+    return _sample_rate
+
+
+def current_request_id() -> str | None:
+    """
+    Returns the id of the request being served in this context, which every event logged in it carries.
+    """
+    return _current_request_id.get()
+
+
+def bind_request_id(request_id: str) -> Token[str | None]:
+    """
+    Makes request_id the current one, returns the token to pass to reset_request_id.
+    """
+    return _current_request_id.set(request_id)
+
+
+def reset_request_id(token: Token[str | None]) -> None:
+    _current_request_id.reset(token)
+
+
+class _Event:
+    """
+    The message of a structured record, rendered only when a handler formats it.
+    """
+
+    __slots__ = ("event", "args", "fields")
+
+    def __init__(self, event: str, args: tuple[Any, ...], fields: dict[str, Any]) -> None:
+        self.event: str = event
+        self.args: tuple[Any, ...] = args
+        self.fields: dict[str, Any] = fields
+
+    def __str__(self) -> str:
+        message = self.event % self.args if self.args else self.event
+        if not self.fields:
+            return message
+        return message + " " + " ".join(f"{name}={value}" for name, value in self.fields.items())
+
+
+class StructuredLogger:
+    """
+    A logging.Logger wrapper that logs events with keyword fields, formatted lazily.
+    Attributes it does not define, such as setLevel or handlers, are the wrapped logger's.
+
+    @param logger: The logger to log to.
+    """
+
+    __slots__ = ("logger",)
+
+    def __init__(self, logger: logging.Logger) -> None:
+        self.logger: logging.Logger = logger
+
+    @property
+    def name(self) -> str:
+        return self.logger.name
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "logger":  # not set yet, e.g. while unpickling
+            raise AttributeError(name)
+        return getattr(self.logger, name)
+
+    def log(
+        self,
+        level: int,
+        event: str,
+        *args: Any,
+        exc_info: Any = None,
+        stack_info: bool = False,
+        stacklevel: int = 1,
+        extra: Mapping[str, object] | None = None,
+        **fields: Any,
+    ) -> None:
+        """
+        Logs event at level, with %-style args and keyword fields, unless level is disabled.
+        exc_info, stack_info, stacklevel and extra are those of logging.Logger.log, not fields:
+        extra is merged with the caps_event and caps_fields attributes.
+        """
+        if self.logger.isEnabledFor(level):
+            self._log(level, event, args, fields, exc_info, stack_info, stacklevel, extra)
+
+    def debug(
+        self,
+        event: str,
+        *args: Any,
+        exc_info: Any = None,
+        stack_info: bool = False,
+        stacklevel: int = 1,
+        extra: Mapping[str, object] | None = None,
+        **fields: Any,
+    ) -> None:
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self._log(logging.DEBUG, event, args, fields, exc_info, stack_info, stacklevel, extra)
+
+    def info(
+        self,
+        event: str,
+        *args: Any,
+        exc_info: Any = None,
+        stack_info: bool = False,
+        stacklevel: int = 1,
+        extra: Mapping[str, object] | None = None,
+        **fields: Any,
+    ) -> None:
+        if self.logger.isEnabledFor(logging.INFO):
+            self._log(logging.INFO, event, args, fields, exc_info, stack_info, stacklevel, extra)
+
+    def warning(
+        self,
+        event: str,
+        *args: Any,
+        exc_info: Any = None,
+        stack_info: bool = False,
+        stacklevel: int = 1,
+        extra: Mapping[str, object] | None = None,
+        **fields: Any,
+    ) -> None:
+        if self.logger.isEnabledFor(logging.WARNING):
+            self._log(logging.WARNING, event, args, fields, exc_info, stack_info, stacklevel, extra)
+
+    def error(
+        self,
+        event: str,
+        *args: Any,
+        exc_info: Any = None,
+        stack_info: bool = False,
+        stacklevel: int = 1,
+        extra: Mapping[str, object] | None = None,
+        **fields: Any,
+    ) -> None:
+        if self.logger.isEnabledFor(logging.ERROR):
+            self._log(logging.ERROR, event, args, fields, exc_info, stack_info, stacklevel, extra)
+
+    def exception(
+        self,
+        event: str,
+        *args: Any,
+        exc_info: Any = True,
+        stack_info: bool = False,
+        stacklevel: int = 1,
+        extra: Mapping[str, object] | None = None,
+        **fields: Any,
+    ) -> None:
+        if self.logger.isEnabledFor(logging.ERROR):
+            self._log(logging.ERROR, event, args, fields, exc_info, stack_info, stacklevel, extra)
+
+    def sampled(self, event: str, *args: Any, level: int = logging.INFO, **fields: Any) -> None:
+        """
+        Logs event like log, but only for a log_sample_rate() fraction of the calls. Logged events
+        carry the sample_rate field, so that counts derived from the logs can be scaled back up.
+        """
+        rate = _sample_rate
+        if rate <= 0.0 or not self.logger.isEnabledFor(level):
+            return
+        if rate < 1.0:
+            if random.random() >= rate:
+                return
+            fields["sample_rate"] = rate
+        self._log(level, event, args, fields)
+
+    def _log(
+        self,
+        level: int,
+        event: str,
+        args: tuple[Any, ...],
+        fields: dict[str, Any],
+        exc_info: Any = None,
+        stack_info: bool = False,
+        stacklevel: int = 1,
+        extra: Mapping[str, object] | None = None,
+    ) -> None:
+        request_id = _current_request_id.get()
+        if request_id is not None:
+            fields = {"request_id": request_id, **fields}
+        attributes: dict[str, object] = {"caps_event": event, "caps_fields": fields}
+        if extra:
+            attributes = {**extra, **attributes}
+        # the level is enabled already: skip Logger.log and attribute the record to our caller
+        self.logger._log(
+            level,
+            _Event(event, args, fields),
+            (),
+            exc_info=exc_info,
+            extra=attributes,
+            stack_info=stack_info,
+            stacklevel=stacklevel + _STACKLEVEL_OFFSET,
+        )
+
+
+def get_logger(name: str) -> StructuredLogger:
+    return StructuredLogger(logging.getLogger(name))
+
+
+class LoggingSink(InstrumentationSink):
+    """
+    Logs every finished execution as a "usecase.finished" event with the use case, its outcome, the
+    last stage it reached and its duration, to the caps.usecase.<use case> logger. Successes are logged
+    at INFO and sampled, exceptions at ERROR and the other outcomes at WARNING, unsampled.
+    """
+
+    def __init__(self) -> None:
+        self._loggers: dict[str, StructuredLogger] = {}
+
+    def record(self, trace: ExecutionTrace) -> None:
+        logger = self._loggers.get(trace.usecase)
+        if logger is None:
+            logger = self._loggers[trace.usecase] = get_logger(f"caps.usecase.{trace.usecase}")
+        stage = next(reversed(trace.durations), None)
+        fields: dict[str, Any] = {
+            "usecase": trace.usecase,
+            "outcome": trace.outcome,
+            "stage": stage,
+            "duration": trace.total,
+        }
+        if trace.outcome == SUCCESS:
+            logger.sampled("usecase.finished", **fields)
+        else:
+            logger.log(logging.ERROR if trace.outcome == EXCEPTION else logging.WARNING, "usecase.finished", **fields)
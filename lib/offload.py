@@ -0,0 +1,200 @@
+"""
+This module defines ProcessOffload, which runs CPU-bound process_dto calls of single-DTO use cases
+in a process pool so they do not hold the GIL of the serving process.
+
+The use case and its DTO are pickled with protocol 5; the in-band pickle and every out-of-band buffer
+(numpy arrays, pickle.PickleBuffer fields, ...) are laid out in a single shared memory segment that the
+worker process maps and unpickles from, instead of being copied through the pool's pipe. Only the
+segment name and layout travel through the pipe. The response model comes back the regular way, copied
+out of the segment first if it refers to one of its buffers.
+
+@author:
+@version: 1.0
+"""
+
+import asyncio
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+import inspect
+from multiprocessing import shared_memory
+import pickle
+import threading
+from typing import Any, Callable, Protocol
+
+from pydantic import BaseModel
+
+_POINTER_SIZE = 8
+
+
+def payload_size(value: Any) -> int:
+    """
+    Cheaply approximates the number of bytes value pickles to, without walking large containers:
+    buffers and strings count their length, containers 8 bytes per item, models the sum of their fields.
+    """
+    if isinstance(value, BaseModel):
+        return sum(payload_size(field) for field in value.__dict__.values())
+    if isinstance(value, (bytes, bytearray, str)):
+        return len(value)
+    if isinstance(value, memoryview):
+        return value.nbytes
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    if isinstance(value, (list, tuple, set, frozenset, dict)):
+        return len(value) * _POINTER_SIZE
+    return _POINTER_SIZE
+
+
+class DTOProcessor(Protocol):
+    def process_dto(self, dto: Any, /) -> Any:
+        """Turns a DTO into a response model, like BaseSingleDTOUseCase.process_dto."""
+
+
+class OffloadStats:
+    """
+    Counters of a ProcessOffload.
+
+    :inline (int): process_dto calls run in the calling process because the DTO was below the threshold.
+    :offloaded (int): process_dto calls run in the process pool.
+    :transferred (int): Bytes written to shared memory for offloaded calls.
+    """
+
+    __slots__ = ("inline", "offloaded", "transferred")
+
+    def __init__(self) -> None:
+        self.inline: int = 0
+        self.offloaded: int = 0
+        self.transferred: int = 0
+
+
+def _process_shared(name: str, layout: list[tuple[int, int]]) -> Any:
+    """
+    Runs in the worker: unpickles the use case and DTO from the shared memory segment and processes the DTO.
+    """
+    segment = shared_memory.SharedMemory(name=name)
+    views = [segment.buf[start : start + size] for start, size in layout]
+    error: BaseException | None = None
+    result: Any = None
+    try:
+        usecase, dto = pickle.loads(views[0], buffers=views[1:])
+        result = usecase.process_dto(dto)
+        if inspect.iscoroutine(result):
+            result = asyncio.run(result)
+        if len(views) > 1:
+            # the result may refer to an out-of-band buffer of the DTO: copy it in band while the
+            # views are alive, as the pool pickles it only after they are released
+            result = pickle.loads(pickle.dumps(result, protocol=5))
+    except BaseException as caught:
+        # the frames of the traceback refer to the use case, the DTO and the buffers they export:
+        # drop them, or releasing the views raises BufferError instead of the error
+        error = caught
+        chained: BaseException | None = caught
+        while chained is not None:
+            chained.__traceback__ = None
+            chained = chained.__context__
+    usecase = dto = None
+    for view in views:
+        view.release()
+    segment.close()
+    if error is not None:
+        raise error
+    return result
+
+
+class ProcessOffload:
+    """
+    Runs process_dto in a process pool for DTOs of at least threshold bytes, and in the calling
+    process below it, where the pickling and IPC would cost more than the processing.
+
+    Set it as the process_offload class attribute of a BaseSingleDTOUseCase or AsyncBaseSingleDTOUseCase.
+    The use case instance is pickled along with the DTO, without its presenter, so its other attributes
+    must be picklable and process_dto must not rely on state of the serving process.
+
+    @param threshold: The approximate DTO size in bytes from which process_dto is offloaded.
+    @param max_workers: The number of worker processes, by default the number of CPUs.
+    @param sizeof: Approximates the size of a DTO, payload_size by default.
+    @param executor: The process pool to use instead of creating one.
+    """
+
+    def __init__(
+        self,
+        threshold: int = 1 << 20,
+        max_workers: int | None = None,
+        sizeof: Callable[[Any], int] = payload_size,
+        executor: Executor | None = None,
+    ) -> None:
+        self.threshold: int = threshold
+        self.max_workers: int | None = max_workers
+        self.sizeof: Callable[[Any], int] = sizeof
+        self.stats: OffloadStats = OffloadStats()
+        self._executor: Executor | None = executor
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(self.max_workers)
+        return self._executor
+
+    def should_offload(self, dto: Any) -> bool:
+        return self.sizeof(dto) >= self.threshold
+
+    def submit(self, usecase: DTOProcessor, dto: Any) -> "Future[Any]":
+        """
+        Offloads usecase.process_dto(dto) to the process pool, unconditionally.
+
+        :return: A future of the response model.
+        """
+        buffers: list[pickle.PickleBuffer] = []
+        data = pickle.dumps((usecase, dto), protocol=5, buffer_callback=buffers.append)
+        raws = [memoryview(data), *(buffer.raw() for buffer in buffers)]
+        layout: list[tuple[int, int]] = []
+        offset = 0
+        for raw in raws:
+            layout.append((offset, raw.nbytes))
+            offset += raw.nbytes
+        segment = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        try:
+            for (start, size), raw in zip(layout, raws):
+                segment.buf[start : start + size] = raw
+            future = self.executor.submit(_process_shared, segment.name, layout)
+        except BaseException:
+            _release(segment)
+            raise
+        future.add_done_callback(lambda _: _release(segment))
+        with self._lock:
+            self.stats.offloaded += 1
+            self.stats.transferred += offset
+        return future
+
+    def process(self, usecase: DTOProcessor, dto: Any) -> Any:
+        """
+        Returns usecase.process_dto(dto), computed in the process pool if the DTO reaches the threshold.
+        """
+        if not self.should_offload(dto):
+            with self._lock:
+                self.stats.inline += 1
+            return usecase.process_dto(dto)
+        return self.submit(usecase, dto).result()
+
+    async def process_async(self, usecase: DTOProcessor, dto: Any) -> Any:
+        """
+        The asynchronous counterpart of process, awaiting the process pool without blocking the event loop.
+        """
+        if not self.should_offload(dto):
+            with self._lock:
+                self.stats.inline += 1
+            return await usecase.process_dto(dto)
+        return await asyncio.wrap_future(self.submit(usecase, dto))
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+def _release(segment: shared_memory.SharedMemory) -> None:
+    segment.close()
+    segment.unlink()
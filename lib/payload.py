@@ -0,0 +1,306 @@
+"""
+This module defines Payload, a field type for large binary data (reports, files, blobs) in DTOs,
+response models and view models.
+
+A Payload references its data instead of holding a copy: a buffer it wraps without copying, a file
+it maps or reads lazily, or a loader it calls only when the data is consumed. Validation accepts a
+Payload as is and wraps bytes-like values without copying, so the same Payload travels from the gateway
+to the presenter response by reference. JSONPresenterResponse streams it in chunks at the end, holding
+one chunk at a time. In JSON it serializes as its metadata only ({"size": ..., "media_type": ...});
+to_json_with_payloads and from_json_with_payloads carry the content alongside that JSON.
+
+Payloads pickle by reference to their file or, with pickle protocol 5, as an out-of-band buffer,
+so ProcessOffload hands them to workers without copying through the pipe.
+
+@author:
+@version: 1.0
+"""
+
+from contextvars import ContextVar
+import mmap
+import os
+import pickle
+from typing import Any, Callable, Iterable, Iterator, TypeVar
+
+from pydantic import BaseModel, GetCoreSchemaHandler, GetJsonSchemaHandler
+from pydantic.json_schema import JsonSchemaValue
+from pydantic_core import core_schema
+
+CHUNK_SIZE = 1 << 16
+
+TModel = TypeVar("TModel", bound=BaseModel)
+
+Loader = Callable[[], "bytes | bytearray | memoryview | Iterable[bytes]"]
+
+
+class Payload:
+    """
+    A lazily read, by-reference blob. Build one with from_buffer, from_file or from_loader.
+
+    :media_type (str): The media type of the data, used as the content type when it is presented.
+    """
+
+    __slots__ = ("media_type", "_buffer", "_path", "_offset", "_length", "_loader", "_mmap")
+
+    def __init__(self, media_type: str = "application/octet-stream") -> None:
+        self.media_type: str = media_type
+        self._buffer: Any = None
+        self._path: str | None = None
+        self._offset: int = 0
+        self._length: int | None = None
+        self._loader: Loader | None = None
+        self._mmap: mmap.mmap | None = None
+
+    @classmethod
+    def from_buffer(cls, buffer: Any, media_type: str = "application/octet-stream") -> "Payload":
+        """
+        Returns a payload over buffer (bytes, bytearray, memoryview, mmap, numpy array, ...), without copying it.
+        """
+        payload = cls(media_type)
+        payload._buffer = memoryview(buffer).cast("B")
+        return payload
+
+    @classmethod
+    def from_file(
+        cls,
+        path: str | os.PathLike[str],
+        offset: int = 0,
+        length: int | None = None,
+        media_type: str = "application/octet-stream",
+    ) -> "Payload":
+        """
+        Returns a payload over length bytes of the file at path from offset, by default up to its end.
+        The file is not opened until the payload is consumed.
+        """
+        payload = cls(media_type)
+        payload._path = os.fspath(path)
+        payload._offset = offset
+        payload._length = length
+        return payload
+
+    @classmethod
+    def from_loader(
+        cls, loader: Loader, size: int | None = None, media_type: str = "application/octet-stream"
+    ) -> "Payload":
+        """
+        Returns a payload whose data loader returns, as one bytes-like object or an iterable of chunks,
+        when the payload is consumed. size is reported as is, the loader is not called to compute it.
+        """
+        payload = cls(media_type)
+        payload._loader = loader
+        payload._length = size
+        return payload
+
+    @property
+    def size(self) -> int | None:
+        """
+        The size of the data in bytes, None for a loader payload of unknown size.
+        """
+        if self._buffer is not None:
+            size: int = self._buffer.nbytes
+            return size
+        if self._path is not None and self._length is None:
+            return max(0, os.stat(self._path).st_size - self._offset)
+        return self._length
+
+    @property
+    def nbytes(self) -> int:
+        return self.size or 0
+
+    @property
+    def path(self) -> str | None:
+        """
+        The file of a file payload, None otherwise.
+        """
+        return self._path
+
+    def view(self) -> memoryview:
+        """
+        Returns the data as a memoryview: the wrapped buffer itself, or a memory map of the file,
+        which the OS pages in as it is read. A loader payload calls its loader, joining chunks if needed.
+        """
+        if self._buffer is not None:
+            view: memoryview = self._buffer
+            return view
+        if self._path is not None:
+            if self._mmap is None:
+                with open(self._path, "rb") as file:
+                    if os.fstat(file.fileno()).st_size == 0:
+                        return memoryview(b"")
+                    self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            end = None if self._length is None else self._offset + self._length
+            return memoryview(self._mmap)[self._offset : end]
+        data = self._load()
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            return memoryview(data).cast("B")
+        return memoryview(b"".join(data))
+
+    def iter_chunks(self, chunk_size: int = CHUNK_SIZE) -> Iterator[memoryview]:
+        """
+        Yields the data in chunks of at most chunk_size bytes, without holding more than one in memory.
+        A file payload reads every chunk into the same buffer, so a chunk is only valid until the next one
+        is pulled: write it out, or copy it, before advancing.
+        """
+        if self._path is not None and self._mmap is None:
+            yield from self._read_chunks(chunk_size)
+            return
+        if self._buffer is None and self._path is None:
+            data = self._load()
+            if not isinstance(data, (bytes, bytearray, memoryview)):
+                for chunk in data:
+                    yield memoryview(chunk)
+                return
+            view = memoryview(data).cast("B")
+        else:
+            view = self.view()
+        for start in range(0, view.nbytes, chunk_size):
+            yield view[start : start + chunk_size]
+
+    def read(self) -> bytes:
+        """
+        Returns a copy of the whole data. Prefer view or iter_chunks.
+        A file payload is read without mapping it, unless it is already mapped.
+        """
+        if self._path is not None and self._mmap is None:
+            with open(self._path, "rb") as file:
+                file.seek(self._offset)
+                return file.read(-1 if self._length is None else self._length)
+        return bytes(self.view())
+
+    def close(self) -> None:
+        """
+        Releases the memory map of a file payload, once no view of it is in use.
+        """
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def _load(self) -> "bytes | bytearray | memoryview | Iterable[bytes]":
+        assert self._loader is not None
+        return self._loader()
+
+    def _read_chunks(self, chunk_size: int) -> Iterator[memoryview]:
+        assert self._path is not None
+        buffer = bytearray(chunk_size)
+        view = memoryview(buffer)
+        remaining = self._length
+        with open(self._path, "rb", buffering=0) as file:
+            file.seek(self._offset)
+            while remaining is None or remaining > 0:
+                wanted = chunk_size if remaining is None else min(chunk_size, remaining)
+                read = file.readinto(view[:wanted])
+                if not read:
+                    return
+                if remaining is not None:
+                    remaining -= read
+                yield view[:read]
+
+    def __repr__(self) -> str:
+        if self._path is not None:
+            source = f"file={self._path!r}, offset={self._offset}"
+        elif self._buffer is not None:
+            source = "buffer"
+        else:
+            source = "loader"
+        size = self.size if self._buffer is not None else self._length
+        return f"Payload({source}, size={size}, media_type={self.media_type!r})"
+
+    def __reduce_ex__(self, protocol: Any) -> Any:
+        if self._path is not None:
+            return (Payload.from_file, (self._path, self._offset, self._length, self.media_type))
+        if self._buffer is not None:
+            buffer = pickle.PickleBuffer(self._buffer) if protocol >= 5 else self._buffer.tobytes()
+            return (Payload.from_buffer, (buffer, self.media_type))
+        return (Payload.from_loader, (self._loader, self._length, self.media_type))
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source: Any, handler: GetCoreSchemaHandler) -> core_schema.CoreSchema:
+        return core_schema.no_info_plain_validator_function(
+            _validate,
+            serialization=core_schema.plain_serializer_function_ser_schema(_serialize, info_arg=True),
+        )
+
+    @classmethod
+    def __get_pydantic_json_schema__(
+        cls, schema: core_schema.CoreSchema, handler: GetJsonSchemaHandler
+    ) -> JsonSchemaValue:
+        return {
+            "type": "object",
+            "properties": {"size": {"type": ["integer", "null"]}, "media_type": {"type": "string"}},
+        }
+
+
+def _validate(value: Any) -> Payload:
+    if isinstance(value, Payload):
+        return value
+    restored = _restored.get()
+    if restored is not None and isinstance(value, dict):
+        content = next(restored, None)
+        if content is None:
+            raise ValueError("no content was recorded for this payload")
+        return Payload.from_buffer(content, value.get("media_type", "application/octet-stream"))
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return Payload.from_buffer(value)
+    raise ValueError("a payload must be a Payload or a bytes-like object")
+
+
+# the payloads serialized to JSON by to_json_with_payloads, None outside of it
+_serialized: ContextVar[list[Payload] | None] = ContextVar("caps_serialized_payloads", default=None)
+_restored: ContextVar[Iterator[bytes] | None] = ContextVar("caps_restored_payloads", default=None)
+
+
+def _serialize(payload: Payload, info: core_schema.SerializationInfo) -> Any:
+    if info.mode_is_json():
+        serialized = _serialized.get()
+        if serialized is not None:
+            serialized.append(payload)
+        return {"size": payload.size, "media_type": payload.media_type}
+    return payload
+
+
+def to_json_with_payloads(model: BaseModel) -> tuple[bytes, list[Payload]]:
+    """
+    Returns the JSON of model, where payloads are metadata only, with the payloads it contains in order,
+    for callers that need their content too, such as fingerprint.
+    """
+    serialized: list[Payload] = []
+    token = _serialized.set(serialized)
+    try:
+        return type(model).__pydantic_serializer__.to_json(model), serialized
+    finally:
+        _serialized.reset(token)
+
+
+def from_json_with_payloads(model_class: type[TModel], data: bytes, contents: Iterable[bytes]) -> TModel:
+    """
+    Validates the JSON of a model_class written by to_json_with_payloads, restoring its payloads, in order,
+    from contents.
+    """
+    token = _restored.set(iter(contents))
+    try:
+        return model_class.model_validate_json(data)
+    finally:
+        _restored.reset(token)
+
+
+_payload_fields: dict[type[BaseModel], str | None] = {}
+
+
+def payload_field(model_class: type[BaseModel]) -> str | None:
+    """
+    Returns the name of the first Payload field of model_class, or None. Computed once per class.
+    """
+    try:
+        return _payload_fields[model_class]
+    except KeyError:
+        pass
+    name = next(
+        (
+            name
+            for name, field in model_class.model_fields.items()
+            if field.annotation is Payload or Payload in getattr(field.annotation, "__args__", ())
+        ),
+        None,
+    )
+    _payload_fields[model_class] = name
+    return name
@@ -0,0 +1,239 @@
+"""
+This module defines UseCasePipeline and AsyncUseCasePipeline, which chain use cases in process: the
+response model of a stage is mapped straight to the request model of the next one, an error response of
+any stage short-circuits to the final presenter's presentError, and only the result of the last stage goes
+through the final presenter, so intermediate results are neither converted to view models nor re-validated.
+
+A mapping is a function (response model of the previous stage, request model of the pipeline) -> request
+model of the next stage; map_fields builds one from a field correspondence. Request models built by a
+mapping are not validated again: their data comes from a response model the previous stage produced.
+
+@author:
+@version: 1.0
+"""
+
+from typing import Any, Callable, Generic
+
+from lib.context import ExecutionContext, bind_context, reset_context
+from lib.deadline import Deadline, bind_deadline, reset_deadline
+from lib.primary_ports import AsyncBaseInputPort, AsyncBaseOutputPort, BaseInputPort, BaseOutputPort
+from lib.usecase import AsyncBaseUseCase, BaseUseCase
+from lib.usecase_models import (
+    BaseErrorResponseModel,
+    BaseRequestModel,
+    BaseResponseModel,
+    TBaseRequestModel,
+)
+
+Mapping = Callable[[Any, Any], BaseRequestModel]
+
+
+def map_fields(
+    request_type: type[BaseRequestModel], fields: dict[str, str] | None = None, keep: tuple[str, ...] = ()
+) -> Mapping:
+    """
+    Returns a mapping building request_type without validation.
+
+    :param request_type: The request model of the next stage.
+    :param fields: The next request's fields by the name of the previous response's field they take their
+        value from, by default every field the two models have in common. The other fields keep their defaults.
+    :param keep: The fields copied from the pipeline's request model instead, e.g. ("user_id", "auth_token").
+    """
+    kept = dict.fromkeys(keep)
+    explicit = None if fields is None else tuple(fields.items())
+    by_response: dict[type, tuple[tuple[str, str], ...]] = {}
+
+    def mapping(responseModel: Any, requestModel: Any) -> BaseRequestModel:
+        items = explicit
+        if items is None:
+            response_type = type(responseModel)
+            items = by_response.get(response_type)
+            if items is None:
+                items = by_response[response_type] = tuple(
+                    (name, name)
+                    for name in request_type.model_fields
+                    if name in response_type.model_fields and name not in kept
+                )
+        data = {name: getattr(responseModel, source) for name, source in items}
+        for name in kept:
+            data[name] = getattr(requestModel, name)
+        return request_type.model_construct(**data)
+
+    return mapping
+
+
+class _Capture(BaseOutputPort[BaseResponseModel, BaseErrorResponseModel]):
+    """
+    Receives the result of an intermediate stage, as is.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.result: BaseResponseModel | BaseErrorResponseModel | None = None
+
+    def presentSuccess(self, responseModel: BaseResponseModel) -> None:
+        self.result = responseModel
+
+    def presentError(self, errorModel: BaseErrorResponseModel) -> None:
+        self.result = errorModel
+
+
+class _AsyncCapture(AsyncBaseOutputPort[BaseResponseModel, BaseErrorResponseModel]):
+    def __init__(self) -> None:
+        super().__init__()
+        self.result: BaseResponseModel | BaseErrorResponseModel | None = None
+
+    async def presentSuccess(self, responseModel: BaseResponseModel) -> None:
+        self.result = responseModel
+
+    async def presentError(self, errorModel: BaseErrorResponseModel) -> None:
+        self.result = errorModel
+
+
+def _captured(usecase: object, capture: _Capture | _AsyncCapture) -> BaseResponseModel | BaseErrorResponseModel:
+    if capture.result is None:
+        raise RuntimeError(f"{type(usecase).__qualname__} presented no result to the pipeline")
+    return capture.result
+
+
+class UseCasePipeline(BaseInputPort[TBaseRequestModel], Generic[TBaseRequestModel]):
+    """
+    Executes use cases one after the other, each with the mapped result of the previous one.
+
+    @param first: The first stage, executed with the pipeline's request model.
+    @param presenter: The final presenter, by default the presenter of the last stage.
+    """
+
+    def __init__(
+        self, first: BaseUseCase[Any, Any, Any, Any], presenter: BaseOutputPort[Any, Any] | None = None
+    ) -> None:
+        super().__init__()
+        self.stages: list[tuple[Mapping | None, BaseUseCase[Any, Any, Any, Any]]] = [(None, first)]
+        self._presenter: BaseOutputPort[Any, Any] | None = presenter
+
+    def then(self, mapping: Mapping, usecase: BaseUseCase[Any, Any, Any, Any]) -> "UseCasePipeline[TBaseRequestModel]":
+        """
+        Appends a stage executed with mapping(result of the previous stage, request model of the pipeline).
+        """
+        self.stages.append((mapping, usecase))
+        return self
+
+    def execute(self, requestModel: TBaseRequestModel) -> None:
+        self.execute_with(requestModel)
+
+    def execute_with(
+        self,
+        requestModel: TBaseRequestModel,
+        presenter: BaseOutputPort[Any, Any] | None = None,
+        response: object = None,
+        deadline: Deadline | float | None = None,
+    ) -> None:
+        """
+        Executes the pipeline, presenting its final result, or the first error, with presenter.
+
+        :param presenter: The final presenter to use instead of the pipeline's.
+        :param response: The presenter response the final presenter writes to instead of its own.
+        :param deadline: The deadline of the whole pipeline, or its time budget in seconds.
+        """
+        presenter = presenter or self._presenter
+        deadline_token = None if deadline is None else bind_deadline(deadline)
+        try:
+            last = len(self.stages) - 1
+            result: BaseResponseModel | BaseErrorResponseModel | None = None
+            for index, (mapping, usecase) in enumerate(self.stages):
+                request = requestModel if mapping is None else mapping(result, requestModel)
+                if index == last:
+                    usecase.execute_with(request, presenter, response)
+                    return
+                capture = _Capture()
+                usecase.execute_with(request, capture)
+                result = _captured(usecase, capture)
+                if result.status == False:
+                    self._present_error(result, presenter, response)  # type: ignore[arg-type]
+                    return
+        finally:
+            reset_deadline(deadline_token)
+
+    def _present_error(
+        self, errorModel: BaseErrorResponseModel, presenter: BaseOutputPort[Any, Any] | None, response: object
+    ) -> None:
+        final = self.stages[-1][1]
+        presenter = presenter or final.presenter
+        token = bind_context(ExecutionContext(final, presenter, response))
+        try:
+            presenter.presentError(errorModel)
+        finally:
+            reset_context(token)
+
+
+class AsyncUseCasePipeline(AsyncBaseInputPort[TBaseRequestModel], Generic[TBaseRequestModel]):
+    """
+    Executes asynchronous use cases one after the other, each with the mapped result of the previous one.
+    Mirrors UseCasePipeline.
+
+    @param first: The first stage, executed with the pipeline's request model.
+    @param presenter: The final presenter, by default the presenter of the last stage.
+    """
+
+    def __init__(
+        self, first: AsyncBaseUseCase[Any, Any, Any, Any], presenter: AsyncBaseOutputPort[Any, Any] | None = None
+    ) -> None:
+        super().__init__()
+        self.stages: list[tuple[Mapping | None, AsyncBaseUseCase[Any, Any, Any, Any]]] = [(None, first)]
+        self._presenter: AsyncBaseOutputPort[Any, Any] | None = presenter
+
+    def then(
+        self, mapping: Mapping, usecase: AsyncBaseUseCase[Any, Any, Any, Any]
+    ) -> "AsyncUseCasePipeline[TBaseRequestModel]":
+        """
+        Appends a stage executed with mapping(result of the previous stage, request model of the pipeline).
+        """
+        self.stages.append((mapping, usecase))
+        return self
+
+    async def execute(self, requestModel: TBaseRequestModel) -> None:
+        await self.execute_with(requestModel)
+
+    async def execute_with(
+        self,
+        requestModel: TBaseRequestModel,
+        presenter: AsyncBaseOutputPort[Any, Any] | None = None,
+        response: object = None,
+        deadline: Deadline | float | None = None,
+    ) -> None:
+        """
+        Executes the pipeline, presenting its final result, or the first error, with presenter.
+
+        :param presenter: The final presenter to use instead of the pipeline's.
+        :param response: The presenter response the final presenter writes to instead of its own.
+        :param deadline: The deadline of the whole pipeline, or its time budget in seconds.
+        """
+        presenter = presenter or self._presenter
+        deadline_token = None if deadline is None else bind_deadline(deadline)
+        try:
+            last = len(self.stages) - 1
+            result: BaseResponseModel | BaseErrorResponseModel | None = None
+            for index, (mapping, usecase) in enumerate(self.stages):
+                request = requestModel if mapping is None else mapping(result, requestModel)
+                if index == last:
+                    await usecase.execute_with(request, presenter, response)
+                    return
+                capture = _AsyncCapture()
+                await usecase.execute_with(request, capture)
+                result = _captured(usecase, capture)
+                if result.status == False:
+                    await self._present_error(result, presenter, response)  # type: ignore[arg-type]
+                    return
+        finally:
+            reset_deadline(deadline_token)
+
+    async def _present_error(
+        self, errorModel: BaseErrorResponseModel, presenter: AsyncBaseOutputPort[Any, Any] | None, response: object
+    ) -> None:
+        final = self.stages[-1][1]
+        presenter = presenter or final.presenter
+        token = bind_context(ExecutionContext(final, presenter, response))
+        try:
+            await presenter.presentError(errorModel)
+        finally:
+            reset_context(token)
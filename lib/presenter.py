@@ -1,16 +1,39 @@
 """
-This module defines the BasePresenter class.
+This module defines the BasePresenter and AsyncBasePresenter classes.
 
 @author:
 @version: 1.0
 """
 
 from abc import abstractmethod
-from typing import Generic
-from lib.primary_ports import BaseOutputPort
-from lib.response import TPresenterResponse
+from typing import Any, AsyncIterable, AsyncIterator, Callable, ClassVar, Generic, Iterable, Iterator, Sequence
+from lib.context import current_context
+from lib.fingerprint import fingerprint
+from lib.instrumentation import CONVERT, PRESENT, current_trace
+from lib.primary_ports import AsyncBaseOutputPort, BaseOutputPort
+from lib.response import AsyncPresenterResponse, PresenterResponse
 from lib.usecase_models import TBaseErrorResponseModel, TBaseResponseModel
-from lib.view_model import TBaseViewModel
+from lib.view_model import BaseBatchViewModel, BaseViewModel, TBaseViewModel
+
+
+def convert_batch(
+    results: Sequence[TBaseResponseModel | TBaseErrorResponseModel],
+    convertResponse: Callable[[Any], BaseViewModel],
+    convertError: Callable[[Any], BaseViewModel],
+) -> BaseBatchViewModel:
+    """
+    Converts the results of a batched execution to a single view model, keeping the success/error
+    split of every item. Shared by the convertBatchToViewModel of BasePresenter and AsyncBasePresenter.
+
+    :param results: The response and error models, in request order.
+    :param convertResponse: Converts a response model to a view model.
+    :param convertError: Converts an error model to a view model.
+    :return: The resulting batch view model.
+    """
+    items: list[BaseViewModel] = [
+        convertError(result) if result.status == False else convertResponse(result) for result in results
+    ]
+    return BaseBatchViewModel(status=all(item.status for item in items), items=items)
 
 
 class BasePresenter(
@@ -20,13 +43,34 @@ class BasePresenter(
     """
     Abstract base class for presenters.
 
-    @param response: The presenter response object to use.
-    :type response: TPresenterResponse
+    @param response: The presenter response object to use, None to bind one per invocation.
+    :type response: PresenterResponse | None
     """
 
-    def __init__(self, response: TPresenterResponse) -> None:
+    conditional: ClassVar[bool] = False
+    """Opt-in fingerprinting of response models: a result whose fingerprint matches the invocation's
+    if_none_match is presented with present_not_modified, without converting it to a view model."""
+
+    def __init__(self, response: PresenterResponse | None = None) -> None:
         super().__init__()
-        self.response: TPresenterResponse = response
+        self._response: PresenterResponse | None = response
+
+    @property
+    def response(self) -> PresenterResponse:
+        """
+        The presenter response bound to the running invocation by execute_with, else the one given to the constructor.
+        """
+        context = current_context()
+        if context is not None and context.presenter is self and context.response is not None:
+            response: PresenterResponse = context.response
+            return response
+        if self._response is None:
+            raise RuntimeError(f"{type(self).__qualname__} has no presenter response, bind one with execute_with")
+        return self._response
+
+    @response.setter
+    def response(self, response: PresenterResponse) -> None:
+        self._response = response
 
     @abstractmethod
     def convertResponseToViewModel(self, responseModel: TBaseResponseModel) -> TBaseViewModel:
@@ -52,15 +96,40 @@ class BasePresenter(
         """
         raise NotImplementedError
 
+    def fingerprintResponse(self, responseModel: TBaseResponseModel) -> str:
+        """
+        Returns the fingerprint of the given response model, used when conditional is set.
+        Override it to hash only the fields that identify a version, e.g. an id and an updated_at.
+
+        :param responseModel: The response model to fingerprint.
+        :type responseModel: TBaseResponseModel
+        :return: The fingerprint.
+        :rtype: str
+        """
+        return fingerprint(responseModel)
+
     def presentSuccess(self, responseModel: TBaseResponseModel) -> None:
         """
-        Presents the given response model as a success.
+        Presents the given response model as a success, or as not modified if conditional is set
+        and the client already has it.
 
         :param responseModel: The response model to present.
         :type responseModel: TBaseResponseModel
         """
+        trace = current_trace()
+        if self.conditional:
+            response = self.response
+            tag = response.fingerprint = self.fingerprintResponse(responseModel)
+            context = current_context()
+            if context is not None and context.if_none_match == tag:
+                trace.mark(CONVERT)
+                response.present_not_modified(tag)
+                trace.mark(PRESENT)
+                return
         view_model: TBaseViewModel = self.convertResponseToViewModel(responseModel)
+        trace.mark(CONVERT)
         self.response.present(view_model)
+        trace.mark(PRESENT)
 
     def presentError(self, errorModel: TBaseErrorResponseModel) -> None:
         """
@@ -69,5 +138,233 @@ class BasePresenter(
         :param errorModel: The error model to present.
         :type errorModel: TBaseErrorResponseModel
         """
+        trace = current_trace()
         view_model: TBaseViewModel = self.convertErrorToViewModel(errorModel)
+        trace.mark(CONVERT)
         self.response.present(view_model)
+        trace.mark(PRESENT)
+
+    def presentBatch(self, results: Sequence[TBaseResponseModel | TBaseErrorResponseModel]) -> None:
+        """
+        Presents the results of a batched execution as one BaseBatchViewModel.
+
+        :param results: The response and error models, in request order.
+        :type results: Sequence[TBaseResponseModel | TBaseErrorResponseModel]
+        """
+        trace = current_trace()
+        view_model = self.convertBatchToViewModel(results)
+        trace.mark(CONVERT)
+        self.response.present(view_model)
+        trace.mark(PRESENT)
+
+    def convertBatchToViewModel(
+        self, results: Sequence[TBaseResponseModel | TBaseErrorResponseModel]
+    ) -> BaseBatchViewModel:
+        """
+        Converts the results of a batched execution to a single view model,
+        keeping the success/error split of every item.
+
+        :param results: The response and error models, in request order.
+        :type results: Sequence[TBaseResponseModel | TBaseErrorResponseModel]
+        :return: The resulting batch view model.
+        :rtype: BaseBatchViewModel
+        """
+        return convert_batch(results, self.convertResponseToViewModel, self.convertErrorToViewModel)
+
+    def presentStream(self, results: Iterable[TBaseResponseModel | TBaseErrorResponseModel]) -> None:
+        """
+        Presents a lazily produced stream of results as one streamed response,
+        converting every item only when the response asks for it.
+
+        :param results: The response and error models, produced lazily.
+        :type results: Iterable[TBaseResponseModel | TBaseErrorResponseModel]
+        """
+        self.response.present_stream(self.convertStreamToViewModels(results))
+
+    def convertStreamToViewModels(
+        self, results: Iterable[TBaseResponseModel | TBaseErrorResponseModel]
+    ) -> Iterator[TBaseViewModel]:
+        """
+        Lazily converts a stream of results to view models, errors with convertErrorToViewModel.
+
+        :param results: The response and error models, produced lazily.
+        :type results: Iterable[TBaseResponseModel | TBaseErrorResponseModel]
+        :return: The view models, one per result.
+        :rtype: Iterator[TBaseViewModel]
+        """
+        trace = current_trace()
+        for result in results:
+            if result.status == False:
+                view_model = self.convertErrorToViewModel(result)  # type: ignore
+            else:
+                view_model = self.convertResponseToViewModel(result)  # type: ignore
+            trace.mark(CONVERT)
+            yield view_model
+            trace.mark(PRESENT)
+
+
+class AsyncBasePresenter(
+    AsyncBaseOutputPort[TBaseResponseModel, TBaseErrorResponseModel],
+    Generic[TBaseResponseModel, TBaseErrorResponseModel, TBaseViewModel],
+):
+    """
+    Abstract base class for asynchronous presenters.
+    The view model conversion stays synchronous, only the hand-off to the response is awaited.
+
+    @param response: The async presenter response object to use, None to bind one per invocation.
+    :type response: AsyncPresenterResponse | None
+    """
+
+    conditional: ClassVar[bool] = False
+    """Opt-in fingerprinting of response models: a result whose fingerprint matches the invocation's
+    if_none_match is presented with present_not_modified, without converting it to a view model."""
+
+    def __init__(self, response: AsyncPresenterResponse | None = None) -> None:
+        super().__init__()
+        self._response: AsyncPresenterResponse | None = response
+
+    @property
+    def response(self) -> AsyncPresenterResponse:
+        """
+        The presenter response bound to the running invocation by execute_with, else the one given to the constructor.
+        """
+        context = current_context()
+        if context is not None and context.presenter is self and context.response is not None:
+            response: AsyncPresenterResponse = context.response
+            return response
+        if self._response is None:
+            raise RuntimeError(f"{type(self).__qualname__} has no presenter response, bind one with execute_with")
+        return self._response
+
+    @response.setter
+    def response(self, response: AsyncPresenterResponse) -> None:
+        self._response = response
+
+    @abstractmethod
+    def convertResponseToViewModel(self, responseModel: TBaseResponseModel) -> TBaseViewModel:
+        """
+        Converts the given response model to a view model.
+
+        :param responseModel: The response model to convert.
+        :type responseModel: TBaseResponseModel
+        :return: The resulting view model.
+        :rtype: TBaseViewModel
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def convertErrorToViewModel(self, errorModel: TBaseErrorResponseModel) -> TBaseViewModel:
+        """
+        Converts the given error model to a view model.
+
+        :param errorModel: The error model to convert.
+        :type errorModel: TBaseErrorResponseModel
+        :return: The resulting view model.
+        :rtype: TBaseViewModel
+        """
+        raise NotImplementedError
+
+    def fingerprintResponse(self, responseModel: TBaseResponseModel) -> str:
+        """
+        Returns the fingerprint of the given response model, used when conditional is set.
+
+        :param responseModel: The response model to fingerprint.
+        :type responseModel: TBaseResponseModel
+        :return: The fingerprint.
+        :rtype: str
+        """
+        return fingerprint(responseModel)
+
+    async def presentSuccess(self, responseModel: TBaseResponseModel) -> None:
+        """
+        Presents the given response model as a success, or as not modified if conditional is set
+        and the client already has it.
+
+        :param responseModel: The response model to present.
+        :type responseModel: TBaseResponseModel
+        """
+        trace = current_trace()
+        if self.conditional:
+            response = self.response
+            tag = response.fingerprint = self.fingerprintResponse(responseModel)
+            context = current_context()
+            if context is not None and context.if_none_match == tag:
+                trace.mark(CONVERT)
+                await response.present_not_modified(tag)
+                trace.mark(PRESENT)
+                return
+        view_model: TBaseViewModel = self.convertResponseToViewModel(responseModel)
+        trace.mark(CONVERT)
+        await self.response.present(view_model)
+        trace.mark(PRESENT)
+
+    async def presentError(self, errorModel: TBaseErrorResponseModel) -> None:
+        """
+        Presents the given error model as an error.
+
+        :param errorModel: The error model to present.
+        :type errorModel: TBaseErrorResponseModel
+        """
+        trace = current_trace()
+        view_model: TBaseViewModel = self.convertErrorToViewModel(errorModel)
+        trace.mark(CONVERT)
+        await self.response.present(view_model)
+        trace.mark(PRESENT)
+
+    async def presentBatch(self, results: Sequence[TBaseResponseModel | TBaseErrorResponseModel]) -> None:
+        """
+        Presents the results of a batched execution as one BaseBatchViewModel.
+
+        :param results: The response and error models, in request order.
+        :type results: Sequence[TBaseResponseModel | TBaseErrorResponseModel]
+        """
+        trace = current_trace()
+        view_model = self.convertBatchToViewModel(results)
+        trace.mark(CONVERT)
+        await self.response.present(view_model)
+        trace.mark(PRESENT)
+
+    def convertBatchToViewModel(
+        self, results: Sequence[TBaseResponseModel | TBaseErrorResponseModel]
+    ) -> BaseBatchViewModel:
+        """
+        Converts the results of a batched execution to a single view model,
+        keeping the success/error split of every item.
+
+        :param results: The response and error models, in request order.
+        :type results: Sequence[TBaseResponseModel | TBaseErrorResponseModel]
+        :return: The resulting batch view model.
+        :rtype: BaseBatchViewModel
+        """
+        return convert_batch(results, self.convertResponseToViewModel, self.convertErrorToViewModel)
+
+    async def presentStream(self, results: AsyncIterable[TBaseResponseModel | TBaseErrorResponseModel]) -> None:
+        """
+        Presents a lazily produced stream of results as one streamed response,
+        converting every item only when the response asks for it.
+
+        :param results: The response and error models, produced lazily.
+        :type results: AsyncIterable[TBaseResponseModel | TBaseErrorResponseModel]
+        """
+        await self.response.present_stream(self.convertStreamToViewModels(results))
+
+    async def convertStreamToViewModels(
+        self, results: AsyncIterable[TBaseResponseModel | TBaseErrorResponseModel]
+    ) -> AsyncIterator[TBaseViewModel]:
+        """
+        Lazily converts a stream of results to view models, errors with convertErrorToViewModel.
+
+        :param results: The response and error models, produced lazily.
+        :type results: AsyncIterable[TBaseResponseModel | TBaseErrorResponseModel]
+        :return: The view models, one per result.
+        :rtype: AsyncIterator[TBaseViewModel]
+        """
+        trace = current_trace()
+        async for result in results:
+            if result.status == False:
+                view_model = self.convertErrorToViewModel(result)  # type: ignore
+            else:
+                view_model = self.convertResponseToViewModel(result)  # type: ignore
+            trace.mark(CONVERT)
+            yield view_model
+            trace.mark(PRESENT)
@@ -1,5 +1,5 @@
 from abc import abstractmethod
-from typing import Generic
+from typing import AsyncIterable, Generic, Iterable, Sequence
 from lib.bac import BaseAbstractClass
 from lib.usecase_models import (
     TBaseErrorResponseModel,
@@ -48,3 +48,90 @@ class BaseOutputPort(BaseAbstractClass, Generic[TBaseResponseModel, TBaseErrorRe
     @abstractmethod
     def presentError(self, errorModel: TBaseErrorResponseModel) -> None:
         raise NotImplementedError
+
+    def presentBatch(self, results: Sequence[TBaseResponseModel | TBaseErrorResponseModel]) -> None:
+        """
+        Present the results of a batched execution, one per request in order.
+        The default presents every item on its own, override it to present them together.
+        """
+        for result in results:
+            if result.status == False:
+                self.presentError(result)  # type: ignore
+            else:
+                self.presentSuccess(result)  # type: ignore
+
+    def presentStream(self, results: Iterable[TBaseResponseModel | TBaseErrorResponseModel]) -> None:
+        """
+        Present a lazily produced stream of results, each one as soon as it is available.
+        The default presents every item on its own, override it to present them as one streamed response.
+        """
+        for result in results:
+            if result.status == False:
+                self.presentError(result)  # type: ignore
+            else:
+                self.presentSuccess(result)  # type: ignore
+
+
+class AsyncBaseInputPort(BaseAbstractClass, Generic[TBaseRequestModel]):
+    """
+    Abstract base class for asynchronous input ports.
+    Mirrors BaseInputPort, but execute is a coroutine so that many requests can share one event loop.
+
+    @param requestModel: The request model to use.
+    @type requestModel: TBaseRequestModel
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+
+    @abstractmethod
+    async def execute(self, requestModel: TBaseRequestModel) -> None:
+        pass
+
+
+class AsyncBaseOutputPort(BaseAbstractClass, Generic[TBaseResponseModel, TBaseErrorResponseModel]):
+    """
+    Abstract base class for asynchronous output ports.
+
+    @type-arg TBaseResponseModel: The response model to use.
+    @type-arg TBaseErrorResponseModel: The error response model to use.
+    @method presentSuccess: Present the success response.
+    @param responseModel: The response model to use.
+    @type responseModel: TBaseResponseModel
+    @method presentError: Present the error response.
+    @param errorModel: The error model to use.
+    @type errorModel: TBaseErrorResponseModel
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+
+    @abstractmethod
+    async def presentSuccess(self, responseModel: TBaseResponseModel) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def presentError(self, errorModel: TBaseErrorResponseModel) -> None:
+        raise NotImplementedError
+
+    async def presentBatch(self, results: Sequence[TBaseResponseModel | TBaseErrorResponseModel]) -> None:
+        """
+        Present the results of a batched execution, one per request in order.
+        The default presents every item on its own, override it to present them together.
+        """
+        for result in results:
+            if result.status == False:
+                await self.presentError(result)  # type: ignore
+            else:
+                await self.presentSuccess(result)  # type: ignore
+
+    async def presentStream(self, results: AsyncIterable[TBaseResponseModel | TBaseErrorResponseModel]) -> None:
+        """
+        Present a lazily produced stream of results, each one as soon as it is available.
+        The default presents every item on its own, override it to present them as one streamed response.
+        """
+        async for result in results:
+            if result.status == False:
+                await self.presentError(result)  # type: ignore
+            else:
+                await self.presentSuccess(result)  # type: ignore
@@ -0,0 +1,281 @@
+"""
+This module defines Profiler, opt-in profiling of individual use case (or any input port) executions.
+
+A Profiler instruments the execute method of the classes it is given. A sampled execution runs under
+cProfile and tracemalloc. Its function timings and the allocation sites of the memory it left allocated
+are added up per class, so a regression in one use case shows up without profiling the whole process.
+report() dumps the top functions and allocation sites on demand. Executions that are not sampled, and
+classes that are not instrumented, run unchanged.
+
+One execution is profiled at a time: both profilers are process-wide, so an execution that is sampled
+while another one is profiled runs unprofiled. The profile of an asynchronous execution includes whatever
+other tasks ran on the event loop while it was suspended.
+
+@author:
+@version: 1.0
+"""
+
+import cProfile
+import functools
+import inspect
+import io
+import pstats
+import random
+import threading
+import tracemalloc
+from typing import Any, Callable, Iterable
+
+_IGNORED = (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__))
+
+
+class AllocationSite:
+    """
+    The memory allocated at one line by the profiled executions of a class and still allocated when they returned.
+
+    :filename (str): The file of the allocating line.
+    :lineno (int): The allocating line.
+    :size (int): Bytes allocated, summed over the executions.
+    :count (int): Memory blocks allocated, summed over the executions.
+    """
+
+    __slots__ = ("filename", "lineno", "size", "count")
+
+    def __init__(self, filename: str, lineno: int) -> None:
+        self.filename: str = filename
+        self.lineno: int = lineno
+        self.size: int = 0
+        self.count: int = 0
+
+    def __repr__(self) -> str:
+        return f"AllocationSite({self.filename}:{self.lineno}, size={self.size}, count={self.count})"
+
+
+class ClassProfile:
+    """
+    The aggregated profile of the sampled executions of one class.
+
+    :cls (type): The profiled class.
+    :name (str): The module and qualified name of the class.
+    :executions (int): The number of profiled executions.
+    :stats (pstats.Stats | None): Their cProfile statistics, None before the first one.
+    :sites (dict[tuple[str, int], AllocationSite]): Their allocation sites, by file and line.
+    :peak (int): The highest traced memory, in bytes, reached during one of them.
+    """
+
+    __slots__ = ("cls", "name", "executions", "stats", "sites", "peak")
+
+    def __init__(self, cls: type) -> None:
+        self.cls: type = cls
+        self.name: str = f"{cls.__module__}.{cls.__qualname__}"
+        self.executions: int = 0
+        self.stats: pstats.Stats | None = None
+        self.sites: dict[tuple[str, int], AllocationSite] = {}
+        self.peak: int = 0
+
+    def top_functions(self, limit: int = 20, sort: str = "cumulative") -> str:
+        """
+        Returns the pstats listing of the limit first functions in sort order.
+        """
+        if self.stats is None:
+            return ""
+        stream = io.StringIO()
+        self.stats.stream = stream  # type: ignore[attr-defined]
+        self.stats.sort_stats(sort).print_stats(limit)
+        return stream.getvalue()
+
+    def top_allocations(self, limit: int = 20) -> list[AllocationSite]:
+        """
+        Returns the limit allocation sites that allocated the most bytes.
+        """
+        return sorted(self.sites.values(), key=lambda site: site.size, reverse=True)[:limit]
+
+
+class Profiler:
+    """
+    Profiles a sample of the executions of the classes it instruments.
+
+    @param rate: The fraction of executions profiled, 1 to profile all of them.
+    @param allocations: Whether to track allocations with tracemalloc in addition to cProfile.
+    @param frames: The number of frames tracemalloc stores per allocation, when it is started by the profiler.
+    """
+
+    def __init__(self, rate: float = 1.0, allocations: bool = True, frames: int = 1) -> None:
+        if not 0.0 <= rate <= 1.0:
+            raise ValueError("rate must be between 0 and 1")
+        self.rate: float = rate
+        self.allocations: bool = allocations
+        self.frames: int = frames
+        self._profiles: dict[type, ClassProfile] = {}
+        self._patched: dict[type, Any] = {}
+        self._busy: threading.Lock = threading.Lock()
+        self._lock: threading.Lock = threading.Lock()
+
+    def instrument(self, *classes: type) -> None:
+        """
+        Wraps the execute method of classes and of their concrete subclasses with the profiler, e.g.
+        instrument(BaseUseCase) profiles every use case. Subclasses defined afterwards are not instrumented.
+        """
+        for cls in _with_subclasses(classes):
+            if cls not in self._patched and not inspect.isabstract(cls) and hasattr(cls, "execute"):
+                self._patched[cls] = cls.__dict__.get("execute")
+                setattr(cls, "execute", self._wrap(getattr(cls, "execute")))
+
+    def restore(self, *classes: type) -> None:
+        """
+        Restores the execute methods instrumented for classes and their subclasses, by default all of them.
+        """
+        for cls in _with_subclasses(classes) if classes else list(self._patched):
+            if cls in self._patched:
+                execute = self._patched.pop(cls)
+                if execute is None:
+                    delattr(cls, "execute")
+                else:
+                    setattr(cls, "execute", execute)
+
+    def _wrap(self, execute: Callable[..., Any]) -> Callable[..., Any]:
+        if inspect.iscoroutinefunction(execute):
+
+            @functools.wraps(execute)
+            async def profiled_async(port: Any, requestModel: Any) -> None:
+                if not self._sample():
+                    return await execute(port, requestModel)  # type: ignore[no-any-return]
+                allocations = self._start()
+                profile = cProfile.Profile()
+                try:
+                    profile.enable()
+                    try:
+                        await execute(port, requestModel)
+                    finally:
+                        profile.disable()
+                finally:
+                    self._finish(type(port), profile, allocations)
+
+            return profiled_async
+
+        @functools.wraps(execute)
+        def profiled(port: Any, requestModel: Any) -> None:
+            if not self._sample():
+                return execute(port, requestModel)  # type: ignore[no-any-return]
+            allocations = self._start()
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+                try:
+                    execute(port, requestModel)
+                finally:
+                    profile.disable()
+            finally:
+                self._finish(type(port), profile, allocations)
+
+        return profiled
+
+    def _sample(self) -> bool:
+        if self.rate < 1.0 and random.random() >= self.rate:
+            return False
+        return self._busy.acquire(blocking=False)
+
+    def _start(self) -> tracemalloc.Snapshot | bool | None:
+        """
+        Starts tracking allocations. Returns whether the profiler started tracemalloc, or the snapshot to
+        compare with when it was already tracing, or None when allocations are not tracked.
+        """
+        if not self.allocations:
+            return None
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            return tracemalloc.take_snapshot()
+        tracemalloc.start(self.frames)
+        return True
+
+    def _finish(self, cls: type, profile: cProfile.Profile, allocations: tracemalloc.Snapshot | bool | None) -> None:
+        try:
+            statistics: list[Any] = []
+            peak = 0
+            if allocations is not None:
+                snapshot = tracemalloc.take_snapshot().filter_traces(_IGNORED)
+                peak = tracemalloc.get_traced_memory()[1]
+                if allocations is True:
+                    tracemalloc.stop()
+                    statistics = snapshot.statistics("lineno")
+                elif isinstance(allocations, tracemalloc.Snapshot):
+                    statistics = snapshot.compare_to(allocations.filter_traces(_IGNORED), "lineno")
+            self._record(cls, profile, statistics, peak)
+        finally:
+            self._busy.release()
+
+    def _record(self, cls: type, profile: cProfile.Profile, statistics: list[Any], peak: int) -> None:
+        with self._lock:
+            aggregate = self._profiles.get(cls)
+            if aggregate is None:
+                aggregate = self._profiles[cls] = ClassProfile(cls)
+            aggregate.executions += 1
+            if aggregate.stats is None:
+                aggregate.stats = pstats.Stats(profile)
+            else:
+                aggregate.stats.add(profile)
+            aggregate.peak = max(aggregate.peak, peak)
+            for statistic in statistics:
+                size = getattr(statistic, "size_diff", statistic.size)
+                count = getattr(statistic, "count_diff", statistic.count)
+                if size <= 0:
+                    continue
+                frame = statistic.traceback[0]
+                site = aggregate.sites.get((frame.filename, frame.lineno))
+                if site is None:
+                    site = aggregate.sites[(frame.filename, frame.lineno)] = AllocationSite(
+                        frame.filename, frame.lineno
+                    )
+                site.size += size
+                site.count += count
+
+    def profile(self, cls: type | str) -> ClassProfile | None:
+        """
+        Returns the aggregated profile of a class, if it was profiled. Given by name, the class is looked up
+        by module and qualified name, or by qualified name alone, the first match if several classes share it.
+        """
+        with self._lock:
+            if not isinstance(cls, str):
+                return self._profiles.get(cls)
+            for aggregate in self._profiles.values():
+                if cls in (aggregate.name, aggregate.cls.__qualname__):
+                    return aggregate
+            return None
+
+    def profiles(self) -> list[ClassProfile]:
+        with self._lock:
+            return list(self._profiles.values())
+
+    def report(self, limit: int = 20, sort: str = "cumulative") -> str:
+        """
+        Returns the top functions and allocation sites of every profiled class, as text.
+
+        :param limit: The number of functions and of allocation sites listed per class.
+        :param sort: The pstats sort key of the functions, e.g. "cumulative", "tottime" or "ncalls".
+        """
+        parts = []
+        for aggregate in self.profiles():
+            parts.append(f"== {aggregate.name}: {aggregate.executions} profiled executions ==")
+            parts.append(aggregate.top_functions(limit, sort))
+            if aggregate.sites:
+                parts.append(f"top allocation sites (peak {aggregate.peak} bytes):")
+                for site in aggregate.top_allocations(limit):
+                    parts.append(f"  {site.filename}:{site.lineno}: {site.size} bytes in {site.count} blocks")
+        return "\n".join(parts)
+
+    def reset(self) -> None:
+        """
+        Discards the profiles recorded so far.
+        """
+        with self._lock:
+            self._profiles.clear()
+
+
+def _with_subclasses(classes: Iterable[type]) -> list[type]:
+    found: list[type] = []
+    pending = list(classes)
+    while pending:
+        cls = pending.pop()
+        if cls not in found:
+            found.append(cls)
+            pending.extend(cls.__subclasses__())
+    return found
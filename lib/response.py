@@ -6,9 +6,9 @@ This module defines the PresenterResponse class.
 """
 
 from abc import ABC, abstractmethod
-from typing import TypeVar
+from typing import AsyncIterator, Iterator, TypeVar
 
-from lib.view_model import TBaseViewModel
+from lib.view_model import BaseViewModel, NotModifiedViewModel, TBaseViewModel
 
 TPresenterResponse = TypeVar("TPresenterResponse", bound="PresenterResponse")
 
@@ -19,6 +19,9 @@ class PresenterResponse(ABC):
     This needs to be implemented by a web framework, for example.
     """
 
+    fingerprint: str | None = None
+    """The fingerprint of the presented result, set by conditional presenters, e.g. to send as an ETag."""
+
     def __init__(self) -> None:
         super().__init__()
 
@@ -33,3 +36,74 @@ class PresenterResponse(ABC):
         :type view_model: TResponse
         """
         raise NotImplementedError
+
+    def present_stream(self, view_models: Iterator[BaseViewModel]) -> None:
+        """
+        Presents a stream of view models, pulling the next one only once the previous one is presented,
+        so that at most one chunk is held in memory. A web framework would send each chunk as soon as it
+        is pulled, with a chunked or streaming response.
+        The default presents every view model on its own.
+
+        :param view_models: The view models to present, produced lazily.
+        :type view_models: Iterator[BaseViewModel]
+        """
+        for view_model in view_models:
+            self.present(view_model)
+
+    def present_not_modified(self, fingerprint: str) -> None:
+        """
+        Presents that the client's copy of the result, with the given fingerprint, is still current.
+        A web framework would answer 304 Not Modified with an empty body.
+        The default presents a NotModifiedViewModel.
+
+        :param fingerprint: The fingerprint of the result.
+        :type fingerprint: str
+        """
+        self.present(NotModifiedViewModel.trusted(status=True, fingerprint=fingerprint))
+
+
+TAsyncPresenterResponse = TypeVar("TAsyncPresenterResponse", bound="AsyncPresenterResponse")
+
+
+class AsyncPresenterResponse(ABC):
+    """
+    Abstract base class for asynchronous presenter response objects.
+    This needs to be implemented by an async web framework (ASGI), for example.
+    """
+
+    fingerprint: str | None = None
+    """The fingerprint of the presented result, set by conditional presenters, e.g. to send as an ETag."""
+
+    def __init__(self) -> None:
+        super().__init__()
+
+    @abstractmethod
+    async def present(self, view_model: TBaseViewModel) -> None:
+        """
+        Presents the given view model to the user without blocking the event loop.
+
+        :param view_model: The view model to present.
+        :type view_model: TBaseViewModel
+        """
+        raise NotImplementedError
+
+    async def present_stream(self, view_models: AsyncIterator[BaseViewModel]) -> None:
+        """
+        Presents a stream of view models without blocking the event loop, pulling the next one only once
+        the previous one is presented. The default presents every view model on its own.
+
+        :param view_models: The view models to present, produced lazily.
+        :type view_models: AsyncIterator[BaseViewModel]
+        """
+        async for view_model in view_models:
+            await self.present(view_model)
+
+    async def present_not_modified(self, fingerprint: str) -> None:
+        """
+        Presents that the client's copy of the result, with the given fingerprint, is still current.
+        The default presents a NotModifiedViewModel.
+
+        :param fingerprint: The fingerprint of the result.
+        :type fingerprint: str
+        """
+        await self.present(NotModifiedViewModel.trusted(status=True, fingerprint=fingerprint))
@@ -0,0 +1,413 @@
+"""
+This module defines the secondary ports: BaseGateway and AsyncBaseGateway, the data-side counterpart
+of the input and output ports, which single-DTO use cases call from make_dto_request and make_dto_requests.
+
+Gateways fetch DTOs by key, one (get) or many per round trip (get_many), and report a missing key as a
+failed DTO rather than raising, so use cases handle it through handle_dto_error like any other DTO error.
+ConnectionPool bounds and reuses the connections a gateway opens, with health checks and idle eviction;
+SQLiteGateway is the reference implementation built on both.
+
+@author:
+@version: 1.0
+"""
+
+import asyncio
+from abc import abstractmethod
+from collections import deque
+from contextlib import contextmanager
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Generic, Hashable, Iterator, Sequence, TypeVar
+
+from lib.bac import BaseAbstractClass
+from lib.deadline import DeadlineExceeded, current_deadline
+from lib.dto import TBaseDTO
+from lib.instrumentation import DTO
+
+TKey = TypeVar("TKey", bound=Hashable)
+C = TypeVar("C")
+
+
+def not_found(dto_type: type[TBaseDTO], key: Hashable) -> TBaseDTO:
+    """
+    Returns the failed DTO gateways report for a missing key. Only its error fields are set.
+    """
+    return dto_type.model_construct(  # type: ignore[return-value]
+        status=False, errorCode=404, errorName="NotFound", errorMessage=f"{dto_type.__name__} {key!r} was not found"
+    )
+
+
+class BaseGateway(BaseAbstractClass, Generic[TKey, TBaseDTO]):
+    """
+    Abstract base class for gateways, the secondary ports use cases fetch their DTOs from.
+
+    @type-arg TKey: The type of the keys DTOs are fetched by.
+    @type-arg TBaseDTO: The DTO to return.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+
+    @abstractmethod
+    def get(self, key: TKey) -> TBaseDTO:
+        """
+        Returns the DTO of key, or a failed DTO if there is none.
+        """
+        raise NotImplementedError
+
+    def get_many(self, keys: Sequence[TKey]) -> list[TBaseDTO]:
+        """
+        Returns the DTOs of keys, one per key and in the same order.
+        The default calls get per key, override it to fetch them in one round trip.
+        """
+        return [self.get(key) for key in keys]
+
+    def close(self) -> None:
+        pass
+
+
+class AsyncBaseGateway(BaseAbstractClass, Generic[TKey, TBaseDTO]):
+    """
+    Abstract base class for asynchronous gateways.
+    Mirrors BaseGateway, but fetches are coroutines.
+
+    @type-arg TKey: The type of the keys DTOs are fetched by.
+    @type-arg TBaseDTO: The DTO to return.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+
+    @abstractmethod
+    async def get(self, key: TKey) -> TBaseDTO:
+        """
+        Returns the DTO of key, or a failed DTO if there is none.
+        """
+        raise NotImplementedError
+
+    async def get_many(self, keys: Sequence[TKey]) -> list[TBaseDTO]:
+        """
+        Returns the DTOs of keys, one per key and in the same order.
+        The default awaits get for all keys concurrently, override it to fetch them in one round trip.
+        """
+        return list(await asyncio.gather(*(self.get(key) for key in keys)))
+
+    async def close(self) -> None:
+        pass
+
+
+class PoolTimeout(TimeoutError):
+    """
+    Raised when no connection of a ConnectionPool became free in time.
+    """
+
+
+class PoolStats:
+    """
+    Counters of a connection pool.
+
+    :created (int): Connections opened.
+    :closed (int): Connections closed, for any reason.
+    :acquired (int): Connections handed out.
+    :waited (int): Acquisitions that had to wait for a release.
+    :unhealthy (int): Connections discarded because their health check failed.
+    :idle_evicted (int): Connections closed because they stayed idle longer than max_idle.
+    """
+
+    __slots__ = ("created", "closed", "acquired", "waited", "unhealthy", "idle_evicted")
+
+    def __init__(self) -> None:
+        self.created: int = 0
+        self.closed: int = 0
+        self.acquired: int = 0
+        self.waited: int = 0
+        self.unhealthy: int = 0
+        self.idle_evicted: int = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"PoolStats(created={self.created}, closed={self.closed}, acquired={self.acquired}, "
+            f"waited={self.waited}, unhealthy={self.unhealthy}, idle_evicted={self.idle_evicted})"
+        )
+
+
+class ConnectionPool(Generic[C]):
+    """
+    A thread-safe pool of at most max_size connections. Connections are opened on demand,
+    handed out most recently used first, health checked when they were idle for check_interval seconds
+    or more, and closed once idle for longer than max_idle.
+
+    Acquisition waits for a release up to timeout, or up to the current deadline if it is sooner,
+    in which case it raises DeadlineExceeded instead of PoolTimeout. The stats are updated under the pool's lock.
+
+    @param connect: Opens a connection.
+    @param close: Closes a connection.
+    @param max_size: The maximum number of open connections.
+    @param health_check: Returns whether a connection is still usable, None to skip health checks.
+    @param check_interval: How long a connection may stay idle before it is health checked again.
+    @param max_idle: How long a connection may stay idle before it is closed, None to keep it.
+    @param timeout: How long acquire waits for a connection before raising PoolTimeout, None to wait forever.
+    @param clock: The monotonic clock to use, injectable for tests.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], C],
+        close: Callable[[C], None],
+        max_size: int = 10,
+        health_check: Callable[[C], bool] | None = None,
+        check_interval: float = 30.0,
+        max_idle: float | None = 300.0,
+        timeout: float | None = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+        self.max_size: int = max_size
+        self.health_check: Callable[[C], bool] | None = health_check
+        self.check_interval: float = check_interval
+        self.max_idle: float | None = max_idle
+        self.timeout: float | None = timeout
+        self.stats: PoolStats = PoolStats()
+        self._connect: Callable[[], C] = connect
+        self._close: Callable[[C], None] = close
+        self._clock: Callable[[], float] = clock
+        # idle connections with the time they were released, oldest on the left
+        self._idle: deque[tuple[C, float]] = deque()
+        self._size: int = 0
+        self._closed: bool = False
+        self._condition = threading.Condition()
+
+    @property
+    def size(self) -> int:
+        """
+        The number of open connections, idle or in use.
+        """
+        return self._size
+
+    @property
+    def idle(self) -> int:
+        return len(self._idle)
+
+    def acquire(self, timeout: float | None = None) -> C:
+        """
+        Returns a connection, opening one if none is idle and the pool is not full.
+
+        :param timeout: Overrides the pool's timeout.
+        :raises PoolTimeout: If no connection became free in time.
+        :raises DeadlineExceeded: If the current deadline passed before the timeout while waiting.
+        """
+        limit = self.timeout if timeout is None else timeout
+        timeout = current_deadline().timeout(limit)
+        by_deadline = timeout is not None and (limit is None or timeout < limit)
+        expires_at = None if timeout is None else self._clock() + timeout
+        while True:
+            with self._condition:
+                if self._closed:
+                    raise RuntimeError("the pool is closed")
+                stale = self._pop_stale()
+                connection: C | None = None
+                idle_since = 0.0
+                opening = False
+                if self._idle:
+                    connection, idle_since = self._idle.pop()
+                elif self._size < self.max_size:
+                    self._size += 1
+                    opening = True
+                else:
+                    remaining = None if expires_at is None else expires_at - self._clock()
+                    if remaining is not None and remaining <= 0:
+                        if by_deadline:
+                            raise DeadlineExceeded(DTO)
+                        raise PoolTimeout(f"no connection became free within {timeout}s")
+                    self.stats.waited += 1
+                    self._condition.wait(remaining)
+            self._close_all(stale)
+            if opening:
+                return self._open()
+            if connection is not None:
+                if self._healthy(connection, idle_since):
+                    with self._condition:
+                        self.stats.acquired += 1
+                    return connection
+                self._discard(connection, unhealthy=True)
+
+    def release(self, connection: C, discard: bool = False) -> None:
+        """
+        Hands connection back to the pool, or closes it if discard is set or the pool is closed.
+        """
+        with self._condition:
+            if not discard and not self._closed:
+                self._idle.append((connection, self._clock()))
+                self._condition.notify()
+                return
+        self._discard(connection)
+
+    @contextmanager
+    def connection(self, timeout: float | None = None) -> Iterator[C]:
+        """
+        Lends a connection for the duration of the block, discarding it if the block raises.
+        """
+        connection = self.acquire(timeout)
+        try:
+            yield connection
+        except BaseException:
+            self.release(connection, discard=True)
+            raise
+        self.release(connection)
+
+    def evict_idle(self) -> int:
+        """
+        Closes the connections idle for longer than max_idle and returns how many were closed.
+        Acquisitions also evict them, call it periodically for pools that can stay unused.
+        """
+        with self._condition:
+            stale = self._pop_stale()
+        self._close_all(stale)
+        return len(stale)
+
+    def close(self) -> None:
+        """
+        Closes the idle connections, and the ones in use as they are released.
+        """
+        with self._condition:
+            self._closed = True
+            stale = [connection for connection, _ in self._idle]
+            self._idle.clear()
+            self._size -= len(stale)
+            self.stats.closed += len(stale)
+            self._condition.notify_all()
+        for connection in stale:
+            self._close_quietly(connection)
+
+    def _open(self) -> C:
+        try:
+            connection = self._connect()
+        except BaseException:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self.stats.created += 1
+            self.stats.acquired += 1
+        return connection
+
+    def _healthy(self, connection: C, idle_since: float) -> bool:
+        if self.health_check is None or self._clock() - idle_since < self.check_interval:
+            return True
+        try:
+            return self.health_check(connection)
+        except Exception:
+            return False
+
+    def _pop_stale(self) -> list[C]:
+        # called with the condition held; the oldest idle connections are on the left
+        if self.max_idle is None:
+            return []
+        cutoff = self._clock() - self.max_idle
+        stale: list[C] = []
+        while self._idle and self._idle[0][1] < cutoff:
+            stale.append(self._idle.popleft()[0])
+        self._size -= len(stale)
+        self.stats.idle_evicted += len(stale)
+        self.stats.closed += len(stale)
+        return stale
+
+    def _close_all(self, connections: list[C]) -> None:
+        for connection in connections:
+            self._close_quietly(connection)
+
+    def _discard(self, connection: C, unhealthy: bool = False) -> None:
+        with self._condition:
+            self._size -= 1
+            self.stats.closed += 1
+            self.stats.unhealthy += unhealthy
+            self._condition.notify()
+        self._close_quietly(connection)
+
+    def _close_quietly(self, connection: C) -> None:
+        # the caller counted the connection as closed, under the lock
+        try:
+            self._close(connection)
+        except Exception:
+            pass
+
+
+class SQLiteGateway(BaseGateway[TKey, TBaseDTO]):
+    """
+    Fetches DTOs from the rows of a SQLite table, one row per DTO, with the columns as DTO fields.
+    Connections come from a ConnectionPool; get_many fetches up to batch_size keys per query.
+
+    @param dto_type: The DTO to build from the rows; they are validated, since they are external data.
+    @param path: The database file, or a "file:" URI such as "file:name?mode=memory&cache=shared".
+    @param table: The table name.
+    @param key_column: The column DTOs are fetched by.
+    @param pool: The connection pool to use, by default one of pool_size connections to path.
+    @param pool_size: The size of the default pool.
+    @param batch_size: The maximum number of keys per get_many query.
+    """
+
+    def __init__(
+        self,
+        dto_type: type[TBaseDTO],
+        path: str,
+        table: str,
+        key_column: str = "id",
+        pool: ConnectionPool[sqlite3.Connection] | None = None,
+        pool_size: int = 5,
+        batch_size: int = 500,
+    ) -> None:
+        super().__init__()
+        for name in (table, key_column):
+            if not name.isidentifier():
+                raise ValueError(f"invalid identifier {name!r}")
+        self.dto_type: type[TBaseDTO] = dto_type
+        self.path: str = path
+        self.table: str = table
+        self.key_column: str = key_column
+        self.batch_size: int = batch_size
+        self.pool: ConnectionPool[sqlite3.Connection] = pool or ConnectionPool(
+            self.connect, sqlite3.Connection.close, max_size=pool_size, health_check=self.ping
+        )
+        self._select: str = f"SELECT * FROM {table} WHERE {key_column} = ?"
+
+    def connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, uri=True, check_same_thread=False, isolation_level=None)
+        connection.row_factory = sqlite3.Row
+        return connection
+
+    @staticmethod
+    def ping(connection: sqlite3.Connection) -> bool:
+        connection.execute("SELECT 1").fetchone()
+        return True
+
+    def to_dto(self, row: sqlite3.Row) -> TBaseDTO:
+        """
+        Builds the DTO of a row. Override it to map columns that differ from the DTO fields.
+        """
+        values: dict[str, Any] = dict(zip(row.keys(), row))
+        return self.dto_type(status=True, errorCode=0, errorName="", errorMessage="", **values)
+
+    def get(self, key: TKey) -> TBaseDTO:
+        with self.pool.connection() as connection:
+            row = connection.execute(self._select, (key,)).fetchone()
+        return not_found(self.dto_type, key) if row is None else self.to_dto(row)
+
+    def get_many(self, keys: Sequence[TKey]) -> list[TBaseDTO]:
+        found: dict[Any, TBaseDTO] = {}
+        unique = list(dict.fromkeys(keys))
+        with self.pool.connection() as connection:
+            for start in range(0, len(unique), self.batch_size):
+                batch = unique[start : start + self.batch_size]
+                placeholders = ", ".join("?" * len(batch))
+                rows = connection.execute(
+                    f"SELECT * FROM {self.table} WHERE {self.key_column} IN ({placeholders})", batch
+                ).fetchall()
+                for row in rows:
+                    found[row[self.key_column]] = self.to_dto(row)
+        return [found.get(key) or not_found(self.dto_type, key) for key in keys]
+
+    def close(self) -> None:
+        self.pool.close()
@@ -0,0 +1,124 @@
+"""
+This module defines SingleFlight and AsyncSingleFlight, which coalesce concurrent calls
+that share a key into one in-flight call whose outcome every caller receives.
+
+@author:
+@version: 1.0
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Generic, Hashable, TypeVar
+
+from lib.deadline import DeadlineExceeded, current_deadline
+from lib.instrumentation import DTO
+
+T = TypeVar("T")
+
+
+class _Call(Generic[T]):
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done: threading.Event = threading.Event()
+        self.result: T | None = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls made from several threads with an equal key:
+    the first caller runs the function, the others block until it finishes
+    and receive the same result, or the same exception. A waiting caller gives up
+    with DeadlineExceeded once its current deadline passes, the first caller's run goes on.
+
+    :shared (int): How many calls were served by another caller's in-flight call.
+    """
+
+    def __init__(self) -> None:
+        self.shared: int = 0
+        self._calls: dict[Hashable, _Call[Any]] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """
+        Runs fn, unless a call with an equal key is already in flight, in which case its outcome is returned.
+
+        :param key: The key identifying equal calls.
+        :param fn: The function to run.
+        :return: The result of the (possibly shared) call.
+        :raises DeadlineExceeded: If the current deadline passed while waiting for another caller's call.
+        """
+        with self._lock:
+            call: _Call[T] | None = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self._calls[key] = _Call()
+            else:
+                self.shared += 1
+        if not leader:
+            if call.done.wait(current_deadline().timeout()) == False:
+                raise DeadlineExceeded(DTO)
+            if call.error is not None:
+                raise call.error
+            return call.result  # type: ignore[return-value]
+        try:
+            result = call.result = fn()
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return result
+
+
+class _Flight(Generic[T]):
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: "asyncio.Future[T]") -> None:
+        self.task: asyncio.Future[T] = task
+        self.waiters: int = 0
+
+
+class AsyncSingleFlight:
+    """
+    Coalesces concurrent calls made from asyncio tasks with an equal key:
+    the first caller starts the coroutine as a task, every caller awaits that task
+    and receives the same result, or the same exception.
+    Cancelling one caller does not cancel the shared task while others still wait for it;
+    the shared task is cancelled with its last waiter, so abandoned work does not keep running.
+
+    :shared (int): How many calls were served by another caller's in-flight call.
+    """
+
+    def __init__(self) -> None:
+        self.shared: int = 0
+        self._flights: dict[tuple[asyncio.AbstractEventLoop, Hashable], _Flight[Any]] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Awaits fn(), unless a call with an equal key is already in flight on this event loop,
+        in which case its outcome is returned.
+
+        :param key: The key identifying equal calls.
+        :param fn: The coroutine function to run.
+        :return: The result of the (possibly shared) call.
+        """
+        loop_key = (asyncio.get_running_loop(), key)
+        flight: _Flight[T] | None = self._flights.get(loop_key)
+        if flight is None:
+            flight = self._flights[loop_key] = _Flight(asyncio.ensure_future(fn()))
+            flight.task.add_done_callback(lambda _: self._flights.pop(loop_key, None))
+        else:
+            self.shared += 1
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and not flight.task.done():
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
@@ -0,0 +1,70 @@
+"""
+This module controls when the pydantic schemas of the library's models are built.
+
+By default pydantic builds the validator and serializer of every model when its class is defined, so an
+entry point pays for all the models it imports. With the CAPS_LAZY_SCHEMAS environment variable set to 1
+before lib is imported, the base models defer it (pydantic's defer_build) and each model builds its schema
+on first use instead: cold starts only pay for the models an invocation touches. Long-running servers call
+warmup() at startup so that no request pays for a schema build.
+
+This module must not import the rest of lib, which reads LAZY_SCHEMAS while defining its models.
+
+@author:
+@version: 1.0
+"""
+
+import os
+from typing import Any, Iterable, get_args
+
+from pydantic import BaseModel
+
+LAZY_SCHEMAS: bool = os.environ.get("CAPS_LAZY_SCHEMAS", "").lower() in ("1", "true", "yes")
+"""Whether the models defer building their schemas, read from CAPS_LAZY_SCHEMAS once at import."""
+
+
+def _generic_args(cls: type) -> Iterable[Any]:
+    for klass in cls.__mro__:
+        for base in getattr(klass, "__orig_bases__", ()):
+            yield from get_args(base)
+
+
+def _models_of(target: Any, seen: set[type[BaseModel]]) -> None:
+    args = get_args(target)
+    if args:
+        # a type expression such as list[Model] or Model | None
+        for arg in args:
+            _models_of(arg, seen)
+    elif not isinstance(target, type):
+        # a TypeVar, a Literal value or another annotation that holds no model
+        return
+    elif issubclass(target, BaseModel):
+        if target not in seen:
+            seen.add(target)
+            for field in target.model_fields.values():
+                _models_of(field.annotation, seen)
+    else:
+        for arg in _generic_args(target):
+            _models_of(arg, seen)
+
+
+def warmup(*targets: Any) -> int:
+    """
+    Builds the schemas of the models used by targets now rather than on first use.
+
+    A target is a model class, or a use case, presenter or any other class (or instance) whose generic
+    type arguments are models, e.g. a BaseSingleDTOUseCase subclass warms up its request, response,
+    error response and DTO models. Models reachable through the fields of those models are built too.
+
+    :param targets: The models, classes or instances to warm up.
+    :return: The number of schemas built, 0 when they were all built already.
+    """
+    seen: set[type[BaseModel]] = set()
+    for target in targets:
+        if not isinstance(target, type) and not get_args(target):
+            target = type(target)
+        _models_of(target, seen)
+    built = 0
+    for model in seen:
+        if not model.__pydantic_complete__ and model.model_rebuild():
+            built += 1
+    return built
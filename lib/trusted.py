@@ -0,0 +1,105 @@
+"""
+This module defines TrustedModel, the base of the models produced inside the pipeline
+(DTOs, response models and view models), which can be built without re-validation.
+
+Request models are external input and are always fully validated, so BaseRequestModel
+does not derive from TrustedModel.
+
+@author:
+@version: 1.0
+"""
+
+import copy
+import os
+import random
+from typing import Any, Callable, TypeVar
+from pydantic import BaseModel, ConfigDict
+from pydantic_core import PydanticUndefined
+from lib.startup import LAZY_SCHEMAS
+
+TTrustedModel = TypeVar("TTrustedModel", bound="TrustedModel")
+
+_validation_rate: float = float(os.environ.get("CAPS_TRUSTED_VALIDATION_RATE", "0"))
+
+
+def set_trusted_validation_rate(rate: float) -> None:
+    """
+    Sets the fraction of trusted constructions that still run full validation,
+    e.g. 1.0 in tests, 0.01 in staging and 0.0 (the default) in production.
+    The initial value is read from the CAPS_TRUSTED_VALIDATION_RATE environment variable.
+
+    :param rate: A fraction between 0 and 1.
+    """
+    global _validation_rate
+    if not 0.0 <= rate <= 1.0:
+        raise ValueError("rate must be between 0 and 1")
+    _validation_rate = rate
+
+
+def trusted_validation_rate() -> float:
+    return _validation_rate
+
+
+class _ConstructionPlan:
+    """
+    What trusted construction needs to know about a model class, computed once per class.
+    """
+
+    __slots__ = ("defaults", "factories", "fallback")
+
+    def __init__(self, cls: type[BaseModel]) -> None:
+        self.defaults: dict[str, Any] = {}
+        self.factories: dict[str, Callable[[], Any]] = {}
+        for name, field in cls.model_fields.items():
+            if field.default_factory is not None:
+                self.factories[name] = field.default_factory  # type: ignore[assignment]
+            elif field.default is not PydanticUndefined:
+                try:
+                    hash(field.default)
+                    self.defaults[name] = field.default
+                except TypeError:
+                    self.factories[name] = lambda default=field.default: copy.deepcopy(default)  # type: ignore[misc]
+        # private attributes and extra fields need pydantic's own bookkeeping
+        self.fallback: bool = bool(cls.__private_attributes__) or cls.model_config.get("extra") == "allow"
+
+
+_plans: dict[type[BaseModel], _ConstructionPlan] = {}
+
+
+class TrustedModel(BaseModel):
+    """
+    A pydantic model that layers of the pipeline can build from data they produced themselves.
+    """
+
+    model_config = ConfigDict(defer_build=LAZY_SCHEMAS)
+
+    @classmethod
+    def trusted(cls: type[TTrustedModel], **data: Any) -> TTrustedModel:
+        """
+        Builds the model without validation, like model_construct but without its per-field
+        Python loop: values must already have their declared types (nested models as instances,
+        not dicts) and defaults are filled in. Validators do not run.
+        A sample of calls, set with set_trusted_validation_rate, is fully validated instead,
+        so contract bugs still surface as ValidationError.
+
+        :param data: The field values.
+        :return: The model.
+        """
+        if _validation_rate and (_validation_rate >= 1.0 or random.random() < _validation_rate):
+            return cls(**data)
+        plan = _plans.get(cls)
+        if plan is None:
+            plan = _plans[cls] = _ConstructionPlan(cls)
+        if plan.fallback:
+            return cls.model_construct(**data)  # type: ignore[return-value]
+        values = plan.defaults.copy()
+        for name, factory in plan.factories.items():
+            if name not in data:
+                values[name] = factory()
+        values.update(data)
+        model = cls.__new__(cls)
+        object.__setattr__(model, "__dict__", values)
+        object.__setattr__(model, "__pydantic_fields_set__", set(data))
+        object.__setattr__(model, "__pydantic_extra__", None)
+        object.__setattr__(model, "__pydantic_private__", None)
+        return model
@@ -1,23 +1,167 @@
+import asyncio
 from abc import abstractmethod
-from typing import Generic
-from lib.dto import TBaseDTO
-from lib.primary_ports import BaseInputPort, BaseOutputPort
+import inspect
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ThreadPoolExecutor, wait
+import contextvars
+import threading
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    ClassVar,
+    Generic,
+    Hashable,
+    Iterable,
+    Iterator,
+    Mapping,
+    Sequence,
+    TYPE_CHECKING,
+)
+from lib.context import ExecutionContext, bind_context, current_context, reset_context
+from lib.deadline import (
+    Deadline,
+    DeadlineExceeded,
+    bind_deadline,
+    current_deadline,
+    enter_deadline,
+    reset_deadline,
+)
+from lib.dto import BaseDTO, TBaseDTO
+from lib.instrumentation import (
+    AUTH,
+    AUTH_ERROR,
+    DTO,
+    DTO_ERROR,
+    EXCEPTION,
+    PROCESS,
+    PROCESS_ERROR,
+    SUCCESS,
+    TIMEOUT,
+    VALIDATE,
+    ExecutionTrace,
+    current_trace,
+    instrumentation,
+)
+from lib.primary_ports import AsyncBaseInputPort, AsyncBaseOutputPort, BaseInputPort, BaseOutputPort
 from lib.usecase_models import (
+    BaseAuthenticatedRequestModel,
     BaseErrorResponseModel,
+    BaseResponseModel,
+    request_key,
     TBaseAuthenticatedRequestModel,
     TBaseErrorResponseModel,
     TBaseRequestModel,
     TBaseResponseModel,
 )
 
+if TYPE_CHECKING:
+    # only annotations refer to the opt-in features, so they are imported by the code that configures them
+    from lib.auth import AsyncTokenVerifier, TokenVerifier
+    from lib.cache import DTOCache
+    from lib.offload import ProcessOffload
+    from lib.singleflight import AsyncSingleFlight, SingleFlight
+
 
 class BaseUseCase(
     BaseInputPort[TBaseRequestModel | TBaseAuthenticatedRequestModel],
     Generic[TBaseRequestModel, TBaseAuthenticatedRequestModel, TBaseResponseModel, TBaseErrorResponseModel],
 ):
-    def __init__(self, presenter: BaseOutputPort[TBaseResponseModel, TBaseErrorResponseModel]) -> None:
+    token_verifier: ClassVar["TokenVerifier | None"] = None
+    """Opt-in verification of the auth_token of authenticated request models, before validate_request_model."""
+    timeout: ClassVar[float | None] = None
+    """The time budget of an execution in seconds, used when no deadline is bound by the caller."""
+
+    def __init__(self, presenter: BaseOutputPort[TBaseResponseModel, TBaseErrorResponseModel] | None = None) -> None:
         super().__init__()
-        self.presenter: BaseOutputPort[TBaseResponseModel, TBaseErrorResponseModel] = presenter
+        self._presenter: BaseOutputPort[TBaseResponseModel, TBaseErrorResponseModel] | None = presenter
+
+    @property
+    def presenter(self) -> BaseOutputPort[TBaseResponseModel, TBaseErrorResponseModel]:
+        """
+        The presenter bound to the running invocation by execute_with, else the one given to the constructor.
+        """
+        context = current_context()
+        if context is not None and context.usecase is self and context.presenter is not None:
+            presenter: BaseOutputPort[TBaseResponseModel, TBaseErrorResponseModel] = context.presenter
+            return presenter
+        if self._presenter is None:
+            raise RuntimeError(f"{type(self).__qualname__} has no presenter, execute it with execute_with")
+        return self._presenter
+
+    @presenter.setter
+    def presenter(self, presenter: BaseOutputPort[TBaseResponseModel, TBaseErrorResponseModel]) -> None:
+        self._presenter = presenter
+
+    def __getstate__(self) -> dict[str, object]:
+        # presenters hold connections and responses, they stay in the serving process
+        state = self.__dict__.copy()
+        state["_presenter"] = None
+        return state
+
+    def execute_with(
+        self,
+        requestModel: TBaseRequestModel | TBaseAuthenticatedRequestModel,
+        presenter: BaseOutputPort[TBaseResponseModel, TBaseErrorResponseModel] | None = None,
+        response: object = None,
+        deadline: Deadline | float | None = None,
+        if_none_match: str | None = None,
+    ) -> None:
+        """
+        Executes the use case with a presenter and/or presenter response bound to this invocation only,
+        so a single use case (and presenter) instance can serve concurrent threads and tasks.
+
+        :param presenter: The presenter to use instead of the constructor's.
+        :param response: The presenter response the presenter writes to instead of its own.
+        :param deadline: The deadline of this invocation, or its time budget in seconds, instead of timeout.
+        :param if_none_match: The fingerprint of the result the client already has, e.g. from an If-None-Match header.
+        """
+        token = bind_context(ExecutionContext(self, presenter or self._presenter, response, if_none_match))
+        deadline_token = None if deadline is None else bind_deadline(deadline)
+        try:
+            self.execute(requestModel)
+        finally:
+            reset_deadline(deadline_token)
+            reset_context(token)
+
+    def authenticate(self, requestModel: TBaseRequestModel | TBaseAuthenticatedRequestModel) -> bool:
+        """
+        Verifies the auth_token of an authenticated request model with token_verifier.
+        Request models that are not a BaseAuthenticatedRequestModel, and all of them while token_verifier
+        is None, are accepted.
+        """
+        if self.token_verifier is None or not isinstance(requestModel, BaseAuthenticatedRequestModel):
+            return True
+        return self.token_verifier.verify(requestModel.user_id, requestModel.auth_token)
+
+    def handle_auth_error(
+        self, requestModel: TBaseRequestModel | TBaseAuthenticatedRequestModel
+    ) -> TBaseErrorResponseModel:
+        """
+        Returns the error model presented when authenticate rejects a request model, a 401 by default.
+        """
+        return BaseErrorResponseModel(code=401, message="Invalid authentication token")  # type: ignore[return-value]
+
+    def handle_timeout(self, exceeded: DeadlineExceeded) -> TBaseErrorResponseModel:
+        """
+        Returns the error model presented when the deadline of an execution passes, a 504 by default.
+        """
+        return BaseErrorResponseModel(  # type: ignore[return-value]
+            code=504, message=f"Deadline exceeded at the {exceeded.stage} stage"
+        )
+
+    def _reject_unauthenticated(
+        self, requestModel: TBaseRequestModel | TBaseAuthenticatedRequestModel, trace: ExecutionTrace
+    ) -> bool:
+        if self.token_verifier is None:
+            return False
+        authenticated = self.authenticate(requestModel)
+        trace.mark(AUTH)
+        if authenticated:
+            return False
+        self.presenter.presentError(self.handle_auth_error(requestModel))
+        trace.finish(AUTH_ERROR)
+        return True
 
     @abstractmethod
     def validate_request_model(self, requestModel: TBaseRequestModel | TBaseAuthenticatedRequestModel) -> None:
@@ -32,7 +176,14 @@ class BaseSingleDTOUseCase(
     BaseUseCase[TBaseRequestModel, TBaseAuthenticatedRequestModel, TBaseResponseModel, TBaseErrorResponseModel],
     Generic[TBaseRequestModel, TBaseAuthenticatedRequestModel, TBaseResponseModel, TBaseErrorResponseModel, TBaseDTO],
 ):
-    def __init__(self, presenter: BaseOutputPort[TBaseResponseModel, TBaseErrorResponseModel]) -> None:
+    dto_cache: ClassVar["DTOCache | None"] = None
+    """Opt-in cache of make_dto_request results, shared by all instances of the class."""
+    dto_coalescing: ClassVar["SingleFlight | None"] = None
+    """Opt-in coalescing of concurrent make_dto_request calls made with equal request models."""
+    process_offload: ClassVar["ProcessOffload | None"] = None
+    """Opt-in offloading of process_dto to a process pool for large DTOs."""
+
+    def __init__(self, presenter: BaseOutputPort[TBaseResponseModel, TBaseErrorResponseModel] | None = None) -> None:
         super().__init__(presenter)
 
     @abstractmethod
@@ -47,15 +198,811 @@ class BaseSingleDTOUseCase(
     def process_dto(self, dto: TBaseDTO) -> TBaseResponseModel | TBaseErrorResponseModel:
         raise NotImplementedError
 
+    def make_dto_requests(
+        self, requestModels: Sequence[TBaseRequestModel | TBaseAuthenticatedRequestModel]
+    ) -> list[TBaseDTO]:
+        """
+        Fetches the DTOs of a batch, one per request model and in the same order.
+        Override it to fetch the whole batch in one round trip, the default calls fetch_dto per item,
+        so dto_cache and dto_coalescing apply to batches as they do to execute.
+        """
+        return [self.fetch_dto(requestModel) for requestModel in requestModels]
+
+    def execute_many(self, requestModels: Sequence[TBaseRequestModel | TBaseAuthenticatedRequestModel]) -> None:
+        """
+        Executes the use case for a batch of request models and presents all results at once
+        through the presenter's presentBatch. Every item keeps its own DTO error / process error / success outcome.
+        The batch is one traced execution under one deadline, see _batch_outcome for its outcome.
+        """
+        trace = instrumentation.start(self)
+        deadline, deadline_token = enter_deadline(self.timeout)
+        try:
+            rejected: dict[int, TBaseErrorResponseModel] = {}
+            accepted: list[TBaseRequestModel | TBaseAuthenticatedRequestModel] = []
+            for index, requestModel in enumerate(requestModels):
+                if self.authenticate(requestModel):
+                    accepted.append(requestModel)
+                else:
+                    rejected[index] = self.handle_auth_error(requestModel)
+            if self.token_verifier is not None:
+                trace.mark(AUTH)
+            for requestModel in accepted:
+                self.validate_request_model(requestModel)
+            trace.mark(VALIDATE)
+            deadline.check(VALIDATE)
+            dtos: list[TBaseDTO] = self.make_dto_requests(accepted)
+            if len(dtos) != len(accepted):
+                raise ValueError(f"make_dto_requests returned {len(dtos)} DTOs for {len(accepted)} request models")
+            trace.mark(DTO)
+            deadline.check(DTO)
+            processed: list[TBaseResponseModel | TBaseErrorResponseModel] = [
+                self.handle_dto_error(dto) if dto.status == False else self._run_process_dto(dto) for dto in dtos
+            ]
+            trace.mark(PROCESS)
+            deadline.check(PROCESS)
+            results = _merge_batch(len(requestModels), rejected, processed)
+            self.presenter.presentBatch(results)
+            trace.finish(_batch_outcome(rejected, dtos, processed))
+        except DeadlineExceeded as exceeded:
+            self.presenter.presentError(self.handle_timeout(exceeded))
+            trace.finish(TIMEOUT)
+        except BaseException:
+            trace.finish(EXCEPTION)
+            raise
+        finally:
+            reset_deadline(deadline_token)
+
+    def fetch_dto(self, requestModel: TBaseRequestModel | TBaseAuthenticatedRequestModel) -> TBaseDTO:
+        """
+        Returns the DTO for requestModel, from dto_cache when enabled, else from make_dto_request,
+        sharing the call with concurrent equal requests when dto_coalescing is enabled.
+        """
+        cache = self.dto_cache
+        coalescing = self.dto_coalescing
+        if cache is None and coalescing is None:
+            return self.make_dto_request(requestModel)
+        key = request_key(requestModel, type(self))
+        if cache is not None:
+            dto = cache.get(requestModel, key)
+            if dto is not None:
+                return dto  # type: ignore[return-value]
+        if coalescing is None:
+            return self._make_and_cache_dto(requestModel, key)
+        return coalescing.do(key, lambda: self._make_and_cache_dto(requestModel, key))
+
+    def _make_and_cache_dto(
+        self, requestModel: TBaseRequestModel | TBaseAuthenticatedRequestModel, key: Hashable
+    ) -> TBaseDTO:
+        dto = self.make_dto_request(requestModel)
+        if self.dto_cache is not None:
+            self.dto_cache.put(requestModel, dto, key)
+        return dto
+
+    def _run_process_dto(self, dto: TBaseDTO) -> TBaseResponseModel | TBaseErrorResponseModel:
+        if self.process_offload is None:
+            return self.process_dto(dto)
+        result: TBaseResponseModel | TBaseErrorResponseModel = self.process_offload.process(self, dto)
+        return result
+
     def execute(self, requestModel: TBaseRequestModel | TBaseAuthenticatedRequestModel) -> None:
-        self.validate_request_model(requestModel)
-        dto: TBaseDTO = self.make_dto_request(requestModel)
-        if dto.status == False:
-            errorModel: TBaseErrorResponseModel = self.handle_dto_error(dto)
-            self.presenter.presentError(errorModel)
-        else:
-            responseModel: TBaseResponseModel | TBaseErrorResponseModel = self.process_dto(dto)
-            if responseModel.status == False:
-                self.presenter.presentError(responseModel)  # type: ignore
+        trace = instrumentation.start(self)
+        deadline, deadline_token = enter_deadline(self.timeout)
+        try:
+            if self._reject_unauthenticated(requestModel, trace):
+                return
+            self.validate_request_model(requestModel)
+            trace.mark(VALIDATE)
+            deadline.check(VALIDATE)
+            dto: TBaseDTO = self.fetch_dto(requestModel)
+            trace.mark(DTO)
+            deadline.check(DTO)
+            if dto.status == False:
+                errorModel: TBaseErrorResponseModel = self.handle_dto_error(dto)
+                trace.mark(PROCESS)
+                deadline.check(PROCESS)
+                self.presenter.presentError(errorModel)
+                trace.finish(DTO_ERROR)
+            else:
+                responseModel: TBaseResponseModel | TBaseErrorResponseModel = self._run_process_dto(dto)
+                trace.mark(PROCESS)
+                deadline.check(PROCESS)
+                if responseModel.status == False:
+                    self.presenter.presentError(responseModel)  # type: ignore
+                    trace.finish(PROCESS_ERROR)
+                else:
+                    self.presenter.presentSuccess(responseModel)  # type: ignore
+                    trace.finish(SUCCESS)
+        except DeadlineExceeded as exceeded:
+            self.presenter.presentError(self.handle_timeout(exceeded))
+            trace.finish(TIMEOUT)
+        except BaseException:
+            trace.finish(EXCEPTION)
+            raise
+        finally:
+            reset_deadline(deadline_token)
+
+
+class AsyncBaseUseCase(
+    AsyncBaseInputPort[TBaseRequestModel | TBaseAuthenticatedRequestModel],
+    Generic[TBaseRequestModel, TBaseAuthenticatedRequestModel, TBaseResponseModel, TBaseErrorResponseModel],
+):
+    token_verifier: ClassVar["AsyncTokenVerifier | TokenVerifier | None"] = None
+    """Opt-in verification of the auth_token of authenticated request models, before validate_request_model."""
+    timeout: ClassVar[float | None] = None
+    """The time budget of an execution in seconds, used when no deadline is bound by the caller."""
+
+    def __init__(
+        self, presenter: AsyncBaseOutputPort[TBaseResponseModel, TBaseErrorResponseModel] | None = None
+    ) -> None:
+        super().__init__()
+        self._presenter: AsyncBaseOutputPort[TBaseResponseModel, TBaseErrorResponseModel] | None = presenter
+
+    @property
+    def presenter(self) -> AsyncBaseOutputPort[TBaseResponseModel, TBaseErrorResponseModel]:
+        """
+        The presenter bound to the running invocation by execute_with, else the one given to the constructor.
+        """
+        context = current_context()
+        if context is not None and context.usecase is self and context.presenter is not None:
+            presenter: AsyncBaseOutputPort[TBaseResponseModel, TBaseErrorResponseModel] = context.presenter
+            return presenter
+        if self._presenter is None:
+            raise RuntimeError(f"{type(self).__qualname__} has no presenter, execute it with execute_with")
+        return self._presenter
+
+    @presenter.setter
+    def presenter(self, presenter: AsyncBaseOutputPort[TBaseResponseModel, TBaseErrorResponseModel]) -> None:
+        self._presenter = presenter
+
+    def __getstate__(self) -> dict[str, object]:
+        state = self.__dict__.copy()
+        state["_presenter"] = None
+        return state
+
+    async def execute_with(
+        self,
+        requestModel: TBaseRequestModel | TBaseAuthenticatedRequestModel,
+        presenter: AsyncBaseOutputPort[TBaseResponseModel, TBaseErrorResponseModel] | None = None,
+        response: object = None,
+        deadline: Deadline | float | None = None,
+        if_none_match: str | None = None,
+    ) -> None:
+        """
+        Executes the use case with a presenter and/or presenter response bound to this invocation only,
+        so a single use case (and presenter) instance can serve concurrent threads and tasks.
+
+        :param presenter: The presenter to use instead of the constructor's.
+        :param response: The presenter response the presenter writes to instead of its own.
+        :param deadline: The deadline of this invocation, or its time budget in seconds, instead of timeout.
+        :param if_none_match: The fingerprint of the result the client already has, e.g. from an If-None-Match header.
+        """
+        token = bind_context(ExecutionContext(self, presenter or self._presenter, response, if_none_match))
+        deadline_token = None if deadline is None else bind_deadline(deadline)
+        try:
+            await self.execute(requestModel)
+        finally:
+            reset_deadline(deadline_token)
+            reset_context(token)
+
+    async def authenticate(self, requestModel: TBaseRequestModel | TBaseAuthenticatedRequestModel) -> bool:
+        """
+        Verifies the auth_token of an authenticated request model with token_verifier.
+        Request models that are not a BaseAuthenticatedRequestModel, and all of them while token_verifier
+        is None, are accepted.
+        """
+        if self.token_verifier is None or not isinstance(requestModel, BaseAuthenticatedRequestModel):
+            return True
+        verified = self.token_verifier.verify(requestModel.user_id, requestModel.auth_token)
+        if inspect.isawaitable(verified):
+            return await verified
+        return verified
+
+    def handle_auth_error(
+        self, requestModel: TBaseRequestModel | TBaseAuthenticatedRequestModel
+    ) -> TBaseErrorResponseModel:
+        """
+        Returns the error model presented when authenticate rejects a request model, a 401 by default.
+        """
+        return BaseErrorResponseModel(code=401, message="Invalid authentication token")  # type: ignore[return-value]
+
+    def handle_timeout(self, exceeded: DeadlineExceeded) -> TBaseErrorResponseModel:
+        """
+        Returns the error model presented when the deadline of an execution passes, a 504 by default.
+        """
+        return BaseErrorResponseModel(  # type: ignore[return-value]
+            code=504, message=f"Deadline exceeded at the {exceeded.stage} stage"
+        )
+
+    async def _reject_unauthenticated(
+        self, requestModel: TBaseRequestModel | TBaseAuthenticatedRequestModel, trace: ExecutionTrace
+    ) -> bool:
+        if self.token_verifier is None:
+            return False
+        authenticated = await self.authenticate(requestModel)
+        trace.mark(AUTH)
+        if authenticated:
+            return False
+        await self.presenter.presentError(self.handle_auth_error(requestModel))
+        trace.finish(AUTH_ERROR)
+        return True
+
+    @abstractmethod
+    async def validate_request_model(self, requestModel: TBaseRequestModel | TBaseAuthenticatedRequestModel) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def execute(self, requestModel: TBaseRequestModel | TBaseAuthenticatedRequestModel) -> None:
+        raise NotImplementedError
+
+
+class AsyncBaseSingleDTOUseCase(
+    AsyncBaseUseCase[TBaseRequestModel, TBaseAuthenticatedRequestModel, TBaseResponseModel, TBaseErrorResponseModel],
+    Generic[TBaseRequestModel, TBaseAuthenticatedRequestModel, TBaseResponseModel, TBaseErrorResponseModel, TBaseDTO],
+):
+    dto_cache: ClassVar["DTOCache | None"] = None
+    """Opt-in cache of make_dto_request results, shared by all instances of the class."""
+    dto_coalescing: ClassVar["AsyncSingleFlight | None"] = None
+    """Opt-in coalescing of concurrent make_dto_request calls made with equal request models."""
+    process_offload: ClassVar["ProcessOffload | None"] = None
+    """Opt-in offloading of process_dto to a process pool for large DTOs."""
+
+    def __init__(
+        self, presenter: AsyncBaseOutputPort[TBaseResponseModel, TBaseErrorResponseModel] | None = None
+    ) -> None:
+        super().__init__(presenter)
+
+    @abstractmethod
+    async def make_dto_request(self, requestModel: TBaseRequestModel | TBaseAuthenticatedRequestModel) -> TBaseDTO:
+        raise NotImplementedError
+
+    @abstractmethod
+    def handle_dto_error(self, dto: TBaseDTO) -> TBaseErrorResponseModel:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def process_dto(self, dto: TBaseDTO) -> TBaseResponseModel | TBaseErrorResponseModel:
+        raise NotImplementedError
+
+    async def make_dto_requests(
+        self, requestModels: Sequence[TBaseRequestModel | TBaseAuthenticatedRequestModel]
+    ) -> list[TBaseDTO]:
+        """
+        Fetches the DTOs of a batch, one per request model and in the same order.
+        Override it to fetch the whole batch in one round trip, the default awaits fetch_dto concurrently,
+        so dto_cache and dto_coalescing apply to batches as they do to execute.
+        """
+        return list(await asyncio.gather(*(self.fetch_dto(requestModel) for requestModel in requestModels)))
+
+    async def execute_many(self, requestModels: Sequence[TBaseRequestModel | TBaseAuthenticatedRequestModel]) -> None:
+        """
+        Executes the use case for a batch of request models and presents all results at once
+        through the presenter's presentBatch. Every item keeps its own DTO error / process error / success outcome.
+        The batch is one traced execution under one deadline, see _batch_outcome for its outcome.
+        """
+        trace = instrumentation.start(self)
+        deadline, deadline_token = enter_deadline(self.timeout)
+        try:
+            rejected: dict[int, TBaseErrorResponseModel] = {}
+            accepted: list[TBaseRequestModel | TBaseAuthenticatedRequestModel] = []
+            for index, requestModel in enumerate(requestModels):
+                if await self.authenticate(requestModel):
+                    accepted.append(requestModel)
+                else:
+                    rejected[index] = self.handle_auth_error(requestModel)
+            if self.token_verifier is not None:
+                trace.mark(AUTH)
+            for requestModel in accepted:
+                await self.validate_request_model(requestModel)
+            trace.mark(VALIDATE)
+            deadline.check(VALIDATE)
+            dtos: list[TBaseDTO] = await deadline.wait(self.make_dto_requests(accepted), DTO)
+            if len(dtos) != len(accepted):
+                raise ValueError(f"make_dto_requests returned {len(dtos)} DTOs for {len(accepted)} request models")
+            trace.mark(DTO)
+            deadline.check(DTO)
+            processed: list[TBaseResponseModel | TBaseErrorResponseModel] = [
+                self.handle_dto_error(dto) if dto.status == False else await self._run_process_dto(dto) for dto in dtos
+            ]
+            trace.mark(PROCESS)
+            deadline.check(PROCESS)
+            results = _merge_batch(len(requestModels), rejected, processed)
+            await self.presenter.presentBatch(results)
+            trace.finish(_batch_outcome(rejected, dtos, processed))
+        except DeadlineExceeded as exceeded:
+            await self.presenter.presentError(self.handle_timeout(exceeded))
+            trace.finish(TIMEOUT)
+        except BaseException:
+            trace.finish(EXCEPTION)
+            raise
+        finally:
+            reset_deadline(deadline_token)
+
+    async def fetch_dto(self, requestModel: TBaseRequestModel | TBaseAuthenticatedRequestModel) -> TBaseDTO:
+        """
+        Returns the DTO for requestModel, from dto_cache when enabled, else from make_dto_request,
+        sharing the call with concurrent equal requests when dto_coalescing is enabled.
+        """
+        cache = self.dto_cache
+        coalescing = self.dto_coalescing
+        if cache is None and coalescing is None:
+            return await self.make_dto_request(requestModel)
+        key = request_key(requestModel, type(self))
+        if cache is not None:
+            dto = cache.get(requestModel, key)
+            if dto is not None:
+                return dto  # type: ignore[return-value]
+        if coalescing is None:
+            return await self._make_and_cache_dto(requestModel, key)
+        return await coalescing.do(key, lambda: self._make_and_cache_dto(requestModel, key))
+
+    async def _make_and_cache_dto(
+        self, requestModel: TBaseRequestModel | TBaseAuthenticatedRequestModel, key: Hashable
+    ) -> TBaseDTO:
+        dto = await self.make_dto_request(requestModel)
+        if self.dto_cache is not None:
+            self.dto_cache.put(requestModel, dto, key)
+        return dto
+
+    async def _run_process_dto(self, dto: TBaseDTO) -> TBaseResponseModel | TBaseErrorResponseModel:
+        if self.process_offload is None:
+            return await self.process_dto(dto)
+        result: TBaseResponseModel | TBaseErrorResponseModel = await self.process_offload.process_async(self, dto)
+        return result
+
+    async def execute(self, requestModel: TBaseRequestModel | TBaseAuthenticatedRequestModel) -> None:
+        trace = instrumentation.start(self)
+        deadline, deadline_token = enter_deadline(self.timeout)
+        try:
+            if await self._reject_unauthenticated(requestModel, trace):
+                return
+            await self.validate_request_model(requestModel)
+            trace.mark(VALIDATE)
+            deadline.check(VALIDATE)
+            dto: TBaseDTO = await deadline.wait(self.fetch_dto(requestModel), DTO)
+            trace.mark(DTO)
+            deadline.check(DTO)
+            if dto.status == False:
+                errorModel: TBaseErrorResponseModel = self.handle_dto_error(dto)
+                trace.mark(PROCESS)
+                deadline.check(PROCESS)
+                await self.presenter.presentError(errorModel)
+                trace.finish(DTO_ERROR)
             else:
-                self.presenter.presentSuccess(responseModel)  # type: ignore
+                responseModel: TBaseResponseModel | TBaseErrorResponseModel = await self._run_process_dto(dto)
+                trace.mark(PROCESS)
+                deadline.check(PROCESS)
+                if responseModel.status == False:
+                    await self.presenter.presentError(responseModel)  # type: ignore
+                    trace.finish(PROCESS_ERROR)
+                else:
+                    await self.presenter.presentSuccess(responseModel)  # type: ignore
+                    trace.finish(SUCCESS)
+        except DeadlineExceeded as exceeded:
+            await self.presenter.presentError(self.handle_timeout(exceeded))
+            trace.finish(TIMEOUT)
+        except BaseException:
+            trace.finish(EXCEPTION)
+            raise
+        finally:
+            reset_deadline(deadline_token)
+
+
+def _merge_batch(
+    size: int,
+    rejected: Mapping[int, TBaseErrorResponseModel],
+    processed: Sequence[TBaseResponseModel | TBaseErrorResponseModel],
+) -> list[TBaseResponseModel | TBaseErrorResponseModel]:
+    """
+    Returns the results of a batch in request order, from the errors of its rejected items by index
+    and the results of the accepted ones in order.
+    """
+    accepted = iter(processed)
+    return [rejected[index] if index in rejected else next(accepted) for index in range(size)]
+
+
+def _batch_outcome(
+    rejected: Mapping[int, BaseErrorResponseModel],
+    dtos: Sequence[BaseDTO],
+    processed: Sequence[BaseResponseModel | BaseErrorResponseModel],
+) -> str:
+    """
+    Returns the trace outcome of a batch: SUCCESS when every item succeeded, else the outcome of the
+    earliest stage at which an item failed.
+    """
+    if rejected:
+        return AUTH_ERROR
+    if any(dto.status == False for dto in dtos):
+        return DTO_ERROR
+    if any(result.status == False for result in processed):
+        return PROCESS_ERROR
+    return SUCCESS
+
+
+_default_dto_executor: ThreadPoolExecutor | None = None
+_default_dto_executor_lock = threading.Lock()
+
+
+def default_dto_executor() -> ThreadPoolExecutor:
+    """
+    Returns the thread pool shared by multi-DTO use cases that do not set their own dto_executor.
+    """
+    global _default_dto_executor
+    if _default_dto_executor is None:
+        with _default_dto_executor_lock:
+            if _default_dto_executor is None:
+                _default_dto_executor = ThreadPoolExecutor(thread_name_prefix="caps-dto")
+    return _default_dto_executor
+
+
+class BaseMultiDTOUseCase(
+    BaseUseCase[TBaseRequestModel, TBaseAuthenticatedRequestModel, TBaseResponseModel, TBaseErrorResponseModel],
+    Generic[TBaseRequestModel, TBaseAuthenticatedRequestModel, TBaseResponseModel, TBaseErrorResponseModel, TBaseDTO],
+):
+    """
+    A use case that needs several independent DTOs: the named requests returned by make_dto_requests
+    are fetched concurrently in dto_executor, so the latency is the slowest fetch instead of their sum.
+    The first failed DTO short-circuits to handle_dto_error; with cancel_on_dto_error the fetches that
+    have not started yet are cancelled (fetches already running in a thread finish but are ignored).
+    """
+
+    dto_executor: ClassVar[Executor | None] = None
+    """The executor running the DTO requests, default_dto_executor() if None."""
+    cancel_on_dto_error: ClassVar[bool] = True
+
+    def __init__(self, presenter: BaseOutputPort[TBaseResponseModel, TBaseErrorResponseModel] | None = None) -> None:
+        super().__init__(presenter)
+
+    @abstractmethod
+    def make_dto_requests(
+        self, requestModel: TBaseRequestModel | TBaseAuthenticatedRequestModel
+    ) -> Mapping[str, Callable[[], TBaseDTO]]:
+        """
+        Returns the DTO requests to run concurrently, as zero-argument callables keyed by name.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def handle_dto_error(self, name: str, dto: TBaseDTO) -> TBaseErrorResponseModel:
+        raise NotImplementedError
+
+    @abstractmethod
+    def process_dtos(self, dtos: dict[str, TBaseDTO]) -> TBaseResponseModel | TBaseErrorResponseModel:
+        raise NotImplementedError
+
+    def fetch_dtos(
+        self, requestModel: TBaseRequestModel | TBaseAuthenticatedRequestModel
+    ) -> tuple[dict[str, TBaseDTO], tuple[str, TBaseDTO] | None]:
+        """
+        Runs the DTO requests concurrently and returns (DTOs by name, first failed (name, DTO) or None).
+        On failure the DTOs dict holds only the DTOs that completed before it.
+        Every request runs in a copy of the caller's context, so it sees the current deadline and context.
+        """
+        executor = self.dto_executor or default_dto_executor()
+        futures: dict[Future[TBaseDTO], str] = {
+            executor.submit(contextvars.copy_context().run, request): name
+            for name, request in self.make_dto_requests(requestModel).items()
+        }
+        dtos: dict[str, TBaseDTO] = {}
+        pending = set(futures)
+        deadline = current_deadline()
+        try:
+            while pending:
+                done, pending = wait(pending, timeout=deadline.timeout(), return_when=FIRST_COMPLETED)
+                if not done:
+                    for future in pending:
+                        future.cancel()
+                    raise DeadlineExceeded(DTO)
+                for future in done:
+                    dto = future.result()
+                    if dto.status == False:
+                        return dtos, (futures[future], dto)
+                    dtos[futures[future]] = dto
+        finally:
+            if pending and self.cancel_on_dto_error:
+                for future in pending:
+                    future.cancel()
+        return {name: dtos[name] for name in futures.values()}, None
+
+    def execute(self, requestModel: TBaseRequestModel | TBaseAuthenticatedRequestModel) -> None:
+        trace = instrumentation.start(self)
+        deadline, deadline_token = enter_deadline(self.timeout)
+        try:
+            if self._reject_unauthenticated(requestModel, trace):
+                return
+            self.validate_request_model(requestModel)
+            trace.mark(VALIDATE)
+            deadline.check(VALIDATE)
+            dtos, failure = self.fetch_dtos(requestModel)
+            trace.mark(DTO)
+            deadline.check(DTO)
+            if failure is not None:
+                errorModel: TBaseErrorResponseModel = self.handle_dto_error(*failure)
+                trace.mark(PROCESS)
+                deadline.check(PROCESS)
+                self.presenter.presentError(errorModel)
+                trace.finish(DTO_ERROR)
+            else:
+                responseModel: TBaseResponseModel | TBaseErrorResponseModel = self.process_dtos(dtos)
+                trace.mark(PROCESS)
+                deadline.check(PROCESS)
+                if responseModel.status == False:
+                    self.presenter.presentError(responseModel)  # type: ignore
+                    trace.finish(PROCESS_ERROR)
+                else:
+                    self.presenter.presentSuccess(responseModel)  # type: ignore
+                    trace.finish(SUCCESS)
+        except DeadlineExceeded as exceeded:
+            self.presenter.presentError(self.handle_timeout(exceeded))
+            trace.finish(TIMEOUT)
+        except BaseException:
+            trace.finish(EXCEPTION)
+            raise
+        finally:
+            reset_deadline(deadline_token)
+
+
+class AsyncBaseMultiDTOUseCase(
+    AsyncBaseUseCase[TBaseRequestModel, TBaseAuthenticatedRequestModel, TBaseResponseModel, TBaseErrorResponseModel],
+    Generic[TBaseRequestModel, TBaseAuthenticatedRequestModel, TBaseResponseModel, TBaseErrorResponseModel, TBaseDTO],
+):
+    """
+    The asynchronous counterpart of BaseMultiDTOUseCase: the named DTO requests are awaited as concurrent
+    tasks, and with cancel_on_dto_error the remaining tasks are cancelled on the first failed DTO.
+    """
+
+    cancel_on_dto_error: ClassVar[bool] = True
+
+    def __init__(
+        self, presenter: AsyncBaseOutputPort[TBaseResponseModel, TBaseErrorResponseModel] | None = None
+    ) -> None:
+        super().__init__(presenter)
+
+    @abstractmethod
+    def make_dto_requests(
+        self, requestModel: TBaseRequestModel | TBaseAuthenticatedRequestModel
+    ) -> Mapping[str, Awaitable[TBaseDTO]]:
+        """
+        Returns the DTO requests to run concurrently, as awaitables (e.g. coroutines) keyed by name.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def handle_dto_error(self, name: str, dto: TBaseDTO) -> TBaseErrorResponseModel:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def process_dtos(self, dtos: dict[str, TBaseDTO]) -> TBaseResponseModel | TBaseErrorResponseModel:
+        raise NotImplementedError
+
+    async def fetch_dtos(
+        self, requestModel: TBaseRequestModel | TBaseAuthenticatedRequestModel
+    ) -> tuple[dict[str, TBaseDTO], tuple[str, TBaseDTO] | None]:
+        """
+        Awaits the DTO requests concurrently and returns (DTOs by name, first failed (name, DTO) or None).
+        On failure the DTOs dict holds only the DTOs that completed before it.
+        """
+        tasks: dict[asyncio.Future[TBaseDTO], str] = {
+            asyncio.ensure_future(request): name for name, request in self.make_dto_requests(requestModel).items()
+        }
+        dtos: dict[str, TBaseDTO] = {}
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    dto = task.result()
+                    if dto.status == False:
+                        return dtos, (tasks[task], dto)
+                    dtos[tasks[task]] = dto
+        except asyncio.CancelledError:
+            # cancelled by the deadline or the caller: no fetch is needed anymore
+            for task in pending:
+                task.cancel()
+            raise
+        finally:
+            if pending and self.cancel_on_dto_error:
+                for task in pending:
+                    task.cancel()
+        return {name: dtos[name] for name in tasks.values()}, None
+
+    async def execute(self, requestModel: TBaseRequestModel | TBaseAuthenticatedRequestModel) -> None:
+        trace = instrumentation.start(self)
+        deadline, deadline_token = enter_deadline(self.timeout)
+        try:
+            if await self._reject_unauthenticated(requestModel, trace):
+                return
+            await self.validate_request_model(requestModel)
+            trace.mark(VALIDATE)
+            deadline.check(VALIDATE)
+            dtos, failure = await deadline.wait(self.fetch_dtos(requestModel), DTO)
+            trace.mark(DTO)
+            deadline.check(DTO)
+            if failure is not None:
+                errorModel: TBaseErrorResponseModel = self.handle_dto_error(*failure)
+                trace.mark(PROCESS)
+                deadline.check(PROCESS)
+                await self.presenter.presentError(errorModel)
+                trace.finish(DTO_ERROR)
+            else:
+                responseModel: TBaseResponseModel | TBaseErrorResponseModel = await self.process_dtos(dtos)
+                trace.mark(PROCESS)
+                deadline.check(PROCESS)
+                if responseModel.status == False:
+                    await self.presenter.presentError(responseModel)  # type: ignore
+                    trace.finish(PROCESS_ERROR)
+                else:
+                    await self.presenter.presentSuccess(responseModel)  # type: ignore
+                    trace.finish(SUCCESS)
+        except DeadlineExceeded as exceeded:
+            await self.presenter.presentError(self.handle_timeout(exceeded))
+            trace.finish(TIMEOUT)
+        except BaseException:
+            trace.finish(EXCEPTION)
+            raise
+        finally:
+            reset_deadline(deadline_token)
+
+
+class BaseStreamingUseCase(
+    BaseUseCase[TBaseRequestModel, TBaseAuthenticatedRequestModel, TBaseResponseModel, TBaseErrorResponseModel],
+    Generic[TBaseRequestModel, TBaseAuthenticatedRequestModel, TBaseResponseModel, TBaseErrorResponseModel, TBaseDTO],
+):
+    """
+    A use case for large result sets: make_dto_stream yields the DTOs (items or pages) lazily and every one
+    is processed and handed to the presenter's presentStream as the response pulls it, so memory is bounded
+    by one DTO instead of the whole result set.
+    The first failed DTO is turned into an error with handle_dto_error and ends the stream, as does the
+    first error returned by process_dto; the presenter converts it with convertErrorToViewModel.
+    """
+
+    def __init__(self, presenter: BaseOutputPort[TBaseResponseModel, TBaseErrorResponseModel] | None = None) -> None:
+        super().__init__(presenter)
+
+    @abstractmethod
+    def make_dto_stream(self, requestModel: TBaseRequestModel | TBaseAuthenticatedRequestModel) -> Iterable[TBaseDTO]:
+        """
+        Returns the DTOs of the result set, produced lazily, for example a generator fetching page by page.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def handle_dto_error(self, dto: TBaseDTO) -> TBaseErrorResponseModel:
+        raise NotImplementedError
+
+    @abstractmethod
+    def process_dto(self, dto: TBaseDTO) -> TBaseResponseModel | TBaseErrorResponseModel:
+        raise NotImplementedError
+
+    def _stream_results(
+        self, dtos: Iterable[TBaseDTO], outcome: list[str]
+    ) -> Iterator[TBaseResponseModel | TBaseErrorResponseModel]:
+        trace = current_trace()
+        deadline = current_deadline()
+        iterator = iter(dtos)
+        try:
+            for dto in iterator:
+                trace.mark(DTO)
+                if deadline.expired:
+                    outcome[0] = TIMEOUT
+                    yield self.handle_timeout(DeadlineExceeded(DTO))
+                    return
+                if dto.status == False:
+                    outcome[0] = DTO_ERROR
+                    yield self.handle_dto_error(dto)
+                    return
+                result: TBaseResponseModel | TBaseErrorResponseModel = self.process_dto(dto)
+                trace.mark(PROCESS)
+                yield result
+                if result.status == False:
+                    outcome[0] = PROCESS_ERROR
+                    return
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+
+    def execute(self, requestModel: TBaseRequestModel | TBaseAuthenticatedRequestModel) -> None:
+        trace = instrumentation.start(self)
+        deadline, deadline_token = enter_deadline(self.timeout)
+        try:
+            if self._reject_unauthenticated(requestModel, trace):
+                return
+            self.validate_request_model(requestModel)
+            trace.mark(VALIDATE)
+            deadline.check(VALIDATE)
+            outcome = [SUCCESS]
+            self.presenter.presentStream(self._stream_results(self.make_dto_stream(requestModel), outcome))
+            trace.finish(outcome[0])
+        except DeadlineExceeded as exceeded:
+            self.presenter.presentError(self.handle_timeout(exceeded))
+            trace.finish(TIMEOUT)
+        except BaseException:
+            trace.finish(EXCEPTION)
+            raise
+        finally:
+            reset_deadline(deadline_token)
+
+
+class AsyncBaseStreamingUseCase(
+    AsyncBaseUseCase[TBaseRequestModel, TBaseAuthenticatedRequestModel, TBaseResponseModel, TBaseErrorResponseModel],
+    Generic[TBaseRequestModel, TBaseAuthenticatedRequestModel, TBaseResponseModel, TBaseErrorResponseModel, TBaseDTO],
+):
+    """
+    The asynchronous counterpart of BaseStreamingUseCase: make_dto_stream is an async iterable,
+    typically an async generator, and the results reach the presenter as an async iterator.
+    """
+
+    def __init__(
+        self, presenter: AsyncBaseOutputPort[TBaseResponseModel, TBaseErrorResponseModel] | None = None
+    ) -> None:
+        super().__init__(presenter)
+
+    @abstractmethod
+    def make_dto_stream(
+        self, requestModel: TBaseRequestModel | TBaseAuthenticatedRequestModel
+    ) -> AsyncIterable[TBaseDTO]:
+        """
+        Returns the DTOs of the result set, produced lazily, for example an async generator fetching page by page.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def handle_dto_error(self, dto: TBaseDTO) -> TBaseErrorResponseModel:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def process_dto(self, dto: TBaseDTO) -> TBaseResponseModel | TBaseErrorResponseModel:
+        raise NotImplementedError
+
+    async def _stream_results(
+        self, dtos: AsyncIterable[TBaseDTO], outcome: list[str]
+    ) -> AsyncIterator[TBaseResponseModel | TBaseErrorResponseModel]:
+        trace = current_trace()
+        deadline = current_deadline()
+        iterator = aiter(dtos)
+        try:
+            while True:
+                try:
+                    dto = await deadline.wait(anext(iterator), DTO)
+                except StopAsyncIteration:
+                    break
+                except DeadlineExceeded as exceeded:
+                    outcome[0] = TIMEOUT
+                    yield self.handle_timeout(exceeded)
+                    return
+                trace.mark(DTO)
+                if dto.status == False:
+                    outcome[0] = DTO_ERROR
+                    yield self.handle_dto_error(dto)
+                    return
+                result: TBaseResponseModel | TBaseErrorResponseModel = await self.process_dto(dto)
+                trace.mark(PROCESS)
+                yield result
+                if result.status == False:
+                    outcome[0] = PROCESS_ERROR
+                    return
+        finally:
+            aclose = getattr(iterator, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+    async def execute(self, requestModel: TBaseRequestModel | TBaseAuthenticatedRequestModel) -> None:
+        trace = instrumentation.start(self)
+        deadline, deadline_token = enter_deadline(self.timeout)
+        try:
+            if await self._reject_unauthenticated(requestModel, trace):
+                return
+            await self.validate_request_model(requestModel)
+            trace.mark(VALIDATE)
+            deadline.check(VALIDATE)
+            outcome = [SUCCESS]
+            await self.presenter.presentStream(self._stream_results(self.make_dto_stream(requestModel), outcome))
+            trace.finish(outcome[0])
+        except DeadlineExceeded as exceeded:
+            await self.presenter.presentError(self.handle_timeout(exceeded))
+            trace.finish(TIMEOUT)
+        except BaseException:
+            trace.finish(EXCEPTION)
+            raise
+        finally:
+            reset_deadline(deadline_token)
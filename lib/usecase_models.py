@@ -1,9 +1,11 @@
-from typing import Literal, TypeVar
-from pydantic import BaseModel
+from typing import Any, Hashable, Literal, Sequence, TypeVar
+from pydantic import BaseModel, ConfigDict, TypeAdapter
+from lib.startup import LAZY_SCHEMAS
+from lib.trusted import TrustedModel
 
 
 class BaseRequestModel(BaseModel):
-    pass
+    model_config = ConfigDict(defer_build=LAZY_SCHEMAS)
 
 
 class BaseAuthenticatedRequestModel(BaseRequestModel):
@@ -11,11 +13,11 @@ class BaseAuthenticatedRequestModel(BaseRequestModel):
     auth_token: str
 
 
-class BaseResponseModel(BaseModel):
+class BaseResponseModel(TrustedModel):
     status: Literal[True] = True
 
 
-class BaseErrorResponseModel(BaseModel):
+class BaseErrorResponseModel(TrustedModel):
     status: Literal[False] = False
     code: int
     message: str
@@ -25,3 +27,38 @@ TBaseRequestModel = TypeVar("TBaseRequestModel", bound=BaseRequestModel)
 TBaseAuthenticatedRequestModel = TypeVar("TBaseAuthenticatedRequestModel", bound=BaseAuthenticatedRequestModel)
 TBaseResponseModel = TypeVar("TBaseResponseModel", bound=BaseResponseModel)
 TBaseErrorResponseModel = TypeVar("TBaseErrorResponseModel", bound=BaseErrorResponseModel)
+
+
+_list_adapters: dict[type[BaseRequestModel], TypeAdapter[Any]] = {}
+
+
+def validate_request_models(model: type[TBaseRequestModel], data: Sequence[Any]) -> list[TBaseRequestModel]:
+    """
+    Validates a batch of raw request payloads (dicts or models) into request models in one pass,
+    using a list TypeAdapter that is built once per request model class.
+
+    :param model: The request model class to validate against.
+    :param data: The raw payloads.
+    :return: The validated request models, in order.
+    """
+    adapter = _list_adapters.get(model)
+    if adapter is None:
+        adapter = _list_adapters[model] = TypeAdapter(list[model])  # type: ignore[valid-type]
+    result: list[TBaseRequestModel] = adapter.validate_python(data)
+    return result
+
+
+def request_key(requestModel: BaseRequestModel, owner: type | None = None) -> Hashable:
+    """
+    Returns a hashable key identifying the content of a request model, as (scope, owner, model class, content).
+    The scope is the user_id for authenticated requests and None otherwise, so equal requests
+    made by different users never share a key. The auth_token is left out of the content.
+
+    :param requestModel: The request model.
+    :param owner: The class answering the request, e.g. the use case, so that use cases sharing
+        a request model class never share a key.
+    :return: The key.
+    """
+    if isinstance(requestModel, BaseAuthenticatedRequestModel):
+        return (requestModel.user_id, owner, type(requestModel), requestModel.model_dump_json(exclude={"auth_token"}))
+    return (None, owner, type(requestModel), requestModel.model_dump_json())
@@ -1,15 +1,16 @@
 """
-This module defines the BaseViewModel class.
+This module defines the BaseViewModel, BaseBatchViewModel and NotModifiedViewModel classes.
 
 @author:
 @version: 1.0
 """
 
 from typing import TypeVar
-from pydantic import BaseModel
+from pydantic import SerializeAsAny
+from lib.trusted import TrustedModel
 
 
-class BaseViewModel(BaseModel):
+class BaseViewModel(TrustedModel):
     """
     A base view model class that contains common properties for all view models.
 
@@ -24,3 +25,25 @@ class BaseViewModel(BaseModel):
 
 
 TBaseViewModel = TypeVar("TBaseViewModel", bound=BaseViewModel)
+
+
+class BaseBatchViewModel(BaseViewModel):
+    """
+    A view model wrapping the per-item view models of a batched execution.
+
+    :status (bool): True only if every item succeeded.
+    :items (list[BaseViewModel]): The view models, in request order, each with its own status.
+    """
+
+    items: list[SerializeAsAny[BaseViewModel]]
+
+
+class NotModifiedViewModel(BaseViewModel):
+    """
+    The view model presented in place of a result the client already has.
+
+    :status (bool): Always True.
+    :fingerprint (str): The fingerprint of the result, which the client sent as if_none_match.
+    """
+
+    fingerprint: str
@@ -0,0 +1,90 @@
+import asyncio
+from lib.dto import BaseDTO
+from lib.presenter import AsyncBasePresenter
+from lib.response import AsyncPresenterResponse
+from lib.usecase import AsyncBaseSingleDTOUseCase
+from lib.usecase_models import (
+    BaseAuthenticatedRequestModel,
+    BaseErrorResponseModel,
+    BaseRequestModel,
+    BaseResponseModel,
+)
+from lib.view_model import BaseViewModel
+
+
+class RequestModel(BaseRequestModel):
+    name: str
+
+
+class ResponseModel(BaseResponseModel):
+    name: str
+
+
+class ErrorResponseModel(BaseErrorResponseModel):
+    pass
+
+
+class DTO(BaseDTO):
+    name: str
+
+
+class ViewModel(BaseViewModel):
+    name: str | None = None
+
+
+class Response(AsyncPresenterResponse):
+    def __init__(self) -> None:
+        super().__init__()
+        self.presented: list[BaseViewModel] = []
+
+    async def present(self, view_model: BaseViewModel) -> None:
+        await asyncio.sleep(0)
+        self.presented.append(view_model)
+
+
+class Presenter(AsyncBasePresenter[ResponseModel, ErrorResponseModel, ViewModel]):
+    def convertResponseToViewModel(self, responseModel: ResponseModel) -> ViewModel:
+        return ViewModel(status=True, name=responseModel.name)
+
+    def convertErrorToViewModel(self, errorModel: ErrorResponseModel) -> ViewModel:
+        return ViewModel(status=False, errorName=str(errorModel.code), errorMessage=errorModel.message)
+
+
+class UseCase(
+    AsyncBaseSingleDTOUseCase[RequestModel, BaseAuthenticatedRequestModel, ResponseModel, ErrorResponseModel, DTO]
+):
+    async def validate_request_model(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> None:
+        pass
+
+    async def make_dto_request(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> DTO:
+        await asyncio.sleep(0.01)
+        assert isinstance(requestModel, RequestModel)
+        if requestModel.name == "missing":
+            return DTO(status=False, errorCode=404, errorName="NotFound", errorMessage="missing", name="")
+        return DTO(status=True, errorCode=0, errorName="", errorMessage="", name=requestModel.name)
+
+    def handle_dto_error(self, dto: DTO) -> ErrorResponseModel:
+        return ErrorResponseModel(code=dto.errorCode, message=dto.errorMessage)
+
+    async def process_dto(self, dto: DTO) -> ResponseModel | ErrorResponseModel:
+        return ResponseModel(name=dto.name.upper())
+
+
+def test_async_usecase_success_and_dto_error() -> None:
+    response = Response()
+    usecase = UseCase(presenter=Presenter(response))
+    asyncio.run(usecase.execute(RequestModel(name="test")))
+    asyncio.run(usecase.execute(RequestModel(name="missing")))
+    assert response.presented[0] == ViewModel(status=True, name="TEST")
+    assert response.presented[1] == ViewModel(status=False, errorName="404", errorMessage="missing")
+
+
+def test_async_usecases_share_one_event_loop() -> None:
+    response = Response()
+    usecase = UseCase(presenter=Presenter(response))
+
+    async def run_all() -> None:
+        await asyncio.gather(*(usecase.execute(RequestModel(name=f"n{i}")) for i in range(200)))
+
+    asyncio.run(run_all())
+    assert sorted(getattr(vm, "name") for vm in response.presented) == sorted(f"N{i}" for i in range(200))
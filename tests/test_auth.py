@@ -0,0 +1,172 @@
+import asyncio
+from lib.auth import AsyncCachingTokenVerifier, AsyncTokenVerifier, CachingTokenVerifier, TokenVerifier
+from lib.dto import BaseDTO
+from lib.primary_ports import AsyncBaseOutputPort, BaseOutputPort
+from lib.usecase import AsyncBaseSingleDTOUseCase, BaseSingleDTOUseCase
+from lib.usecase_models import BaseAuthenticatedRequestModel, BaseErrorResponseModel, BaseResponseModel
+
+
+class RequestModel(BaseAuthenticatedRequestModel):
+    item: int
+
+
+class DTO(BaseDTO):
+    item: int
+
+
+class ResponseModel(BaseResponseModel):
+    item: int
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now: float = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class Verifier(TokenVerifier):
+    def __init__(self) -> None:
+        self.calls: int = 0
+
+    def verify(self, user_id: int, auth_token: str) -> bool:
+        self.calls += 1
+        return auth_token == f"token-{user_id}"
+
+
+class AsyncVerifier(AsyncTokenVerifier):
+    def __init__(self) -> None:
+        self.calls: int = 0
+
+    async def verify(self, user_id: int, auth_token: str) -> bool:
+        self.calls += 1
+        return auth_token == f"token-{user_id}"
+
+
+class Presenter(BaseOutputPort[ResponseModel, BaseErrorResponseModel]):
+    def __init__(self) -> None:
+        super().__init__()
+        self.presented: list[ResponseModel | BaseErrorResponseModel] = []
+
+    def presentSuccess(self, responseModel: ResponseModel) -> None:
+        self.presented.append(responseModel)
+
+    def presentError(self, errorModel: BaseErrorResponseModel) -> None:
+        self.presented.append(errorModel)
+
+
+class AsyncPresenter(AsyncBaseOutputPort[ResponseModel, BaseErrorResponseModel]):
+    def __init__(self) -> None:
+        super().__init__()
+        self.presented: list[ResponseModel | BaseErrorResponseModel] = []
+
+    async def presentSuccess(self, responseModel: ResponseModel) -> None:
+        self.presented.append(responseModel)
+
+    async def presentError(self, errorModel: BaseErrorResponseModel) -> None:
+        self.presented.append(errorModel)
+
+
+def make_dto(requestModel: RequestModel) -> DTO:
+    return DTO(status=True, errorCode=0, errorName="", errorMessage="", item=requestModel.item)
+
+
+class UseCase(BaseSingleDTOUseCase[RequestModel, RequestModel, ResponseModel, BaseErrorResponseModel, DTO]):
+    token_verifier = CachingTokenVerifier(Verifier())
+    validated: list[int] = []
+
+    def validate_request_model(self, requestModel: RequestModel) -> None:
+        self.validated.append(requestModel.item)
+
+    def make_dto_request(self, requestModel: RequestModel) -> DTO:
+        return make_dto(requestModel)
+
+    def handle_dto_error(self, dto: DTO) -> BaseErrorResponseModel:
+        return BaseErrorResponseModel(code=500, message="failed")
+
+    def process_dto(self, dto: DTO) -> ResponseModel | BaseErrorResponseModel:
+        return ResponseModel(item=dto.item)
+
+
+class AsyncUseCase(AsyncBaseSingleDTOUseCase[RequestModel, RequestModel, ResponseModel, BaseErrorResponseModel, DTO]):
+    token_verifier = AsyncCachingTokenVerifier(AsyncVerifier())
+
+    async def validate_request_model(self, requestModel: RequestModel) -> None:
+        pass
+
+    async def make_dto_request(self, requestModel: RequestModel) -> DTO:
+        return make_dto(requestModel)
+
+    def handle_dto_error(self, dto: DTO) -> BaseErrorResponseModel:
+        return BaseErrorResponseModel(code=500, message="failed")
+
+    async def process_dto(self, dto: DTO) -> ResponseModel | BaseErrorResponseModel:
+        return ResponseModel(item=dto.item)
+
+    def handle_auth_error(self, requestModel: RequestModel) -> BaseErrorResponseModel:
+        return BaseErrorResponseModel(code=403, message=f"user {requestModel.user_id} rejected")
+
+
+def test_tokens_are_verified_once_per_ttl_and_failures_are_not_cached() -> None:
+    verifier = Verifier()
+    clock = Clock()
+    cache = CachingTokenVerifier(verifier, ttl=10, clock=clock)
+    assert all(cache.verify(1, "token-1") for _ in range(3))
+    assert verifier.calls == 1
+    assert not cache.verify(1, "forged") and not cache.verify(1, "forged")
+    assert verifier.calls == 3
+    clock.now = 11
+    assert cache.verify(1, "token-1")
+    assert verifier.calls == 4
+    assert (cache.stats.hits, cache.stats.expirations) == (2, 1)
+    assert cache.stats.hit_rate == 2 / 6
+
+
+def test_revocation_forgets_tokens() -> None:
+    verifier = Verifier()
+    cache = CachingTokenVerifier(verifier)
+    for user_id in (1, 2):
+        cache.verify(user_id, f"token-{user_id}")
+    assert cache.revoke(1, "token-1")
+    assert cache.revoke_user(2) == 1
+    assert len(cache) == 0
+    cache.verify(1, "token-1")
+    assert verifier.calls == 3
+
+
+def test_use_case_rejects_invalid_tokens_before_validation() -> None:
+    presenter = Presenter()
+    usecase = UseCase(presenter)
+    usecase.execute(RequestModel(user_id=7, auth_token="token-7", item=1))
+    usecase.execute(RequestModel(user_id=7, auth_token="stolen", item=2))
+    usecase.execute_many(
+        [RequestModel(user_id=7, auth_token="token-7", item=3), RequestModel(user_id=8, auth_token="x", item=4)]
+    )
+    assert presenter.presented == [
+        ResponseModel(item=1),
+        BaseErrorResponseModel(code=401, message="Invalid authentication token"),
+        ResponseModel(item=3),
+        BaseErrorResponseModel(code=401, message="Invalid authentication token"),
+    ]
+    assert UseCase.validated == [1, 3]
+    assert isinstance(UseCase.token_verifier, CachingTokenVerifier)
+    assert isinstance(UseCase.token_verifier.verifier, Verifier)
+    assert UseCase.token_verifier.verifier.calls == 3
+
+
+def test_async_use_case_awaits_the_verifier_on_cache_misses_only() -> None:
+    presenter = AsyncPresenter()
+    usecase = AsyncUseCase(presenter)
+
+    async def run() -> None:
+        for item in range(3):
+            await usecase.execute(RequestModel(user_id=1, auth_token="token-1", item=item))
+        await usecase.execute(RequestModel(user_id=2, auth_token="token-1", item=3))
+
+    asyncio.run(run())
+    assert presenter.presented[:3] == [ResponseModel(item=item) for item in range(3)]
+    assert presenter.presented[3] == BaseErrorResponseModel(code=403, message="user 2 rejected")
+    assert isinstance(AsyncUseCase.token_verifier, AsyncCachingTokenVerifier)
+    assert isinstance(AsyncUseCase.token_verifier.verifier, AsyncVerifier)
+    assert AsyncUseCase.token_verifier.verifier.calls == 2
@@ -0,0 +1,22 @@
+import json
+from pathlib import Path
+from benchmarks.bench_framework import suite
+from benchmarks.harness import compare, main, to_json
+
+
+def test_framework_suite_runs_and_writes_json(tmp_path: Path) -> None:
+    output = tmp_path / "results.json"
+    assert main([suite], ["--number", "1", "--repeat", "1", "--json", str(output)]) == 0
+    results = json.loads(output.read_text())["results"]
+    assert "framework.execute_success" in results
+    assert "framework.construct_BaseViewModel_50_fields" in results
+    assert all(result["ns_per_call"] > 0 for result in results.values())
+
+
+def test_compare_reports_regressions_beyond_tolerance() -> None:
+    results = suite.run(number=1, repeat=1, only="execute_success")
+    current = to_json(results)
+    baseline = {"results": {"framework.execute_success": {"ns_per_call": results[0].ns_per_call / 2}}}
+    assert [name for name, _, _ in compare(current, baseline, tolerance=0.1)] == ["framework.execute_success"]
+    assert compare(current, baseline, tolerance=1.5) == []
+    assert compare(current, {"results": {}}) == []
@@ -0,0 +1,219 @@
+import asyncio
+import queue
+import time
+import threading
+import pytest
+from dependency_injector import containers, providers
+from benchmarks.bench_container import suite
+from lib.container import AsyncUseCaseResolver, Pooled, UseCaseResolver
+from lib.dto import BaseDTO
+from lib.primary_ports import AsyncBaseOutputPort, BaseOutputPort
+from lib.usecase import AsyncBaseSingleDTOUseCase, BaseSingleDTOUseCase
+from lib.usecase_models import (
+    BaseAuthenticatedRequestModel,
+    BaseErrorResponseModel,
+    BaseRequestModel,
+    BaseResponseModel,
+)
+
+
+class RequestModel(BaseRequestModel):
+    id: int
+
+
+class OtherRequestModel(BaseRequestModel):
+    pass
+
+
+class DTO(BaseDTO):
+    id: int
+
+
+class ResponseModel(BaseResponseModel):
+    id: int
+
+
+class Presenter(BaseOutputPort[ResponseModel, BaseErrorResponseModel]):
+    def __init__(self) -> None:
+        super().__init__()
+        self.presented: list[ResponseModel | BaseErrorResponseModel] = []
+
+    def presentSuccess(self, responseModel: ResponseModel) -> None:
+        self.presented.append(responseModel)
+
+    def presentError(self, errorModel: BaseErrorResponseModel) -> None:
+        self.presented.append(errorModel)
+
+
+class AsyncPresenter(AsyncBaseOutputPort[ResponseModel, BaseErrorResponseModel]):
+    def __init__(self) -> None:
+        super().__init__()
+        self.presented: list[ResponseModel | BaseErrorResponseModel] = []
+
+    async def presentSuccess(self, responseModel: ResponseModel) -> None:
+        self.presented.append(responseModel)
+
+    async def presentError(self, errorModel: BaseErrorResponseModel) -> None:
+        self.presented.append(errorModel)
+
+
+class UseCase(
+    BaseSingleDTOUseCase[RequestModel, BaseAuthenticatedRequestModel, ResponseModel, BaseErrorResponseModel, DTO]
+):
+    def validate_request_model(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> None:
+        pass
+
+    def make_dto_request(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> DTO:
+        assert isinstance(requestModel, RequestModel)
+        return DTO(status=True, errorCode=0, errorName="", errorMessage="", id=requestModel.id)
+
+    def handle_dto_error(self, dto: DTO) -> BaseErrorResponseModel:
+        return BaseErrorResponseModel(code=500, message="failed")
+
+    def process_dto(self, dto: DTO) -> ResponseModel | BaseErrorResponseModel:
+        return ResponseModel(id=dto.id)
+
+
+class AsyncUseCase(
+    AsyncBaseSingleDTOUseCase[RequestModel, BaseAuthenticatedRequestModel, ResponseModel, BaseErrorResponseModel, DTO]
+):
+    async def validate_request_model(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> None:
+        pass
+
+    async def make_dto_request(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> DTO:
+        assert isinstance(requestModel, RequestModel)
+        await asyncio.sleep(0)
+        return DTO(status=True, errorCode=0, errorName="", errorMessage="", id=requestModel.id)
+
+    def handle_dto_error(self, dto: DTO) -> BaseErrorResponseModel:
+        return BaseErrorResponseModel(code=500, message="failed")
+
+    async def process_dto(self, dto: DTO) -> ResponseModel | BaseErrorResponseModel:
+        return ResponseModel(id=dto.id)
+
+
+class Container(containers.DeclarativeContainer):
+    presenter = providers.Factory(Presenter)
+    shared_presenter = providers.Singleton(Presenter)
+    usecase = providers.Singleton(UseCase, shared_presenter)
+    thread_usecase = providers.ThreadLocalSingleton(UseCase, shared_presenter)
+    pooled_usecase = Pooled(UseCase, shared_presenter, size=2, timeout=0.01)
+    async_presenter = providers.Singleton(AsyncPresenter)
+    async_usecase = providers.Singleton(AsyncUseCase, async_presenter)
+
+
+def test_singleton_use_case_with_a_presenter_per_request() -> None:
+    container = Container()
+    resolver = UseCaseResolver()
+    resolver.register(RequestModel, container.usecase, container.presenter)
+    presenters = [Presenter(), Presenter()]
+    container.presenter.override(providers.Callable(iter(presenters).__next__))
+    resolver.wire()
+    resolver.execute(RequestModel(id=1))
+    resolver.execute(RequestModel(id=2))
+    assert [presenter.presented for presenter in presenters] == [[ResponseModel(id=1)], [ResponseModel(id=2)]]
+    assert container.shared_presenter().presented == []
+    container.presenter.reset_override()
+    first, second = resolver.resolve(RequestModel), resolver.resolve(RequestModel)
+    assert first[0] is second[0] is container.usecase() and first[1] is not second[1]
+    with pytest.raises(LookupError, match="OtherRequestModel"):
+        resolver.execute(OtherRequestModel())
+
+
+def test_thread_local_use_cases_differ_across_threads() -> None:
+    container = Container()
+    resolver = UseCaseResolver()
+    resolver.register(RequestModel, container.thread_usecase)
+    usecases: list[object] = []
+
+    def resolve() -> None:
+        usecases.append(resolver.resolve(RequestModel)[0])
+        usecases.append(resolver.resolve(RequestModel)[0])
+
+    threads = [threading.Thread(target=resolve) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert usecases[0] is usecases[1] and usecases[2] is usecases[3] and usecases[0] is not usecases[2]
+
+
+def test_pool_is_bounded_and_reuses_released_instances() -> None:
+    container = Container()
+    pool = container.pooled_usecase
+    assert isinstance(pool, Pooled) and pool is not Container.pooled_usecase
+    with pool.lease() as first, pool.lease() as second:
+        assert first is not second and pool.created == 2
+        with pytest.raises(queue.Empty):
+            pool()
+    resolver = UseCaseResolver()
+    resolver.register(RequestModel, pool)
+    for id in range(5):
+        resolver.execute(RequestModel(id=id))
+    assert pool.created == 2
+    assert len(container.shared_presenter().presented) == 5
+
+
+def test_async_resolver_executes_with_the_registered_use_case() -> None:
+    container = Container()
+    resolver = AsyncUseCaseResolver()
+    resolver.register(RequestModel, container.async_usecase)
+    resolver.wire()
+
+    async def run() -> None:
+        await asyncio.gather(*(resolver.execute(RequestModel(id=id)) for id in range(3)))
+
+    asyncio.run(run())
+    assert sorted(response.id for response in container.async_presenter().presented) == [0, 1, 2]  # type: ignore[union-attr]
+
+
+def test_container_benchmark_suite_runs() -> None:
+    results = suite.run(number=1, repeat=1)
+    assert {result.name for result in results} >= {"container.resolve_pooled_and_execute"}
+
+
+class SlowAsyncUseCase(AsyncUseCase):
+    async def make_dto_request(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> DTO:
+        await asyncio.sleep(0.01)
+        return await super().make_dto_request(requestModel)
+
+
+def test_async_resolver_awaits_an_exhausted_pool_without_blocking_the_loop() -> None:
+    presenter = AsyncPresenter()
+    pool: Pooled[SlowAsyncUseCase] = Pooled(SlowAsyncUseCase, presenter, size=1, timeout=1.0)
+    resolver = AsyncUseCaseResolver()
+    resolver.register(RequestModel, pool)
+    resolver.wire()
+
+    async def run() -> float:
+        started = time.perf_counter()
+        await asyncio.gather(*(resolver.execute(RequestModel(id=id)) for id in range(5)))
+        return time.perf_counter() - started
+
+    assert asyncio.run(run()) < 0.5
+    assert pool.created == 1 and sorted(r.id for r in presenter.presented) == list(range(5))  # type: ignore[union-attr]
+
+
+def test_async_acquire_times_out_and_cancelled_waiters_do_not_keep_instances() -> None:
+    pool: Pooled[AsyncUseCase] = Pooled(AsyncUseCase, AsyncPresenter(), size=1, timeout=0.01)
+
+    async def run() -> None:
+        held = await pool.acquire()
+        with pytest.raises(queue.Empty):
+            await pool.acquire()
+        waiter = asyncio.ensure_future(pool.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.sleep(0)
+        pool.release(held)
+        assert await pool.acquire() is held
+
+        waiter = asyncio.ensure_future(pool.acquire())
+        await asyncio.sleep(0)
+        pool.release(held)  # handed over to the waiter, which is cancelled before it resumes
+        waiter.cancel()
+        await asyncio.sleep(0.001)
+        # the waiter either returns the instance despite the cancellation, or hands it back
+        assert (not waiter.cancelled() and waiter.result() is held) or await pool.acquire() is held
+
+    asyncio.run(run())
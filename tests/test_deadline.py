@@ -0,0 +1,170 @@
+import asyncio
+import time
+from typing import AsyncIterator
+import pytest
+from lib.deadline import NO_DEADLINE, Deadline, DeadlineExceeded, current_deadline
+from lib.dto import BaseDTO
+from lib.primary_ports import AsyncBaseOutputPort, BaseOutputPort
+from lib.usecase import AsyncBaseSingleDTOUseCase, AsyncBaseStreamingUseCase, BaseSingleDTOUseCase
+from lib.usecase_models import (
+    BaseAuthenticatedRequestModel,
+    BaseErrorResponseModel,
+    BaseRequestModel,
+    BaseResponseModel,
+)
+
+
+class RequestModel(BaseRequestModel):
+    delay: float = 0
+
+
+class DTO(BaseDTO):
+    timeout: float | None = None
+
+
+class ResponseModel(BaseResponseModel):
+    timeout: float | None = None
+
+
+def make_dto(timeout: float | None = None) -> DTO:
+    return DTO(status=True, errorCode=0, errorName="", errorMessage="", timeout=timeout)
+
+
+class Presenter(BaseOutputPort[ResponseModel, BaseErrorResponseModel]):
+    def __init__(self) -> None:
+        super().__init__()
+        self.presented: list[ResponseModel | BaseErrorResponseModel] = []
+
+    def presentSuccess(self, responseModel: ResponseModel) -> None:
+        self.presented.append(responseModel)
+
+    def presentError(self, errorModel: BaseErrorResponseModel) -> None:
+        self.presented.append(errorModel)
+
+
+class AsyncPresenter(AsyncBaseOutputPort[ResponseModel, BaseErrorResponseModel]):
+    def __init__(self) -> None:
+        super().__init__()
+        self.presented: list[ResponseModel | BaseErrorResponseModel] = []
+
+    async def presentSuccess(self, responseModel: ResponseModel) -> None:
+        self.presented.append(responseModel)
+
+    async def presentError(self, errorModel: BaseErrorResponseModel) -> None:
+        self.presented.append(errorModel)
+
+
+class UseCase(
+    BaseSingleDTOUseCase[RequestModel, BaseAuthenticatedRequestModel, ResponseModel, BaseErrorResponseModel, DTO]
+):
+    def __init__(self, presenter: Presenter) -> None:
+        super().__init__(presenter)
+        self.processed: int = 0
+
+    def validate_request_model(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> None:
+        pass
+
+    def make_dto_request(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> DTO:
+        assert isinstance(requestModel, RequestModel)
+        # a gateway bounds its own call by the remaining budget
+        timeout = current_deadline().timeout(default=5)
+        time.sleep(requestModel.delay)
+        return make_dto(timeout)
+
+    def handle_dto_error(self, dto: DTO) -> BaseErrorResponseModel:
+        return BaseErrorResponseModel(code=500, message="failed")
+
+    def process_dto(self, dto: DTO) -> ResponseModel | BaseErrorResponseModel:
+        self.processed += 1
+        return ResponseModel(timeout=dto.timeout)
+
+
+class AsyncUseCase(
+    AsyncBaseSingleDTOUseCase[RequestModel, BaseAuthenticatedRequestModel, ResponseModel, BaseErrorResponseModel, DTO]
+):
+    timeout = 0.05
+
+    def __init__(self, presenter: AsyncPresenter) -> None:
+        super().__init__(presenter)
+        self.cancelled: bool = False
+
+    async def validate_request_model(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> None:
+        pass
+
+    async def make_dto_request(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> DTO:
+        assert isinstance(requestModel, RequestModel)
+        try:
+            await asyncio.sleep(requestModel.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return make_dto()
+
+    def handle_dto_error(self, dto: DTO) -> BaseErrorResponseModel:
+        return BaseErrorResponseModel(code=500, message="failed")
+
+    async def process_dto(self, dto: DTO) -> ResponseModel | BaseErrorResponseModel:
+        return ResponseModel()
+
+
+class StreamingUseCase(
+    AsyncBaseStreamingUseCase[RequestModel, BaseAuthenticatedRequestModel, ResponseModel, BaseErrorResponseModel, DTO]
+):
+    async def validate_request_model(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> None:
+        pass
+
+    async def make_dto_stream(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> AsyncIterator[DTO]:
+        assert isinstance(requestModel, RequestModel)
+        for _ in range(10):
+            await asyncio.sleep(requestModel.delay)
+            yield make_dto()
+
+    def handle_dto_error(self, dto: DTO) -> BaseErrorResponseModel:
+        return BaseErrorResponseModel(code=500, message="failed")
+
+    async def process_dto(self, dto: DTO) -> ResponseModel | BaseErrorResponseModel:
+        return ResponseModel()
+
+
+def test_deadline_checks_and_timeouts() -> None:
+    now = [0.0]
+    deadline = Deadline.after(2, clock=lambda: now[0])
+    assert deadline.timeout(5) == 2 and deadline.timeout(1) == 1
+    deadline.check("validate")
+    now[0] = 2
+    assert deadline.expired and deadline.remaining() == 0
+    with pytest.raises(DeadlineExceeded, match="dto"):
+        deadline.check("dto")
+    assert current_deadline() is NO_DEADLINE
+    assert NO_DEADLINE.timeout(5) == 5
+
+
+def test_expired_deadline_presents_a_timeout_instead_of_processing() -> None:
+    presenter = Presenter()
+    usecase = UseCase(presenter)
+    usecase.execute_with(RequestModel(), deadline=1)
+    response = presenter.presented[0]
+    assert isinstance(response, ResponseModel) and response.timeout is not None and 0.9 < response.timeout <= 1
+
+    usecase.execute_with(RequestModel(delay=0.03), deadline=0.01)
+    assert presenter.presented[1] == BaseErrorResponseModel(code=504, message="Deadline exceeded at the dto stage")
+    assert usecase.processed == 1
+    assert current_deadline() is NO_DEADLINE
+
+
+def test_async_timeout_cancels_the_fetch_in_flight() -> None:
+    presenter = AsyncPresenter()
+    usecase = AsyncUseCase(presenter)
+    start = time.perf_counter()
+    asyncio.run(usecase.execute(RequestModel(delay=5)))
+    assert time.perf_counter() - start < 1
+    assert usecase.cancelled
+    assert presenter.presented == [BaseErrorResponseModel(code=504, message="Deadline exceeded at the dto stage")]
+
+
+def test_async_stream_ends_with_a_timeout_error() -> None:
+    presenter = AsyncPresenter()
+    asyncio.run(StreamingUseCase(presenter).execute_with(RequestModel(delay=0.02), deadline=0.05))
+    assert 1 <= len(presenter.presented) < 10
+    assert presenter.presented[-1] == BaseErrorResponseModel(code=504, message="Deadline exceeded at the dto stage")
+    assert all(isinstance(response, ResponseModel) for response in presenter.presented[:-1])
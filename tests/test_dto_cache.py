@@ -0,0 +1,156 @@
+from lib.cache import DTOCache, LRUCache
+from lib.dto import BaseDTO
+from lib.primary_ports import BaseOutputPort
+from lib.singleflight import SingleFlight
+from lib.usecase import BaseSingleDTOUseCase
+from lib.usecase_models import (
+    BaseAuthenticatedRequestModel,
+    BaseErrorResponseModel,
+    BaseRequestModel,
+    BaseResponseModel,
+)
+
+
+class RequestModel(BaseAuthenticatedRequestModel):
+    item: str
+
+
+class ResponseModel(BaseResponseModel):
+    item: str
+    owner: int
+
+
+class DTO(BaseDTO):
+    item: str
+    owner: int
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now: float = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class Presenter(BaseOutputPort[ResponseModel, BaseErrorResponseModel]):
+    def __init__(self) -> None:
+        super().__init__()
+        self.presented: list[ResponseModel | BaseErrorResponseModel] = []
+
+    def presentSuccess(self, responseModel: ResponseModel) -> None:
+        self.presented.append(responseModel)
+
+    def presentError(self, errorModel: BaseErrorResponseModel) -> None:
+        self.presented.append(errorModel)
+
+
+class UseCase(
+    BaseSingleDTOUseCase[BaseRequestModel, RequestModel, ResponseModel, BaseErrorResponseModel, DTO],
+):
+    calls: int = 0
+
+    def validate_request_model(self, requestModel: BaseRequestModel | RequestModel) -> None:
+        pass
+
+    def make_dto_request(self, requestModel: BaseRequestModel | RequestModel) -> DTO:
+        assert isinstance(requestModel, RequestModel)
+        type(self).calls += 1
+        found = requestModel.item != "missing"
+        return DTO(
+            status=found,
+            errorCode=0 if found else 404,
+            errorName="",
+            errorMessage="",
+            item=requestModel.item,
+            owner=requestModel.user_id,
+        )
+
+    def handle_dto_error(self, dto: DTO) -> BaseErrorResponseModel:
+        return BaseErrorResponseModel(code=dto.errorCode, message="missing")
+
+    def process_dto(self, dto: DTO) -> ResponseModel | BaseErrorResponseModel:
+        return ResponseModel(item=dto.item, owner=dto.owner)
+
+
+def test_lru_cache_evicts_least_recently_used_and_expires() -> None:
+    clock = Clock()
+    cache: LRUCache[str, int] = LRUCache(maxsize=2, ttl=10, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.stats.evictions == 1
+    clock.now = 11
+    assert cache.get("a") is None
+    assert cache.stats.expirations == 1
+    assert cache.stats.hits == 1 and cache.stats.misses == 2
+
+
+def test_dto_cache_is_scoped_per_user_and_invalidated() -> None:
+    class CachedUseCase(UseCase):
+        dto_cache = DTOCache(maxsize=16, ttl=60)
+
+    presenter = Presenter()
+    usecase = CachedUseCase(presenter)
+    usecase.execute(RequestModel(user_id=1, auth_token="a", item="x"))
+    usecase.execute(RequestModel(user_id=1, auth_token="b", item="x"))
+    usecase.execute(RequestModel(user_id=2, auth_token="a", item="x"))
+    assert CachedUseCase.calls == 2
+    assert [r.owner for r in presenter.presented] == [1, 1, 2]  # type: ignore[union-attr]
+
+    assert CachedUseCase.dto_cache is not None
+    assert CachedUseCase.dto_cache.invalidate_user(1) == 1
+    usecase.execute(RequestModel(user_id=1, auth_token="a", item="x"))
+    assert CachedUseCase.calls == 3
+    assert CachedUseCase.dto_cache.stats.hits == 1
+
+
+def test_dto_cache_failed_dtos_are_not_cached_by_default() -> None:
+    clock = Clock()
+
+    class CachedUseCase(UseCase):
+        dto_cache = DTOCache(clock=clock)
+
+    class NegativeCachedUseCase(UseCase):
+        dto_cache = DTOCache(error_ttl=5, clock=clock)
+
+    request = RequestModel(user_id=1, auth_token="a", item="missing")
+    for usecase_class in (CachedUseCase, NegativeCachedUseCase):
+        presenter = Presenter()
+        usecase = usecase_class(presenter)
+        usecase.execute(request)
+        usecase.execute(request)
+        assert all(r.status == False for r in presenter.presented)
+    assert CachedUseCase.calls == 2
+    assert NegativeCachedUseCase.calls == 1
+
+    clock.now = 6
+    NegativeCachedUseCase(Presenter()).execute(request)
+    assert NegativeCachedUseCase.calls == 2
+
+
+def test_use_cases_sharing_a_request_model_do_not_share_dtos() -> None:
+    class CachedUseCase(UseCase):
+        dto_cache = DTOCache()
+        dto_coalescing = SingleFlight()
+
+    class PricingUseCase(CachedUseCase):
+        calls = 0
+
+        def make_dto_request(self, requestModel: BaseRequestModel | RequestModel) -> DTO:
+            dto = super().make_dto_request(requestModel)
+            return dto.model_copy(update={"item": f"price of {dto.item}"})
+
+    request = RequestModel(user_id=1, auth_token="a", item="x")
+    presenters = [Presenter() for _ in range(4)]
+    for usecase in (CachedUseCase(presenters[0]), PricingUseCase(presenters[1]), CachedUseCase(presenters[2])):
+        usecase.execute(request)
+    PricingUseCase(presenters[3]).execute(request)
+    assert [r.item for p in presenters for r in p.presented] == ["x", "price of x"] * 2  # type: ignore[union-attr]
+    assert CachedUseCase.calls == PricingUseCase.calls == 1
+
+    assert CachedUseCase.dto_cache is not None
+    assert CachedUseCase.dto_cache.invalidate(request, PricingUseCase) and len(CachedUseCase.dto_cache) == 1
+    assert CachedUseCase.dto_cache.invalidate(request) and len(CachedUseCase.dto_cache) == 0
@@ -0,0 +1,160 @@
+from typing import Sequence
+from lib.cache import DTOCache
+from lib.deadline import bind_deadline, reset_deadline
+from lib.dto import BaseDTO
+from lib.instrumentation import (
+    PROCESS,
+    PROCESS_ERROR,
+    SUCCESS,
+    TIMEOUT,
+    CallbackSink,
+    ExecutionTrace,
+    instrumentation,
+)
+from lib.presenter import BasePresenter
+from lib.response import PresenterResponse
+from lib.usecase import BaseSingleDTOUseCase
+from lib.usecase_models import (
+    BaseAuthenticatedRequestModel,
+    BaseErrorResponseModel,
+    BaseRequestModel,
+    BaseResponseModel,
+    validate_request_models,
+)
+from lib.view_model import BaseBatchViewModel, BaseViewModel
+
+
+class RequestModel(BaseRequestModel):
+    id: int
+
+
+class ResponseModel(BaseResponseModel):
+    id: int
+
+
+class ErrorResponseModel(BaseErrorResponseModel):
+    pass
+
+
+class DTO(BaseDTO):
+    id: int
+
+
+class ViewModel(BaseViewModel):
+    id: int | None = None
+
+
+class Response(PresenterResponse):
+    def __init__(self) -> None:
+        super().__init__()
+        self.presented: list[BaseViewModel] = []
+
+    def present(self, view_model: BaseViewModel) -> None:
+        self.presented.append(view_model)
+
+
+class Presenter(BasePresenter[ResponseModel, ErrorResponseModel, ViewModel]):
+    def convertResponseToViewModel(self, responseModel: ResponseModel) -> ViewModel:
+        return ViewModel(status=True, id=responseModel.id)
+
+    def convertErrorToViewModel(self, errorModel: ErrorResponseModel) -> ViewModel:
+        return ViewModel(status=False, errorName=str(errorModel.code), errorMessage=errorModel.message)
+
+
+class UseCase(
+    BaseSingleDTOUseCase[RequestModel, BaseAuthenticatedRequestModel, ResponseModel, ErrorResponseModel, DTO]
+):
+    def __init__(self, presenter: Presenter) -> None:
+        super().__init__(presenter)
+        self.bulk_calls: int = 0
+
+    def validate_request_model(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> None:
+        pass
+
+    def make_dto_request(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> DTO:
+        raise AssertionError("the bulk hook should be used")
+
+    def make_dto_requests(self, requestModels: Sequence[RequestModel | BaseAuthenticatedRequestModel]) -> list[DTO]:
+        self.bulk_calls += 1
+        ids = [requestModel.id for requestModel in requestModels]  # type: ignore[union-attr]
+        return [DTO(status=i >= 0, errorCode=0 if i >= 0 else 404, errorName="", errorMessage="", id=i) for i in ids]
+
+    def handle_dto_error(self, dto: DTO) -> ErrorResponseModel:
+        return ErrorResponseModel(code=dto.errorCode, message="not found")
+
+    def process_dto(self, dto: DTO) -> ResponseModel | ErrorResponseModel:
+        if dto.id == 0:
+            return ErrorResponseModel(code=400, message="zero")
+        return ResponseModel(id=dto.id)
+
+
+def test_execute_many_presents_one_batch_with_per_item_status() -> None:
+    response = Response()
+    usecase = UseCase(Presenter(response))
+    requestModels = validate_request_models(RequestModel, [{"id": 1}, {"id": -1}, {"id": 0}, RequestModel(id=2)])
+    usecase.execute_many(requestModels)
+
+    assert usecase.bulk_calls == 1
+    assert len(response.presented) == 1
+    batch = response.presented[0]
+    assert isinstance(batch, BaseBatchViewModel)
+    assert batch.status is False
+    assert batch.items == [
+        ViewModel(status=True, id=1),
+        ViewModel(status=False, errorName="404", errorMessage="not found"),
+        ViewModel(status=False, errorName="400", errorMessage="zero"),
+        ViewModel(status=True, id=2),
+    ]
+    assert batch.model_dump()["items"][0] == {"status": True, "errorName": None, "errorMessage": None, "id": 1}
+
+
+class PerItemUseCase(
+    BaseSingleDTOUseCase[RequestModel, BaseAuthenticatedRequestModel, ResponseModel, ErrorResponseModel, DTO]
+):
+    dto_cache = DTOCache()
+
+    def __init__(self, presenter: Presenter) -> None:
+        super().__init__(presenter)
+        self.fetched: list[int] = []
+
+    def validate_request_model(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> None:
+        pass
+
+    def make_dto_request(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> DTO:
+        assert isinstance(requestModel, RequestModel)
+        self.fetched.append(requestModel.id)
+        return DTO(status=True, errorCode=0, errorName="", errorMessage="", id=requestModel.id)
+
+    def handle_dto_error(self, dto: DTO) -> ErrorResponseModel:
+        return ErrorResponseModel(code=dto.errorCode, message="not found")
+
+    def process_dto(self, dto: DTO) -> ResponseModel | ErrorResponseModel:
+        if dto.id == 0:
+            return ErrorResponseModel(code=400, message="zero")
+        return ResponseModel(id=dto.id)
+
+
+def test_execute_many_fetches_items_like_execute() -> None:
+    traces: list[ExecutionTrace] = []
+    sink = CallbackSink(traces.append)
+    instrumentation.add_sink(sink)
+    try:
+        response = Response()
+        usecase = PerItemUseCase(Presenter(response))
+        usecase.execute(RequestModel(id=1))
+        usecase.execute_many([RequestModel(id=1), RequestModel(id=2), RequestModel(id=0)])
+        assert usecase.fetched == [1, 2, 0]  # the batch's id=1 comes from the DTO cache
+        assert [trace.outcome for trace in traces] == [SUCCESS, PROCESS_ERROR]
+        assert {"dto", PROCESS}.issubset(traces[1].durations)
+
+        token = bind_deadline(-1.0)
+        try:
+            usecase.execute_many([RequestModel(id=3)])
+        finally:
+            reset_deadline(token)
+        assert traces[-1].outcome == TIMEOUT
+        assert response.presented[-1] == ViewModel(
+            status=False, errorName="504", errorMessage="Deadline exceeded at the validate stage"
+        )
+    finally:
+        instrumentation.remove_sink(sink)
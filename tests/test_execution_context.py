@@ -0,0 +1,148 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from lib.dto import BaseDTO
+from lib.presenter import AsyncBasePresenter, BasePresenter
+from lib.response import AsyncPresenterResponse, PresenterResponse
+from lib.usecase import AsyncBaseSingleDTOUseCase, BaseSingleDTOUseCase
+from lib.usecase_models import (
+    BaseAuthenticatedRequestModel,
+    BaseErrorResponseModel,
+    BaseRequestModel,
+    BaseResponseModel,
+)
+from lib.view_model import BaseViewModel
+
+
+class RequestModel(BaseRequestModel):
+    value: int
+
+
+class DTO(BaseDTO):
+    value: int
+
+
+class ResponseModel(BaseResponseModel):
+    value: int
+
+
+class ViewModel(BaseViewModel):
+    value: int | None = None
+
+
+class Response(PresenterResponse):
+    def __init__(self) -> None:
+        super().__init__()
+        self.presented: list[BaseViewModel] = []
+
+    def present(self, view_model: BaseViewModel) -> None:
+        self.presented.append(view_model)
+
+
+class AsyncResponse(AsyncPresenterResponse):
+    def __init__(self) -> None:
+        super().__init__()
+        self.presented: list[BaseViewModel] = []
+
+    async def present(self, view_model: BaseViewModel) -> None:
+        self.presented.append(view_model)
+
+
+class Presenter(BasePresenter[ResponseModel, BaseErrorResponseModel, ViewModel]):
+    def convertResponseToViewModel(self, responseModel: ResponseModel) -> ViewModel:
+        return ViewModel(status=True, value=responseModel.value)
+
+    def convertErrorToViewModel(self, errorModel: BaseErrorResponseModel) -> ViewModel:
+        return ViewModel(status=False, errorMessage=errorModel.message)
+
+
+class AsyncPresenter(AsyncBasePresenter[ResponseModel, BaseErrorResponseModel, ViewModel]):
+    def convertResponseToViewModel(self, responseModel: ResponseModel) -> ViewModel:
+        return ViewModel(status=True, value=responseModel.value)
+
+    def convertErrorToViewModel(self, errorModel: BaseErrorResponseModel) -> ViewModel:
+        return ViewModel(status=False, errorMessage=errorModel.message)
+
+
+class UseCase(
+    BaseSingleDTOUseCase[RequestModel, BaseAuthenticatedRequestModel, ResponseModel, BaseErrorResponseModel, DTO]
+):
+    def __init__(self, inner: "UseCase | None" = None) -> None:
+        super().__init__()
+        self.inner: UseCase | None = inner
+
+    def validate_request_model(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> None:
+        pass
+
+    def make_dto_request(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> DTO:
+        assert isinstance(requestModel, RequestModel)
+        if self.inner is not None:
+            self.inner.execute(requestModel)
+        return DTO(status=True, errorCode=0, errorName="", errorMessage="", value=requestModel.value)
+
+    def handle_dto_error(self, dto: DTO) -> BaseErrorResponseModel:
+        raise NotImplementedError
+
+    def process_dto(self, dto: DTO) -> ResponseModel | BaseErrorResponseModel:
+        return ResponseModel(value=dto.value * 2)
+
+
+class AsyncUseCase(
+    AsyncBaseSingleDTOUseCase[RequestModel, BaseAuthenticatedRequestModel, ResponseModel, BaseErrorResponseModel, DTO]
+):
+    async def validate_request_model(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> None:
+        pass
+
+    async def make_dto_request(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> DTO:
+        assert isinstance(requestModel, RequestModel)
+        await asyncio.sleep(0.001 * (requestModel.value % 3))
+        return DTO(status=True, errorCode=0, errorName="", errorMessage="", value=requestModel.value)
+
+    def handle_dto_error(self, dto: DTO) -> BaseErrorResponseModel:
+        raise NotImplementedError
+
+    async def process_dto(self, dto: DTO) -> ResponseModel | BaseErrorResponseModel:
+        return ResponseModel(value=dto.value * 2)
+
+
+def test_shared_instances_bind_response_per_invocation_across_threads() -> None:
+    usecase = UseCase()
+    presenter = Presenter()
+    responses = [Response() for _ in range(50)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        for future in [
+            pool.submit(usecase.execute_with, RequestModel(value=i), presenter, response)
+            for i, response in enumerate(responses)
+        ]:
+            future.result()
+    assert all(response.presented == [ViewModel(status=True, value=i * 2)] for i, response in enumerate(responses))
+
+
+def test_shared_instances_bind_response_per_invocation_across_tasks() -> None:
+    usecase = AsyncUseCase(AsyncPresenter())
+    responses = [AsyncResponse() for _ in range(30)]
+
+    async def run_all() -> None:
+        await asyncio.gather(
+            *(usecase.execute_with(RequestModel(value=i), response=response) for i, response in enumerate(responses))
+        )
+
+    asyncio.run(run_all())
+    assert all(response.presented == [ViewModel(status=True, value=i * 2)] for i, response in enumerate(responses))
+
+
+def test_bound_presenter_does_not_leak_into_nested_use_cases() -> None:
+    inner_response = Response()
+    inner = UseCase()
+    inner.presenter = Presenter(inner_response)
+    outer_response = Response()
+    UseCase(inner).execute_with(RequestModel(value=1), Presenter(), outer_response)
+    assert inner_response.presented == [ViewModel(status=True, value=2)]
+    assert outer_response.presented == [ViewModel(status=True, value=2)]
+
+
+def test_missing_presenter_or_response_is_reported() -> None:
+    with pytest.raises(RuntimeError, match="no presenter"):
+        UseCase().execute(RequestModel(value=1))
+    with pytest.raises(RuntimeError, match="no presenter response"):
+        UseCase().execute_with(RequestModel(value=1), Presenter())
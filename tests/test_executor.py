@@ -0,0 +1,199 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Executor, Future
+from typing import Any
+from lib.deadline import bind_deadline, current_deadline, reset_deadline
+from lib.executor import AsyncUseCaseExecutor, UseCaseExecutor
+from lib.primary_ports import AsyncBaseInputPort, AsyncBaseOutputPort, BaseInputPort, BaseOutputPort
+from lib.usecase_models import BaseErrorResponseModel, BaseRequestModel, BaseResponseModel
+
+
+class RequestModel(BaseRequestModel):
+    value: int
+
+
+class ResponseModel(BaseResponseModel):
+    value: int
+
+
+class Presenter(BaseOutputPort[ResponseModel, BaseErrorResponseModel]):
+    def __init__(self) -> None:
+        super().__init__()
+        self.presented: list[ResponseModel | BaseErrorResponseModel] = []
+
+    def presentSuccess(self, responseModel: ResponseModel) -> None:
+        self.presented.append(responseModel)
+
+    def presentError(self, errorModel: BaseErrorResponseModel) -> None:
+        self.presented.append(errorModel)
+
+
+class AsyncPresenter(AsyncBaseOutputPort[ResponseModel, BaseErrorResponseModel]):
+    def __init__(self) -> None:
+        super().__init__()
+        self.presented: list[ResponseModel | BaseErrorResponseModel] = []
+
+    async def presentSuccess(self, responseModel: ResponseModel) -> None:
+        self.presented.append(responseModel)
+
+    async def presentError(self, errorModel: BaseErrorResponseModel) -> None:
+        self.presented.append(errorModel)
+
+
+class UseCase(BaseInputPort[RequestModel]):
+    """
+    Doubles the value. Module-level so the process backend can pickle it as a factory.
+    """
+
+    def __init__(self, presenter: BaseOutputPort[ResponseModel, BaseErrorResponseModel]) -> None:
+        super().__init__()
+        self.presenter = presenter
+
+    def execute(self, requestModel: RequestModel) -> None:
+        self.presenter.presentSuccess(ResponseModel(value=requestModel.value * 2))
+
+
+class GatedUseCase(UseCase):
+    gate: threading.Event = threading.Event()
+    running: int = 0
+    peak: int = 0
+    lock: threading.Lock = threading.Lock()
+
+    def execute(self, requestModel: RequestModel) -> None:
+        cls = type(self)
+        with cls.lock:
+            cls.running += 1
+            cls.peak = max(cls.peak, cls.running)
+        cls.gate.wait(5)
+        with cls.lock:
+            cls.running -= 1
+        super().execute(requestModel)
+
+
+class AsyncUseCase(AsyncBaseInputPort[RequestModel]):
+    running: int = 0
+    peak: int = 0
+
+    def __init__(self, presenter: AsyncBaseOutputPort[ResponseModel, BaseErrorResponseModel]) -> None:
+        super().__init__()
+        self.presenter = presenter
+
+    async def execute(self, requestModel: RequestModel) -> None:
+        cls = type(self)
+        cls.running += 1
+        cls.peak = max(cls.peak, cls.running)
+        await asyncio.sleep(0.01)
+        cls.running -= 1
+        await self.presenter.presentSuccess(ResponseModel(value=requestModel.value * 2))
+
+
+def test_thread_backend_limits_concurrency_and_rejects_when_full() -> None:
+    executor = UseCaseExecutor(max_workers=4, max_queue=3)
+    executor.register(RequestModel, GatedUseCase, max_concurrency=2)
+    presenters = [Presenter() for _ in range(7)]
+    futures = [executor.submit(RequestModel(value=i), presenter) for i, presenter in enumerate(presenters)]
+
+    assert executor.metrics.running == 2
+    assert executor.metrics.queue_depth == 3
+    assert executor.metrics.rejected == 2
+    assert presenters[6].presented[0].status is False
+    assert presenters[6].presented[0].code == 503
+
+    GatedUseCase.gate.set()
+    for future in futures:
+        future.result(timeout=5)
+    executor.shutdown()
+    assert GatedUseCase.peak == 2
+    assert [p.presented for p in presenters[:5]] == [[ResponseModel(value=i * 2)] for i in range(5)]
+    assert executor.metrics.completed == 5
+    assert executor.metrics.max_queue_depth == 3
+    assert executor.metrics.wait_time_percentiles((50,))[50] >= 0
+
+
+def test_thread_backend_blocks_submitter_when_full() -> None:
+    class Gated(GatedUseCase):
+        gate = threading.Event()
+
+    executor = UseCaseExecutor(max_workers=1, max_queue=1, block=True)
+    executor.register(RequestModel, Gated)
+    presenters = [Presenter() for _ in range(3)]
+    executor.submit(RequestModel(value=0), presenters[0])
+    executor.submit(RequestModel(value=1), presenters[1])
+    threading.Timer(0.05, Gated.gate.set).start()
+    start = time.monotonic()
+    executor.submit(RequestModel(value=2), presenters[2]).result(timeout=5)
+    assert time.monotonic() - start >= 0.04
+    assert executor.metrics.rejected == 0
+    executor.shutdown()
+
+
+def test_process_backend_replays_presentations_in_parent() -> None:
+    executor = UseCaseExecutor(backend="process", max_workers=2)
+    executor.register(RequestModel, UseCase)
+    presenter = Presenter()
+    for future in [executor.submit(RequestModel(value=i), presenter) for i in range(4)]:
+        future.result(timeout=30)
+    executor.shutdown()
+    assert sorted(r.value for r in presenter.presented) == [0, 2, 4, 6]  # type: ignore[union-attr]
+
+
+def test_asyncio_backend_limits_concurrency_and_rejects() -> None:
+    executor = AsyncUseCaseExecutor(max_concurrency=10, max_queue=5)
+    executor.register(RequestModel, AsyncUseCase, max_concurrency=3)
+    presenters = [AsyncPresenter() for _ in range(20)]
+
+    async def run_all() -> Any:
+        return await asyncio.gather(*(executor.submit(RequestModel(value=i), p) for i, p in enumerate(presenters)))
+
+    asyncio.run(run_all())
+    assert AsyncUseCase.peak == 3
+    assert executor.metrics.completed == 8
+    assert executor.metrics.rejected == 12
+    assert sum(p.presented[0].status is False for p in presenters) == 12
+
+
+def test_thread_backend_runs_jobs_in_the_submitters_context() -> None:
+    timeouts: list[float | None] = []
+
+    class DeadlineUseCase(UseCase):
+        def execute(self, requestModel: RequestModel) -> None:
+            timeouts.append(current_deadline().timeout())
+            super().execute(requestModel)
+
+    executor = UseCaseExecutor(max_workers=1)
+    executor.register(RequestModel, DeadlineUseCase)
+    token = bind_deadline(0.5)
+    try:
+        future = executor.submit(RequestModel(value=1), Presenter())
+    finally:
+        reset_deadline(token)
+    future.result(timeout=5)
+    executor.shutdown()
+    assert len(timeouts) == 1 and timeouts[0] is not None and 0 < timeouts[0] <= 0.5
+
+
+class InlinePool(Executor):
+    """
+    Runs every job in submit, so the executor only ever sees futures that are already done.
+    """
+
+    def submit(self, fn: Any, /, *args: Any, **kwargs: Any) -> "Future[Any]":
+        future: Future[Any] = Future()
+        future.set_result(fn(*args, **kwargs))
+        return future
+
+
+def test_thread_backend_handles_finished_jobs_without_recursing_under_the_lock() -> None:
+    executor = UseCaseExecutor(max_workers=1, max_queue=5000)
+    executor.register(RequestModel, UseCase)
+    executor.shutdown()
+    executor._pool = InlinePool()
+    executor.max_workers = 0
+    presenters = [Presenter() for _ in range(3000)]
+    futures = [executor.submit(RequestModel(value=i), presenter) for i, presenter in enumerate(presenters)]
+    executor.max_workers = 1
+    futures.append(executor.submit(RequestModel(value=0), Presenter()))
+    assert all(future.done() for future in futures)
+    assert executor.metrics.completed == 3001 and executor.metrics.running == 0
+    assert [presenter.presented[0].value for presenter in presenters] == [i * 2 for i in range(3000)]  # type: ignore[union-attr]
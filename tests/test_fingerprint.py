@@ -0,0 +1,162 @@
+import asyncio
+from pathlib import Path
+from lib.dto import BaseDTO
+from lib.fingerprint import fingerprint, fingerprint_bytes
+from lib.json_response import AsyncJSONPresenterResponse, JSONPresenterResponse
+from lib.payload import Payload
+from lib.presenter import AsyncBasePresenter, BasePresenter
+from lib.response import PresenterResponse
+from lib.usecase import AsyncBaseSingleDTOUseCase, BaseSingleDTOUseCase
+from lib.usecase_models import (
+    BaseAuthenticatedRequestModel,
+    BaseErrorResponseModel,
+    BaseRequestModel,
+    BaseResponseModel,
+)
+from lib.view_model import BaseViewModel, NotModifiedViewModel
+
+
+class RequestModel(BaseRequestModel):
+    id: int
+
+
+class DTO(BaseDTO):
+    id: int
+    name: str
+
+
+class ResponseModel(BaseResponseModel):
+    id: int
+    name: str
+
+
+class OtherResponseModel(BaseResponseModel):
+    id: int
+    name: str
+
+
+class ViewModel(BaseViewModel):
+    name: str | None = None
+
+
+class Response(PresenterResponse):
+    def __init__(self) -> None:
+        super().__init__()
+        self.presented: list[BaseViewModel] = []
+
+    def present(self, view_model: BaseViewModel) -> None:
+        self.presented.append(view_model)
+
+
+class Presenter(BasePresenter[ResponseModel, BaseErrorResponseModel, ViewModel]):
+    conditional = True
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.converted: int = 0
+
+    def convertResponseToViewModel(self, responseModel: ResponseModel) -> ViewModel:
+        self.converted += 1
+        return ViewModel(status=True, name=responseModel.name)
+
+    def convertErrorToViewModel(self, errorModel: BaseErrorResponseModel) -> ViewModel:
+        return ViewModel(status=False, errorMessage=errorModel.message)
+
+
+class AsyncPresenter(AsyncBasePresenter[ResponseModel, BaseErrorResponseModel, ViewModel]):
+    conditional = True
+
+    def convertResponseToViewModel(self, responseModel: ResponseModel) -> ViewModel:
+        return ViewModel(status=True, name=responseModel.name)
+
+    def convertErrorToViewModel(self, errorModel: BaseErrorResponseModel) -> ViewModel:
+        return ViewModel(status=False, errorMessage=errorModel.message)
+
+
+class UseCase(
+    BaseSingleDTOUseCase[RequestModel, BaseAuthenticatedRequestModel, ResponseModel, BaseErrorResponseModel, DTO]
+):
+    def validate_request_model(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> None:
+        pass
+
+    def make_dto_request(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> DTO:
+        assert isinstance(requestModel, RequestModel)
+        return DTO(status=True, errorCode=0, errorName="", errorMessage="", id=requestModel.id, name="ada")
+
+    def handle_dto_error(self, dto: DTO) -> BaseErrorResponseModel:
+        return BaseErrorResponseModel(code=dto.errorCode, message=dto.errorMessage)
+
+    def process_dto(self, dto: DTO) -> ResponseModel | BaseErrorResponseModel:
+        return ResponseModel(id=dto.id, name=dto.name)
+
+
+class AsyncUseCase(
+    AsyncBaseSingleDTOUseCase[RequestModel, BaseAuthenticatedRequestModel, ResponseModel, BaseErrorResponseModel, DTO]
+):
+    async def validate_request_model(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> None:
+        pass
+
+    async def make_dto_request(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> DTO:
+        assert isinstance(requestModel, RequestModel)
+        return DTO(status=True, errorCode=0, errorName="", errorMessage="", id=requestModel.id, name="ada")
+
+    def handle_dto_error(self, dto: DTO) -> BaseErrorResponseModel:
+        return BaseErrorResponseModel(code=dto.errorCode, message=dto.errorMessage)
+
+    async def process_dto(self, dto: DTO) -> ResponseModel | BaseErrorResponseModel:
+        return ResponseModel(id=dto.id, name=dto.name)
+
+
+def test_fingerprints_are_stable_content_hashes() -> None:
+    tag = fingerprint(ResponseModel(id=1, name="ada"))
+    assert len(tag) == 32 and tag == fingerprint(ResponseModel.trusted(id=1, name="ada"))
+    assert tag != fingerprint(ResponseModel(id=2, name="ada"))
+    assert tag != fingerprint(OtherResponseModel(id=1, name="ada"))
+    assert fingerprint_bytes(b"{}") == fingerprint_bytes(memoryview(b"{}"))
+
+
+def test_matching_fingerprint_skips_conversion() -> None:
+    presenter = Presenter()
+    usecase = UseCase(presenter)
+    first = JSONPresenterResponse()
+    usecase.execute_with(RequestModel(id=1), response=first)
+    assert (
+        first.status_code == 200
+        and bytes(first.body) == b'{"status":true,"errorName":null,"errorMessage":null,"name":"ada"}'
+    )
+    assert first.fingerprint == fingerprint(ResponseModel(id=1, name="ada"))
+
+    second = JSONPresenterResponse()
+    usecase.execute_with(RequestModel(id=1), response=second, if_none_match=first.fingerprint)
+    assert second.status_code == 304 and bytes(second.body) == b"" and presenter.converted == 1
+
+    third = JSONPresenterResponse()
+    usecase.execute_with(RequestModel(id=2), response=third, if_none_match=first.fingerprint)
+    assert third.status_code == 200 and third.fingerprint != first.fingerprint and presenter.converted == 2
+
+
+def test_default_not_modified_presents_a_view_model() -> None:
+    response = Response()
+    tag = fingerprint(ResponseModel(id=1, name="ada"))
+    UseCase(Presenter()).execute_with(RequestModel(id=1), response=response, if_none_match=tag)
+    assert response.presented == [NotModifiedViewModel(status=True, fingerprint=tag)]
+
+
+def test_async_matching_fingerprint() -> None:
+    response = AsyncJSONPresenterResponse()
+    tag = fingerprint(ResponseModel(id=1, name="ada"))
+    asyncio.run(AsyncUseCase(AsyncPresenter()).execute_with(RequestModel(id=1), response=response, if_none_match=tag))
+    assert response.status_code == 304 and response.fingerprint == tag
+
+
+class ReportResponseModel(BaseResponseModel):
+    content: Payload
+
+
+def test_fingerprint_hashes_payload_content(tmp_path: Path) -> None:
+    path = tmp_path / "report.csv"
+    path.write_bytes(b"a,b\n1,2\n")
+    first = ReportResponseModel(content=Payload.from_buffer(b"a,b\n1,2\n", media_type="text/csv"))
+    same = ReportResponseModel(content=Payload.from_file(path, media_type="text/csv"))
+    changed = ReportResponseModel(content=Payload.from_buffer(b"a,b\n3,4\n", media_type="text/csv"))
+    assert fingerprint(first) == fingerprint(same) != fingerprint(changed)
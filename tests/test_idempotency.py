@@ -0,0 +1,325 @@
+import asyncio
+from pathlib import Path
+from lib.auth import TokenVerifier
+from lib.dto import BaseDTO
+from lib.idempotency import (
+    AsyncIdempotentUseCase,
+    IdempotentUseCase,
+    InMemoryIdempotencyStore,
+    SQLiteIdempotencyStore,
+    idempotency_key,
+    scoped_key,
+)
+from lib.payload import Payload
+from lib.presenter import AsyncBasePresenter, BasePresenter
+from lib.response import AsyncPresenterResponse, PresenterResponse
+from lib.usecase import AsyncBaseSingleDTOUseCase, BaseSingleDTOUseCase
+from lib.usecase_models import (
+    BaseAuthenticatedRequestModel,
+    BaseErrorResponseModel,
+    BaseRequestModel,
+    BaseResponseModel,
+)
+from lib.view_model import BaseViewModel
+
+
+class RequestModel(BaseRequestModel):
+    amount: int
+
+
+class AuthenticatedRequestModel(BaseAuthenticatedRequestModel):
+    amount: int
+
+
+class DTO(BaseDTO):
+    payment_id: int
+
+
+class ResponseModel(BaseResponseModel):
+    payment_id: int
+
+
+class ViewModel(BaseViewModel):
+    payment_id: int | None = None
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now: float = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class Response(PresenterResponse):
+    def __init__(self) -> None:
+        super().__init__()
+        self.presented: list[BaseViewModel] = []
+
+    def present(self, view_model: BaseViewModel) -> None:
+        self.presented.append(view_model)
+
+
+class AsyncResponse(AsyncPresenterResponse):
+    def __init__(self) -> None:
+        super().__init__()
+        self.presented: list[BaseViewModel] = []
+
+    async def present(self, view_model: BaseViewModel) -> None:
+        self.presented.append(view_model)
+
+
+class Presenter(BasePresenter[ResponseModel, BaseErrorResponseModel, ViewModel]):
+    def convertResponseToViewModel(self, responseModel: ResponseModel) -> ViewModel:
+        return ViewModel(status=True, payment_id=responseModel.payment_id)
+
+    def convertErrorToViewModel(self, errorModel: BaseErrorResponseModel) -> ViewModel:
+        return ViewModel(status=False, errorName=str(errorModel.code), errorMessage=errorModel.message)
+
+
+class AsyncPresenter(AsyncBasePresenter[ResponseModel, BaseErrorResponseModel, ViewModel]):
+    def convertResponseToViewModel(self, responseModel: ResponseModel) -> ViewModel:
+        return ViewModel(status=True, payment_id=responseModel.payment_id)
+
+    def convertErrorToViewModel(self, errorModel: BaseErrorResponseModel) -> ViewModel:
+        return ViewModel(status=False, errorName=str(errorModel.code), errorMessage=errorModel.message)
+
+
+class UseCase(
+    BaseSingleDTOUseCase[RequestModel, BaseAuthenticatedRequestModel, ResponseModel, BaseErrorResponseModel, DTO]
+):
+    def __init__(self, presenter: Presenter) -> None:
+        super().__init__(presenter)
+        self.payments: int = 0
+
+    def validate_request_model(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> None:
+        pass
+
+    def make_dto_request(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> DTO:
+        assert isinstance(requestModel, RequestModel)
+        self.payments += 1  # the side effect retries must not repeat
+        ok = requestModel.amount > 0
+        return DTO(status=ok, errorCode=402, errorName="", errorMessage="declined", payment_id=self.payments)
+
+    def handle_dto_error(self, dto: DTO) -> BaseErrorResponseModel:
+        return BaseErrorResponseModel(code=dto.errorCode, message=dto.errorMessage)
+
+    def process_dto(self, dto: DTO) -> ResponseModel | BaseErrorResponseModel:
+        return ResponseModel(payment_id=dto.payment_id)
+
+
+class Verifier(TokenVerifier):
+    def verify(self, user_id: int, auth_token: str) -> bool:
+        return auth_token == f"token-{user_id}"
+
+
+class AuthUseCase(UseCase):
+    token_verifier = Verifier()
+
+    def make_dto_request(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> DTO:
+        assert isinstance(requestModel, AuthenticatedRequestModel)
+        self.payments += 1
+        return DTO(status=True, errorCode=0, errorName="", errorMessage="", payment_id=self.payments)
+
+
+class AsyncUseCase(
+    AsyncBaseSingleDTOUseCase[RequestModel, BaseAuthenticatedRequestModel, ResponseModel, BaseErrorResponseModel, DTO]
+):
+    def __init__(self, presenter: AsyncPresenter) -> None:
+        super().__init__(presenter)
+        self.payments: int = 0
+
+    async def validate_request_model(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> None:
+        pass
+
+    async def make_dto_request(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> DTO:
+        self.payments += 1
+        await asyncio.sleep(0.01)
+        return DTO(status=True, errorCode=0, errorName="", errorMessage="", payment_id=self.payments)
+
+    def handle_dto_error(self, dto: DTO) -> BaseErrorResponseModel:
+        return BaseErrorResponseModel(code=dto.errorCode, message=dto.errorMessage)
+
+    async def process_dto(self, dto: DTO) -> ResponseModel | BaseErrorResponseModel:
+        return ResponseModel(payment_id=dto.payment_id)
+
+
+def test_duplicates_are_replayed_without_executing_again() -> None:
+    clock = Clock()
+    usecase = UseCase(Presenter())
+    idempotent: IdempotentUseCase[RequestModel] = IdempotentUseCase(
+        usecase, InMemoryIdempotencyStore(clock=clock), ttl=60
+    )
+    responses = [Response() for _ in range(4)]
+    idempotent.execute_with(RequestModel(amount=10), response=responses[0])
+    idempotent.execute_with(RequestModel(amount=10), response=responses[1])
+    idempotent.execute_with(RequestModel(amount=10), response=responses[2], idempotency_key="client-key")
+    clock.now += 61
+    idempotent.execute_with(RequestModel(amount=10), response=responses[3])
+
+    assert [response.presented for response in responses] == [
+        [ViewModel(status=True, payment_id=1)],
+        [ViewModel(status=True, payment_id=1)],
+        [ViewModel(status=True, payment_id=2)],
+        [ViewModel(status=True, payment_id=3)],
+    ]
+    assert usecase.payments == 3
+    assert idempotent.replayed == 1
+
+
+def test_failed_executions_are_not_stored_unless_asked() -> None:
+    usecase = UseCase(Presenter())
+    idempotent: IdempotentUseCase[RequestModel] = IdempotentUseCase(usecase, InMemoryIdempotencyStore())
+    for _ in range(2):
+        idempotent.execute_with(RequestModel(amount=0), response=Response())
+    assert usecase.payments == 2
+
+    idempotent.store_errors = True
+    responses = [Response() for _ in range(2)]
+    for response in responses:
+        idempotent.execute_with(RequestModel(amount=0), response=response)
+    assert usecase.payments == 3
+    assert (
+        responses[0].presented
+        == responses[1].presented
+        == [ViewModel(status=False, errorName="402", errorMessage="declined")]
+    )
+
+
+def test_idempotency_key_is_scoped_to_the_user_and_ignores_the_token() -> None:
+    key = idempotency_key(AuthenticatedRequestModel(user_id=1, auth_token="a", amount=5))
+    assert key == idempotency_key(AuthenticatedRequestModel(user_id=1, auth_token="b", amount=5))
+    assert key != idempotency_key(AuthenticatedRequestModel(user_id=2, auth_token="a", amount=5))
+    assert key != idempotency_key(RequestModel(amount=5))
+
+
+def test_sqlite_store_is_shared_and_expires(tmp_path: Path) -> None:
+    clock = Clock()
+    path = str(tmp_path / "idempotency.db")
+    first, second = SQLiteIdempotencyStore(path, clock=clock), SQLiteIdempotencyStore(path, clock=clock)
+    usecase = UseCase(Presenter())
+    for store in (first, second):
+        IdempotentUseCase[RequestModel](usecase, store, ttl=10).execute_with(
+            RequestModel(amount=3), response=Response()
+        )
+    assert usecase.payments == 1
+    clock.now += 11
+    request = RequestModel(amount=3)
+    assert second.get(scoped_key(request, idempotency_key(request))) is None
+    assert first.evict_expired() == 1
+    first.close()
+    second.close()
+
+
+def test_async_concurrent_duplicates_execute_once() -> None:
+    usecase = AsyncUseCase(AsyncPresenter())
+    idempotent: AsyncIdempotentUseCase[RequestModel] = AsyncIdempotentUseCase(usecase, InMemoryIdempotencyStore())
+    responses = [AsyncResponse() for _ in range(3)]
+
+    async def run() -> None:
+        await asyncio.gather(*(idempotent.execute_with(RequestModel(amount=1), response=r) for r in responses))
+
+    asyncio.run(run())
+    assert usecase.payments == 1
+    assert all(response.presented == [ViewModel(status=True, payment_id=1)] for response in responses)
+
+
+def test_forged_tokens_are_rejected_before_replay() -> None:
+    usecase = AuthUseCase(Presenter())
+    idempotent: IdempotentUseCase[AuthenticatedRequestModel] = IdempotentUseCase(usecase, InMemoryIdempotencyStore())
+    first, forged = Response(), Response()
+    idempotent.execute_with(AuthenticatedRequestModel(user_id=1, auth_token="token-1", amount=5), response=first)
+    idempotent.execute_with(AuthenticatedRequestModel(user_id=1, auth_token="forged", amount=5), response=forged)
+    assert first.presented == [ViewModel(status=True, payment_id=1)]
+    assert forged.presented == [ViewModel(status=False, errorName="401", errorMessage="Invalid authentication token")]
+    assert idempotent.replayed == 0
+
+
+def test_client_keys_are_scoped_to_the_user() -> None:
+    usecase = AuthUseCase(Presenter())
+    idempotent: IdempotentUseCase[AuthenticatedRequestModel] = IdempotentUseCase(usecase, InMemoryIdempotencyStore())
+    responses = [Response() for _ in range(3)]
+    for user_id, response in zip((2, 3, 2), responses):
+        request = AuthenticatedRequestModel(user_id=user_id, auth_token=f"token-{user_id}", amount=5)
+        idempotent.execute_with(request, response=response, idempotency_key="k1")
+    assert [response.presented for response in responses] == [
+        [ViewModel(status=True, payment_id=1)],
+        [ViewModel(status=True, payment_id=2)],
+        [ViewModel(status=True, payment_id=1)],
+    ]
+    assert scoped_key(RequestModel(amount=1), "k1") != scoped_key(
+        AuthenticatedRequestModel(user_id=0, auth_token="", amount=1), "k1"
+    )
+
+
+class ConditionalPresenter(Presenter):
+    conditional = True
+
+    def fingerprintResponse(self, responseModel: ResponseModel) -> str:
+        return f"v{responseModel.payment_id}"
+
+
+class ConditionalResponse(Response):
+    def __init__(self) -> None:
+        super().__init__()
+        self.not_modified: list[str] = []
+
+    def present_not_modified(self, fingerprint: str) -> None:
+        self.not_modified.append(fingerprint)
+
+
+def test_fingerprints_reach_the_caller_on_execution_and_replay() -> None:
+    usecase = UseCase(ConditionalPresenter())
+    idempotent: IdempotentUseCase[RequestModel] = IdempotentUseCase(usecase, InMemoryIdempotencyStore())
+    first, replayed, revalidated = ConditionalResponse(), ConditionalResponse(), ConditionalResponse()
+    idempotent.execute_with(RequestModel(amount=4), response=first)
+    idempotent.execute_with(RequestModel(amount=4), response=replayed)
+    idempotent.execute_with(RequestModel(amount=4), response=revalidated, if_none_match="v1")
+    assert first.fingerprint == replayed.fingerprint == revalidated.fingerprint == "v1"
+    assert first.presented == replayed.presented == [ViewModel(status=True, payment_id=1)]
+    assert revalidated.presented == [] and revalidated.not_modified == ["v1"]
+    assert usecase.payments == 1 and idempotent.replayed == 2
+
+
+def test_not_modified_results_are_not_stored() -> None:
+    store = InMemoryIdempotencyStore()
+    usecase = UseCase(ConditionalPresenter())
+    idempotent: IdempotentUseCase[RequestModel] = IdempotentUseCase(usecase, store)
+    skipped, full = ConditionalResponse(), ConditionalResponse()
+    idempotent.execute_with(RequestModel(amount=4), response=skipped, if_none_match="v1")
+    assert skipped.not_modified == ["v1"] and skipped.presented == [] and len(store) == 0
+    idempotent.execute_with(RequestModel(amount=4), response=full)
+    assert full.fingerprint == "v2" and full.presented == [ViewModel(status=True, payment_id=2)]
+
+
+class ReportViewModel(BaseViewModel):
+    content: Payload | None = None
+    attachments: list[Payload] = []
+
+
+class ReportPresenter(BasePresenter[ResponseModel, BaseErrorResponseModel, ReportViewModel]):
+    def convertResponseToViewModel(self, responseModel: ResponseModel) -> ReportViewModel:
+        report = f"payment\t{responseModel.payment_id}\n".encode()
+        return ReportViewModel(
+            status=True,
+            content=Payload.from_buffer(report, "text/tab-separated-values"),
+            attachments=[Payload.from_buffer(b"\x00\n\t\xff"), Payload.from_loader(lambda: [b"a", b"b"], 2)],
+        )
+
+    def convertErrorToViewModel(self, errorModel: BaseErrorResponseModel) -> ReportViewModel:
+        return ReportViewModel(status=False, errorName=str(errorModel.code), errorMessage=errorModel.message)
+
+
+def test_duplicates_replay_payload_content() -> None:
+    usecase = UseCase(ReportPresenter())  # type: ignore[arg-type]
+    idempotent: IdempotentUseCase[RequestModel] = IdempotentUseCase(usecase, InMemoryIdempotencyStore())
+    first, replayed = Response(), Response()
+    idempotent.execute_with(RequestModel(amount=7), response=first)
+    idempotent.execute_with(RequestModel(amount=7), response=replayed)
+    assert usecase.payments == 1 and idempotent.replayed == 1
+    for response in (first, replayed):
+        [view_model] = response.presented
+        assert isinstance(view_model, ReportViewModel) and view_model.content is not None
+        assert view_model.content.read() == b"payment\t1\n"
+        assert view_model.content.media_type == "text/tab-separated-values"
+        assert [attachment.read() for attachment in view_model.attachments] == [b"\x00\n\t\xff", b"ab"]
@@ -0,0 +1,138 @@
+from typing import Iterator
+import pytest
+from lib.dto import BaseDTO
+from lib.instrumentation import (
+    NULL_TRACE,
+    CallbackSink,
+    ExecutionTrace,
+    HistogramSink,
+    PrometheusSink,
+    current_trace,
+    instrumentation,
+)
+from lib.presenter import BasePresenter
+from lib.response import PresenterResponse
+from lib.usecase import BaseSingleDTOUseCase
+from lib.usecase_models import (
+    BaseAuthenticatedRequestModel,
+    BaseErrorResponseModel,
+    BaseRequestModel,
+    BaseResponseModel,
+)
+from lib.view_model import BaseViewModel
+
+
+class RequestModel(BaseRequestModel):
+    value: int
+
+
+class DTO(BaseDTO):
+    value: int
+
+
+class ResponseModel(BaseResponseModel):
+    value: int
+
+
+class Response(PresenterResponse):
+    def present(self, view_model: BaseViewModel) -> None:
+        pass
+
+
+class Presenter(BasePresenter[ResponseModel, BaseErrorResponseModel, BaseViewModel]):
+    def convertResponseToViewModel(self, responseModel: ResponseModel) -> BaseViewModel:
+        return BaseViewModel(status=True)
+
+    def convertErrorToViewModel(self, errorModel: BaseErrorResponseModel) -> BaseViewModel:
+        return BaseViewModel(status=False, errorMessage=errorModel.message)
+
+
+class UseCase(
+    BaseSingleDTOUseCase[RequestModel, BaseAuthenticatedRequestModel, ResponseModel, BaseErrorResponseModel, DTO]
+):
+    def validate_request_model(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> None:
+        assert isinstance(requestModel, RequestModel)
+        if requestModel.value > 100:
+            raise ValueError("too large")
+
+    def make_dto_request(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> DTO:
+        assert isinstance(requestModel, RequestModel)
+        return DTO(status=requestModel.value >= 0, errorCode=0, errorName="", errorMessage="", value=requestModel.value)
+
+    def handle_dto_error(self, dto: DTO) -> BaseErrorResponseModel:
+        return BaseErrorResponseModel(code=400, message="negative")
+
+    def process_dto(self, dto: DTO) -> ResponseModel | BaseErrorResponseModel:
+        if dto.value == 0:
+            return BaseErrorResponseModel(code=400, message="zero")
+        return ResponseModel(value=dto.value)
+
+
+@pytest.fixture
+def histogram() -> Iterator[HistogramSink]:
+    sink = HistogramSink()
+    instrumentation.add_sink(sink)
+    yield sink
+    instrumentation.remove_sink(sink)
+
+
+def test_disabled_instrumentation_uses_null_trace() -> None:
+    assert not instrumentation.enabled
+    assert instrumentation.start(object()) is NULL_TRACE
+    assert current_trace() is NULL_TRACE
+
+
+def test_stage_durations_and_outcomes_are_recorded(histogram: HistogramSink) -> None:
+    traces: list[ExecutionTrace] = []
+    callback = CallbackSink(traces.append)
+    instrumentation.add_sink(callback)
+    try:
+        usecase = UseCase(Presenter(Response()))
+        for value in (1, 2, -1, 0):
+            usecase.execute(RequestModel(value=value))
+        with pytest.raises(ValueError):
+            usecase.execute(RequestModel(value=101))
+    finally:
+        instrumentation.remove_sink(callback)
+
+    assert [trace.outcome for trace in traces] == ["success", "success", "dto_error", "process_error", "exception"]
+    assert set(traces[0].durations) == {"validate", "dto", "process", "convert", "present"}
+    assert all(trace.total >= sum(trace.durations.values()) for trace in traces)
+    assert current_trace() is NULL_TRACE
+
+    name = f"{__name__}.UseCase"
+    assert histogram.outcomes(name) == {
+        "success": 2,
+        "auth_error": 0,
+        "dto_error": 1,
+        "process_error": 1,
+        "timeout": 0,
+        "exception": 1,
+    }
+    p = histogram.percentiles(name, "dto", (50, 99))
+    assert 0 < p[50] <= p[99]
+    assert 0 < sum(histogram.share(name).values()) <= 1
+
+
+def test_prometheus_sink_renders_histograms() -> None:
+    sink = PrometheusSink(buckets=(0.001, 1.0))
+    instrumentation.add_sink(sink)
+    try:
+        UseCase(Presenter(Response())).execute(RequestModel(value=1))
+    finally:
+        instrumentation.remove_sink(sink)
+    text = sink.render()
+    name = f"{__name__}.UseCase"
+    assert "# TYPE caps_usecase_stage_seconds histogram" in text
+    assert f'caps_usecase_stage_seconds_count{{usecase="{name}",stage="total"}} 1' in text
+    assert f'caps_usecase_stage_seconds_bucket{{usecase="{name}",stage="dto",le="+Inf"}} 1' in text
+    assert f'caps_usecase_executions_total{{usecase="{name}",outcome="success"}} 1' in text
+
+
+def test_same_named_use_cases_of_different_modules_are_traced_apart(histogram: HistogramSink) -> None:
+    other = type("UseCase", (UseCase,), {"__module__": "orders.usecases"})
+    UseCase(Presenter(Response())).execute(RequestModel(value=1))
+    other(Presenter(Response())).execute(RequestModel(value=0))
+    assert histogram.outcomes(f"{__name__}.UseCase")["success"] == 1
+    assert histogram.outcomes("orders.usecases.UseCase")["process_error"] == 1
+    assert histogram.outcomes("UseCase")["success"] == 0
@@ -0,0 +1,59 @@
+import asyncio
+import io
+import json
+import socket
+from lib.json_response import AsyncJSONPresenterResponse, JSONPresenterResponse, json_serializer
+from lib.view_model import BaseBatchViewModel, BaseViewModel
+
+
+class ViewModel(BaseViewModel):
+    name: str | None = None
+    tags: list[str] = []
+
+
+class StreamWriter:
+    def __init__(self) -> None:
+        self.data: bytearray = bytearray()
+        self.drained: int = 0
+
+    def write(self, data: memoryview) -> None:
+        self.data += data
+
+    async def drain(self) -> None:
+        self.drained += 1
+
+
+def test_present_serializes_to_json_bytes_and_maps_status() -> None:
+    response = JSONPresenterResponse(status_codes={"NotFound": 404})
+    view_model = ViewModel(status=True, name="café", tags=["a"])
+    response.present(view_model)
+    assert response.status_code == 200
+    assert isinstance(response.body, memoryview)
+    assert response.body.tobytes() == view_model.model_dump_json().encode()
+
+    response.present(ViewModel(status=False, errorName="NotFound", errorMessage="gone"))
+    assert response.status_code == 404
+    response.present(ViewModel(status=False, errorName="Unexpected"))
+    assert response.status_code == 500
+    assert json_serializer(ViewModel) is ViewModel.__pydantic_serializer__
+
+
+def test_present_writes_to_file_and_socket_sinks() -> None:
+    file = io.BytesIO()
+    JSONPresenterResponse(file).present(ViewModel(status=True, name="x"))
+    assert json.loads(file.getvalue())["name"] == "x"
+
+    left, right = socket.socketpair()
+    with left, right:
+        JSONPresenterResponse(left).present(BaseBatchViewModel(status=True, items=[ViewModel(status=True, name="y")]))
+        left.shutdown(socket.SHUT_WR)
+        received = b"".join(iter(lambda: right.recv(4096), b""))
+    assert json.loads(received)["items"][0]["name"] == "y"
+
+
+def test_async_present_writes_and_drains() -> None:
+    writer = StreamWriter()
+    response = AsyncJSONPresenterResponse(writer)
+    asyncio.run(response.present(ViewModel(status=True, name="z")))
+    assert json.loads(writer.data) == {"status": True, "errorName": None, "errorMessage": None, "name": "z", "tags": []}
+    assert writer.drained == 1
@@ -0,0 +1,75 @@
+import asyncio
+import json
+from pathlib import Path
+from typing import Any
+
+from benchmarks.fixtures import (
+    AsyncGatewayUseCase,
+    AsyncInMemoryPresenterResponse,
+    AsyncNoOpPresenter,
+    AsyncSimulatedLatencyGateway,
+    GatewayUseCase,
+    InMemoryPresenterResponse,
+    NoOpPresenter,
+    RequestModel,
+    SimulatedLatencyGateway,
+)
+from benchmarks.load import LoadResult, main, percentiles, run_asyncio, run_threads, saturation_point, sweep
+from lib.primary_ports import AsyncBaseInputPort, BaseInputPort
+from lib.usecase_models import BaseRequestModel
+
+
+def request(index: int) -> BaseRequestModel:
+    return RequestModel(id=index + 1)
+
+
+def target(error_rate: float = 0.0) -> tuple[BaseInputPort[Any], InMemoryPresenterResponse]:
+    response = InMemoryPresenterResponse()
+    return GatewayUseCase(SimulatedLatencyGateway(0.001, error_rate=error_rate), NoOpPresenter(response)), response
+
+
+def async_target() -> tuple[AsyncBaseInputPort[Any], AsyncInMemoryPresenterResponse]:
+    response = AsyncInMemoryPresenterResponse()
+    return AsyncGatewayUseCase(AsyncSimulatedLatencyGateway(0.001), AsyncNoOpPresenter(response)), response
+
+
+def test_percentiles() -> None:
+    assert percentiles(range(1, 1001), (50, 99, 99.9)) == {50: 500, 99: 990, 99.9: 999}
+    assert all(value != value for value in percentiles([]).values())
+
+
+def test_threads_report_throughput_latency_and_errors() -> None:
+    result = run_threads(lambda: target(error_rate=1.0), request, concurrency=4, duration=5.0, limit=40)
+    assert result.mode == "threads" and result.requests == 40 and result.error_ratio == 1.0
+    assert result.latencies[50] >= 0.001 and result.throughput > 0
+
+
+def test_open_loop_measures_from_due_time() -> None:
+    result = run_threads(target, request, concurrency=1, duration=0.05, rate=2000)
+    # a single worker serves 1 ms requests due every 0.5 ms, so the last ones wait in line
+    assert result.latencies[99] > 0.01 and result.errors == 0
+
+
+def test_asyncio_runs_many_tasks_on_one_loop() -> None:
+    result = asyncio.run(run_asyncio(async_target, request, concurrency=50, duration=5.0, limit=200))
+    assert result.mode == "asyncio" and result.requests == 200 and result.errors == 0
+    assert result.elapsed < 1.0
+
+
+def test_sweep_and_saturation_point() -> None:
+    results = sweep(lambda level: run_asyncio(async_target, request, level, duration=5.0, limit=20), [1, 4])
+    assert [result.concurrency for result in results] == [1, 4]
+    assert results[1].throughput > results[0].throughput
+
+    flat = [
+        LoadResult("threads", level, throughput, 0, 1.0, {}) for level, throughput in [(1, 100), (2, 190), (4, 200)]
+    ]
+    assert saturation_point(flat) is flat[1] and saturation_point(flat[:2]) is None
+
+
+def test_main_writes_json(tmp_path: Path, capsys: Any) -> None:
+    output = tmp_path / "load.json"
+    assert main(["--levels", "1,2", "--duration", "0.05", "--latency", "0.001", "--json", str(output)]) == 0
+    assert "p99.9" in capsys.readouterr().out
+    data = json.loads(output.read_text())
+    assert [result["concurrency"] for result in data["results"]] == [1, 2]
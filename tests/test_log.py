@@ -0,0 +1,147 @@
+import logging
+import random
+from typing import Any, Iterator
+import pytest
+from lib.dto import BaseDTO
+from lib.instrumentation import instrumentation
+from lib.log import LoggingSink, bind_request_id, log_sample_rate, reset_request_id, set_log_sample_rate
+from lib.primary_ports import BaseOutputPort
+from lib.usecase import BaseSingleDTOUseCase
+from lib.usecase_models import (
+    BaseAuthenticatedRequestModel,
+    BaseErrorResponseModel,
+    BaseRequestModel,
+    BaseResponseModel,
+)
+
+
+class RequestModel(BaseRequestModel):
+    value: int
+
+
+class DTO(BaseDTO):
+    value: int
+
+
+class ResponseModel(BaseResponseModel):
+    value: int
+
+
+class Rendered:
+    def __init__(self) -> None:
+        self.count: int = 0
+
+    def __str__(self) -> str:
+        self.count += 1
+        return "rendered"
+
+
+class Presenter(BaseOutputPort[ResponseModel, BaseErrorResponseModel]):
+    def presentSuccess(self, responseModel: ResponseModel) -> None:
+        pass
+
+    def presentError(self, errorModel: BaseErrorResponseModel) -> None:
+        pass
+
+
+class UseCase(
+    BaseSingleDTOUseCase[RequestModel, BaseAuthenticatedRequestModel, ResponseModel, BaseErrorResponseModel, DTO]
+):
+    def validate_request_model(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> None:
+        pass
+
+    def make_dto_request(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> DTO:
+        assert isinstance(requestModel, RequestModel)
+        return DTO(status=requestModel.value > 0, errorCode=404, errorName="", errorMessage="", value=1)
+
+    def handle_dto_error(self, dto: DTO) -> BaseErrorResponseModel:
+        return BaseErrorResponseModel(code=dto.errorCode, message="missing")
+
+    def process_dto(self, dto: DTO) -> ResponseModel | BaseErrorResponseModel:
+        return ResponseModel(value=dto.value)
+
+
+@pytest.fixture
+def sample_rate() -> Iterator[None]:
+    rate = log_sample_rate()
+    yield
+    set_log_sample_rate(rate)
+
+
+def test_loggers_are_per_class_and_shared_by_instances() -> None:
+    assert UseCase.logger.name == f"{__name__}.UseCase"
+    assert Presenter.logger.name == f"{__name__}.Presenter"
+    assert UseCase(Presenter()).logger is UseCase(Presenter()).logger is UseCase.logger
+    assert "logger" not in vars(UseCase(Presenter()))
+
+
+def test_fields_are_rendered_only_when_the_level_is_enabled(caplog: Any) -> None:
+    field = Rendered()
+    with caplog.at_level(logging.WARNING, logger=UseCase.logger.name):
+        UseCase.logger.info("usecase.executing", request=field)
+    assert field.count == 0 and caplog.records == []
+
+    token = bind_request_id("r-1")
+    try:
+        with caplog.at_level(logging.INFO, logger=UseCase.logger.name):
+            UseCase.logger.info("usecase.executing", request=field)
+    finally:
+        reset_request_id(token)
+    (record,) = caplog.records
+    assert record.getMessage() == "usecase.executing request_id=r-1 request=rendered"
+    assert record.caps_event == "usecase.executing"
+    assert record.caps_fields["request_id"] == "r-1"
+    assert record.funcName == "test_fields_are_rendered_only_when_the_level_is_enabled"
+
+
+def test_sampled_events_keep_a_fraction_and_their_rate(caplog: Any, sample_rate: None) -> None:
+    random.seed(1)
+    set_log_sample_rate(0.25)
+    with caplog.at_level(logging.INFO, logger=UseCase.logger.name):
+        for _ in range(400):
+            UseCase.logger.sampled("usecase.succeeded")
+        set_log_sample_rate(0)
+        UseCase.logger.sampled("usecase.succeeded")
+    assert 60 < len(caplog.records) < 140
+    assert all(record.caps_fields == {"sample_rate": 0.25} for record in caplog.records)
+    with pytest.raises(ValueError):
+        set_log_sample_rate(2)
+
+
+def test_logging_sink_logs_finished_executions(caplog: Any, sample_rate: None) -> None:
+    sink = LoggingSink()
+    instrumentation.add_sink(sink)
+    try:
+        with caplog.at_level(logging.INFO, logger="caps.usecase"):
+            usecase = UseCase(Presenter())
+            usecase.execute(RequestModel(value=1))
+            set_log_sample_rate(0)
+            usecase.execute(RequestModel(value=1))
+            usecase.execute(RequestModel(value=0))
+    finally:
+        instrumentation.remove_sink(sink)
+    assert [(record.levelname, record.caps_fields["outcome"]) for record in caplog.records] == [
+        ("INFO", "success"),
+        ("WARNING", "dto_error"),
+    ]
+    assert (
+        caplog.records[1].caps_fields["stage"] == "process"
+        and caplog.records[1].name == f"caps.usecase.{__name__}.UseCase"
+    )
+
+
+def test_logging_keyword_arguments_are_forwarded(caplog: Any) -> None:
+    with caplog.at_level(logging.INFO, logger=UseCase.logger.name):
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            UseCase.logger.error("usecase.failed", exc_info=True, extra={"tenant": "acme"}, value=1)
+            UseCase.logger.exception("usecase.failed")
+        UseCase.logger.info("usecase.done", stack_info=True)
+    failed, logged, done = caplog.records
+    assert failed.exc_info is not None and failed.exc_info[0] is ValueError
+    assert "ValueError: boom" in caplog.text
+    assert failed.tenant == "acme" and failed.caps_fields == {"value": 1}
+    assert failed.getMessage() == "usecase.failed value=1"
+    assert logged.exc_info is not None and logged.exc_info[0] is ValueError
+    assert done.stack_info is not None and done.funcName == "test_logging_keyword_arguments_are_forwarded"
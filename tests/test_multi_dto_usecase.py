@@ -0,0 +1,169 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import time
+from typing import Awaitable, Callable, Mapping
+from lib.deadline import current_deadline
+from lib.dto import BaseDTO
+from lib.primary_ports import AsyncBaseOutputPort, BaseOutputPort
+from lib.usecase import AsyncBaseMultiDTOUseCase, BaseMultiDTOUseCase
+from lib.usecase_models import (
+    BaseAuthenticatedRequestModel,
+    BaseErrorResponseModel,
+    BaseRequestModel,
+    BaseResponseModel,
+)
+
+
+class RequestModel(BaseRequestModel):
+    fail: str | None = None
+
+
+class DTO(BaseDTO):
+    value: str
+
+
+class ResponseModel(BaseResponseModel):
+    values: dict[str, str]
+
+
+def make_dto(name: str, fail: str | None) -> DTO:
+    return DTO(status=name != fail, errorCode=500, errorName=name, errorMessage="failed", value=name)
+
+
+class Presenter(BaseOutputPort[ResponseModel, BaseErrorResponseModel]):
+    def __init__(self) -> None:
+        super().__init__()
+        self.presented: list[ResponseModel | BaseErrorResponseModel] = []
+
+    def presentSuccess(self, responseModel: ResponseModel) -> None:
+        self.presented.append(responseModel)
+
+    def presentError(self, errorModel: BaseErrorResponseModel) -> None:
+        self.presented.append(errorModel)
+
+
+class AsyncPresenter(AsyncBaseOutputPort[ResponseModel, BaseErrorResponseModel]):
+    def __init__(self) -> None:
+        super().__init__()
+        self.presented: list[ResponseModel | BaseErrorResponseModel] = []
+
+    async def presentSuccess(self, responseModel: ResponseModel) -> None:
+        self.presented.append(responseModel)
+
+    async def presentError(self, errorModel: BaseErrorResponseModel) -> None:
+        self.presented.append(errorModel)
+
+
+class UseCase(
+    BaseMultiDTOUseCase[RequestModel, BaseAuthenticatedRequestModel, ResponseModel, BaseErrorResponseModel, DTO]
+):
+    dto_executor = ThreadPoolExecutor(max_workers=3)
+    started: list[str] = []
+
+    def validate_request_model(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> None:
+        pass
+
+    def make_dto_requests(
+        self, requestModel: RequestModel | BaseAuthenticatedRequestModel
+    ) -> Mapping[str, Callable[[], DTO]]:
+        assert isinstance(requestModel, RequestModel)
+
+        def fetch(name: str, delay: float) -> Callable[[], DTO]:
+            def run() -> DTO:
+                self.started.append(name)
+                time.sleep(delay)
+                return make_dto(name, requestModel.fail)
+
+            return run
+
+        return {
+            "profile": fetch("profile", 0.1),
+            "permissions": fetch("permissions", 0.1),
+            "quota": fetch("quota", 0.1),
+        }
+
+    def handle_dto_error(self, name: str, dto: DTO) -> BaseErrorResponseModel:
+        return BaseErrorResponseModel(code=dto.errorCode, message=f"{name} {dto.errorMessage}")
+
+    def process_dtos(self, dtos: dict[str, DTO]) -> ResponseModel | BaseErrorResponseModel:
+        return ResponseModel(values={name: dto.value for name, dto in dtos.items()})
+
+
+class AsyncUseCase(
+    AsyncBaseMultiDTOUseCase[RequestModel, BaseAuthenticatedRequestModel, ResponseModel, BaseErrorResponseModel, DTO]
+):
+    cancelled: list[str] = []
+
+    async def validate_request_model(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> None:
+        pass
+
+    def make_dto_requests(
+        self, requestModel: RequestModel | BaseAuthenticatedRequestModel
+    ) -> Mapping[str, Awaitable[DTO]]:
+        assert isinstance(requestModel, RequestModel)
+
+        async def fetch(name: str, delay: float) -> DTO:
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                self.cancelled.append(name)
+                raise
+            return make_dto(name, requestModel.fail)
+
+        return {"profile": fetch("profile", 0.1), "permissions": fetch("permissions", 0.01), "quota": fetch("quota", 5)}
+
+    def handle_dto_error(self, name: str, dto: DTO) -> BaseErrorResponseModel:
+        return BaseErrorResponseModel(code=dto.errorCode, message=f"{name} {dto.errorMessage}")
+
+    async def process_dtos(self, dtos: dict[str, DTO]) -> ResponseModel | BaseErrorResponseModel:
+        return ResponseModel(values={name: dto.value for name, dto in dtos.items()})
+
+
+def test_dtos_are_fetched_concurrently() -> None:
+    presenter = Presenter()
+    start = time.perf_counter()
+    UseCase(presenter).execute(RequestModel())
+    assert time.perf_counter() - start < 0.25
+    assert presenter.presented == [
+        ResponseModel(values={"profile": "profile", "permissions": "permissions", "quota": "quota"})
+    ]
+
+
+def test_first_failed_dto_short_circuits_and_cancels_queued_fetches() -> None:
+    class SerialUseCase(UseCase):
+        dto_executor = ThreadPoolExecutor(max_workers=1)
+        started: list[str] = []
+
+    presenter = Presenter()
+    SerialUseCase(presenter).execute(RequestModel(fail="profile"))
+    assert presenter.presented == [BaseErrorResponseModel(code=500, message="profile failed")]
+    time.sleep(0.25)
+    # the single worker may already have picked up the next fetch, the last one never starts
+    assert SerialUseCase.started[0] == "profile"
+    assert "quota" not in SerialUseCase.started
+
+
+def test_async_failure_cancels_remaining_tasks() -> None:
+    presenter = AsyncPresenter()
+    start = time.perf_counter()
+    asyncio.run(AsyncUseCase(presenter).execute(RequestModel(fail="permissions")))
+    assert time.perf_counter() - start < 1
+    assert presenter.presented == [BaseErrorResponseModel(code=500, message="permissions failed")]
+    assert sorted(AsyncUseCase.cancelled) == ["profile", "quota"]
+
+
+def test_dto_requests_see_the_callers_deadline() -> None:
+    timeouts: list[float | None] = []
+
+    class DeadlineUseCase(UseCase):
+        def make_dto_requests(
+            self, requestModel: RequestModel | BaseAuthenticatedRequestModel
+        ) -> Mapping[str, Callable[[], DTO]]:
+            def run() -> DTO:
+                timeouts.append(current_deadline().timeout())
+                return make_dto("profile", None)
+
+            return {"profile": run}
+
+    DeadlineUseCase(Presenter()).execute_with(RequestModel(), deadline=0.5)
+    assert len(timeouts) == 1 and timeouts[0] is not None and 0 < timeouts[0] <= 0.5
@@ -0,0 +1,142 @@
+import asyncio
+import pickle
+from pathlib import Path
+
+from lib.dto import BaseDTO
+from lib.json_response import AsyncJSONPresenterResponse, JSONPresenterResponse
+from lib.payload import Payload, payload_field
+from lib.usecase_models import BaseResponseModel
+from lib.view_model import BaseViewModel
+
+
+class ReportDTO(BaseDTO):
+    name: str
+    content: Payload
+
+
+class ReportResponseModel(BaseResponseModel):
+    name: str
+    content: Payload
+
+
+class ReportViewModel(BaseViewModel):
+    content: Payload | None = None
+
+
+class Sink:
+    def __init__(self) -> None:
+        self.chunks: list[bytes] = []
+
+    def write(self, data: memoryview) -> None:
+        self.chunks.append(bytes(data))
+
+
+class AsyncSink(Sink):
+    def __init__(self) -> None:
+        super().__init__()
+        self.drained: int = 0
+
+    async def drain(self) -> None:
+        self.drained += 1
+
+
+def test_buffer_payload_wraps_without_copying() -> None:
+    data = bytearray(b"abc" * 1000)
+    payload = Payload.from_buffer(data)
+    assert payload.size == 3000 and payload.view().obj is data
+    assert [chunk.nbytes for chunk in payload.iter_chunks(1024)] == [1024, 1024, 952]
+
+
+def test_file_payload_reads_lazily(tmp_path: Path) -> None:
+    path = tmp_path / "report.bin"
+    path.write_bytes(bytes(range(256)) * 4)
+    payload = Payload.from_file(path, offset=10, length=1000, media_type="application/pdf")
+    assert payload.size == 1000
+    assert b"".join(bytes(chunk) for chunk in payload.iter_chunks(300)) == path.read_bytes()[10:1010]
+    assert payload.read() == path.read_bytes()[10:1010]
+    payload.close()
+    assert Payload.from_file(path).size == 1024
+    empty = tmp_path / "empty.bin"
+    empty.write_bytes(b"")
+    assert Payload.from_file(empty).read() == b""
+
+
+def test_loader_payload_calls_loader_when_consumed() -> None:
+    calls: list[int] = []
+
+    def load() -> list[bytes]:
+        calls.append(1)
+        return [b"ab", b"cd"]
+
+    payload = Payload.from_loader(load, size=4)
+    assert payload.size == 4 and calls == []
+    assert [bytes(chunk) for chunk in payload.iter_chunks()] == [b"ab", b"cd"] and len(calls) == 1
+
+
+def test_payload_travels_by_reference() -> None:
+    payload = Payload.from_buffer(b"x" * 100)
+    dto = ReportDTO(status=True, errorCode=0, errorName="", errorMessage="", name="q3", content=payload)
+    response_model = ReportResponseModel(name=dto.name, content=dto.content)
+    view_model = ReportViewModel.trusted(status=True, content=response_model.content)
+    assert dto.content is payload and response_model.content is payload and view_model.content is payload
+    assert isinstance(ReportViewModel(status=True, content=b"raw").content, Payload)
+    assert payload_field(ReportViewModel) == "content" and payload_field(BaseViewModel) is None
+
+
+def test_payload_serializes_as_metadata() -> None:
+    model = ReportResponseModel(name="q3", content=Payload.from_buffer(b"abcd", media_type="text/csv"))
+    assert model.model_dump_json() == '{"status":true,"name":"q3","content":{"size":4,"media_type":"text/csv"}}'
+    assert model.model_dump()["content"] is model.content
+    assert ReportResponseModel.model_json_schema()["properties"]["content"]["type"] == "object"
+
+
+def test_payload_pickles_by_reference(tmp_path: Path) -> None:
+    path = tmp_path / "report.bin"
+    path.write_bytes(b"0123456789")
+    restored = pickle.loads(pickle.dumps(Payload.from_file(path, offset=2, length=3)))
+    assert restored.read() == b"234"
+
+    buffers: list[pickle.PickleBuffer] = []
+    data = pickle.dumps(
+        Payload.from_buffer(b"abc", media_type="text/plain"), protocol=5, buffer_callback=buffers.append
+    )
+    assert len(buffers) == 1
+    restored = pickle.loads(data, buffers=buffers)
+    assert restored.read() == b"abc" and restored.media_type == "text/plain"
+
+
+def test_json_response_streams_payload(tmp_path: Path) -> None:
+    path = tmp_path / "report.bin"
+    path.write_bytes(b"z" * 150_000)
+    sink = Sink()
+    response = JSONPresenterResponse(sink)
+    response.present(ReportViewModel(status=True, content=Payload.from_file(path, media_type="application/pdf")))
+    assert response.status_code == 200 and response.media_type == "application/pdf" and bytes(response.body) == b""
+    assert [len(chunk) for chunk in sink.chunks] == [65536, 65536, 18928]
+
+    response = JSONPresenterResponse()
+    response.present(ReportViewModel(status=True, content=Payload.from_buffer(b"abc")))
+    assert bytes(response.body) == b"abc"
+
+    response.present(ReportViewModel(status=False, errorName="NotFound"))
+    assert response.status_code == 500 and response.media_type == "application/json"
+
+
+def test_async_json_response_streams_payload() -> None:
+    sink = AsyncSink()
+    response = AsyncJSONPresenterResponse(sink)
+    asyncio.run(response.present(ReportViewModel(status=True, content=Payload.from_buffer(b"a" * 70_000))))
+    assert [len(chunk) for chunk in sink.chunks] == [65536, 4464] and sink.drained == 2
+
+
+def test_file_payload_presented_without_a_sink_is_not_mapped(tmp_path: Path) -> None:
+    path = tmp_path / "report.bin"
+    path.write_bytes(b"0123456789")
+    payload = Payload.from_file(path, offset=2, length=5)
+    response = JSONPresenterResponse()
+    response.present(ReportViewModel(status=True, content=payload))
+    async_response = AsyncJSONPresenterResponse()
+    asyncio.run(async_response.present(ReportViewModel(status=True, content=payload)))
+    payload.close()  # raises BufferError if body still exports a memory map
+    assert bytes(response.body) == bytes(async_response.body) == b"23456"
+    assert payload.read() == b"23456" and payload.path == str(path)
@@ -0,0 +1,215 @@
+import asyncio
+from typing import Any
+from lib.dto import BaseDTO
+from lib.pipeline import AsyncUseCasePipeline, UseCasePipeline, map_fields
+from lib.presenter import AsyncBasePresenter, BasePresenter
+from lib.response import AsyncPresenterResponse, PresenterResponse
+from lib.usecase import AsyncBaseSingleDTOUseCase, BaseSingleDTOUseCase
+from lib.usecase_models import (
+    BaseAuthenticatedRequestModel,
+    BaseErrorResponseModel,
+    BaseResponseModel,
+)
+from lib.view_model import BaseViewModel
+
+
+class AccountRequestModel(BaseAuthenticatedRequestModel):
+    email: str
+
+
+class AccountResponseModel(BaseResponseModel):
+    account_id: int
+
+
+class BillingRequestModel(BaseAuthenticatedRequestModel):
+    account_id: int
+
+
+class BillingResponseModel(BaseResponseModel):
+    account_id: int
+    balance: int
+
+
+class DTO(BaseDTO):
+    value: int
+
+
+class ViewModel(BaseViewModel):
+    balance: int | None = None
+
+
+class Response(PresenterResponse):
+    def __init__(self) -> None:
+        super().__init__()
+        self.presented: list[BaseViewModel] = []
+
+    def present(self, view_model: BaseViewModel) -> None:
+        self.presented.append(view_model)
+
+
+class AsyncResponse(AsyncPresenterResponse):
+    def __init__(self) -> None:
+        super().__init__()
+        self.presented: list[BaseViewModel] = []
+
+    async def present(self, view_model: BaseViewModel) -> None:
+        self.presented.append(view_model)
+
+
+class Presenter(BasePresenter[BillingResponseModel, BaseErrorResponseModel, ViewModel]):
+    def __init__(self, response: Response | None = None) -> None:
+        super().__init__(response)
+        self.converted: int = 0
+
+    def convertResponseToViewModel(self, responseModel: BillingResponseModel) -> ViewModel:
+        self.converted += 1
+        return ViewModel(status=True, balance=responseModel.balance)
+
+    def convertErrorToViewModel(self, errorModel: BaseErrorResponseModel) -> ViewModel:
+        return ViewModel(status=False, errorName=str(errorModel.code), errorMessage=errorModel.message)
+
+
+class AsyncPresenter(AsyncBasePresenter[BillingResponseModel, BaseErrorResponseModel, ViewModel]):
+    def convertResponseToViewModel(self, responseModel: BillingResponseModel) -> ViewModel:
+        return ViewModel(status=True, balance=responseModel.balance)
+
+    def convertErrorToViewModel(self, errorModel: BaseErrorResponseModel) -> ViewModel:
+        return ViewModel(status=False, errorName=str(errorModel.code), errorMessage=errorModel.message)
+
+
+class ResolveAccount(
+    BaseSingleDTOUseCase[
+        AccountRequestModel, BaseAuthenticatedRequestModel, AccountResponseModel, BaseErrorResponseModel, DTO
+    ]
+):
+    def validate_request_model(self, requestModel: AccountRequestModel | BaseAuthenticatedRequestModel) -> None:
+        pass
+
+    def make_dto_request(self, requestModel: AccountRequestModel | BaseAuthenticatedRequestModel) -> DTO:
+        assert isinstance(requestModel, AccountRequestModel)
+        known = requestModel.email == "ada@example.com"
+        return DTO(status=known, errorCode=404, errorName="", errorMessage="unknown account", value=7)
+
+    def handle_dto_error(self, dto: DTO) -> BaseErrorResponseModel:
+        return BaseErrorResponseModel(code=dto.errorCode, message=dto.errorMessage)
+
+    def process_dto(self, dto: DTO) -> AccountResponseModel | BaseErrorResponseModel:
+        return AccountResponseModel(account_id=dto.value)
+
+
+class LoadBilling(
+    BaseSingleDTOUseCase[
+        BillingRequestModel, BaseAuthenticatedRequestModel, BillingResponseModel, BaseErrorResponseModel, DTO
+    ]
+):
+    def __init__(self, presenter: Any = None) -> None:
+        super().__init__(presenter)
+        self.requests: list[BillingRequestModel | BaseAuthenticatedRequestModel] = []
+
+    def validate_request_model(self, requestModel: BillingRequestModel | BaseAuthenticatedRequestModel) -> None:
+        pass
+
+    def make_dto_request(self, requestModel: BillingRequestModel | BaseAuthenticatedRequestModel) -> DTO:
+        assert isinstance(requestModel, BillingRequestModel)
+        self.requests.append(requestModel)
+        return DTO(status=True, errorCode=0, errorName="", errorMessage="", value=requestModel.account_id * 100)
+
+    def handle_dto_error(self, dto: DTO) -> BaseErrorResponseModel:
+        return BaseErrorResponseModel(code=dto.errorCode, message=dto.errorMessage)
+
+    def process_dto(self, dto: DTO) -> BillingResponseModel | BaseErrorResponseModel:
+        return BillingResponseModel(account_id=dto.value // 100, balance=dto.value)
+
+
+class AsyncResolveAccount(
+    AsyncBaseSingleDTOUseCase[
+        AccountRequestModel, BaseAuthenticatedRequestModel, AccountResponseModel, BaseErrorResponseModel, DTO
+    ]
+):
+    async def validate_request_model(self, requestModel: AccountRequestModel | BaseAuthenticatedRequestModel) -> None:
+        pass
+
+    async def make_dto_request(self, requestModel: AccountRequestModel | BaseAuthenticatedRequestModel) -> DTO:
+        return DTO(status=True, errorCode=0, errorName="", errorMessage="", value=3)
+
+    def handle_dto_error(self, dto: DTO) -> BaseErrorResponseModel:
+        return BaseErrorResponseModel(code=dto.errorCode, message=dto.errorMessage)
+
+    async def process_dto(self, dto: DTO) -> AccountResponseModel | BaseErrorResponseModel:
+        return AccountResponseModel(account_id=dto.value)
+
+
+class AsyncLoadBilling(
+    AsyncBaseSingleDTOUseCase[
+        BillingRequestModel, BaseAuthenticatedRequestModel, BillingResponseModel, BaseErrorResponseModel, DTO
+    ]
+):
+    async def validate_request_model(self, requestModel: BillingRequestModel | BaseAuthenticatedRequestModel) -> None:
+        pass
+
+    async def make_dto_request(self, requestModel: BillingRequestModel | BaseAuthenticatedRequestModel) -> DTO:
+        assert isinstance(requestModel, BillingRequestModel)
+        return DTO(status=True, errorCode=0, errorName="", errorMessage="", value=requestModel.account_id * 100)
+
+    def handle_dto_error(self, dto: DTO) -> BaseErrorResponseModel:
+        return BaseErrorResponseModel(code=dto.errorCode, message=dto.errorMessage)
+
+    async def process_dto(self, dto: DTO) -> BillingResponseModel | BaseErrorResponseModel:
+        return BillingResponseModel(account_id=dto.value // 100, balance=dto.value)
+
+
+def make_pipeline(presenter: Presenter, billing: LoadBilling) -> UseCasePipeline[AccountRequestModel]:
+    mapping = map_fields(BillingRequestModel, keep=("user_id", "auth_token"))
+    return UseCasePipeline[AccountRequestModel](ResolveAccount(), presenter).then(mapping, billing)
+
+
+def test_intermediate_results_are_mapped_without_presenting() -> None:
+    presenter, billing, response = Presenter(), LoadBilling(), Response()
+    make_pipeline(presenter, billing).execute_with(
+        AccountRequestModel(user_id=1, auth_token="t", email="ada@example.com"), response=response
+    )
+    assert response.presented == [ViewModel(status=True, balance=700)]
+    assert presenter.converted == 1
+    assert billing.requests == [BillingRequestModel(user_id=1, auth_token="t", account_id=7)]
+
+
+def test_errors_short_circuit_to_the_final_presenter() -> None:
+    presenter, billing, response = Presenter(), LoadBilling(), Response()
+    make_pipeline(presenter, billing).execute_with(
+        AccountRequestModel(user_id=1, auth_token="t", email="bob@example.com"), response=response
+    )
+    assert response.presented == [ViewModel(status=False, errorName="404", errorMessage="unknown account")]
+    assert billing.requests == []
+
+
+def test_last_stage_presenter_is_the_default() -> None:
+    response = Response()
+    pipeline = UseCasePipeline[AccountRequestModel](ResolveAccount()).then(
+        lambda account, request: BillingRequestModel.model_construct(
+            user_id=request.user_id, auth_token=request.auth_token, account_id=account.account_id
+        ),
+        LoadBilling(Presenter(response)),
+    )
+    pipeline.execute(AccountRequestModel(user_id=1, auth_token="t", email="ada@example.com"))
+    assert response.presented == [ViewModel(status=True, balance=700)]
+
+
+def test_async_pipeline() -> None:
+    response = AsyncResponse()
+    pipeline = AsyncUseCasePipeline[AccountRequestModel](AsyncResolveAccount(), AsyncPresenter()).then(
+        map_fields(BillingRequestModel, {"account_id": "account_id"}, keep=("user_id", "auth_token")),
+        AsyncLoadBilling(),
+    )
+    asyncio.run(pipeline.execute_with(AccountRequestModel(user_id=1, auth_token="t", email="a@b.c"), response=response))
+    assert response.presented == [ViewModel(status=True, balance=300)]
+
+
+def test_map_fields_maps_only_common_fields_by_default() -> None:
+    class StatementRequestModel(BaseAuthenticatedRequestModel):
+        account_id: int
+        months: int = 12
+
+    mapping = map_fields(StatementRequestModel, keep=("user_id", "auth_token"))
+    request = AccountRequestModel(user_id=1, auth_token="t", email="ada@example.com")
+    mapped = mapping(AccountResponseModel(account_id=7), request)
+    assert mapped == StatementRequestModel(user_id=1, auth_token="t", account_id=7, months=12)
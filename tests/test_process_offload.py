@@ -0,0 +1,177 @@
+import asyncio
+import os
+import threading
+from typing import Iterator
+import pytest
+from lib.dto import BaseDTO
+from lib.offload import ProcessOffload, payload_size
+from lib.payload import Payload
+from lib.primary_ports import AsyncBaseOutputPort, BaseOutputPort
+from lib.usecase import AsyncBaseSingleDTOUseCase, BaseSingleDTOUseCase
+from lib.usecase_models import (
+    BaseAuthenticatedRequestModel,
+    BaseErrorResponseModel,
+    BaseRequestModel,
+    BaseResponseModel,
+)
+
+offload = ProcessOffload(threshold=10_000, max_workers=1)
+
+
+class RequestModel(BaseRequestModel):
+    size: int
+
+
+class DTO(BaseDTO):
+    values: list[float]
+    blob: bytes = b""
+
+
+class ResponseModel(BaseResponseModel):
+    total: float
+    blob_size: int
+    pid: int
+
+
+def make_dto(size: int) -> DTO:
+    return DTO(status=True, errorCode=0, errorName="", errorMessage="", values=[1.5] * size, blob=b"x" * size)
+
+
+class Presenter(BaseOutputPort[ResponseModel, BaseErrorResponseModel]):
+    def __init__(self) -> None:
+        super().__init__()
+        self.lock = threading.Lock()  # not picklable, must stay in the serving process
+        self.presented: list[ResponseModel | BaseErrorResponseModel] = []
+
+    def presentSuccess(self, responseModel: ResponseModel) -> None:
+        self.presented.append(responseModel)
+
+    def presentError(self, errorModel: BaseErrorResponseModel) -> None:
+        self.presented.append(errorModel)
+
+
+class AsyncPresenter(AsyncBaseOutputPort[ResponseModel, BaseErrorResponseModel]):
+    def __init__(self) -> None:
+        super().__init__()
+        self.presented: list[ResponseModel | BaseErrorResponseModel] = []
+
+    async def presentSuccess(self, responseModel: ResponseModel) -> None:
+        self.presented.append(responseModel)
+
+    async def presentError(self, errorModel: BaseErrorResponseModel) -> None:
+        self.presented.append(errorModel)
+
+
+class UseCase(
+    BaseSingleDTOUseCase[RequestModel, BaseAuthenticatedRequestModel, ResponseModel, BaseErrorResponseModel, DTO]
+):
+    process_offload = offload
+
+    def validate_request_model(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> None:
+        pass
+
+    def make_dto_request(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> DTO:
+        assert isinstance(requestModel, RequestModel)
+        return make_dto(requestModel.size)
+
+    def handle_dto_error(self, dto: DTO) -> BaseErrorResponseModel:
+        return BaseErrorResponseModel(code=500, message="failed")
+
+    def process_dto(self, dto: DTO) -> ResponseModel | BaseErrorResponseModel:
+        return ResponseModel(total=sum(dto.values), blob_size=len(dto.blob), pid=os.getpid())
+
+
+class AsyncUseCase(
+    AsyncBaseSingleDTOUseCase[RequestModel, BaseAuthenticatedRequestModel, ResponseModel, BaseErrorResponseModel, DTO]
+):
+    process_offload = offload
+
+    async def validate_request_model(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> None:
+        pass
+
+    async def make_dto_request(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> DTO:
+        assert isinstance(requestModel, RequestModel)
+        return make_dto(requestModel.size)
+
+    def handle_dto_error(self, dto: DTO) -> BaseErrorResponseModel:
+        return BaseErrorResponseModel(code=500, message="failed")
+
+    async def process_dto(self, dto: DTO) -> ResponseModel | BaseErrorResponseModel:
+        return ResponseModel(total=sum(dto.values), blob_size=len(dto.blob), pid=os.getpid())
+
+
+class BlobDTO(BaseDTO):
+    content: Payload
+
+
+class HeadResponseModel(BaseResponseModel):
+    head: Payload
+
+
+class Head:
+    """
+    Returns a view of the first bytes of the DTO's buffer, which the worker receives out of band.
+    """
+
+    def process_dto(self, dto: BlobDTO) -> HeadResponseModel:
+        return HeadResponseModel(head=Payload.from_buffer(dto.content.view()[:4]))
+
+
+class Reject:
+    """
+    Raises while the DTO still exports its out-of-band buffer.
+    """
+
+    def process_dto(self, dto: BlobDTO) -> HeadResponseModel:
+        head = dto.content.view()[:4]
+        raise ValueError(f"unsupported blob {bytes(head)!r}")
+
+
+@pytest.fixture(autouse=True, scope="module")
+def shutdown_pool() -> Iterator[None]:
+    yield
+    offload.shutdown()
+
+
+def test_payload_size_approximates_without_walking_containers() -> None:
+    assert payload_size(make_dto(1000)) >= 9000
+    assert payload_size(make_dto(1)) < 100
+
+
+def test_small_dtos_are_processed_in_process() -> None:
+    presenter = Presenter()
+    UseCase(presenter).execute(RequestModel(size=10))
+    assert presenter.presented == [ResponseModel(total=15, blob_size=10, pid=os.getpid())]
+
+
+def test_large_dtos_are_processed_in_the_pool_through_shared_memory() -> None:
+    presenter = Presenter()
+    inline, transferred = offload.stats.inline, offload.stats.transferred
+    UseCase(presenter).execute(RequestModel(size=100_000))
+    response = presenter.presented[0]
+    assert isinstance(response, ResponseModel)
+    assert (response.total, response.blob_size) == (150_000, 100_000)
+    assert response.pid != os.getpid()
+    assert offload.stats.inline == inline
+    assert offload.stats.transferred - transferred > 100_000
+
+
+def test_async_large_dtos_are_awaited_from_the_pool() -> None:
+    presenter = AsyncPresenter()
+    asyncio.run(AsyncUseCase(presenter).execute(RequestModel(size=50_000)))
+    response = presenter.presented[0]
+    assert isinstance(response, ResponseModel)
+    assert response.total == 75_000
+    assert response.pid != os.getpid()
+
+
+def test_results_referring_to_out_of_band_buffers_are_returned() -> None:
+    dto = BlobDTO(status=True, errorCode=0, errorName="", errorMessage="", content=b"abcd" + bytes(100_000))
+    response = offload.submit(Head(), dto).result(timeout=30)
+    assert isinstance(response, HeadResponseModel) and response.head.read() == b"abcd"
+
+
+def test_errors_raised_with_out_of_band_buffers_are_returned() -> None:
+    dto = BlobDTO(status=True, errorCode=0, errorName="", errorMessage="", content=bytearray(b"abcd" + bytes(100_000)))
+    with pytest.raises(ValueError, match="unsupported blob b'abcd'"):
+        offload.submit(Reject(), dto).result(timeout=30)
@@ -0,0 +1,186 @@
+import asyncio
+
+import pytest
+
+from lib.dto import BaseDTO
+from lib.presenter import AsyncBasePresenter, BasePresenter
+from lib.profiling import Profiler
+from lib.response import AsyncPresenterResponse, PresenterResponse
+from lib.usecase import AsyncBaseSingleDTOUseCase, BaseSingleDTOUseCase, BaseUseCase
+from lib.usecase_models import (
+    BaseAuthenticatedRequestModel,
+    BaseErrorResponseModel,
+    BaseRequestModel,
+    BaseResponseModel,
+)
+from lib.view_model import BaseViewModel
+
+
+class RequestModel(BaseRequestModel):
+    id: int
+
+
+class DTO(BaseDTO):
+    id: int
+
+
+class ResponseModel(BaseResponseModel):
+    id: int
+
+
+class ViewModel(BaseViewModel):
+    rows: list[dict[str, int]] = []
+
+
+class Response(PresenterResponse):
+    def __init__(self) -> None:
+        super().__init__()
+        self.presented: list[BaseViewModel] = []
+
+    def present(self, view_model: BaseViewModel) -> None:
+        self.presented.append(view_model)
+
+
+class AsyncResponse(AsyncPresenterResponse):
+    async def present(self, view_model: BaseViewModel) -> None:
+        pass
+
+
+class Presenter(BasePresenter[ResponseModel, BaseErrorResponseModel, ViewModel]):
+    def __init__(self) -> None:
+        super().__init__(Response())
+
+    def convertResponseToViewModel(self, responseModel: ResponseModel) -> ViewModel:
+        return ViewModel.model_construct(status=True, rows=[{"id": index} for index in range(1000)])
+
+    def convertErrorToViewModel(self, errorModel: BaseErrorResponseModel) -> ViewModel:
+        return ViewModel(status=False, errorMessage=errorModel.message)
+
+
+class AsyncPresenter(AsyncBasePresenter[ResponseModel, BaseErrorResponseModel, ViewModel]):
+    def __init__(self) -> None:
+        super().__init__(AsyncResponse())
+
+    def convertResponseToViewModel(self, responseModel: ResponseModel) -> ViewModel:
+        return ViewModel(status=True)
+
+    def convertErrorToViewModel(self, errorModel: BaseErrorResponseModel) -> ViewModel:
+        return ViewModel(status=False, errorMessage=errorModel.message)
+
+
+class UseCase(
+    BaseSingleDTOUseCase[RequestModel, BaseAuthenticatedRequestModel, ResponseModel, BaseErrorResponseModel, DTO]
+):
+    def validate_request_model(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> None:
+        pass
+
+    def make_dto_request(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> DTO:
+        assert isinstance(requestModel, RequestModel)
+        return DTO(status=True, errorCode=0, errorName="", errorMessage="", id=requestModel.id)
+
+    def handle_dto_error(self, dto: DTO) -> BaseErrorResponseModel:
+        return BaseErrorResponseModel(code=dto.errorCode, message=dto.errorMessage)
+
+    def process_dto(self, dto: DTO) -> ResponseModel | BaseErrorResponseModel:
+        return ResponseModel(id=dto.id)
+
+
+class OtherUseCase(UseCase):
+    pass
+
+
+class AsyncUseCase(
+    AsyncBaseSingleDTOUseCase[RequestModel, BaseAuthenticatedRequestModel, ResponseModel, BaseErrorResponseModel, DTO]
+):
+    async def validate_request_model(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> None:
+        pass
+
+    async def make_dto_request(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> DTO:
+        assert isinstance(requestModel, RequestModel)
+        return DTO(status=True, errorCode=0, errorName="", errorMessage="", id=requestModel.id)
+
+    def handle_dto_error(self, dto: DTO) -> BaseErrorResponseModel:
+        return BaseErrorResponseModel(code=dto.errorCode, message=dto.errorMessage)
+
+    async def process_dto(self, dto: DTO) -> ResponseModel | BaseErrorResponseModel:
+        return ResponseModel(id=dto.id)
+
+
+def test_profiles_instrumented_class_only() -> None:
+    profiler = Profiler()
+    profiler.instrument(UseCase)
+    try:
+        assert OtherUseCase in profiler._patched and UseCase.execute is not BaseSingleDTOUseCase.execute
+        presenter = Presenter()
+        for index in range(3):
+            UseCase(presenter).execute(RequestModel(id=index))
+        OtherUseCase(presenter).execute(RequestModel(id=3))
+    finally:
+        profiler.restore()
+    assert "execute" not in UseCase.__dict__ and "execute" not in OtherUseCase.__dict__
+    assert len(presenter.response.presented) == 4  # type: ignore[attr-defined]
+
+    profile = profiler.profile(UseCase)
+    assert profile is not None and profile.executions == 3
+    assert "convertResponseToViewModel" in profile.top_functions()
+    top = profile.top_allocations(5)
+    assert top and top[0].filename == __file__ and top[0].count >= 1000 and profile.peak > 0
+    other = profiler.profile("OtherUseCase")
+    assert other is not None and other.executions == 1
+
+    report = profiler.report(limit=5)
+    assert "== test_profiling.UseCase: 3 profiled executions ==" in report and "top allocation sites" in report
+    profiler.reset()
+    assert profiler.profiles() == []
+
+
+def test_sample_rate() -> None:
+    profiler = Profiler(rate=0.0)
+    profiler.instrument(UseCase)
+    try:
+        UseCase(Presenter()).execute(RequestModel(id=1))
+    finally:
+        profiler.restore(UseCase)
+    assert profiler.profile(UseCase) is None
+    with pytest.raises(ValueError):
+        Profiler(rate=2)
+
+
+def test_nested_instrumentation_profiles_outermost_execution() -> None:
+    profiler = Profiler(allocations=False)
+    profiler.instrument(BaseUseCase)
+    try:
+        UseCase(Presenter()).execute(RequestModel(id=1))
+    finally:
+        profiler.restore()
+    profile = profiler.profile(UseCase)
+    assert profile is not None and profile.executions == 1 and not profile.sites
+
+
+def test_profiles_async_executions() -> None:
+    # warmed up unprofiled, so that lazily built schemas do not crowd the use case out of the top functions
+    asyncio.run(AsyncUseCase(AsyncPresenter()).execute(RequestModel(id=0)))
+    profiler = Profiler()
+    profiler.instrument(AsyncUseCase)
+    try:
+        asyncio.run(AsyncUseCase(AsyncPresenter()).execute(RequestModel(id=1)))
+    finally:
+        profiler.restore()
+    profile = profiler.profile(AsyncUseCase)
+    assert profile is not None and profile.executions == 1 and "process_dto" in profile.top_functions()
+
+
+def test_classes_sharing_a_qualified_name_are_profiled_apart() -> None:
+    first = type("Scoped", (UseCase,), {"__module__": "billing"})
+    second = type("Scoped", (UseCase,), {"__module__": "shipping"})
+    profiler = Profiler(allocations=False)
+    profiler.instrument(first, second)
+    try:
+        first(Presenter()).execute(RequestModel(id=1))
+        second(Presenter()).execute(RequestModel(id=2))
+        second(Presenter()).execute(RequestModel(id=3))
+    finally:
+        profiler.restore()
+    profiles = [profiler.profile(first), profiler.profile(second)]
+    assert [profile.executions for profile in profiles if profile is not None] == [1, 2]
+    assert profiler.profile("shipping.Scoped") is profiler.profile(second)
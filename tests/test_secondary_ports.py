@@ -0,0 +1,203 @@
+import asyncio
+from pathlib import Path
+import sqlite3
+import threading
+from typing import Sequence
+import pytest
+from lib.deadline import DeadlineExceeded, bind_deadline, reset_deadline
+from lib.dto import BaseDTO
+from lib.primary_ports import BaseOutputPort
+from lib.secondary_ports import AsyncBaseGateway, ConnectionPool, PoolTimeout, SQLiteGateway, not_found
+from lib.usecase import BaseSingleDTOUseCase
+from lib.usecase_models import (
+    BaseAuthenticatedRequestModel,
+    BaseErrorResponseModel,
+    BaseRequestModel,
+    BaseResponseModel,
+)
+
+
+class RequestModel(BaseRequestModel):
+    id: int
+
+
+class DTO(BaseDTO):
+    id: int
+    name: str
+
+
+class ResponseModel(BaseResponseModel):
+    name: str
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now: float = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class Connection:
+    def __init__(self) -> None:
+        self.healthy: bool = True
+        self.closed: bool = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class Presenter(BaseOutputPort[ResponseModel, BaseErrorResponseModel]):
+    def __init__(self) -> None:
+        super().__init__()
+        self.presented: list[ResponseModel | BaseErrorResponseModel] = []
+
+    def presentSuccess(self, responseModel: ResponseModel) -> None:
+        self.presented.append(responseModel)
+
+    def presentError(self, errorModel: BaseErrorResponseModel) -> None:
+        self.presented.append(errorModel)
+
+
+class UseCase(
+    BaseSingleDTOUseCase[RequestModel, BaseAuthenticatedRequestModel, ResponseModel, BaseErrorResponseModel, DTO]
+):
+    def __init__(self, presenter: Presenter, gateway: SQLiteGateway[int, DTO]) -> None:
+        super().__init__(presenter)
+        self.gateway: SQLiteGateway[int, DTO] = gateway
+
+    def validate_request_model(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> None:
+        pass
+
+    def make_dto_request(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> DTO:
+        assert isinstance(requestModel, RequestModel)
+        return self.gateway.get(requestModel.id)
+
+    def make_dto_requests(self, requestModels: Sequence[RequestModel | BaseAuthenticatedRequestModel]) -> list[DTO]:
+        return self.gateway.get_many([requestModel.id for requestModel in requestModels])  # type: ignore[union-attr]
+
+    def handle_dto_error(self, dto: DTO) -> BaseErrorResponseModel:
+        return BaseErrorResponseModel(code=dto.errorCode, message=dto.errorMessage)
+
+    def process_dto(self, dto: DTO) -> ResponseModel | BaseErrorResponseModel:
+        return ResponseModel(name=dto.name)
+
+
+class AsyncGateway(AsyncBaseGateway[int, DTO]):
+    async def get(self, key: int) -> DTO:
+        await asyncio.sleep(0)
+        if key < 0:
+            return not_found(DTO, key)
+        return DTO(status=True, errorCode=0, errorName="", errorMessage="", id=key, name=str(key))
+
+
+def make_gateway(tmp_path: Path, rows: int = 3) -> SQLiteGateway[int, DTO]:
+    path = str(tmp_path / "gateway.db")
+    with sqlite3.connect(path) as connection:
+        connection.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT NOT NULL)")
+        connection.executemany("INSERT INTO users VALUES (?, ?)", [(i, f"user{i}") for i in range(rows)])
+    return SQLiteGateway(DTO, path, "users", pool_size=2, batch_size=2)
+
+
+def test_pool_is_bounded_and_reuses_connections() -> None:
+    pool: ConnectionPool[Connection] = ConnectionPool(Connection, Connection.close, max_size=2, timeout=0.01)
+    first, second = pool.acquire(), pool.acquire()
+    with pytest.raises(PoolTimeout):
+        pool.acquire()
+    released = threading.Timer(0.02, pool.release, (second,))
+    released.start()
+    assert pool.acquire(timeout=1) is second
+    released.join()
+    pool.release(first)
+    pool.release(second)
+    with pool.connection() as connection:
+        assert connection is second
+    assert pool.stats.created == 2 and pool.size == 2 and pool.stats.waited >= 1
+
+    with pytest.raises(ValueError):
+        with pool.connection() as connection:
+            raise ValueError
+    assert connection.closed and pool.size == 1
+    pool.close()
+    assert first.closed and pool.size == 0
+
+
+def test_pool_health_checks_and_evicts_idle_connections() -> None:
+    clock = Clock()
+    pool: ConnectionPool[Connection] = ConnectionPool(
+        Connection,
+        Connection.close,
+        health_check=lambda connection: connection.healthy,
+        check_interval=10,
+        max_idle=60,
+        clock=clock,
+    )
+    connection = pool.acquire()
+    pool.release(connection)
+    connection.healthy = False
+    assert pool.acquire() is connection  # idle for less than check_interval
+    pool.release(connection)
+    clock.now = 20
+    replacement = pool.acquire()
+    assert replacement is not connection and connection.closed and pool.stats.unhealthy == 1
+    pool.release(replacement)
+    clock.now = 100
+    assert pool.evict_idle() == 1 and replacement.closed and pool.size == 0
+
+
+def test_sqlite_gateway_fetches_one_or_many_per_round_trip(tmp_path: Path) -> None:
+    gateway = make_gateway(tmp_path, rows=5)
+    assert gateway.get(1) == DTO(status=True, errorCode=0, errorName="", errorMessage="", id=1, name="user1")
+    assert gateway.get(9).errorCode == 404
+    dtos = gateway.get_many([4, 9, 0, 4, 2])
+    assert [dto.name if dto.status else None for dto in dtos] == ["user4", None, "user0", "user4", "user2"]
+    assert gateway.pool.stats.created == 1
+    gateway.close()
+
+
+def test_use_case_batches_through_the_gateway(tmp_path: Path) -> None:
+    presenter = Presenter()
+    usecase = UseCase(presenter, make_gateway(tmp_path))
+    usecase.execute(RequestModel(id=2))
+    usecase.execute_many([RequestModel(id=0), RequestModel(id=7)])
+    assert presenter.presented == [
+        ResponseModel(name="user2"),
+        ResponseModel(name="user0"),
+        BaseErrorResponseModel(code=404, message="DTO 7 was not found"),
+    ]
+
+
+def test_async_gateway_get_many_keeps_the_order() -> None:
+    dtos = asyncio.run(AsyncGateway().get_many([3, -1, 1]))
+    assert [dto.status for dto in dtos] == [True, False, True] and dtos[2].id == 1
+
+
+def test_pool_wait_cut_short_by_the_deadline_raises_deadline_exceeded() -> None:
+    pool: ConnectionPool[Connection] = ConnectionPool(Connection, Connection.close, max_size=1, timeout=5)
+    connection = pool.acquire()
+    token = bind_deadline(0.05)
+    try:
+        with pytest.raises(PoolTimeout):
+            pool.acquire(timeout=0.001)
+        with pytest.raises(DeadlineExceeded):
+            pool.acquire()
+    finally:
+        reset_deadline(token)
+    pool.release(connection)
+
+
+def test_pool_stats_add_up_under_concurrent_use() -> None:
+    pool: ConnectionPool[Connection] = ConnectionPool(Connection, Connection.close, max_size=4, timeout=5)
+
+    def borrow() -> None:
+        for index in range(200):
+            connection = pool.acquire()
+            pool.release(connection, discard=index % 10 == 0)
+
+    threads = [threading.Thread(target=borrow) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert pool.stats.acquired == 1600 and pool.stats.closed == 160
+    assert pool.stats.created - pool.stats.closed == pool.size
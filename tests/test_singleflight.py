@@ -0,0 +1,211 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from lib.deadline import DeadlineExceeded, bind_deadline, reset_deadline
+from lib.dto import BaseDTO
+from lib.primary_ports import AsyncBaseOutputPort, BaseOutputPort
+from lib.singleflight import AsyncSingleFlight, SingleFlight
+from lib.usecase import AsyncBaseSingleDTOUseCase, BaseSingleDTOUseCase
+from lib.usecase_models import (
+    BaseAuthenticatedRequestModel,
+    BaseErrorResponseModel,
+    BaseRequestModel,
+    BaseResponseModel,
+)
+
+
+class RequestModel(BaseRequestModel):
+    key: str
+
+
+class DTO(BaseDTO):
+    key: str
+
+
+class ResponseModel(BaseResponseModel):
+    key: str
+
+
+def make_dto(key: str) -> DTO:
+    return DTO(status=key != "missing", errorCode=404, errorName="NotFound", errorMessage=key, key=key)
+
+
+class Presenter(BaseOutputPort[ResponseModel, BaseErrorResponseModel]):
+    def __init__(self) -> None:
+        super().__init__()
+        self.presented: list[ResponseModel | BaseErrorResponseModel] = []
+
+    def presentSuccess(self, responseModel: ResponseModel) -> None:
+        self.presented.append(responseModel)
+
+    def presentError(self, errorModel: BaseErrorResponseModel) -> None:
+        self.presented.append(errorModel)
+
+
+class UseCase(
+    BaseSingleDTOUseCase[RequestModel, BaseAuthenticatedRequestModel, ResponseModel, BaseErrorResponseModel, DTO]
+):
+    dto_coalescing = SingleFlight()
+    calls: int = 0
+    release: threading.Event = threading.Event()
+
+    def validate_request_model(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> None:
+        pass
+
+    def make_dto_request(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> DTO:
+        assert isinstance(requestModel, RequestModel)
+        type(self).calls += 1
+        self.release.wait(5)
+        return make_dto(requestModel.key)
+
+    def handle_dto_error(self, dto: DTO) -> BaseErrorResponseModel:
+        return BaseErrorResponseModel(code=dto.errorCode, message=dto.errorMessage)
+
+    def process_dto(self, dto: DTO) -> ResponseModel | BaseErrorResponseModel:
+        return ResponseModel(key=dto.key)
+
+
+class AsyncPresenter(AsyncBaseOutputPort[ResponseModel, BaseErrorResponseModel]):
+    def __init__(self) -> None:
+        super().__init__()
+        self.presented: list[ResponseModel | BaseErrorResponseModel] = []
+
+    async def presentSuccess(self, responseModel: ResponseModel) -> None:
+        self.presented.append(responseModel)
+
+    async def presentError(self, errorModel: BaseErrorResponseModel) -> None:
+        self.presented.append(errorModel)
+
+
+class AsyncUseCase(
+    AsyncBaseSingleDTOUseCase[RequestModel, BaseAuthenticatedRequestModel, ResponseModel, BaseErrorResponseModel, DTO]
+):
+    dto_coalescing = AsyncSingleFlight()
+    calls: int = 0
+
+    async def validate_request_model(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> None:
+        pass
+
+    async def make_dto_request(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> DTO:
+        assert isinstance(requestModel, RequestModel)
+        type(self).calls += 1
+        await asyncio.sleep(0.05)
+        return make_dto(requestModel.key)
+
+    def handle_dto_error(self, dto: DTO) -> BaseErrorResponseModel:
+        return BaseErrorResponseModel(code=dto.errorCode, message=dto.errorMessage)
+
+    async def process_dto(self, dto: DTO) -> ResponseModel | BaseErrorResponseModel:
+        return ResponseModel(key=dto.key)
+
+
+def test_single_flight_shares_exceptions() -> None:
+    flight = SingleFlight()
+    gate = threading.Event()
+
+    def fail() -> int:
+        gate.wait(5)
+        raise RuntimeError("backend down")
+
+    def call() -> str:
+        try:
+            flight.do("k", fail)
+        except RuntimeError as error:
+            return str(error)
+        return "no error"
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(call) for _ in range(4)]
+        while flight.shared < 3:
+            time.sleep(0.001)
+        gate.set()
+        assert [future.result() for future in futures] == ["backend down"] * 4
+
+
+def test_waiting_callers_give_up_at_their_deadline() -> None:
+    flight = SingleFlight()
+    gate = threading.Event()
+
+    def slow() -> str:
+        gate.wait(5)
+        return "done"
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        leader = pool.submit(flight.do, "k", slow)
+        while "k" not in flight._calls:
+            time.sleep(0.001)
+        token = bind_deadline(0.05)
+        started = time.monotonic()
+        try:
+            with pytest.raises(DeadlineExceeded, match="dto"):
+                flight.do("k", slow)
+        finally:
+            reset_deadline(token)
+        assert time.monotonic() - started < 1
+        gate.set()
+        assert leader.result() == "done" and flight.shared == 1
+
+
+def test_threads_share_one_dto_fetch_including_dto_errors() -> None:
+    presenters = [Presenter() for _ in range(8)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = [
+            pool.submit(UseCase(presenter).execute, RequestModel(key="missing" if i % 2 else "hot"))
+            for i, presenter in enumerate(presenters)
+        ]
+        while UseCase.dto_coalescing.shared < 6:
+            time.sleep(0.001)
+        UseCase.release.set()
+        for future in futures:
+            future.result()
+    assert UseCase.calls == 2
+    assert [p.presented for p in presenters[:2]] == [
+        [ResponseModel(key="hot")],
+        [BaseErrorResponseModel(code=404, message="missing")],
+    ]
+    assert all(p.presented == presenters[i % 2].presented for i, p in enumerate(presenters))
+
+
+def test_async_tasks_share_one_dto_fetch() -> None:
+    presenters = [AsyncPresenter() for _ in range(20)]
+
+    async def run_all() -> None:
+        await asyncio.gather(*(AsyncUseCase(p).execute(RequestModel(key="hot")) for p in presenters))
+
+    asyncio.run(run_all())
+    assert AsyncUseCase.calls == 1
+    assert AsyncUseCase.dto_coalescing is not None and AsyncUseCase.dto_coalescing.shared == 19
+    assert all(p.presented == [ResponseModel(key="hot")] for p in presenters)
+
+
+def test_shared_task_is_cancelled_with_its_last_waiter() -> None:
+    flight = AsyncSingleFlight()
+    started: list[str] = []
+    cancelled: list[str] = []
+
+    async def fetch(key: str) -> str:
+        started.append(key)
+        try:
+            await asyncio.sleep(0.05)
+        except asyncio.CancelledError:
+            cancelled.append(key)
+            raise
+        return key
+
+    async def run() -> str:
+        leader = asyncio.ensure_future(flight.do("a", lambda: fetch("a")))
+        follower = asyncio.ensure_future(flight.do("a", lambda: fetch("a")))
+        await asyncio.sleep(0)
+        leader.cancel()
+        shared = await follower
+        alone = asyncio.ensure_future(flight.do("b", lambda: fetch("b")))
+        await asyncio.sleep(0.01)
+        alone.cancel()
+        await asyncio.sleep(0.01)
+        assert alone.cancelled() and cancelled == ["b"]
+        return shared
+
+    assert asyncio.run(run()) == "a"
+    assert started == ["a", "b"]
@@ -0,0 +1,134 @@
+import os
+from pathlib import Path
+import subprocess
+import sys
+import textwrap
+import pytest
+from pydantic import BaseModel, ConfigDict
+import lib
+from benchmarks.bench_startup import suite
+from lib.dto import BaseDTO
+from lib.primary_ports import BaseOutputPort
+from lib.startup import warmup
+from lib.usecase import BaseSingleDTOUseCase
+from lib.usecase_models import (
+    BaseAuthenticatedRequestModel,
+    BaseErrorResponseModel,
+    BaseRequestModel,
+    BaseResponseModel,
+)
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+class Deferred(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
+
+class Address(Deferred):
+    city: str
+
+
+class Customer(Deferred):
+    name: str
+    addresses: list[Address]
+
+
+class RequestModel(BaseRequestModel):
+    id: int
+
+
+class DTO(BaseDTO):
+    id: int
+
+
+class ResponseModel(BaseResponseModel):
+    id: int
+
+
+class UseCase(
+    BaseSingleDTOUseCase[RequestModel, BaseAuthenticatedRequestModel, ResponseModel, BaseErrorResponseModel, DTO]
+):
+    def validate_request_model(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> None:
+        pass
+
+    def make_dto_request(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> DTO:
+        raise NotImplementedError
+
+    def handle_dto_error(self, dto: DTO) -> BaseErrorResponseModel:
+        raise NotImplementedError
+
+    def process_dto(self, dto: DTO) -> ResponseModel | BaseErrorResponseModel:
+        raise NotImplementedError
+
+
+def run_python(code: str, lazy: bool = False) -> str:
+    env = {**os.environ, "CAPS_LAZY_SCHEMAS": "1" if lazy else "0"}
+    return subprocess.run(
+        [sys.executable, "-c", textwrap.dedent(code)], cwd=ROOT, env=env, check=True, capture_output=True, text=True
+    ).stdout
+
+
+def test_package_exports_are_lazy() -> None:
+    output = run_python("""
+        import sys
+        import lib
+        print(sorted(name for name in sys.modules if name.startswith("lib.")))
+        from lib import BaseDTO
+        print("lib.usecase" in sys.modules, BaseDTO.__module__)
+        """)
+    assert output.split("\n")[:2] == ["[]", "False lib.dto"]
+    assert "BaseSingleDTOUseCase" in dir(lib) and lib.BaseSingleDTOUseCase is BaseSingleDTOUseCase
+    with pytest.raises(AttributeError):
+        lib.missing
+
+
+def test_use_cases_do_not_import_opt_in_features() -> None:
+    output = run_python("""
+        import sys
+        from lib import BaseSingleDTOUseCase, AsyncBaseSingleDTOUseCase
+        print(sorted(name for name in sys.modules if name.startswith(("lib.", "multiprocessing"))))
+        """)
+    loaded = output.split("\n")[0]
+    for module in ("lib.auth", "lib.cache", "lib.offload", "lib.singleflight", "multiprocessing"):
+        assert f"'{module}" not in loaded
+
+
+def test_lazy_schemas_are_built_on_first_use_or_by_warmup() -> None:
+    output = run_python(
+        """
+        from lib.dto import BaseDTO
+        from lib.startup import warmup
+        from lib.view_model import BaseViewModel
+
+        class DTO(BaseDTO):
+            id: int
+
+        class ViewModel(BaseViewModel):
+            id: int
+
+        print(DTO.__pydantic_complete__, ViewModel.__pydantic_complete__)
+        print(ViewModel.trusted(status=True, id=1).model_dump_json(exclude_none=True))
+        print(warmup(DTO), DTO.__pydantic_complete__, warmup(DTO))
+        """,
+        lazy=True,
+    )
+    assert output.split("\n")[:3] == [
+        "False False",
+        '{"status":true,"id":1}',
+        "1 True 0",
+    ]
+
+
+def test_warmup_builds_the_models_of_use_cases_and_nested_fields() -> None:
+    assert not Customer.__pydantic_complete__ and not Address.__pydantic_complete__
+    assert warmup(Customer) == 2
+    assert Customer.__pydantic_complete__ and Address.__pydantic_complete__
+    warmup(UseCase(), list[Customer])
+    assert all(model.__pydantic_complete__ for model in (RequestModel, DTO, ResponseModel, BaseErrorResponseModel))
+    assert warmup(UseCase, Customer) == 0
+
+
+def test_startup_benchmarks_run() -> None:
+    results = suite.run(number=1, repeat=1, only="define")
+    assert len(results) == 3 and all(result.ns_per_call > 0 for result in results)
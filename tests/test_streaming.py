@@ -0,0 +1,149 @@
+import asyncio
+import json
+from typing import AsyncIterator, Iterator
+from lib.dto import BaseDTO
+from lib.json_response import AsyncJSONPresenterResponse, JSONPresenterResponse
+from lib.presenter import AsyncBasePresenter, BasePresenter
+from lib.usecase import AsyncBaseStreamingUseCase, BaseStreamingUseCase
+from lib.usecase_models import (
+    BaseAuthenticatedRequestModel,
+    BaseErrorResponseModel,
+    BaseRequestModel,
+    BaseResponseModel,
+)
+from lib.view_model import BaseViewModel
+
+
+class RequestModel(BaseRequestModel):
+    pages: int
+    fail_at: int = -1
+
+
+class DTO(BaseDTO):
+    page: int
+
+
+class ResponseModel(BaseResponseModel):
+    page: int
+
+
+class ViewModel(BaseViewModel):
+    page: int | None = None
+
+
+def make_dto(page: int, fail_at: int) -> DTO:
+    return DTO(status=page != fail_at, errorCode=502, errorName="Upstream", errorMessage="page failed", page=page)
+
+
+class Sink:
+    def __init__(self, produced: list[int]) -> None:
+        self.produced = produced
+        self.lines: list[tuple[int, bytes]] = []
+
+    def write(self, data: bytes) -> None:
+        # records how many pages had been produced when the line was written
+        self.lines.append((len(self.produced), bytes(data)))
+
+    async def drain(self) -> None:
+        pass
+
+
+class Presenter(BasePresenter[ResponseModel, BaseErrorResponseModel, ViewModel]):
+    def convertResponseToViewModel(self, responseModel: ResponseModel) -> ViewModel:
+        return ViewModel(status=True, page=responseModel.page)
+
+    def convertErrorToViewModel(self, errorModel: BaseErrorResponseModel) -> ViewModel:
+        return ViewModel(status=False, errorName="Upstream", errorMessage=errorModel.message)
+
+
+class AsyncPresenter(AsyncBasePresenter[ResponseModel, BaseErrorResponseModel, ViewModel]):
+    def convertResponseToViewModel(self, responseModel: ResponseModel) -> ViewModel:
+        return ViewModel(status=True, page=responseModel.page)
+
+    def convertErrorToViewModel(self, errorModel: BaseErrorResponseModel) -> ViewModel:
+        return ViewModel(status=False, errorName="Upstream", errorMessage=errorModel.message)
+
+
+class UseCase(
+    BaseStreamingUseCase[RequestModel, BaseAuthenticatedRequestModel, ResponseModel, BaseErrorResponseModel, DTO]
+):
+    def __init__(self, presenter: Presenter) -> None:
+        super().__init__(presenter)
+        self.produced: list[int] = []
+        self.closed = False
+
+    def validate_request_model(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> None:
+        pass
+
+    def make_dto_stream(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> Iterator[DTO]:
+        assert isinstance(requestModel, RequestModel)
+        try:
+            for page in range(requestModel.pages):
+                self.produced.append(page)
+                yield make_dto(page, requestModel.fail_at)
+        finally:
+            self.closed = True
+
+    def handle_dto_error(self, dto: DTO) -> BaseErrorResponseModel:
+        return BaseErrorResponseModel(code=dto.errorCode, message=dto.errorMessage)
+
+    def process_dto(self, dto: DTO) -> ResponseModel | BaseErrorResponseModel:
+        return ResponseModel(page=dto.page)
+
+
+class AsyncUseCase(
+    AsyncBaseStreamingUseCase[RequestModel, BaseAuthenticatedRequestModel, ResponseModel, BaseErrorResponseModel, DTO]
+):
+    def __init__(self, presenter: AsyncPresenter) -> None:
+        super().__init__(presenter)
+        self.produced: list[int] = []
+
+    async def validate_request_model(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> None:
+        pass
+
+    async def make_dto_stream(self, requestModel: RequestModel | BaseAuthenticatedRequestModel) -> AsyncIterator[DTO]:
+        assert isinstance(requestModel, RequestModel)
+        for page in range(requestModel.pages):
+            await asyncio.sleep(0)
+            self.produced.append(page)
+            yield make_dto(page, requestModel.fail_at)
+
+    def handle_dto_error(self, dto: DTO) -> BaseErrorResponseModel:
+        return BaseErrorResponseModel(code=dto.errorCode, message=dto.errorMessage)
+
+    async def process_dto(self, dto: DTO) -> ResponseModel | BaseErrorResponseModel:
+        return ResponseModel(page=dto.page)
+
+
+def test_stream_is_written_line_by_line_as_pages_are_produced() -> None:
+    presenter = Presenter()
+    usecase = UseCase(presenter)
+    sink = Sink(usecase.produced)
+    response = JSONPresenterResponse(sink)
+    usecase.execute_with(RequestModel(pages=3), response=response)
+    assert [produced for produced, _ in sink.lines] == [1, 2, 3]
+    assert [json.loads(line)["page"] for _, line in sink.lines] == [0, 1, 2]
+    assert response.status_code == 200
+
+
+def test_failed_dto_ends_the_stream_with_a_converted_error() -> None:
+    presenter = Presenter(JSONPresenterResponse(status_codes={"Upstream": 502}))
+    usecase = UseCase(presenter)
+    usecase.execute(RequestModel(pages=5, fail_at=2))
+    lines = [json.loads(line) for line in presenter.response.body.tobytes().splitlines()]  # type: ignore[attr-defined]
+    assert [line["page"] for line in lines[:2]] == [0, 1]
+    assert lines[2] == {"status": False, "errorName": "Upstream", "errorMessage": "page failed", "page": None}
+    assert usecase.produced == [0, 1, 2]
+    assert usecase.closed
+    assert presenter.response.status_code == 200  # type: ignore[attr-defined]
+
+
+def test_async_stream_is_written_and_drained_line_by_line() -> None:
+    presenter = AsyncPresenter()
+    usecase = AsyncUseCase(presenter)
+    sink = Sink(usecase.produced)
+    response = AsyncJSONPresenterResponse(sink, status_codes={"Upstream": 502})
+    asyncio.run(usecase.execute_with(RequestModel(pages=4, fail_at=0), response=response))
+    assert [json.loads(line)["errorName"] for _, line in sink.lines] == ["Upstream"]
+    assert response.status_code == 502
+    assert usecase.produced == [0]
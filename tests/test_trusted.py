@@ -0,0 +1,54 @@
+from typing import Iterator
+import pytest
+from pydantic import ValidationError
+from lib.dto import BaseDTO
+from lib.trusted import set_trusted_validation_rate, trusted_validation_rate
+from lib.usecase_models import BaseRequestModel, BaseResponseModel
+from lib.view_model import BaseViewModel
+
+
+class ResponseModel(BaseResponseModel):
+    count: int
+
+
+class ViewModel(BaseViewModel):
+    count: int
+
+
+@pytest.fixture
+def validation_rate() -> Iterator[None]:
+    previous = trusted_validation_rate()
+    yield
+    set_trusted_validation_rate(previous)
+
+
+def test_trusted_construction_skips_validation_and_fills_defaults(validation_rate: None) -> None:
+    set_trusted_validation_rate(0.0)
+    responseModel = ResponseModel.trusted(count="not validated")
+    assert responseModel.status is True
+    assert responseModel.count == "not validated"  # type: ignore[comparison-overlap]
+    viewModel = ViewModel.trusted(status=True, count=3)
+    assert viewModel == ViewModel(status=True, count=3)
+    assert viewModel.errorName is None
+
+
+def test_sampled_validation_still_catches_contract_bugs(validation_rate: None) -> None:
+    set_trusted_validation_rate(1.0)
+    with pytest.raises(ValidationError):
+        BaseDTO.trusted(status=True, errorCode="x", errorName="", errorMessage="")
+    with pytest.raises(ValueError):
+        set_trusted_validation_rate(2.0)
+
+
+def test_request_models_are_never_trusted() -> None:
+    assert not hasattr(BaseRequestModel, "trusted")
+
+
+def test_trusted_construction_does_not_share_mutable_defaults() -> None:
+    class ListViewModel(BaseViewModel):
+        items: list[int] = []
+
+    first = ListViewModel.trusted(status=True)
+    first.items.append(1)
+    assert ListViewModel.trusted(status=True).items == []
+    assert first.model_fields_set == {"status"}